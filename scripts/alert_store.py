@@ -0,0 +1,410 @@
+"""
+Alert Store Module
+
+Indexed, concurrent-safe store for alerts (TECHNICAL_SPEC.md §14).
+
+Writers used to load alerts.json, append and rewrite it, so two skills
+alerting at once could drop each other's alerts, and acknowledged alerts
+piled up in alerts_archive.json forever. Alerts now live in a SQLite file
+(alerts.sqlite in the repo root, override with IDIO_ALERTS_DB):
+- add() inserts atomically; an alert with the same (type, ticker, reason)
+  as an unacknowledged one is merged into it (occurrences, last_seen)
+  instead of duplicated. "reason" falls back to "message".
+- acknowledge() and archive() are single UPDATEs
+- active() reads unacknowledged alerts through a partial index, so it
+  costs O(active alerts), not O(history)
+
+alerts.json (next to the database) stays the human/skill-readable view:
+after every change it is rewritten (atomic rename) with the unacknowledged
+alerts only. Alerts added to alerts.json by hand are picked up (and alerts
+marked "acknowledged": true there are acknowledged) before each rewrite.
+
+Existing alerts.json / alerts_archive.json files are loaded with
+import_json() (idempotent: alerts are keyed by id).
+
+Usage:
+    from alert_store import AlertStore
+
+    store = AlertStore()
+    alert_id, created = store.add({"type": "exit_signal", "ticker": "SRPT", "priority": "immediate",
+                                   "message": "Info parity weighted sum = 2.1. Exit 50% recommended."})
+    store.active(priority="immediate")
+    store.acknowledge([alert_id], resolution="Exited 50%")
+
+    python alert_store.py active [--priority immediate]
+    python alert_store.py add '{"type": "regime_change", "priority": "immediate", "message": "..."}'
+    python alert_store.py ack ALERT-20260120161500 --resolution "Closed position"
+    python alert_store.py archive [--days 7]
+    python alert_store.py history [--ticker LULU] [--limit 20]
+    python alert_store.py import alerts.json alerts_archive.json
+"""
+
+import json
+import os
+import sqlite3
+import sys
+import tempfile
+import threading
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+DEFAULT_METADATA = {
+    "version": "1.0",
+    "description": "Active alerts requiring user action (view of alerts.sqlite, see scripts/alert_store.py)",
+}
+
+
+def alerts_db_path() -> Path:
+    """Resolve the alert database (env override: IDIO_ALERTS_DB)."""
+    override = os.getenv("IDIO_ALERTS_DB")
+    if override:
+        return Path(override)
+    return REPO_ROOT / "alerts.sqlite"
+
+
+def dedup_key(alert: Dict) -> str:
+    """(type, ticker, reason) identity used to merge repeated alerts."""
+    reason = alert.get("reason") or alert.get("message") or ""
+    return json.dumps([alert.get("type"), (alert.get("ticker") or "").upper(), reason])
+
+
+class AlertStore:
+    """
+    SQLite-backed alerts with an alerts.json view of the active ones.
+
+    Safe for concurrent use from several processes (WAL mode, busy
+    timeout, IMMEDIATE transactions) and threads.
+    """
+
+    def __init__(self, path: Optional[Path] = None, active_file: Optional[Path] = None,
+                 write_view: bool = True):
+        """
+        Args:
+            path: Database file (default: alerts_db_path())
+            active_file: alerts.json view (default: alerts.json next to the database)
+            write_view: Keep the alerts.json view in sync
+        """
+        self.path = Path(path) if path else alerts_db_path()
+        self.active_file = None
+        if write_view:
+            self.active_file = Path(active_file) if active_file else self.path.with_name("alerts.json")
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.path), timeout=10, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS alerts (
+                    id TEXT PRIMARY KEY,
+                    timestamp TEXT NOT NULL,
+                    priority TEXT,
+                    type TEXT,
+                    ticker TEXT,
+                    trade_id TEXT,
+                    dedup_key TEXT NOT NULL,
+                    payload TEXT NOT NULL,
+                    occurrences INTEGER NOT NULL DEFAULT 1,
+                    last_seen TEXT NOT NULL,
+                    acknowledged INTEGER NOT NULL DEFAULT 0,
+                    acknowledged_at TEXT,
+                    resolution TEXT,
+                    archived INTEGER NOT NULL DEFAULT 0
+                )
+                """
+            )
+            conn.execute(
+                "CREATE UNIQUE INDEX IF NOT EXISTS idx_alerts_active_dedup ON alerts(dedup_key) "
+                "WHERE acknowledged = 0"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_alerts_active ON alerts(priority, timestamp) "
+                "WHERE acknowledged = 0"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_alerts_ticker ON alerts(ticker, timestamp)")
+            self._conn = conn
+        return self._conn
+
+    def _transaction(self, fn, sync_view: bool = True):
+        """Run fn(conn) in one IMMEDIATE transaction, then rewrite alerts.json before releasing the lock."""
+        with self._lock:
+            conn = self._connect()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                if sync_view:
+                    self._ingest_view(conn)
+                result = fn(conn)
+                if sync_view:
+                    self._write_view(conn)
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+            return result
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _insert(conn, alert: Dict, archived: bool = False) -> Tuple[str, bool]:
+        """Insert or merge one alert (caller holds the transaction)."""
+        now = datetime.now().isoformat()
+        alert = dict(alert)
+        alert.setdefault("timestamp", now)
+        alert.setdefault("acknowledged", False)
+        key = dedup_key(alert)
+        acknowledged = bool(alert["acknowledged"]) or archived
+
+        if not acknowledged:
+            row = conn.execute(
+                "SELECT id FROM alerts WHERE dedup_key = ? AND acknowledged = 0", (key,)).fetchone()
+            if row is not None:
+                conn.execute(
+                    "UPDATE alerts SET occurrences = occurrences + 1, last_seen = ? WHERE id = ?",
+                    (alert["timestamp"], row[0]),
+                )
+                return row[0], False
+
+        base_id = alert.get("id") or f"ALERT-{datetime.now().strftime('%Y%m%d%H%M%S')}"
+        alert_id, suffix = base_id, 1
+        while conn.execute("SELECT 1 FROM alerts WHERE id = ?", (alert_id,)).fetchone():
+            suffix += 1
+            alert_id = f"{base_id}-{suffix}"
+        alert["id"] = alert_id
+
+        conn.execute(
+            "INSERT INTO alerts (id, timestamp, priority, type, ticker, trade_id, dedup_key, payload, "
+            "last_seen, acknowledged, acknowledged_at, resolution, archived) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (alert_id, alert["timestamp"], alert.get("priority"), alert.get("type"),
+             (alert.get("ticker") or "").upper() or None, alert.get("trade_id"), key,
+             json.dumps(alert, default=str), alert["timestamp"], int(acknowledged),
+             alert.get("acknowledged_date") or (now if acknowledged else None),
+             alert.get("resolution"), int(archived)),
+        )
+        return alert_id, True
+
+    def add(self, alert: Dict) -> Tuple[str, bool]:
+        """
+        Insert an alert, or merge it into the active alert with the same (type, ticker, reason).
+
+        Returns:
+            (alert id, True if a new alert was created)
+        """
+        return self._transaction(lambda conn: self._insert(conn, alert))
+
+    def acknowledge(self, alert_ids: Iterable[str], resolution: Optional[str] = None) -> int:
+        """Acknowledge alerts by id. Returns the number acknowledged."""
+        ids = list(alert_ids)
+        now = datetime.now().isoformat()
+
+        def update(conn):
+            return sum(conn.execute(
+                "UPDATE alerts SET acknowledged = 1, acknowledged_at = ?, resolution = COALESCE(?, resolution) "
+                "WHERE id = ? AND acknowledged = 0",
+                (now, resolution, alert_id),
+            ).rowcount for alert_id in ids)
+
+        return self._transaction(update)
+
+    def archive(self, older_than_days: float = 0) -> int:
+        """Archive acknowledged alerts acknowledged at least `older_than_days` ago. Returns the count."""
+        cutoff = (datetime.now() - timedelta(days=older_than_days)).isoformat()
+        return self._transaction(lambda conn: conn.execute(
+            "UPDATE alerts SET archived = 1 WHERE acknowledged = 1 AND archived = 0 AND acknowledged_at <= ?",
+            (cutoff,),
+        ).rowcount, sync_view=False)
+
+    def import_json(self, path: Path) -> int:
+        """
+        Import an alerts.json ("alerts") or alerts_archive.json ("archived_alerts") file.
+
+        Alerts already in the store (same id) are skipped.
+
+        Returns:
+            Number of alerts imported
+        """
+        data = json.loads(Path(path).read_text())
+
+        def load(conn):
+            imported = 0
+            for archived, key in ((False, "alerts"), (True, "archived_alerts")):
+                for alert in data.get(key, []):
+                    if alert.get("id") and conn.execute(
+                            "SELECT 1 FROM alerts WHERE id = ?", (alert["id"],)).fetchone():
+                        continue
+                    imported += self._insert(conn, alert, archived=archived)[1]
+            return imported
+
+        return self._transaction(load)
+
+    # ------------------------------------------------------------------
+    # alerts.json view
+    # ------------------------------------------------------------------
+
+    def _read_view(self) -> Dict:
+        if self.active_file is None or not self.active_file.exists():
+            return {}
+        try:
+            return json.loads(self.active_file.read_text())
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"Could not read {self.active_file}: {e}", file=sys.stderr)
+            return {}
+
+    def _ingest_view(self, conn):
+        """Pick up alerts added to (or acknowledged in) alerts.json by hand."""
+        now = datetime.now().isoformat()
+        for alert in self._read_view().get("alerts", []):
+            row = conn.execute("SELECT acknowledged FROM alerts WHERE id = ?", (alert.get("id"),)).fetchone()
+            if row is None:
+                self._insert(conn, alert)
+            elif alert.get("acknowledged") and not row[0]:
+                conn.execute(
+                    "UPDATE alerts SET acknowledged = 1, acknowledged_at = ?, resolution = ? WHERE id = ?",
+                    (alert.get("acknowledged_date") or now, alert.get("resolution"), alert["id"]),
+                )
+
+    def _write_view(self, conn):
+        """Rewrite alerts.json with the unacknowledged alerts (atomic rename)."""
+        if self.active_file is None:
+            return
+        existing = self._read_view()
+        view = {
+            "alerts": self._active(conn),
+            "metadata": existing.get("metadata", DEFAULT_METADATA),
+        }
+        if "priority_levels" in existing:
+            view["priority_levels"] = existing["priority_levels"]
+
+        self.active_file.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=self.active_file.parent, suffix=".tmp")
+        with os.fdopen(fd, "w") as handle:
+            json.dump(view, handle, indent=2, default=str)
+            handle.write("\n")
+        os.replace(tmp_name, self.active_file)
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _row_to_alert(payload, occurrences, last_seen, acknowledged, acknowledged_at, resolution) -> Dict:
+        alert = json.loads(payload)
+        alert["acknowledged"] = bool(acknowledged)
+        if occurrences > 1:
+            alert["occurrences"] = occurrences
+            alert["last_seen"] = last_seen
+        if acknowledged_at and acknowledged:
+            alert["acknowledged_date"] = acknowledged_at
+        if resolution:
+            alert["resolution"] = resolution
+        return alert
+
+    def _active(self, conn, priority: Optional[str] = None) -> List[Dict]:
+        sql = ("SELECT payload, occurrences, last_seen, acknowledged, acknowledged_at, resolution "
+               "FROM alerts WHERE acknowledged = 0")
+        params = ()
+        if priority:
+            sql += " AND priority = ?"
+            params = (priority,)
+        rows = conn.execute(sql + " ORDER BY timestamp", params).fetchall()
+        return [self._row_to_alert(*row) for row in rows]
+
+    def active(self, priority: Optional[str] = None) -> List[Dict]:
+        """Unacknowledged alerts, oldest first (optionally one priority)."""
+        with self._lock:
+            return self._active(self._connect(), priority)
+
+    def history(self, ticker: Optional[str] = None, include_archived: bool = True,
+                limit: Optional[int] = None) -> List[Dict]:
+        """All alerts, newest first (optionally for one ticker)."""
+        clauses, params = [], []
+        if ticker:
+            clauses.append("ticker = ?")
+            params.append(ticker.upper())
+        if not include_archived:
+            clauses.append("archived = 0")
+        sql = "SELECT payload, occurrences, last_seen, acknowledged, acknowledged_at, resolution FROM alerts"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY timestamp DESC"
+        if limit:
+            sql += f" LIMIT {int(limit)}"
+        with self._lock:
+            rows = self._connect().execute(sql, params).fetchall()
+        return [self._row_to_alert(*row) for row in rows]
+
+    def stats(self) -> Dict:
+        """Alert counts by state."""
+        with self._lock:
+            active, acknowledged, archived = self._connect().execute(
+                "SELECT COALESCE(SUM(acknowledged = 0), 0), COALESCE(SUM(acknowledged = 1 AND archived = 0), 0), "
+                "COALESCE(SUM(archived = 1), 0) FROM alerts"
+            ).fetchone()
+        return {"path": str(self.path), "active": active, "acknowledged": acknowledged, "archived": archived}
+
+
+def main():
+    """CLI interface for the alert store."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Query and manage alerts")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    active = sub.add_parser("active", help="Unacknowledged alerts")
+    active.add_argument("--priority", choices=["immediate", "daily_digest", "weekly_review"])
+
+    add = sub.add_parser("add", help="Add an alert (JSON object)")
+    add.add_argument("alert")
+
+    ack = sub.add_parser("ack", help="Acknowledge alerts")
+    ack.add_argument("ids", nargs="+")
+    ack.add_argument("--resolution")
+
+    archive = sub.add_parser("archive", help="Archive acknowledged alerts")
+    archive.add_argument("--days", type=float, default=0, help="Only those acknowledged at least N days ago")
+
+    history = sub.add_parser("history", help="All alerts, newest first")
+    history.add_argument("--ticker")
+    history.add_argument("--limit", type=int)
+
+    imp = sub.add_parser("import", help="Import alerts.json / alerts_archive.json files")
+    imp.add_argument("files", nargs="+")
+
+    sub.add_parser("stats", help="Alert counts")
+    args = parser.parse_args()
+
+    store = AlertStore()
+    if args.command == "active":
+        result = store.active(args.priority)
+    elif args.command == "add":
+        alert_id, created = store.add(json.loads(args.alert))
+        result = {"id": alert_id, "created": created}
+    elif args.command == "ack":
+        result = {"acknowledged": store.acknowledge(args.ids, args.resolution)}
+    elif args.command == "archive":
+        result = {"archived": store.archive(args.days)}
+    elif args.command == "history":
+        result = store.history(args.ticker, limit=args.limit)
+    elif args.command == "import":
+        result = {path: store.import_json(Path(path)) for path in args.files}
+    else:
+        result = store.stats()
+    print(json.dumps(result, indent=2, default=str))
+
+
+if __name__ == "__main__":
+    main()
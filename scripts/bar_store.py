@@ -0,0 +1,265 @@
+"""
+Bar Store Module
+
+Local columnar store of daily OHLCV bars, one file per ticker.
+
+Each ticker's history is kept as NumPy arrays (date as YYYYMMDD int, open,
+high, low, close, volume) in cache/bars/{TICKER}.npz. Fetchers only request
+the tail since the last stored date and append it, so a daily monitor run
+pulls ~1 bar per ticker instead of ~210. MA-200, volume averages and
+returns are computed straight from the stored arrays.
+
+Writes go to a temp file and are atomically renamed into place, so
+concurrent readers never see a partial file.
+
+Usage:
+    from bar_store import BarStore
+
+    store = BarStore()
+    store.append("SPY", bars, source="IBKR Paper")
+    print(store.load("SPY").moving_average(200))
+
+    python bar_store.py show SPY
+"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+
+import indicators
+from price_cache import DEFAULT_HISTORICAL_MINUTES, MARKET_TZ, cache_dir, expires_at, load_cache_policy
+
+COLUMNS = ("open", "high", "low", "close", "volume")
+
+
+def _date_to_int(value) -> int:
+    """Convert 'YYYY-MM-DD', 'YYYYMMDD' or 'YYYYMMDD  HH:MM:SS' to YYYYMMDD."""
+    return int(str(value).strip().split(" ")[0].replace("-", ""))
+
+
+def _int_to_date(value: int) -> date:
+    return date(value // 10000, value // 100 % 100, value % 100)
+
+
+@dataclass
+class Bars:
+    """Daily OHLCV history for one ticker, oldest first."""
+    ticker: str
+    date: np.ndarray
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+    source: str = ""
+    fetched_at: float = 0.0
+
+    def __len__(self) -> int:
+        return len(self.date)
+
+    @property
+    def last_date(self) -> Optional[date]:
+        if not len(self):
+            return None
+        try:
+            return _int_to_date(int(self.date[-1]))
+        except ValueError:
+            return None
+
+    def moving_average(self, window: int = 200) -> Optional[float]:
+        """Simple moving average of the last `window` closes."""
+        return indicators.to_optional(indicators.trailing_mean(self.close, window))
+
+    def average_volume(self, window: int = 20) -> Optional[float]:
+        """Average daily volume over the last `window` bars."""
+        return indicators.to_optional(indicators.trailing_mean(self.volume, window))
+
+    def period_return(self, days: int) -> Optional[float]:
+        """Close-to-close return over the last `days` bars (0.05 = +5%)."""
+        return indicators.to_optional(indicators.period_return(self.close, days))
+
+    def to_records(self) -> List[Dict]:
+        """Bars as list of dicts (date as YYYY-MM-DD), oldest first."""
+        records = []
+        for idx, value in enumerate(self.date):
+            value = int(value)
+            records.append(
+                {
+                    "date": f"{value // 10000:04d}-{value // 100 % 100:02d}-{value % 100:02d}",
+                    **{column: float(getattr(self, column)[idx]) for column in COLUMNS},
+                }
+            )
+        return records
+
+
+class BarStore:
+    """Per-ticker .npz bar files under cache/bars (override root for tests)."""
+
+    def __init__(self, root: Optional[Path] = None):
+        self._root = Path(root) if root else None
+        # Intraday refresh interval for the (partial) latest bar.
+        self.regular_hours_ttl = timedelta(minutes=load_cache_policy().get(
+            "price_duration_minutes", DEFAULT_HISTORICAL_MINUTES))
+
+    @property
+    def root(self) -> Path:
+        return self._root or cache_dir() / "bars"
+
+    def _path(self, ticker: str) -> Path:
+        return self.root / f"{ticker.upper()}.npz"
+
+    def load(self, ticker: str) -> Optional[Bars]:
+        """Load stored bars, or None if the ticker has no (readable) file."""
+        path = self._path(ticker)
+        if not path.exists():
+            return None
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                return Bars(
+                    ticker=ticker.upper(),
+                    date=data["date"],
+                    **{column: data[column] for column in COLUMNS},
+                    source=str(data["source"]),
+                    fetched_at=float(data["fetched_at"]),
+                )
+        except (OSError, KeyError, ValueError) as e:
+            print(f"Bar store read error for {ticker}: {e}", file=sys.stderr)
+            return None
+
+    def append(self, ticker: str, bars: List[Dict], source: str) -> Optional[Bars]:
+        """
+        Merge new bars into the stored history and persist it.
+
+        Bars for dates already stored replace the stored values, so a
+        partial intraday bar is corrected by the next fetch.
+
+        Args:
+            ticker: Stock ticker symbol
+            bars: List of dicts with date and close (open/high/low/volume optional)
+            source: Data source of the new bars
+
+        Returns:
+            Updated Bars
+        """
+        new = {"date": [], **{column: [] for column in COLUMNS}}
+        for bar in bars:
+            if bar.get("close") is None or bar.get("date") is None:
+                continue
+            try:
+                new["date"].append(_date_to_int(bar["date"]))
+            except ValueError:
+                continue
+            close = float(bar["close"])
+            new["close"].append(close)
+            for column in ("open", "high", "low"):
+                new[column].append(float(bar.get(column) if bar.get(column) is not None else close))
+            new["volume"].append(float(bar.get("volume") or 0))
+
+        existing = self.load(ticker)
+        if existing is not None and len(existing):
+            dates = np.concatenate([existing.date, np.asarray(new["date"], dtype=np.int64)])
+            columns = {
+                column: np.concatenate([getattr(existing, column), np.asarray(new[column], dtype=np.float64)])
+                for column in COLUMNS
+            }
+        else:
+            dates = np.asarray(new["date"], dtype=np.int64)
+            columns = {column: np.asarray(new[column], dtype=np.float64) for column in COLUMNS}
+
+        # Keep the last occurrence of each date (new bars win), sorted by date.
+        reversed_dates = dates[::-1]
+        _, first_idx = np.unique(reversed_dates, return_index=True)
+        keep = len(dates) - 1 - first_idx
+
+        result = Bars(
+            ticker=ticker.upper(),
+            date=dates[keep],
+            **{column: values[keep] for column, values in columns.items()},
+            source=source,
+            fetched_at=time.time(),
+        )
+        self._write(result)
+        return result
+
+    def _write(self, bars: Bars):
+        path = self._path(bars.ticker)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as handle:
+                np.savez(
+                    handle,
+                    date=bars.date,
+                    **{column: getattr(bars, column) for column in COLUMNS},
+                    source=np.array(bars.source),
+                    fetched_at=np.array(bars.fetched_at),
+                )
+            os.replace(tmp_name, path)
+        except OSError as e:
+            print(f"Bar store write error for {bars.ticker}: {e}", file=sys.stderr)
+            if os.path.exists(tmp_name):
+                os.unlink(tmp_name)
+
+    def is_fresh(self, bars: Optional[Bars]) -> bool:
+        """
+        Whether stored bars are recent enough to skip fetching.
+
+        Uses the same session rules as the price cache: intraday bars
+        refresh after regular_hours_ttl (and at the close), bars fetched
+        after the close stay fresh until the next open.
+        """
+        if bars is None or not len(bars) or not bars.fetched_at:
+            return False
+        fetched = datetime.fromtimestamp(bars.fetched_at, MARKET_TZ)
+        return datetime.now(MARKET_TZ) < expires_at(self.regular_hours_ttl, fetched)
+
+    def missing_days(self, bars: Optional[Bars], full_days: int) -> int:
+        """
+        Number of days to request so the store covers the latest session.
+
+        Re-requests the last stored date so a partial bar gets corrected.
+        """
+        last = bars.last_date if bars is not None else None
+        if last is None:
+            return full_days
+        gap = (datetime.now(MARKET_TZ).date() - last).days + 1
+        return max(2, min(gap, full_days))
+
+
+def main():
+    """CLI interface for inspecting stored bars."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Inspect the local daily bar store")
+    parser.add_argument("command", choices=["show"])
+    parser.add_argument("ticker", help="Stock ticker symbol")
+    args = parser.parse_args()
+
+    bars = BarStore().load(args.ticker)
+    if bars is None:
+        print(f"ERROR: No stored bars for {args.ticker.upper()}", file=sys.stderr)
+        sys.exit(1)
+
+    records = bars.to_records()
+    print(json.dumps({
+        "ticker": bars.ticker,
+        "bars": len(bars),
+        "first_date": records[0]["date"] if records else None,
+        "last_date": records[-1]["date"] if records else None,
+        "source": bars.source,
+        "fetched_at": datetime.fromtimestamp(bars.fetched_at).isoformat(),
+        "ma_200": bars.moving_average(200),
+        "avg_volume_20d": bars.average_volume(20),
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,268 @@
+"""
+Black-Scholes Module
+
+Vectorized Black-Scholes-Merton pricing, implied volatility and Greeks.
+
+Second source for option Greeks next to IBKR's tickOptionComputation,
+which returns sentinels (-1/-2) when the model has not run yet or the
+quote is stale. All functions broadcast over NumPy arrays, so a whole
+option chain is priced in one pass:
+
+- implied_volatility(): IV from option prices (safeguarded Newton steps
+  inside a shrinking bisection bracket; NaN when the price violates the
+  no-arbitrage bounds)
+- greeks(): delta, gamma, vega, theta in IBKR's units (vega per 1 vol
+  point, theta per calendar day)
+- model_greeks(): IV from the mid price plus Greeks for one quote or a
+  chain of rows, ready to compare with IBKR values
+- compare_greeks(): fields where IBKR and the model disagree beyond the
+  configured tolerances (data_quality.model_greeks in CONFIG.json)
+
+Usage:
+    from black_scholes import model_greeks
+
+    model = model_greeks(mid_price=2.10, underlying_price=100.0, strike=100.0,
+                         expiration="2026-02-20", right="CALL")
+    print(model["implied_volatility"], model["delta"])
+"""
+
+import math
+from datetime import datetime, time as dt_time
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from indicators import to_optional
+from price_cache import MARKET_TZ
+
+DEFAULT_RISK_FREE_RATE = 0.04
+DEFAULT_DIVIDEND_YIELD = 0.0
+
+# IV search bounds and convergence
+IV_LOWER = 1e-4
+IV_UPPER = 5.0
+IV_TOLERANCE = 1e-6
+IV_MAX_ITERATIONS = 100
+
+# Absolute tolerances for IV/delta, relative for gamma/vega/theta
+DEFAULT_TOLERANCES = {
+    "abs": {"implied_volatility": 0.05, "delta": 0.05},
+    "rel": {"gamma": 0.25, "vega": 0.25, "theta": 0.25},
+}
+
+GREEK_FIELDS = ("implied_volatility", "delta", "gamma", "vega", "theta")
+
+# Floor on time to expiry (about one trading hour) so expiring options stay finite
+MIN_YEARS = 1.0 / (365 * 24)
+
+_SQRT_2PI = math.sqrt(2 * math.pi)
+
+
+def norm_cdf(x: np.ndarray) -> np.ndarray:
+    """Standard normal CDF (vectorized erf via Abramowitz-Stegun 7.1.26, |error| < 1.5e-7)."""
+    x = np.asarray(x, dtype=np.float64)
+    z = np.abs(x) / math.sqrt(2)
+    t = 1.0 / (1.0 + 0.3275911 * z)
+    poly = t * (0.254829592 + t * (-0.284496736 + t * (1.421413741 + t * (-1.453152027 + t * 1.061405429))))
+    erf = 1.0 - poly * np.exp(-z * z)
+    return 0.5 * (1.0 + np.sign(x) * erf)
+
+
+def norm_pdf(x: np.ndarray) -> np.ndarray:
+    x = np.asarray(x, dtype=np.float64)
+    return np.exp(-0.5 * x * x) / _SQRT_2PI
+
+
+def year_fraction(expiration: str, as_of: Optional[datetime] = None) -> float:
+    """Years from as_of (default now) to the 16:00 ET close on the expiration date."""
+    expiry = datetime.combine(datetime.strptime(expiration, "%Y-%m-%d").date(), dt_time(16, 0), MARKET_TZ)
+    now = as_of or datetime.now(MARKET_TZ)
+    return max((expiry - now).total_seconds() / (365 * 24 * 3600), MIN_YEARS)
+
+
+def _d1_d2(spot, strike, years, rate, dividend, sigma):
+    spot, strike, years, sigma = np.broadcast_arrays(*(np.asarray(v, dtype=np.float64)
+                                                       for v in (spot, strike, years, sigma)))
+    sqrt_t = np.sqrt(years)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        d1 = (np.log(spot / strike) + (rate - dividend + 0.5 * sigma ** 2) * years) / (sigma * sqrt_t)
+    return d1, d1 - sigma * sqrt_t, sqrt_t
+
+
+def price(spot, strike, years, sigma, is_call, rate=DEFAULT_RISK_FREE_RATE,
+          dividend=DEFAULT_DIVIDEND_YIELD) -> np.ndarray:
+    """Black-Scholes-Merton option price."""
+    d1, d2, _ = _d1_d2(spot, strike, years, rate, dividend, sigma)
+    years = np.asarray(years, dtype=np.float64)
+    spot_df = np.asarray(spot, dtype=np.float64) * np.exp(-dividend * years)
+    strike_df = np.asarray(strike, dtype=np.float64) * np.exp(-rate * years)
+    call = spot_df * norm_cdf(d1) - strike_df * norm_cdf(d2)
+    put = strike_df * norm_cdf(-d2) - spot_df * norm_cdf(-d1)
+    return np.where(is_call, call, put)
+
+
+def greeks(spot, strike, years, sigma, is_call, rate=DEFAULT_RISK_FREE_RATE,
+           dividend=DEFAULT_DIVIDEND_YIELD) -> Dict[str, np.ndarray]:
+    """
+    Delta, gamma, vega (per 1 vol point) and theta (per calendar day).
+
+    Returns:
+        Dict of arrays with keys delta, gamma, vega, theta
+    """
+    d1, d2, sqrt_t = _d1_d2(spot, strike, years, rate, dividend, sigma)
+    spot = np.asarray(spot, dtype=np.float64)
+    strike = np.asarray(strike, dtype=np.float64)
+    years = np.asarray(years, dtype=np.float64)
+    sigma = np.asarray(sigma, dtype=np.float64)
+    q_df = np.exp(-dividend * years)
+    r_df = np.exp(-rate * years)
+    pdf = norm_pdf(d1)
+
+    call_delta = q_df * norm_cdf(d1)
+    put_delta = call_delta - q_df
+    with np.errstate(divide="ignore", invalid="ignore"):
+        gamma = q_df * pdf / (spot * sigma * sqrt_t)
+        decay = -spot * q_df * pdf * sigma / (2 * sqrt_t)
+    call_theta = decay - rate * strike * r_df * norm_cdf(d2) + dividend * spot * q_df * norm_cdf(d1)
+    put_theta = decay + rate * strike * r_df * norm_cdf(-d2) - dividend * spot * q_df * norm_cdf(-d1)
+
+    return {
+        "delta": np.where(is_call, call_delta, put_delta),
+        "gamma": gamma,
+        "vega": spot * q_df * pdf * sqrt_t / 100.0,
+        "theta": np.where(is_call, call_theta, put_theta) / 365.0,
+    }
+
+
+def implied_volatility(option_price, spot, strike, years, is_call, rate=DEFAULT_RISK_FREE_RATE,
+                       dividend=DEFAULT_DIVIDEND_YIELD) -> np.ndarray:
+    """
+    Implied volatility for option prices (NaN where no volatility fits).
+
+    Newton steps are taken when they stay inside the current bracket,
+    otherwise the bracket is bisected, so every element converges even
+    for deep ITM/OTM options where vega is tiny.
+    """
+    option_price, spot, strike, years, is_call = np.broadcast_arrays(
+        *(np.asarray(v, dtype=np.float64) for v in (option_price, spot, strike, years, is_call)))
+    is_call = is_call.astype(bool)
+
+    # No-arbitrage bounds: discounted intrinsic value < price < spot (call) / strike (put)
+    spot_df = spot * np.exp(-dividend * years)
+    strike_df = strike * np.exp(-rate * years)
+    intrinsic = np.where(is_call, np.maximum(spot_df - strike_df, 0.0), np.maximum(strike_df - spot_df, 0.0))
+    upper = np.where(is_call, spot_df, strike_df)
+    valid = (option_price > intrinsic) & (option_price < upper) & (years > 0) & (spot > 0) & (strike > 0)
+
+    lo = np.full(option_price.shape, IV_LOWER)
+    hi = np.full(option_price.shape, IV_UPPER)
+    sigma = np.full(option_price.shape, 0.3)
+    for _ in range(IV_MAX_ITERATIONS):
+        diff = price(spot, strike, years, sigma, is_call, rate, dividend) - option_price
+        if np.all(~valid | (np.abs(diff) < IV_TOLERANCE)):
+            break
+        lo = np.where(diff < 0, sigma, lo)
+        hi = np.where(diff > 0, sigma, hi)
+        vega = greeks(spot, strike, years, sigma, is_call, rate, dividend)["vega"] * 100.0
+        with np.errstate(divide="ignore", invalid="ignore"):
+            newton = sigma - diff / vega
+        inside = np.isfinite(newton) & (newton > lo) & (newton < hi)
+        sigma = np.where(inside, newton, 0.5 * (lo + hi))
+
+    return np.where(valid, sigma, np.nan)
+
+
+def model_greeks(mid_price, underlying_price, strike, expiration: str, right="CALL",
+                 rate: float = DEFAULT_RISK_FREE_RATE, dividend: float = DEFAULT_DIVIDEND_YIELD,
+                 as_of: Optional[datetime] = None):
+    """
+    IV from the mid price plus Greeks, for one option or arrays of options.
+
+    Args:
+        mid_price: Option mid price(s)
+        underlying_price: Underlying price(s)
+        strike: Strike(s)
+        expiration: Expiration (YYYY-MM-DD), shared by all options
+        right: "CALL"/"PUT" or an array of them
+        rate: Risk-free rate (continuous)
+        dividend: Dividend yield (continuous)
+        as_of: Valuation time (default: now)
+
+    Returns:
+        Dict with implied_volatility, delta, gamma, vega, theta - floats
+        (None where not computable) for scalar input, arrays otherwise
+    """
+    years = year_fraction(expiration, as_of)
+    is_call = np.char.upper(np.asarray(right, dtype=str)) == "CALL"
+    mid = np.asarray(np.nan if mid_price is None else mid_price, dtype=np.float64)
+    spot = np.asarray(np.nan if underlying_price is None else underlying_price, dtype=np.float64)
+
+    sigma = implied_volatility(mid, spot, strike, years, is_call, rate, dividend)
+    result = {"implied_volatility": sigma, **greeks(spot, strike, years, sigma, is_call, rate, dividend)}
+    if np.ndim(sigma) == 0:
+        return {name: to_optional(value) for name, value in result.items()}
+    return result
+
+
+def compare_greeks(ibkr: Dict, model: Dict, tolerances: Optional[Dict] = None) -> List[Dict]:
+    """
+    Greeks where IBKR and the model differ beyond tolerance.
+
+    Returns:
+        List of {field, ibkr, model, difference} (empty when they agree or
+        either side is missing)
+    """
+    tolerances = tolerances or DEFAULT_TOLERANCES
+    divergences = []
+    for field in GREEK_FIELDS:
+        reported, expected = ibkr.get(field), model.get(field)
+        if reported is None or expected is None:
+            continue
+        difference = abs(reported - expected)
+        if field in tolerances.get("abs", {}):
+            limit = tolerances["abs"][field]
+        elif field in tolerances.get("rel", {}):
+            limit = tolerances["rel"][field] * max(abs(expected), 1e-9)
+        else:
+            continue
+        if difference > limit:
+            divergences.append({"field": field, "ibkr": reported, "model": expected,
+                                "difference": round(difference, 6)})
+    return divergences
+
+
+def fill_chain_greeks(chain: Dict, rate: float = DEFAULT_RISK_FREE_RATE,
+                      dividend: float = DEFAULT_DIVIDEND_YIELD,
+                      tolerances: Optional[Dict] = None, as_of: Optional[datetime] = None) -> Dict:
+    """
+    Model Greeks for every row of an option chain in one pass.
+
+    Missing IBKR Greeks are filled from the model (recorded in the row's
+    "model_filled"), and IBKR values that diverge beyond tolerance are
+    listed in "model_divergence". Rows are updated in place.
+
+    Args:
+        chain: option_chain response (underlying_price, expiration, options)
+
+    Returns:
+        The chain
+    """
+    rows = chain.get("options") or []
+    if not rows or not chain.get("underlying_price") or not chain.get("expiration"):
+        return chain
+
+    mids = np.array([row.get("mid_price") if row.get("mid_price") else np.nan for row in rows], dtype=np.float64)
+    model = model_greeks(
+        mids, chain["underlying_price"], np.array([row["strike"] for row in rows], dtype=np.float64),
+        chain["expiration"], np.array([row.get("right", "CALL") for row in rows]),
+        rate, dividend, as_of,
+    )
+
+    for idx, row in enumerate(rows):
+        row_model = {field: to_optional(model[field][idx]) for field in GREEK_FIELDS}
+        row["model_divergence"] = compare_greeks(row, row_model, tolerances)
+        filled = [field for field in GREEK_FIELDS if row.get(field) is None and row_model[field] is not None]
+        for field in filled:
+            row[field] = row_model[field]
+        row["model_filled"] = filled
+    return chain
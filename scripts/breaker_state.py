@@ -0,0 +1,261 @@
+"""
+Circuit Breaker State Module
+
+Circuit breaker state shared by every process that fetches options data.
+
+data_fetcher.py runs as a fresh process per skill invocation, so failure
+counters held in the monitor object reset on every launch and the
+"3 consecutive failures" and "timeouts per hour" rules never held across
+runs. This store keeps them in a SQLite file under the cache directory
+(cache/circuit_breaker.sqlite, override with IDIO_CACHE_DIR):
+- state: triggered flag, trigger time and reason, consecutive failures
+- failures: recent failures (time, type, ticker, error, timeout flag),
+  used for the per-hour timeout window and the alert's failure list
+
+Every update is a single IMMEDIATE transaction, so concurrent processes
+never lose an increment and only one of them wins the trip (and writes
+the alert). expire() clears a breaker triggered more than
+auto_reset_after_hours ago; the monitor calls it when it finds an old
+trigger.
+
+The connection is kept open for the life of the object, so the check on
+every fetch_options_data call is one primary-key SELECT.
+
+Usage:
+    from breaker_state import CircuitBreakerState
+
+    state = CircuitBreakerState()
+    counts = state.record_failure({"type": "ibkr_timeout", "error": "...", "ticker": "SPY"}, timeout=True)
+    if counts["consecutive"] >= 3 and state.trip("3 consecutive failures"):
+        ...  # this process tripped the breaker
+
+    python breaker_state.py status
+    python breaker_state.py reset          # manual reset (logged)
+"""
+
+import json
+import sqlite3
+import sys
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from price_cache import cache_dir
+
+# Failure types counted against timeout_threshold_per_hour
+TIMEOUT_FAILURE_TYPES = ("ibkr_timeout",)
+
+TIMEOUT_WINDOW_SECONDS = 3600
+
+# Failure rows kept (oldest are pruned on insert)
+MAX_FAILURE_ROWS = 500
+
+
+class CircuitBreakerState:
+    """
+    SQLite-backed breaker flag and failure counters.
+
+    Safe for concurrent use from several processes (WAL mode, busy
+    timeout) and threads (one connection behind a lock).
+    """
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = Path(path) if path else cache_dir() / "circuit_breaker.sqlite"
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.path), timeout=10, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS state (
+                    id INTEGER PRIMARY KEY CHECK (id = 1),
+                    triggered INTEGER NOT NULL DEFAULT 0,
+                    triggered_at REAL,
+                    reason TEXT,
+                    consecutive INTEGER NOT NULL DEFAULT 0
+                )
+                """
+            )
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS failures (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    at REAL NOT NULL,
+                    type TEXT,
+                    ticker TEXT,
+                    error TEXT,
+                    timeout INTEGER NOT NULL DEFAULT 0
+                )
+                """
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_failures_timeout_at ON failures(timeout, at)")
+            conn.execute("INSERT OR IGNORE INTO state (id) VALUES (1)")
+            self._conn = conn
+        return self._conn
+
+    def _transaction(self, fn):
+        """Run fn(conn) in one IMMEDIATE (write-locked) transaction."""
+        with self._lock:
+            conn = self._connect()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                result = fn(conn)
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+            return result
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    # ------------------------------------------------------------------
+    # Updates
+    # ------------------------------------------------------------------
+
+    def record_failure(self, failure: Dict, timeout: bool = False) -> Dict:
+        """
+        Record one failure and return the counters after it.
+
+        Args:
+            failure: Failure dict (type, error, ticker)
+            timeout: Count it against the per-hour timeout window
+
+        Returns:
+            Dict with consecutive, timeouts_last_hour and triggered (the
+            breaker was already tripped before this failure)
+        """
+        now = time.time()
+
+        def update(conn):
+            conn.execute(
+                "INSERT INTO failures (at, type, ticker, error, timeout) VALUES (?, ?, ?, ?, ?)",
+                (now, failure.get("type"), failure.get("ticker"), failure.get("error"), int(timeout)),
+            )
+            conn.execute("DELETE FROM failures WHERE id <= (SELECT MAX(id) FROM failures) - ?", (MAX_FAILURE_ROWS,))
+            conn.execute("UPDATE state SET consecutive = consecutive + 1 WHERE id = 1")
+            consecutive, triggered = conn.execute(
+                "SELECT consecutive, triggered FROM state WHERE id = 1").fetchone()
+            timeouts = conn.execute(
+                "SELECT COUNT(*) FROM failures WHERE timeout = 1 AND at > ?",
+                (now - TIMEOUT_WINDOW_SECONDS,),
+            ).fetchone()[0]
+            return {"consecutive": consecutive, "timeouts_last_hour": timeouts, "triggered": bool(triggered)}
+
+        return self._transaction(update)
+
+    def record_success(self):
+        """Clear the consecutive failure count (no write when it is already zero)."""
+        with self._lock:
+            conn = self._connect()
+            if conn.execute("SELECT consecutive FROM state WHERE id = 1").fetchone()[0] == 0:
+                return
+        self._transaction(lambda conn: conn.execute("UPDATE state SET consecutive = 0 WHERE id = 1"))
+
+    def trip(self, reason: str) -> bool:
+        """
+        Trigger the breaker.
+
+        Returns:
+            True if this call tripped it, False if it was already triggered
+        """
+        def update(conn):
+            return conn.execute(
+                "UPDATE state SET triggered = 1, triggered_at = ?, reason = ? WHERE id = 1 AND triggered = 0",
+                (time.time(), reason),
+            ).rowcount == 1
+
+        return self._transaction(update)
+
+    def reset(self):
+        """Clear the breaker and the consecutive failure count."""
+        self._transaction(lambda conn: conn.execute(
+            "UPDATE state SET triggered = 0, triggered_at = NULL, reason = NULL, consecutive = 0 WHERE id = 1"))
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def triggered_at(self) -> Optional[float]:
+        """Epoch time the breaker was triggered, or None if it is not triggered."""
+        with self._lock:
+            triggered, triggered_at = self._connect().execute(
+                "SELECT triggered, triggered_at FROM state WHERE id = 1").fetchone()
+        return triggered_at if triggered else None
+
+    def expire(self, auto_reset_after_hours: float) -> bool:
+        """
+        Clear a breaker triggered more than auto_reset_after_hours ago.
+
+        Returns:
+            True if this call cleared it (so exactly one process logs the reset)
+        """
+        cutoff = time.time() - auto_reset_after_hours * 3600
+
+        def update(conn):
+            return conn.execute(
+                "UPDATE state SET triggered = 0, triggered_at = NULL, reason = NULL, consecutive = 0 "
+                "WHERE id = 1 AND triggered = 1 AND triggered_at <= ?",
+                (cutoff,),
+            ).rowcount == 1
+
+        return self._transaction(update)
+
+    def recent_failures(self, limit: int = 10) -> List[Dict]:
+        """Most recent failures, oldest first."""
+        with self._lock:
+            rows = self._connect().execute(
+                "SELECT at, type, ticker, error FROM failures ORDER BY id DESC LIMIT ?", (limit,)).fetchall()
+        return [
+            {"timestamp": datetime.fromtimestamp(at).isoformat(), "type": failure_type, "ticker": ticker, "error": error}
+            for at, failure_type, ticker, error in reversed(rows)
+        ]
+
+    def status(self) -> Dict:
+        """Breaker flag, reason, consecutive failures and timeouts in the last hour."""
+        with self._lock:
+            conn = self._connect()
+            triggered, triggered_at, reason, consecutive = conn.execute(
+                "SELECT triggered, triggered_at, reason, consecutive FROM state WHERE id = 1").fetchone()
+            timeouts = conn.execute(
+                "SELECT COUNT(*) FROM failures WHERE timeout = 1 AND at > ?",
+                (time.time() - TIMEOUT_WINDOW_SECONDS,),
+            ).fetchone()[0]
+        return {
+            "path": str(self.path),
+            "triggered": bool(triggered),
+            "triggered_at": datetime.fromtimestamp(triggered_at).isoformat() if triggered_at else None,
+            "reason": reason,
+            "consecutive_failures": consecutive,
+            "timeouts_last_hour": timeouts,
+        }
+
+
+def main():
+    """CLI interface for inspecting and resetting the circuit breaker."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Inspect or reset the options data circuit breaker")
+    parser.add_argument("command", choices=["status", "reset"])
+    args = parser.parse_args()
+
+    if args.command == "reset":
+        from data_quality_monitor import get_monitor
+        get_monitor().reset_circuit_breaker()
+        print("Circuit breaker reset", file=sys.stderr)
+
+    print(json.dumps(CircuitBreakerState().status(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,217 @@
+"""
+Contract Cache Module
+
+Persistent ticker -> IBKR stock contract cache.
+
+Stock conIds almost never change, but every quote, historical and atm_iv
+call used to start with a reqContractDetails round trip and wait for
+contractDetailsEnd. ibkr_paper.resolve_contracts now looks tickers up
+here first and only asks IBKR for tickers that are missing or whose entry
+is older than contract_revalidate_days (CONFIG.json cache_policy, default
+7). Entries hold conId, symbol, primaryExchange, currency and localSymbol,
+enough to rebuild the Contract without a lookup.
+
+An entry is dropped when IBKR rejects its conId (error 200, no security
+definition), so the next call re-resolves it.
+
+The cache is one JSON file, cache/ibkr/contracts.json, written to a temp
+file and atomically renamed. Writers merge with the file on disk under an
+exclusive lock file (contracts.lock), so the gateway daemon and one-shot
+ibkr_paper.py processes can share it without dropping each other's entries;
+readers pick up other processes' writes when the file's mtime changes.
+
+Batch prefill for the watchlist (trades/active plus tracked events):
+    python data_fetcher.py prefill_contracts
+
+Usage:
+    python contract_cache.py stats
+    python contract_cache.py show SPY
+    python contract_cache.py clear
+"""
+
+import fcntl
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from price_cache import cache_dir, load_cache_policy
+
+DEFAULT_REVALIDATE_DAYS = 7
+
+FIELDS = ("conid", "symbol", "primary_exchange", "currency", "local_symbol")
+
+
+def _merge(entries: Dict[str, Dict], updates: Dict[str, Optional[Dict]]) -> Dict[str, Dict]:
+    for ticker, entry in updates.items():
+        if entry is None:
+            entries.pop(ticker, None)
+        else:
+            entries[ticker] = entry
+    return entries
+
+
+class ContractCache:
+    """JSON-backed ticker -> contract map with age-based revalidation."""
+
+    def __init__(self, path: Optional[Path] = None, revalidate_days: Optional[float] = None):
+        self._path = Path(path) if path else None
+        self.max_age = timedelta(days=revalidate_days or load_cache_policy().get(
+            "contract_revalidate_days", DEFAULT_REVALIDATE_DAYS))
+        self._entries: Dict[str, Dict] = {}
+        self._mtime: Optional[float] = None
+        self._lock = threading.Lock()
+
+    @property
+    def path(self) -> Path:
+        return self._path or cache_dir() / "ibkr" / "contracts.json"
+
+    def _read_file(self) -> Dict[str, Dict]:
+        try:
+            return json.loads(self.path.read_text()).get("contracts", {})
+        except (OSError, json.JSONDecodeError, AttributeError):
+            return {}
+
+    def _refresh(self):
+        """Reload from disk if another process rewrote the file."""
+        try:
+            mtime = self.path.stat().st_mtime
+        except OSError:
+            self._entries, self._mtime = {}, None
+            return
+        if mtime != self._mtime:
+            self._entries, self._mtime = self._read_file(), mtime
+
+    def _locked(self):
+        """Exclusive lock file serialising read-merge-replace cycles across processes."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        handle = open(self.path.with_suffix(".lock"), "w")
+        fcntl.flock(handle, fcntl.LOCK_EX)
+        return handle
+
+    def _write(self, updates: Dict[str, Optional[Dict]]):
+        """Merge updates (None = delete) into the file on disk and rename into place."""
+        try:
+            with self._locked():
+                entries = _merge(self._read_file(), updates)
+                fd, tmp_name = tempfile.mkstemp(dir=self.path.parent, suffix=".tmp")
+                with os.fdopen(fd, "w") as handle:
+                    json.dump({"contracts": entries}, handle, indent=1, sort_keys=True)
+                os.replace(tmp_name, self.path)
+                self._mtime = self.path.stat().st_mtime
+        except OSError as e:
+            print(f"Contract cache write error: {e}", file=sys.stderr)
+            entries = _merge(dict(self._entries), updates)
+        self._entries = entries
+
+    def is_fresh(self, entry: Optional[Dict], now: Optional[float] = None) -> bool:
+        """Whether the entry was validated within max_age."""
+        if not entry or not entry.get("conid"):
+            return False
+        return (now or time.time()) - entry.get("validated_at", 0) < self.max_age.total_seconds()
+
+    def get(self, ticker: str) -> Optional[Dict]:
+        """Fresh entry for `ticker`, or None if missing or due for revalidation."""
+        with self._lock:
+            self._refresh()
+            entry = self._entries.get(ticker.upper())
+        return dict(entry) if self.is_fresh(entry) else None
+
+    def get_many(self, tickers: Iterable[str]) -> Dict[str, Dict]:
+        """Fresh entries for the tickers that have one."""
+        with self._lock:
+            self._refresh()
+            entries = {ticker: self._entries.get(ticker.upper()) for ticker in tickers}
+        now = time.time()
+        return {ticker: dict(entry) for ticker, entry in entries.items() if self.is_fresh(entry, now)}
+
+    def put_many(self, contracts: Dict[str, Dict]):
+        """
+        Store resolved contracts.
+
+        Args:
+            contracts: {ticker: {conid, symbol, primary_exchange, currency, local_symbol}}
+        """
+        now = time.time()
+        updates = {
+            ticker.upper(): {**{field: entry.get(field) for field in FIELDS}, "validated_at": now}
+            for ticker, entry in contracts.items()
+            if entry.get("conid")
+        }
+        if not updates:
+            return
+        with self._lock:
+            self._write(updates)
+
+    def put(self, ticker: str, entry: Dict):
+        self.put_many({ticker: entry})
+
+    def invalidate(self, tickers: Iterable[str]):
+        """Drop entries so the next lookup goes back to IBKR."""
+        updates = {ticker.upper(): None for ticker in tickers}
+        if not updates:
+            return
+        with self._lock:
+            self._write(updates)
+
+    def missing(self, tickers: Iterable[str]) -> List[str]:
+        """Tickers without a fresh entry."""
+        tickers = list(tickers)
+        fresh = self.get_many(tickers)
+        return [ticker for ticker in tickers if ticker not in fresh]
+
+    def clear(self):
+        with self._lock:
+            try:
+                self.path.unlink()
+            except FileNotFoundError:
+                pass
+            self._entries, self._mtime = {}, None
+
+    def stats(self) -> Dict:
+        with self._lock:
+            self._refresh()
+            entries = dict(self._entries)
+        now = time.time()
+        validated = [entry.get("validated_at", 0) for entry in entries.values()]
+        return {
+            "path": str(self.path),
+            "entries": len(entries),
+            "fresh": sum(self.is_fresh(entry, now) for entry in entries.values()),
+            "revalidate_days": self.max_age.days,
+            "oldest_validation": datetime.fromtimestamp(min(validated)).isoformat() if validated else None,
+        }
+
+
+def main():
+    """CLI interface for inspecting the contract cache."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Inspect the persistent IBKR contract cache")
+    parser.add_argument("command", choices=["stats", "show", "clear"])
+    parser.add_argument("ticker", nargs="?", help="Ticker for show")
+    args = parser.parse_args()
+
+    cache = ContractCache()
+    if args.command == "stats":
+        print(json.dumps(cache.stats(), indent=2))
+    elif args.command == "show":
+        if not args.ticker:
+            parser.error("show requires a ticker")
+        entry = cache._read_file().get(args.ticker.upper())
+        if entry is None:
+            print(f"ERROR: No cached contract for {args.ticker.upper()}", file=sys.stderr)
+            sys.exit(1)
+        print(json.dumps({"ticker": args.ticker.upper(), **entry, "fresh": cache.is_fresh(entry)}, indent=2))
+    elif args.command == "clear":
+        cache.clear()
+        print(json.dumps({"status": "cleared"}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -12,29 +12,50 @@ Used by analyze, score, and monitor skills.
 
 import calendar
 import json
-import subprocess
 import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime, date
 
 # Import local modules
-from price_sources import fetch_price, fetch_historical_yahoo, get_bid_ask_midpoint
+from ibkr_client import IBKRTimeout, run_ibkr_command
+from bar_store import Bars, BarStore
+from black_scholes import fill_chain_greeks, model_greeks
+from indicators import compute_indicators, price_vs_target, to_optional, trailing_mean
+from iv_store import IVStore
+from options_utils import select_atm_option
+from price_sources import fetch_price, fetch_prices, fetch_historical_yahoo, get_bid_ask_midpoint
 from sec_api import (
     parse_financials,
     fetch_two_periods,
     calculate_m_score,
     calculate_z_score,
-    get_cik_from_ticker
+    get_cik_from_ticker,
+    get_company_name
 )
+from regulatory_data import search_fda_enforcement
+from trade_repository import TradeRepository
 
 # Note: Archetype-specific data (Form 483, EMA approval, insider clusters, WARN filings)
 # requires manual lookup by the agent. The utility scripts (regulatory_data.py,
 # insider_analysis.py, warn_act_checker.py) provide helper functions and lookup
-# instructions, but do not have automated data fetching for these sources.
+# instructions; only the openFDA enforcement search is automated (PDUFA).
 # Import data quality monitor
 from data_quality_monitor import get_monitor
 
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+# Local daily bar history (see bar_store.py)
+_bar_store = BarStore()
+
+# Indexed trade files (see trade_repository.py)
+_trade_repo = TradeRepository(REPO_ROOT / "trades")
+
+# Local ATM IV history for IV percentile / average IV (see iv_store.py)
+_iv_store = IVStore()
+
 
 def _calculate_ma_200(bars: list) -> Optional[float]:
     """Calculate 200-day moving average from bar data."""
@@ -43,70 +64,77 @@ def _calculate_ma_200(bars: list) -> Optional[float]:
         for bar in bars
         if bar.get("close") is not None and bar.get("close") >= 0
     ]
-    if len(closes) < 200:
-        return None
-    recent = closes[-200:]
-    return sum(recent) / 200
+    return to_optional(trailing_mean(closes, 200))
 
 
-def _fetch_ma_200(ticker: str, days: int = 210) -> Optional[Dict]:
-    """Fetch MA-200 from IBKR with Yahoo fallback."""
-    script_path = Path(__file__).parent / "ibkr_paper.py"
-
+def _fetch_ibkr_bars(ticker: str, days: int) -> list:
+    """Fetch the last `days` daily bars from IBKR (empty list on failure)."""
     try:
-        result = subprocess.run(
-            [
-                sys.executable,
-                str(script_path),
-                "historical",
-                ticker,
-                "--days",
-                str(days),
-            ],
-            capture_output=True,
-            text=True,
-            timeout=60,
-        )
-    except subprocess.TimeoutExpired:
+        data = run_ibkr_command("historical", {"ticker": ticker, "days": days}, timeout=60)
+        if "error" in data:
+            print(f"IBKR historical fetch failed for {ticker}: {data['error']}", file=sys.stderr)
+            return []
+        return data.get("bars", []) or []
+    except IBKRTimeout:
         print(f"IBKR historical timeout for {ticker}", file=sys.stderr)
-        result = None
+    except json.JSONDecodeError as e:
+        print(f"IBKR historical JSON parse error for {ticker}: {e}", file=sys.stderr)
+    return []
 
-    bars = []
-    source = None
 
-    if result and result.returncode == 0:
-        try:
-            data = json.loads(result.stdout)
-            bars = data.get("bars", []) or []
-            source = data.get("source", "IBKR Paper")
-        except json.JSONDecodeError as e:
-            print(f"IBKR historical JSON parse error for {ticker}: {e}", file=sys.stderr)
-
-    if bars:
-        bars_sorted = sorted(bars, key=lambda b: b.get("date", ""))
-        ma_200 = _calculate_ma_200(bars_sorted)
-        if ma_200 is not None:
-            return {
-                "ma_200": ma_200,
-                "source": source or "IBKR Paper",
-                "bars_used": 200,
-                "bars_total": len(bars_sorted),
-            }
-
-    # Yahoo fallback
-    yahoo_bars = fetch_historical_yahoo(ticker, days=days)
-    if yahoo_bars:
-        bars_sorted = sorted(yahoo_bars, key=lambda b: b.get("date", ""))
-        ma_200 = _calculate_ma_200(bars_sorted)
-        if ma_200 is not None:
-            return {
-                "ma_200": ma_200,
-                "source": "Yahoo Finance",
-                "bars_used": 200,
-                "bars_total": len(bars_sorted),
-            }
-
-    return None
+def _update_bars(ticker: str, days: int = 210) -> Tuple[Optional[Bars], int]:
+    """
+    Bring the local bar store up to date for a ticker.
+
+    Only the bars missing since the last stored date are fetched (IBKR,
+    then Yahoo). A full `days` history is requested when the store has
+    fewer than 200 bars.
+
+    Returns:
+        (stored Bars or None, number of bars fetched)
+    """
+    ticker = ticker.upper()
+    bars = _bar_store.load(ticker)
+    bars_fetched = 0
+
+    if not _bar_store.is_fresh(bars):
+        has_history = bars is not None and len(bars) >= 200
+        tail_days = _bar_store.missing_days(bars, days) if has_history else days
+
+        ibkr_bars = _fetch_ibkr_bars(ticker, tail_days)
+        if ibkr_bars:
+            bars = _bar_store.append(ticker, ibkr_bars, "IBKR Paper")
+            bars_fetched = len(ibkr_bars)
+
+        # Yahoo fallback: for the tail if IBKR failed, for full history if still short
+        if not ibkr_bars or bars.moving_average(200) is None:
+            yahoo_bars = fetch_historical_yahoo(ticker, days=tail_days if not ibkr_bars else days)
+            if yahoo_bars:
+                bars = _bar_store.append(ticker, yahoo_bars, "Yahoo Finance")
+                bars_fetched += len(yahoo_bars)
+
+    return bars, bars_fetched
+
+
+def _fetch_ma_200(ticker: str, days: int = 210) -> Optional[Dict]:
+    """MA-200 and the other bar indicators (see indicators.py) from the local bar store."""
+    ticker = ticker.upper()
+    bars, bars_fetched = _update_bars(ticker, days)
+    if bars is None:
+        return None
+
+    stats = compute_indicators({ticker: bars}).get(ticker, {})
+    if stats.get("ma_200") is None:
+        return None
+
+    return {
+        "ma_200": stats["ma_200"],
+        "source": bars.source,
+        "bars_used": 200,
+        "bars_total": len(bars),
+        "bars_fetched": bars_fetched,
+        "indicators": stats,
+    }
 
 
 def _is_atm_delta(delta: Optional[float]) -> bool:
@@ -123,48 +151,22 @@ def _fetch_atm_iv(
 ) -> Optional[Dict]:
     """Fetch implied volatility from ATM option via IBKR."""
     expiration = expiration or _calculate_next_monthly_expiration()
-    script_path = Path(__file__).parent / "ibkr_paper.py"
-
-    cmd = [
-        sys.executable,
-        str(script_path),
-        "atm_iv",
-        ticker,
-        "--expiration",
-        expiration,
-    ]
+
+    params = {"ticker": ticker, "expiration": expiration}
     if underlying_price is not None:
-        cmd.extend(["--underlying-price", str(underlying_price)])
+        params["underlying_price"] = underlying_price
 
     try:
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            timeout=30,
-        )
-    except subprocess.TimeoutExpired:
+        data = run_ibkr_command("atm_iv", params, timeout=30)
+    except IBKRTimeout:
         print(f"IBKR IV timeout for {ticker}", file=sys.stderr)
         return None
-
-    if result.returncode != 0:
-        error_detail = result.stderr.strip()
-        if not error_detail and result.stdout:
-            try:
-                error_payload = json.loads(result.stdout)
-                error_detail = error_payload.get("error") or error_payload
-            except json.JSONDecodeError:
-                error_detail = result.stdout.strip()
-        print(f"IBKR IV fetch failed for {ticker}: {error_detail}", file=sys.stderr)
-        return None
-
-    try:
-        data = json.loads(result.stdout)
     except json.JSONDecodeError as e:
         print(f"IBKR IV JSON parse error for {ticker}: {e}", file=sys.stderr)
         return None
 
     if "error" in data:
+        print(f"IBKR IV fetch failed for {ticker}: {data['error']}", file=sys.stderr)
         return None
 
     implied_vol = data.get("implied_volatility")
@@ -190,10 +192,13 @@ def _fetch_atm_iv(
                 file=sys.stderr,
             )
 
+    _iv_store.record(ticker, implied_vol, data.get("expiration", expiration), strike=strike, delta=delta)
+
     return {
         "implied_volatility": implied_vol,
         "source": data.get("source", "IBKR Paper"),
         "strike": strike,
+        "expiration": data.get("expiration", expiration),
         "delta": delta,
         "is_atm": is_atm,
     }
@@ -222,6 +227,213 @@ def _calculate_next_monthly_expiration() -> str:
     return expiration.isoformat()
 
 
+Z_SCORE_THRESHOLDS = {
+    "biotech": 1.5,
+    "pharma": 1.5,
+    "software": 2.0,
+    "saas": 2.0,
+    "utilities": 2.5,
+    "general": 1.81
+}
+
+
+def _run_task_graph(tasks: Dict[str, Tuple], max_workers: int = 4) -> Tuple[Dict, Dict[str, float], Dict[str, str]]:
+    """
+    Run a small dependency graph of blocking tasks on a thread pool.
+
+    Each task starts as soon as the tasks it depends on have finished, so
+    independent sources overlap and wall-clock time follows the slowest
+    chain rather than the sum of all stages.
+
+    Args:
+        tasks: name -> (func, [dependency names]); func receives the
+               dependency results as keyword arguments
+        max_workers: Thread pool size
+
+    Returns:
+        (results, timings_ms, errors): a failed task's result is None and
+        its exception text is in errors; dependents still run
+    """
+    results: Dict = {}
+    timings: Dict[str, float] = {}
+    errors: Dict[str, str] = {}
+
+    def timed(name, func, kwargs):
+        started = time.perf_counter()
+        try:
+            return func(**kwargs)
+        finally:
+            timings[name] = round((time.perf_counter() - started) * 1000, 1)
+
+    pending = dict(tasks)
+    running = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        while pending or running:
+            for name, (func, deps) in list(pending.items()):
+                if all(dep in results for dep in deps):
+                    kwargs = {dep: results[dep] for dep in deps}
+                    running[executor.submit(timed, name, func, kwargs)] = name
+                    del pending[name]
+            if not running:
+                raise ValueError(f"Unresolvable task dependencies: {sorted(pending)}")
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                try:
+                    results[name] = future.result()
+                except Exception as e:
+                    print(f"fetch_all stage {name} failed: {e}", file=sys.stderr)
+                    results[name] = None
+                    errors[name] = str(e)
+
+    return results, timings, errors
+
+
+def _fetch_financials(ticker: str, cik: Optional[str]) -> Tuple:
+    """Current and previous period financials (None, None without a CIK)."""
+    if not cik:
+        return (None, None)
+    return fetch_two_periods(ticker, cik=cik)
+
+
+def _archetype_checks(archetype: str, cik: Optional[str]) -> Dict:
+    """
+    Archetype-specific lookups.
+
+    Most archetype kill screens need manual lookup by the agent (see
+    regulatory_data.py, insider_analysis.py, warn_act_checker.py); PDUFA
+    trades also get the automated openFDA enforcement search.
+    """
+    archetype_lower = archetype.lower()
+    checks: Dict = {}
+
+    if archetype_lower == "pdufa":
+        checks["manual_checks_required"] = [
+            "Form 483 with OAI status (FDA FOIA Reading Room)",
+            "EMA approval status (ema.europa.eu/medicines)",
+            "CRL classification if applicable"
+        ]
+        company_name = get_company_name(cik) if cik else None
+        if company_name:
+            checks["fda_enforcement"] = search_fda_enforcement(company_name)
+    elif archetype_lower == "insider":
+        checks["manual_checks_required"] = [
+            "Insider cluster validation (OpenInsider.com)",
+            "Routine vs opportunistic classification (3-year Form 4 history)"
+        ]
+    elif archetype_lower in ["activist", "spinoff"]:
+        checks["manual_checks_required"] = [
+            "WARN Act filings (state labor department databases)",
+            "Contract loss language analysis if WARN found"
+        ]
+    elif archetype_lower == "merger_arb":
+        checks["manual_checks_required"] = [
+            "Second request status (FTC/DOJ)",
+            "CFIUS exposure",
+            "China-connected buyer risk"
+        ]
+
+    return checks
+
+
+def _apply_kill_screens(result: Dict, current_financials, prev_financials,
+                        industry: str, archetype: str):
+    """Join step: market cap from price x shares, then the financial kill screens."""
+    # Calculate market cap (price * shares outstanding)
+    if result.get("price") and current_financials.shares_outstanding > 0:
+        market_cap = result["price"] * current_financials.shares_outstanding
+        current_financials.market_cap = market_cap
+        result["market_cap"] = market_cap
+    else:
+        result["market_cap"] = None
+
+    # Apply archetype-specific kill screens
+    if archetype.lower() == "pdufa":
+        # PDUFA-specific financial health screens (for pre-revenue biotechs)
+        result["archetype"] = "pdufa"
+        result["kill_screen_type"] = "pdufa_financial_health"
+
+        # Skip traditional M-Score/Z-Score for PDUFA trades
+        result["m_score"] = None
+        result["m_score_note"] = "Skipped for PDUFA archetype (pre-revenue biotech)"
+        result["z_score"] = None
+        result["z_score_note"] = "Skipped for PDUFA archetype (pre-revenue biotech)"
+
+        # Calculate PDUFA-specific screens
+        # 1. Cash runway (assume quarterly burn rate from operating cash flow)
+        quarterly_burn = abs(current_financials.operating_cash_flow) / 4 if current_financials.operating_cash_flow < 0 else 0
+        cash_runway_months = (current_financials.cash_and_equivalents / quarterly_burn * 3) if quarterly_burn > 0 else 999
+
+        # 2. Debt-to-equity ratio
+        equity = current_financials.total_assets - current_financials.total_liabilities
+        debt_to_equity = current_financials.long_term_debt / equity if equity > 0 else 999
+
+        # 3. Net cash position (cash - debt)
+        net_cash = current_financials.cash_and_equivalents - current_financials.long_term_debt
+
+        result["pdufa_financial_health"] = {
+            "cash_runway_months": round(cash_runway_months, 1),
+            "cash_runway_threshold": 18,
+            "cash_runway_pass": cash_runway_months >= 18,
+            "debt_to_equity": round(debt_to_equity, 2),
+            "debt_to_equity_threshold": 0.75,
+            "debt_to_equity_pass": debt_to_equity < 0.75,
+            "net_cash": net_cash,
+            "net_cash_pass": net_cash > 0,
+            "cash_and_equivalents": current_financials.cash_and_equivalents,
+            "long_term_debt": current_financials.long_term_debt
+        }
+
+        # Overall PDUFA financial health pass/fail
+        pdufa_pass = (
+            result["pdufa_financial_health"]["cash_runway_pass"] and
+            result["pdufa_financial_health"]["debt_to_equity_pass"] and
+            result["pdufa_financial_health"]["net_cash_pass"]
+        )
+        result["pdufa_financial_health"]["overall_pass"] = pdufa_pass
+
+        # Use PDUFA screens for final pass/fail
+        result["financial_screens_pass"] = pdufa_pass
+
+    else:
+        # Traditional M-Score and Z-Score for non-PDUFA archetypes
+        result["archetype"] = archetype
+        result["kill_screen_type"] = "traditional"
+
+        # Calculate M-Score (requires TWO periods)
+        m_score = calculate_m_score(current_financials, prev_financials)
+        result["m_score"] = m_score
+        result["m_score_threshold"] = -1.78
+        result["m_score_pass"] = m_score is not None and m_score <= -1.78
+
+        # Calculate Z-Score
+        z_score = calculate_z_score(current_financials, industry)
+        result["z_score"] = z_score
+
+        # Industry-adjusted Z-Score threshold
+        z_threshold = Z_SCORE_THRESHOLDS.get(industry.lower(), 1.81)
+        result["z_score_threshold"] = z_threshold
+        result["z_score_pass"] = z_score is not None and z_score >= z_threshold
+
+        # Use traditional screens for final pass/fail
+        result["financial_screens_pass"] = (
+            result.get("m_score_pass", False) and
+            result.get("z_score_pass", False)
+        )
+
+    # Include key financial metrics
+    result["financials"] = {
+        "total_assets": current_financials.total_assets,
+        "total_liabilities": current_financials.total_liabilities,
+        "working_capital": current_financials.working_capital,
+        "revenue": current_financials.revenue,
+        "ebit": current_financials.ebit,
+        "net_income": current_financials.net_income,
+        "shares_outstanding": current_financials.shares_outstanding
+    }
+
+
 def fetch_all(ticker: str, industry: str = "general", archetype: str = "general") -> Dict:
     """
     Fetch ALL data needed for /analyze skill (kill screens).
@@ -233,6 +445,10 @@ def fetch_all(ticker: str, industry: str = "general", archetype: str = "general"
     - Market cap
     - Financial metrics
 
+    Sources run as a task graph: price, CIK -> SEC financials, and
+    archetype lookups overlap; market cap and the kill screens are the
+    join step. Per-stage timings are returned in "stage_timings_ms".
+
     Args:
         ticker: Stock ticker symbol
         industry: Industry for Z-Score adjustment (biotech, software, utilities, general)
@@ -242,6 +458,7 @@ def fetch_all(ticker: str, industry: str = "general", archetype: str = "general"
         Dict with all fetched data and kill screen pass/fail status
     """
     ticker = ticker.upper()
+    started = time.perf_counter()
     result = {
         "ticker": ticker,
         "timestamp": datetime.now().isoformat(),
@@ -249,8 +466,17 @@ def fetch_all(ticker: str, industry: str = "general", archetype: str = "general"
         "errors": []
     }
 
-    # 1. Fetch price data
-    price_data = fetch_price(ticker)
+    stages, timings, stage_errors = _run_task_graph({
+        "price": (lambda: fetch_price(ticker), []),
+        "cik": (lambda: get_cik_from_ticker(ticker), []),
+        "financials": (lambda cik: _fetch_financials(ticker, cik), ["cik"]),
+        "archetype": (lambda cik: _archetype_checks(archetype, cik), ["cik"]),
+    })
+    for stage, error in stage_errors.items():
+        result["errors"].append(f"{stage} stage failed: {error}")
+
+    # 1. Price data
+    price_data = stages["price"]
     if price_data:
         result["price"] = price_data["price"]
         result["price_source"] = price_data["source"]
@@ -259,147 +485,23 @@ def fetch_all(ticker: str, industry: str = "general", archetype: str = "general"
         result["price"] = None
         result["errors"].append(f"Could not fetch price for {ticker}")
 
-    # 2. Fetch financial data from SEC (TWO periods for M-Score)
-    current_financials, prev_financials = fetch_two_periods(ticker)
+    # 2. Join: market cap and kill screens from SEC financials (TWO periods for M-Score)
+    join_started = time.perf_counter()
+    current_financials, prev_financials = stages["financials"] or (None, None)
     if current_financials:
         result["data_sources_used"].append(current_financials.source)
-
-        # Calculate market cap (price * shares outstanding)
-        if result.get("price") and current_financials.shares_outstanding > 0:
-            market_cap = result["price"] * current_financials.shares_outstanding
-            current_financials.market_cap = market_cap
-            result["market_cap"] = market_cap
-        else:
-            result["market_cap"] = None
-
-        # Apply archetype-specific kill screens
-        if archetype.lower() == "pdufa":
-            # PDUFA-specific financial health screens (for pre-revenue biotechs)
-            result["archetype"] = "pdufa"
-            result["kill_screen_type"] = "pdufa_financial_health"
-
-            # Skip traditional M-Score/Z-Score for PDUFA trades
-            result["m_score"] = None
-            result["m_score_note"] = "Skipped for PDUFA archetype (pre-revenue biotech)"
-            result["z_score"] = None
-            result["z_score_note"] = "Skipped for PDUFA archetype (pre-revenue biotech)"
-
-            # Calculate PDUFA-specific screens
-            # 1. Cash runway (assume quarterly burn rate from operating cash flow)
-            quarterly_burn = abs(current_financials.operating_cash_flow) / 4 if current_financials.operating_cash_flow < 0 else 0
-            cash_runway_months = (current_financials.cash_and_equivalents / quarterly_burn * 3) if quarterly_burn > 0 else 999
-
-            # 2. Debt-to-equity ratio
-            equity = current_financials.total_assets - current_financials.total_liabilities
-            debt_to_equity = current_financials.long_term_debt / equity if equity > 0 else 999
-
-            # 3. Net cash position (cash - debt)
-            net_cash = current_financials.cash_and_equivalents - current_financials.long_term_debt
-
-            result["pdufa_financial_health"] = {
-                "cash_runway_months": round(cash_runway_months, 1),
-                "cash_runway_threshold": 18,
-                "cash_runway_pass": cash_runway_months >= 18,
-                "debt_to_equity": round(debt_to_equity, 2),
-                "debt_to_equity_threshold": 0.75,
-                "debt_to_equity_pass": debt_to_equity < 0.75,
-                "net_cash": net_cash,
-                "net_cash_pass": net_cash > 0,
-                "cash_and_equivalents": current_financials.cash_and_equivalents,
-                "long_term_debt": current_financials.long_term_debt
-            }
-
-            # Overall PDUFA financial health pass/fail
-            pdufa_pass = (
-                result["pdufa_financial_health"]["cash_runway_pass"] and
-                result["pdufa_financial_health"]["debt_to_equity_pass"] and
-                result["pdufa_financial_health"]["net_cash_pass"]
-            )
-            result["pdufa_financial_health"]["overall_pass"] = pdufa_pass
-
-            # Use PDUFA screens for final pass/fail
-            result["financial_screens_pass"] = pdufa_pass
-
-        else:
-            # Traditional M-Score and Z-Score for non-PDUFA archetypes
-            result["archetype"] = archetype
-            result["kill_screen_type"] = "traditional"
-
-            # Calculate M-Score (requires TWO periods)
-            m_score = calculate_m_score(current_financials, prev_financials)
-            result["m_score"] = m_score
-            result["m_score_threshold"] = -1.78
-            result["m_score_pass"] = m_score is not None and m_score <= -1.78
-
-            # Calculate Z-Score
-            z_score = calculate_z_score(current_financials, industry)
-            result["z_score"] = z_score
-
-            # Industry-adjusted Z-Score threshold
-            z_thresholds = {
-                "biotech": 1.5,
-                "pharma": 1.5,
-                "software": 2.0,
-                "saas": 2.0,
-                "utilities": 2.5,
-                "general": 1.81
-            }
-            z_threshold = z_thresholds.get(industry.lower(), 1.81)
-            result["z_score_threshold"] = z_threshold
-            result["z_score_pass"] = z_score is not None and z_score >= z_threshold
-
-            # Use traditional screens for final pass/fail
-            result["financial_screens_pass"] = (
-                result.get("m_score_pass", False) and
-                result.get("z_score_pass", False)
-            )
-
-        # Include key financial metrics
-        result["financials"] = {
-            "total_assets": current_financials.total_assets,
-            "total_liabilities": current_financials.total_liabilities,
-            "working_capital": current_financials.working_capital,
-            "revenue": current_financials.revenue,
-            "ebit": current_financials.ebit,
-            "net_income": current_financials.net_income,
-            "shares_outstanding": current_financials.shares_outstanding
-        }
-
+        _apply_kill_screens(result, current_financials, prev_financials, industry, archetype)
     else:
         result["errors"].append(f"Could not fetch financials for {ticker}")
         result["m_score"] = None
         result["z_score"] = None
         result["financial_screens_pass"] = False
+    timings["kill_screens"] = round((time.perf_counter() - join_started) * 1000, 1)
 
-    # 3. Archetype-specific notes (manual lookup required by agent)
-    # See utility scripts for lookup instructions:
-    # - regulatory_data.py: Form 483, EMA approval, CRL classification
-    # - insider_analysis.py: Insider cluster validation
-    # - warn_act_checker.py: WARN Act filings
-    archetype_lower = archetype.lower()
-
-    if archetype_lower == "pdufa":
-        result["manual_checks_required"] = [
-            "Form 483 with OAI status (FDA FOIA Reading Room)",
-            "EMA approval status (ema.europa.eu/medicines)",
-            "CRL classification if applicable"
-        ]
-    elif archetype_lower == "insider":
-        result["manual_checks_required"] = [
-            "Insider cluster validation (OpenInsider.com)",
-            "Routine vs opportunistic classification (3-year Form 4 history)"
-        ]
-    elif archetype_lower in ["activist", "spinoff"]:
-        result["manual_checks_required"] = [
-            "WARN Act filings (state labor department databases)",
-            "Contract loss language analysis if WARN found"
-        ]
-    elif archetype_lower == "merger_arb":
-        result["manual_checks_required"] = [
-            "Second request status (FTC/DOJ)",
-            "CFIUS exposure",
-            "China-connected buyer risk"
-        ]
+    # 3. Archetype-specific checks (mostly manual lookup by the agent)
+    result.update(stages["archetype"] or {})
+    if "fda_enforcement" in result:
+        result["data_sources_used"].append("openFDA")
 
     # 4. Summary
     # Note: Archetype-specific kill screens (insider cluster, WARN filings)
@@ -407,9 +509,154 @@ def fetch_all(ticker: str, industry: str = "general", archetype: str = "general"
     kill_screens_passed = result.get("financial_screens_pass", False)
     result["kill_screens_status"] = "PASS" if kill_screens_passed else "FAIL"
 
+    timings["total"] = round((time.perf_counter() - started) * 1000, 1)
+    result["stage_timings_ms"] = timings
+
     return result
 
 
+def _load_events(statuses: Tuple[str, ...]) -> List[Dict]:
+    """Batch requests from universe/events.json for events with the given statuses."""
+    events_file = REPO_ROOT / "universe" / "events.json"
+    try:
+        events = json.loads(events_file.read_text()).get("events", [])
+    except (OSError, json.JSONDecodeError) as e:
+        print(f"Skipping {events_file.name}: {e}", file=sys.stderr)
+        return []
+
+    return [
+        {
+            "ticker": event["ticker"],
+            "industry": event.get("industry", "general"),
+            "archetype": event.get("archetype", "general"),
+            "event_id": event.get("id"),
+        }
+        for event in events
+        if event.get("ticker") and event.get("status") in statuses
+    ]
+
+
+def _parse_batch_file(path: Path) -> List[Dict]:
+    """
+    Batch requests from a file.
+
+    Accepts a JSON list (or {"events": [...]}) of objects with ticker,
+    industry and archetype; JSONL with one such object per line; or plain
+    text / CSV lines "TICKER[,industry[,archetype]]" (# comments allowed).
+    """
+    text = path.read_text()
+    if path.suffix == ".json":
+        data = json.loads(text)
+        return data.get("events", []) if isinstance(data, dict) else data
+    if path.suffix == ".jsonl":
+        return [json.loads(line) for line in text.splitlines() if line.strip()]
+
+    requests_list = []
+    for line in text.splitlines():
+        line = line.split("#", 1)[0].strip()
+        if not line:
+            continue
+        fields = [field.strip() for field in line.replace(",", " ").split()]
+        if fields[0].lower() == "ticker":
+            continue  # CSV header
+        requests_list.append({
+            "ticker": fields[0],
+            "industry": fields[1] if len(fields) > 1 else "general",
+            "archetype": fields[2] if len(fields) > 2 else "general",
+        })
+    return requests_list
+
+
+def load_batch_requests(path: Optional[str] = None,
+                        statuses: Tuple[str, ...] = ("tracking",)) -> List[Dict]:
+    """
+    Tickers with industry/archetype for fetch_all_batch.
+
+    Args:
+        path: Ticker file (see _parse_batch_file); default universe/events.json
+        statuses: Event statuses to include when reading events.json
+
+    Returns:
+        List of {ticker, industry, archetype[, event_id]}, one per ticker
+    """
+    if path:
+        raw = _parse_batch_file(Path(path))
+    else:
+        raw = _load_events(statuses)
+
+    batch = {}
+    for item in raw:
+        ticker = str(item.get("ticker") or "").upper()
+        if not ticker or ticker in batch:
+            continue
+        request = {
+            "ticker": ticker,
+            "industry": item.get("industry") or "general",
+            "archetype": item.get("archetype") or "general",
+        }
+        event_id = item.get("event_id") or item.get("id")
+        if event_id:
+            request["event_id"] = event_id
+        batch[ticker] = request
+    return list(batch.values())
+
+
+def _fetch_all_line(request: Dict) -> Dict:
+    """One fetch_all_batch output record; errors are captured, never raised."""
+    started = time.perf_counter()
+    line = dict(request)
+    try:
+        line["result"] = fetch_all(request["ticker"], request["industry"], request["archetype"])
+        line["ok"] = True
+    except Exception as e:
+        line["ok"] = False
+        line["error"] = f"{type(e).__name__}: {e}"
+    line["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 1)
+    return line
+
+
+def fetch_all_batch(batch: List[Dict], max_workers: int = 4, output=None) -> Dict:
+    """
+    Run fetch_all over many tickers with a bounded worker pool.
+
+    One JSON line per ticker is written to `output` as soon as that ticker
+    completes (completion order, flushed immediately), so consumers can
+    read results incrementally. A failing ticker produces an error line
+    and does not stop the batch.
+
+    Args:
+        batch: Requests from load_batch_requests()
+        max_workers: Tickers processed concurrently
+        output: Text stream for JSONL (default: sys.stdout)
+
+    Returns:
+        Summary {total, ok, failed, passed, elapsed_ms}
+    """
+    output = output or sys.stdout
+    started = time.perf_counter()
+    summary = {"total": len(batch), "ok": 0, "failed": 0, "passed": 0}
+    if not batch:
+        summary["elapsed_ms"] = 0.0
+        return summary
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(batch))) as executor:
+        futures = [executor.submit(_fetch_all_line, request) for request in batch]
+        for future in as_completed(futures):
+            line = future.result()
+            output.write(json.dumps(line) + "\n")
+            output.flush()
+
+            if line["ok"]:
+                summary["ok"] += 1
+                if line["result"].get("kill_screens_status") == "PASS":
+                    summary["passed"] += 1
+            else:
+                summary["failed"] += 1
+
+    summary["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 1)
+    return summary
+
+
 def fetch_market_data(ticker: str) -> Optional[Dict]:
     """
     Fetch market data for /score and /monitor skills.
@@ -418,7 +665,8 @@ def fetch_market_data(ticker: str) -> Optional[Dict]:
     - Current price
     - 200-day moving average (approximation)
     - Volume
-    - Implied Volatility (if available)
+    - Implied Volatility (if available), with IV percentile and multiple
+      vs average IV from the local IV history (see iv_store.py)
 
     Args:
         ticker: Stock ticker symbol
@@ -447,6 +695,10 @@ def fetch_market_data(ticker: str) -> Optional[Dict]:
         result["ma_200_source"] = ma_200_data["source"]
         result["ma_200_bars_used"] = ma_200_data["bars_used"]
         result["ma_200_bars_total"] = ma_200_data.get("bars_total")
+        indicators = ma_200_data["indicators"]
+        for key in ("ma_50", "avg_volume_20d", "return_20d", "runup_t90",
+                    "hv_20", "hv_percentile", "drawdown_from_high"):
+            result[key] = indicators.get(key)
     else:
         result["ma_200"] = None
         result["ma_200_note"] = "Historical data unavailable"
@@ -458,9 +710,12 @@ def fetch_market_data(ticker: str) -> Optional[Dict]:
         result["iv_strike"] = iv_data["strike"]
         result["iv_delta"] = iv_data["delta"]
         result["iv_is_atm"] = iv_data["is_atm"]
+        result.update(_iv_store.summary(ticker, iv_data["implied_volatility"]))
     else:
         result["implied_volatility"] = None
         result["iv_note"] = "Options data unavailable"
+        result["iv_percentile"] = None
+        result["iv_multiple_vs_avg"] = None
 
     return result
 
@@ -478,6 +733,221 @@ def fetch_quote(ticker: str) -> Optional[Dict]:
     return fetch_price(ticker)
 
 
+def _load_active_trades() -> List[Dict]:
+    """
+    Index records for trades/active/*.json (unreadable files are skipped).
+
+    Records carry trade_id, ticker, position and the latest monitoring
+    summary without parsing monitoring histories (see trade_repository.py).
+    """
+    return _trade_repo.find(status="active")
+
+
+def watchlist_tickers() -> List[str]:
+    """
+    Tickers the monitor flow cares about: active trades plus tracked events.
+
+    Returns:
+        Unique upper-case tickers from trades/active/*.json and events in
+        universe/events.json with status "tracking"
+    """
+    tickers = [trade["ticker"].upper() for trade in _load_active_trades() if trade.get("ticker")]
+
+    events_file = REPO_ROOT / "universe" / "events.json"
+    try:
+        events = json.loads(events_file.read_text()).get("events", [])
+    except (OSError, json.JSONDecodeError) as e:
+        print(f"Skipping {events_file.name}: {e}", file=sys.stderr)
+        events = []
+    for event in events:
+        if event.get("status") == "tracking" and event.get("ticker"):
+            tickers.append(event["ticker"].upper())
+
+    return list(dict.fromkeys(tickers))
+
+
+def fetch_quotes(tickers: Optional[List[str]] = None) -> Dict[str, Optional[Dict]]:
+    """
+    Price quotes for many tickers in one batched fetch.
+
+    Args:
+        tickers: Stock ticker symbols (default: watchlist_tickers())
+
+    Returns:
+        Dict of ticker -> quote dict (same shape as fetch_quote), or None
+        for tickers where every source failed
+    """
+    if not tickers:
+        tickers = watchlist_tickers()
+    return fetch_prices(tickers)
+
+
+def prefill_contracts(tickers: Optional[List[str]] = None) -> Optional[Dict]:
+    """
+    Resolve IBKR contracts for the watchlist ahead of time.
+
+    Tickers without a fresh contract cache entry are looked up in one
+    batched IBKR call and cached (see contract_cache.py), so later quote,
+    historical and atm_iv calls skip the contract lookup.
+
+    Args:
+        tickers: Stock ticker symbols (default: watchlist_tickers())
+
+    Returns:
+        Dict with cached, resolved ({ticker: conid}) and failed tickers, or None
+    """
+    tickers = [ticker.upper() for ticker in (tickers or watchlist_tickers())]
+    if not tickers:
+        return {"cached": [], "resolved": {}, "failed": []}
+
+    try:
+        data = run_ibkr_command("prefill_contracts", {"tickers": tickers}, timeout=60)
+    except IBKRTimeout:
+        print("IBKR contract prefill timeout", file=sys.stderr)
+        return None
+    except json.JSONDecodeError as e:
+        print(f"IBKR contract prefill JSON parse error: {e}", file=sys.stderr)
+        return None
+
+    if "error" in data:
+        print(f"IBKR contract prefill failed: {data['error']}", file=sys.stderr)
+        return None
+    return data
+
+
+def fetch_indicators(tickers: Optional[List[str]] = None, max_workers: int = 8) -> Dict:
+    """
+    Indicators for many tickers plus info parity price progress for active trades.
+
+    Bar stores are brought up to date concurrently, then every indicator
+    (see indicators.compute_indicators) is computed in one batched pass.
+    Live prices come from one fetch_prices() call.
+
+    Args:
+        tickers: Stock ticker symbols (default: watchlist_tickers())
+        max_workers: Concurrent bar updates
+
+    Returns:
+        Dict with "indicators" (ticker -> indicator dict with live price)
+        and "trades" (per active trade: price, price_vs_target, below_stop)
+    """
+    tickers = [ticker.upper() for ticker in (tickers or watchlist_tickers())]
+    tickers = list(dict.fromkeys(tickers))
+    if not tickers:
+        return {"indicators": {}, "trades": []}
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(tickers))) as executor:
+        updated = dict(zip(tickers, executor.map(lambda t: _update_bars(t)[0], tickers)))
+
+    table = compute_indicators(updated)
+    prices = fetch_prices(tickers)
+    for ticker in tickers:
+        row = table.setdefault(ticker, {})
+        quote = prices.get(ticker)
+        row["price"] = quote["price"] if quote else row.get("last_close")
+        row["price_source"] = quote["source"] if quote else ("bar store" if row.get("last_close") else None)
+
+    trades = [
+        trade for trade in _load_active_trades()
+        if trade.get("ticker", "").upper() in table and trade.get("position")
+    ]
+    trade_prices = [table[trade["ticker"].upper()]["price"] for trade in trades]
+    progress = price_vs_target(
+        [price if price is not None else float("nan") for price in trade_prices],
+        [trade["position"].get("entry_price") or float("nan") for trade in trades],
+        [trade["position"].get("target_price") or float("nan") for trade in trades],
+    )
+
+    trade_rows = []
+    for idx, trade in enumerate(trades):
+        position = trade["position"]
+        price = trade_prices[idx]
+        stop = position.get("stop_price")
+        trade_rows.append({
+            "trade_id": trade.get("trade_id"),
+            "ticker": trade["ticker"].upper(),
+            "price": price,
+            "entry_price": position.get("entry_price"),
+            "target_price": position.get("target_price"),
+            "stop_price": stop,
+            "price_vs_target": to_optional(progress[idx]),
+            "below_stop": bool(price is not None and stop and price <= stop),
+        })
+
+    return {"indicators": table, "trades": trade_rows}
+
+
+def fetch_option_chain(ticker: str, expiration: Optional[str] = None, strikes: int = 5,
+                       right: str = "CALL") -> Optional[Dict]:
+    """
+    Fetch a slice of the listed option chain around the current price.
+
+    Expirations and strikes come from IBKR's chain definition, so callers
+    pick from contracts that actually exist ($1 strikes, irregular
+    spacing, holiday-shifted expirations) instead of guessing.
+
+    Args:
+        ticker: Stock ticker symbol (underlying)
+        expiration: Target expiration (YYYY-MM-DD); the next listed one is
+            used if it is not listed. Default: nearest listed expiration
+        strikes: Listed strikes to include on each side of the price
+        right: "CALL", "PUT" or "BOTH"
+
+    Returns:
+        Dict with underlying_price, expiration, expirations and "options"
+        (one row per strike/right with pricing and Greeks), or None
+    """
+    ticker = ticker.upper()
+    params = {"ticker": ticker, "expiration": expiration, "strikes": strikes, "right": right}
+
+    try:
+        data = run_ibkr_command("option_chain", params, timeout=60)
+    except IBKRTimeout:
+        print(f"IBKR option chain timeout for {ticker}", file=sys.stderr)
+        return None
+    except json.JSONDecodeError as e:
+        print(f"IBKR option chain JSON parse error for {ticker}: {e}", file=sys.stderr)
+        return None
+
+    if "error" in data:
+        print(f"IBKR option chain fetch failed for {ticker}: {data['error']}", file=sys.stderr)
+        return None
+
+    if not data.get("options"):
+        print(f"IBKR option chain for {ticker} has no options", file=sys.stderr)
+        return None
+
+    # Fill sentinel Greeks and flag IBKR/model disagreements for the whole chain
+    model_config = get_monitor().model_greeks_config
+    fill_chain_greeks(data, model_config.get("risk_free_rate", 0.04), model_config.get("dividend_yield", 0.0),
+                      model_config.get("tolerance"))
+
+    atm = select_atm_option([row for row in data["options"] if row.get("right") == "CALL"],
+                            data.get("underlying_price") or 0)
+    if atm is not None:
+        _iv_store.record(ticker, atm["implied_volatility"], data["expiration"],
+                         strike=atm["strike"], delta=atm.get("delta"))
+
+    return data
+
+
+def _model_greeks(ticker: str, data: Dict, strike: float, expiration: str, right: str = "CALL") -> Optional[Dict]:
+    """Black-Scholes Greeks for an IBKR option quote, priced from its mid price."""
+    underlying_price = data.get("underlying_price")
+    if not underlying_price:
+        price_data = fetch_price(ticker)
+        underlying_price = price_data.get("price") if price_data else None
+    if not underlying_price or not data.get("mid_price"):
+        return None
+
+    model_config = get_monitor().model_greeks_config
+    return model_greeks(
+        data["mid_price"], underlying_price, strike, expiration, right,
+        rate=model_config.get("risk_free_rate", 0.04),
+        dividend=model_config.get("dividend_yield", 0.0),
+    )
+
+
 def fetch_options_data(ticker: str, strike: float, expiration: str) -> Optional[Dict]:
     """
     Fetch options chain data for monitor skill.
@@ -490,7 +960,11 @@ def fetch_options_data(ticker: str, strike: float, expiration: str) -> Optional[
     - Volume
 
     IMPORTANT: Includes data quality validation with circuit breaker.
-    Will halt trading after 3 consecutive validation failures.
+    Will halt trading after 3 consecutive validation failures. Greeks
+    IBKR leaves as sentinels (or out of range) are taken from a
+    Black-Scholes model of the mid price before validating, and IBKR
+    values that disagree with the model are flagged in
+    "greeks_divergence" (warning only).
 
     Args:
         ticker: Stock ticker symbol (underlying)
@@ -505,35 +979,22 @@ def fetch_options_data(ticker: str, strike: float, expiration: str) -> Optional[
 
     # Check if circuit breaker is active
     if monitor.is_circuit_breaker_active():
-        raise RuntimeError("⛔ Circuit breaker is active. Options trading halted. Reset manually after reviewing data quality logs.")
+        raise RuntimeError("⛔ Circuit breaker is active. Options trading halted. Reset manually after reviewing data quality logs (python scripts/breaker_state.py reset).")
 
     try:
-        script_path = Path(__file__).parent / "ibkr_paper.py"
-
-        result = subprocess.run(
-            [
-                sys.executable,
-                str(script_path),
-                "quote_option",
-                ticker,
-                "--strike", str(strike),
-                "--expiration", expiration,
-                "--right", "CALL"
-            ],
-            capture_output=True,
-            text=True,
-            timeout=30
+        data = run_ibkr_command(
+            "quote_option",
+            {"ticker": ticker, "strike": strike, "expiration": expiration, "right": "CALL"},
+            timeout=30,
         )
 
-        if result.returncode != 0:
-            error_msg = f"IBKR fetch failed: {result.stderr}"
+        if "error" in data:
+            error_msg = f"IBKR fetch failed: {data['error']}"
             print(f"Options fetch failed for {ticker}: {error_msg}", file=sys.stderr)
             monitor.record_failure("ibkr_connection", error_msg, ticker)
             return None
 
-        data = json.loads(result.stdout)
-
-        if "error" in data or not data.get("mid_price"):
+        if not data.get("mid_price"):
             error_msg = f"IBKR returned error or missing mid_price"
             monitor.record_failure("ibkr_response", error_msg, ticker)
             return None
@@ -549,6 +1010,16 @@ def fetch_options_data(ticker: str, strike: float, expiration: str) -> Optional[
             "implied_volatility": data.get("implied_volatility")
         }
 
+        model = _model_greeks(ticker, data, strike, expiration, "CALL")
+        greeks, model_filled, divergences = monitor.reconcile_greeks(greeks, model, right="CALL")
+        if model_filled:
+            print(f"Greeks from Black-Scholes for {ticker}: {', '.join(model_filled)}", file=sys.stderr)
+        for divergence in divergences:
+            print(
+                f"⚠️  {ticker} {divergence['field']} IBKR {divergence['ibkr']:.4f} vs model {divergence['model']:.4f}",
+                file=sys.stderr,
+            )
+
         valid, error = monitor.validate_greeks(greeks, right="CALL")
         if not valid:
             print(f"⚠️  Greeks validation failed for {ticker}: {error}", file=sys.stderr)
@@ -588,19 +1059,21 @@ def fetch_options_data(ticker: str, strike: float, expiration: str) -> Optional[
             "ask": data.get("ask"),
             "last": data.get("last"),
             "mid_price": data.get("mid_price"),
-            "delta": data.get("delta"),
-            "theta": data.get("theta"),
-            "gamma": data.get("gamma"),
-            "vega": data.get("vega"),
-            "implied_volatility": data.get("implied_volatility"),
+            "delta": greeks["delta"],
+            "theta": greeks["theta"],
+            "gamma": greeks["gamma"],
+            "vega": greeks["vega"],
+            "implied_volatility": greeks["implied_volatility"],
             "open_interest": data.get("open_interest"),
             "volume": data.get("volume"),
             "timestamp": datetime.now().isoformat(),
             "source": data.get("source", "IBKR Paper"),
+            "greeks_model_filled": model_filled,
+            "greeks_divergence": divergences,
             "data_quality_validated": True  # Flag that validation passed
         }
 
-    except subprocess.TimeoutExpired:
+    except IBKRTimeout:
         error_msg = f"IBKR timeout after 30 seconds"
         print(f"Options fetch timeout for {ticker}", file=sys.stderr)
         monitor.record_failure("ibkr_timeout", error_msg, ticker)
@@ -635,6 +1108,17 @@ def main():
     parser_all.add_argument("--archetype", default="general",
                            help="Trade archetype (pdufa, merger_arb, activist, etc.)")
 
+    # fetch_all_batch command
+    parser_batch = subparsers.add_parser("fetch_all_batch",
+                                         help="fetch_all over many tickers, streaming JSONL")
+    parser_batch.add_argument("--file",
+                              help="Ticker file (.json, .jsonl, or TICKER[,industry[,archetype]] lines); "
+                                   "default: universe/events.json")
+    parser_batch.add_argument("--status", nargs="+", default=["tracking"],
+                              help="Event statuses to include from events.json (default: tracking)")
+    parser_batch.add_argument("--workers", type=int, default=4, help="Tickers processed concurrently")
+    parser_batch.add_argument("--output", help="Write JSONL to this file instead of stdout")
+
     # fetch_market_data command
     parser_market = subparsers.add_parser("fetch_market_data",
                                           help="Fetch market data for score/monitor skills")
@@ -648,6 +1132,32 @@ def main():
     parser_price = subparsers.add_parser("fetch_price", help="Fetch price (alias for fetch_quote)")
     parser_price.add_argument("ticker", help="Stock ticker symbol")
 
+    # fetch_quotes command
+    parser_quotes = subparsers.add_parser("fetch_quotes",
+                                          help="Fetch price quotes for many tickers at once")
+    parser_quotes.add_argument("tickers", nargs="*",
+                               help="Stock ticker symbols (default: active trades + tracked events)")
+
+    # fetch_indicators command
+    parser_indicators = subparsers.add_parser("fetch_indicators",
+                                              help="Batch indicators + info parity price for monitor skill")
+    parser_indicators.add_argument("tickers", nargs="*",
+                                   help="Stock ticker symbols (default: active trades + tracked events)")
+
+    # prefill_contracts command
+    parser_prefill = subparsers.add_parser("prefill_contracts",
+                                           help="Resolve and cache IBKR contracts for the watchlist")
+    parser_prefill.add_argument("tickers", nargs="*",
+                                help="Stock ticker symbols (default: active trades + tracked events)")
+
+    # fetch_option_chain command
+    parser_chain = subparsers.add_parser("fetch_option_chain",
+                                         help="Fetch listed option chain slice with Greeks")
+    parser_chain.add_argument("ticker", help="Stock ticker symbol (underlying)")
+    parser_chain.add_argument("--expiration", help="Target expiration (YYYY-MM-DD); default nearest listed")
+    parser_chain.add_argument("--strikes", type=int, default=5, help="Listed strikes on each side of the price")
+    parser_chain.add_argument("--right", choices=["CALL", "PUT", "BOTH"], default="CALL", help="Option right")
+
     # fetch_options_data command
     parser_options = subparsers.add_parser("fetch_options_data",
                                            help="Fetch options data for monitor skill")
@@ -669,6 +1179,23 @@ def main():
         if data["kill_screens_status"] == "FAIL":
             sys.exit(1)
 
+    elif args.command == "fetch_all_batch":
+        batch = load_batch_requests(args.file, tuple(args.status))
+        if not batch:
+            print("ERROR: No tickers to process", file=sys.stderr)
+            sys.exit(1)
+
+        if args.output:
+            with open(args.output, "w") as handle:
+                summary = fetch_all_batch(batch, args.workers, handle)
+        else:
+            summary = fetch_all_batch(batch, args.workers)
+
+        # Summary on stderr keeps stdout pure JSONL
+        print(json.dumps(summary), file=sys.stderr)
+        if summary["ok"] == 0:
+            sys.exit(1)
+
     elif args.command == "fetch_market_data":
         data = fetch_market_data(args.ticker)
         if data:
@@ -693,6 +1220,35 @@ def main():
             print(f"ERROR: Could not fetch price for {args.ticker}", file=sys.stderr)
             sys.exit(1)
 
+    elif args.command == "fetch_quotes":
+        data = fetch_quotes(args.tickers)
+        print(json.dumps(data, indent=2))
+        if not data or not any(data.values()):
+            print("ERROR: Could not fetch any quotes", file=sys.stderr)
+            sys.exit(1)
+
+    elif args.command == "fetch_indicators":
+        data = fetch_indicators(args.tickers)
+        print(json.dumps(data, indent=2))
+        if not data["indicators"]:
+            print("ERROR: Could not compute any indicators", file=sys.stderr)
+            sys.exit(1)
+
+    elif args.command == "prefill_contracts":
+        data = prefill_contracts(args.tickers)
+        if data is None:
+            print("ERROR: Could not prefill contracts", file=sys.stderr)
+            sys.exit(1)
+        print(json.dumps(data, indent=2))
+
+    elif args.command == "fetch_option_chain":
+        data = fetch_option_chain(args.ticker, args.expiration, args.strikes, args.right)
+        if data:
+            print(json.dumps(data, indent=2))
+        else:
+            print(f"ERROR: Could not fetch option chain for {args.ticker}", file=sys.stderr)
+            sys.exit(1)
+
     elif args.command == "fetch_options_data":
         data = fetch_options_data(args.ticker, args.strike, args.expiration)
         if data:
@@ -2,7 +2,9 @@
 Data Quality Monitoring for Options Trading
 
 Real-time validation of IBKR data to prevent trading on invalid responses.
-Implements circuit breaker pattern: halt trading after 3 consecutive failures.
+Implements circuit breaker pattern: halt trading after 3 consecutive failures
+(or too many IBKR timeouts in an hour). Breaker state and failure counters
+are shared across processes (see breaker_state.py).
 
 Usage:
     from data_quality_monitor import OptionsDataQualityMonitor
@@ -11,12 +13,26 @@ Usage:
     valid, error = monitor.validate_greeks(greeks_dict)
     if not valid:
         monitor.record_failure("greeks_validation", error)
+
+    # With Black-Scholes Greeks as a second source (see black_scholes.py)
+    greeks, filled, divergences = monitor.reconcile_greeks(greeks_dict, model_greeks)
+
+    # Logged events (logs/data_quality/YYYY-MM-DD.jsonl, see event_log.py)
+    failures = monitor.event_log.query(start="2026-01-20", ticker="SPY", types=["greeks_validation"])
 """
 
 import json
+import time
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, Optional, Tuple
+from typing import Dict, List, Optional, Tuple
+
+from alert_store import AlertStore
+from black_scholes import DEFAULT_TOLERANCES, GREEK_FIELDS, compare_greeks
+from breaker_state import TIMEOUT_FAILURE_TYPES, CircuitBreakerState
+from event_log import EventLog
+
+LOG_DIR = Path(__file__).resolve().parents[1] / "logs" / "data_quality"
 
 
 class OptionsDataQualityMonitor:
@@ -24,27 +40,34 @@ class OptionsDataQualityMonitor:
     Real-time data quality validation for options trading.
 
     Validates:
-    - Greeks ranges (IV, delta, theta, gamma, vega)
+    - Greeks ranges (IV, delta, theta, gamma, vega), optionally against
+      Black-Scholes Greeks from the option's mid price
     - Pricing sanity (bid/ask spread, crossed markets)
     - Liquidity thresholds (open interest, volume)
 
     Circuit breaker:
-    - Triggers after 3 consecutive validation failures
+    - Triggers after 3 consecutive validation failures, or 3 IBKR
+      timeouts within an hour, counted across processes
     - Halts all options trading
     - Writes immediate alert to alerts.json
-    - Requires manual reset
+    - Requires manual reset (clears itself after auto_reset_after_hours)
     """
 
-    def __init__(self, config: Dict):
+    def __init__(self, config: Dict, log_dir: Optional[Path] = None,
+                 state_path: Optional[Path] = None, alerts: Optional[AlertStore] = None):
         """
         Initialize monitor with config thresholds.
 
         Args:
             config: CONFIG.json data with data_quality settings
+            log_dir: Event log directory (default: logs/data_quality)
+            state_path: Shared breaker state file (default: cache/circuit_breaker.sqlite)
+            alerts: Alert store (default: alerts.sqlite, see alert_store.py)
         """
         self.config = config
-        self.failures = []
-        self.circuit_breaker_triggered = False
+        self.breaker = CircuitBreakerState(state_path)
+        self.event_log = EventLog(log_dir or LOG_DIR)
+        self.alerts = alerts or AlertStore()
 
         # Load thresholds from config
         dq_config = config.get("data_quality", {})
@@ -68,61 +91,80 @@ class OptionsDataQualityMonitor:
             "min_daily_volume": 10
         })
 
+        self.model_greeks_config = dq_config.get("model_greeks", {
+            "risk_free_rate": 0.04,
+            "dividend_yield": 0.0,
+            "tolerance": DEFAULT_TOLERANCES
+        })
+
         self.circuit_breaker_config = dq_config.get("circuit_breaker", {
             "consecutive_failures_threshold": 3,
             "timeout_threshold_per_hour": 3,
             "auto_reset_after_hours": 24
         })
 
-    def validate_greeks(self, greeks: Dict, right: str = "CALL") -> Tuple[bool, str]:
-        """
-        Validate Greeks are within expected ranges.
-
-        Args:
-            greeks: Dict with delta, theta, gamma, vega, implied_volatility
-            right: "CALL" or "PUT"
+    def _greek_error(self, name: str, value: Optional[float], right: str = "CALL") -> str:
+        """Range check for one Greek; returns an error message or "" if OK (or missing)."""
+        if value is None:
+            return ""
 
-        Returns:
-            Tuple of (is_valid, error_message)
-        """
         # IV: 10% to 300%
-        iv = greeks.get("implied_volatility")
-        if iv is not None:
+        if name == "implied_volatility":
             iv_min, iv_max = self.greeks_validation["iv_range"]
-            if not (iv_min <= iv <= iv_max):
-                return False, f"IV {iv*100:.1f}% outside range [{iv_min*100:.0f}%, {iv_max*100:.0f}%]"
+            if not (iv_min <= value <= iv_max):
+                return f"IV {value*100:.1f}% outside range [{iv_min*100:.0f}%, {iv_max*100:.0f}%]"
 
         # Delta for calls: 0.01 to 1.00
-        delta = greeks.get("delta")
-        if delta is not None and right == "CALL":
+        elif name == "delta" and right == "CALL":
             delta_min, delta_max = self.greeks_validation["delta_range_calls"]
-            if not (delta_min <= delta <= delta_max):
-                return False, f"Delta {delta:.3f} outside range [{delta_min}, {delta_max}]"
+            if not (delta_min <= value <= delta_max):
+                return f"Delta {value:.3f} outside range [{delta_min}, {delta_max}]"
 
         # Theta should be negative for long calls (time decay)
-        theta = greeks.get("theta")
-        if theta is not None and right == "CALL":
+        elif name == "theta" and right == "CALL":
             theta_min, theta_max = self.greeks_validation["theta_range_long"]
-            if not (theta_min <= theta <= theta_max):
-                return False, f"Theta {theta:.3f} outside range [{theta_min}, {theta_max}]"
+            if not (theta_min <= value <= theta_max):
+                return f"Theta {value:.3f} outside range [{theta_min}, {theta_max}]"
 
             # Positive theta is especially suspicious for long options
-            if theta > 0:
-                return False, f"Theta {theta:.3f} is positive (expected negative for long calls)"
+            if value > 0:
+                return f"Theta {value:.3f} is positive (expected negative for long calls)"
 
         # Gamma should be positive and reasonable
-        gamma = greeks.get("gamma")
-        if gamma is not None:
+        elif name == "gamma":
             gamma_min, gamma_max = self.greeks_validation["gamma_range"]
-            if not (gamma_min < gamma <= gamma_max):
-                return False, f"Gamma {gamma:.4f} outside range ({gamma_min}, {gamma_max}]"
+            if not (gamma_min < value <= gamma_max):
+                return f"Gamma {value:.4f} outside range ({gamma_min}, {gamma_max}]"
 
         # Vega should be positive
-        vega = greeks.get("vega")
-        if vega is not None:
+        elif name == "vega":
             vega_min, vega_max = self.greeks_validation["vega_range"]
-            if not (vega_min < vega <= vega_max):
-                return False, f"Vega {vega:.4f} outside range ({vega_min}, {vega_max}]"
+            if not (vega_min < value <= vega_max):
+                return f"Vega {value:.4f} outside range ({vega_min}, {vega_max}]"
+
+        return ""
+
+    def validate_greeks(self, greeks: Dict, right: str = "CALL",
+                        model_greeks: Optional[Dict] = None) -> Tuple[bool, str]:
+        """
+        Validate Greeks are within expected ranges.
+
+        Args:
+            greeks: Dict with delta, theta, gamma, vega, implied_volatility
+            right: "CALL" or "PUT"
+            model_greeks: Optional Black-Scholes Greeks; missing or
+                out-of-range values are taken from it (see reconcile_greeks)
+
+        Returns:
+            Tuple of (is_valid, error_message)
+        """
+        if model_greeks:
+            greeks, _, _ = self.reconcile_greeks(greeks, model_greeks, right)
+
+        for name in ("implied_volatility", "delta", "theta", "gamma", "vega"):
+            error = self._greek_error(name, greeks.get(name), right)
+            if error:
+                return False, error
 
         # Check that we have at least delta, theta, and IV
         critical_greeks = [greeks.get("delta"), greeks.get("theta"), greeks.get("implied_volatility")]
@@ -133,6 +175,42 @@ class OptionsDataQualityMonitor:
 
         return True, ""
 
+    def reconcile_greeks(self, greeks: Dict, model_greeks: Optional[Dict],
+                         right: str = "CALL") -> Tuple[Dict, List[str], List[Dict]]:
+        """
+        Combine IBKR Greeks with Black-Scholes Greeks as a second source.
+
+        IBKR values that are missing (sentinels) or fail their range check
+        are replaced by the model value when that passes. IBKR values kept
+        are compared with the model; disagreements beyond the configured
+        tolerance are returned as warnings, not failures.
+
+        Args:
+            greeks: IBKR Greeks
+            model_greeks: Model Greeks (black_scholes.model_greeks), or None
+            right: "CALL" or "PUT"
+
+        Returns:
+            Tuple of (merged Greeks, fields filled from the model, divergences)
+        """
+        merged = dict(greeks)
+        if not model_greeks:
+            return merged, [], []
+
+        filled = []
+        for name in GREEK_FIELDS:
+            value = greeks.get(name)
+            model_value = model_greeks.get(name)
+            if model_value is None or self._greek_error(name, model_value, right):
+                continue
+            if value is None or self._greek_error(name, value, right):
+                merged[name] = model_value
+                filled.append(name)
+
+        kept = {name: value for name, value in greeks.items() if name not in filled}
+        divergences = compare_greeks(kept, model_greeks, self.model_greeks_config.get("tolerance"))
+        return merged, filled, divergences
+
     def validate_pricing(self, bid: Optional[float], ask: Optional[float], last: Optional[float]) -> Tuple[bool, str]:
         """
         Validate bid/ask pricing is reasonable.
@@ -218,23 +296,41 @@ class OptionsDataQualityMonitor:
             "ticker": ticker
         }
 
-        self.failures.append(failure)
-
         # Log to daily data quality log
         self._log_failure(failure)
 
-        # Check if we should trigger circuit breaker
-        consecutive_failures = len(self.failures)
+        # Count it in the shared state and check if we should trigger circuit breaker
+        is_timeout = failure_type in TIMEOUT_FAILURE_TYPES
+        counts = self.breaker.record_failure(failure, timeout=is_timeout)
+        if counts["triggered"]:
+            return
+
+        consecutive_failures = counts["consecutive"]
         threshold = self.circuit_breaker_config["consecutive_failures_threshold"]
+        timeout_threshold = self.circuit_breaker_config.get("timeout_threshold_per_hour")
 
-        if consecutive_failures >= threshold and not self.circuit_breaker_triggered:
+        if consecutive_failures >= threshold:
             self.trigger_circuit_breaker(
                 f"{consecutive_failures} consecutive data quality failures. Latest: {error}"
             )
+        elif is_timeout and timeout_threshold and counts["timeouts_last_hour"] >= timeout_threshold:
+            self.trigger_circuit_breaker(
+                f"{counts['timeouts_last_hour']} IBKR timeouts in the last hour. Latest: {error}"
+            )
 
     def reset_failures(self):
         """Reset failure counter on successful validation."""
-        self.failures = []
+        self.breaker.record_success()
+
+    @property
+    def failures(self) -> List[Dict]:
+        """Current run of consecutive failures (most recent 10), across processes."""
+        consecutive = self.breaker.status()["consecutive_failures"]
+        return self.breaker.recent_failures(min(consecutive, 10)) if consecutive else []
+
+    @property
+    def circuit_breaker_triggered(self) -> bool:
+        return self.is_circuit_breaker_active()
 
     def trigger_circuit_breaker(self, reason: str):
         """
@@ -243,12 +339,10 @@ class OptionsDataQualityMonitor:
         Args:
             reason: Reason for triggering circuit breaker
         """
-        if self.circuit_breaker_triggered:
-            # Already triggered, don't duplicate
+        if not self.breaker.trip(reason):
+            # Already triggered (possibly by another process), don't duplicate
             return
 
-        self.circuit_breaker_triggered = True
-
         alert_id = f"alert-{datetime.now().strftime('%Y%m%d-%H%M%S')}"
 
         alert = {
@@ -260,10 +354,10 @@ class OptionsDataQualityMonitor:
             "reason": reason,
             "action_required": "Review logs/data_quality/ and manually reset circuit breaker",
             "acknowledged": False,
-            "failures": self.failures[-10:]  # Last 10 failures
+            "failures": self.failures  # Last 10 failures
         }
 
-        # Write to alerts.json
+        # Write to the alert store (alerts.json)
         self._write_alert(alert)
 
         # Log circuit breaker event
@@ -273,8 +367,26 @@ class OptionsDataQualityMonitor:
         raise RuntimeError(f"⛔ OPTIONS TRADING HALTED: {reason}")
 
     def is_circuit_breaker_active(self) -> bool:
-        """Check if circuit breaker is currently triggered."""
-        return self.circuit_breaker_triggered
+        """
+        Check if circuit breaker is currently triggered (in any process).
+
+        A breaker older than auto_reset_after_hours is cleared and logged.
+        """
+        triggered_at = self.breaker.triggered_at()
+        if triggered_at is None:
+            return False
+
+        auto_reset_hours = self.circuit_breaker_config.get("auto_reset_after_hours")
+        if not auto_reset_hours or time.time() - triggered_at < auto_reset_hours * 3600:
+            return True
+
+        if self.breaker.expire(auto_reset_hours):
+            self._log_circuit_breaker_reset({
+                "timestamp": datetime.now().isoformat(),
+                "event": "circuit_breaker_reset",
+                "note": f"Auto reset after {auto_reset_hours} hours"
+            })
+        return self.breaker.triggered_at() is not None
 
     def reset_circuit_breaker(self):
         """
@@ -282,8 +394,7 @@ class OptionsDataQualityMonitor:
 
         Should only be called after reviewing logs and confirming data quality is restored.
         """
-        self.circuit_breaker_triggered = False
-        self.failures = []
+        self.breaker.reset()
 
         # Log reset
         log_entry = {
@@ -295,107 +406,33 @@ class OptionsDataQualityMonitor:
         self._log_circuit_breaker_reset(log_entry)
 
     def _write_alert(self, alert: Dict):
-        """Write alert to alerts.json."""
-        alerts_file = Path("alerts.json")
-
+        """Add alert to the alert store (shown in alerts.json)."""
         try:
-            if alerts_file.exists():
-                alerts_data = json.loads(alerts_file.read_text())
-            else:
-                alerts_data = {
-                    "alerts": [],
-                    "metadata": {
-                        "version": "1.0",
-                        "description": "Active alerts requiring user action"
-                    }
-                }
-
-            # Add new alert
-            alerts_data["alerts"].append(alert)
-
-            # Write back
-            alerts_file.write_text(json.dumps(alerts_data, indent=2))
+            alert_id, _ = self.alerts.add(alert)
 
             print(f"\n⚠️  IMMEDIATE ALERT: {alert['reason']}", flush=True)
-            print(f"Alert ID: {alert['id']}", flush=True)
+            print(f"Alert ID: {alert_id}", flush=True)
             print(f"Review: alerts.json", flush=True)
 
         except Exception as e:
-            print(f"ERROR: Could not write alert to alerts.json: {e}", flush=True)
+            print(f"ERROR: Could not write alert to alert store: {e}", flush=True)
 
     def _log_failure(self, failure: Dict):
-        """Log failure to daily data quality log."""
-        today = datetime.now().strftime('%Y-%m-%d')
-        log_file = Path(f"logs/data_quality/{today}.json")
-        log_file.parent.mkdir(parents=True, exist_ok=True)
-
-        try:
-            if log_file.exists():
-                log_data = json.loads(log_file.read_text())
-            else:
-                log_data = {
-                    "date": today,
-                    "events": []
-                }
-
-            log_data["events"].append({
-                "type": "validation_failure",
-                **failure
-            })
-
-            log_file.write_text(json.dumps(log_data, indent=2))
-        except Exception as e:
-            print(f"WARNING: Could not write to data quality log: {e}", flush=True)
+        """Queue a failure in the data quality event log (written in the background)."""
+        self.event_log.append({"type": "validation_failure", **failure})
 
     def _log_circuit_breaker(self, reason: str):
-        """Log circuit breaker trigger event."""
-        today = datetime.now().strftime('%Y-%m-%d')
-        log_file = Path(f"logs/data_quality/{today}.json")
-        log_file.parent.mkdir(parents=True, exist_ok=True)
-
-        try:
-            if log_file.exists():
-                log_data = json.loads(log_file.read_text())
-            else:
-                log_data = {
-                    "date": today,
-                    "events": []
-                }
-
-            log_data["events"].append({
-                "type": "circuit_breaker_triggered",
-                "timestamp": datetime.now().isoformat(),
-                "reason": reason,
-                "failures_count": len(self.failures)
-            })
-
-            log_file.write_text(json.dumps(log_data, indent=2))
-        except Exception as e:
-            print(f"WARNING: Could not write circuit breaker event: {e}", flush=True)
+        """Log circuit breaker trigger event (written before returning)."""
+        self.event_log.append({
+            "type": "circuit_breaker_triggered",
+            "timestamp": datetime.now().isoformat(),
+            "reason": reason,
+            "failures_count": self.breaker.status()["consecutive_failures"]
+        }, sync=True)
 
     def _log_circuit_breaker_reset(self, log_entry: Dict):
-        """Log circuit breaker reset event."""
-        today = datetime.now().strftime('%Y-%m-%d')
-        log_file = Path(f"logs/data_quality/{today}.json")
-        log_file.parent.mkdir(parents=True, exist_ok=True)
-
-        try:
-            if log_file.exists():
-                log_data = json.loads(log_file.read_text())
-            else:
-                log_data = {
-                    "date": today,
-                    "events": []
-                }
-
-            log_data["events"].append({
-                "type": "circuit_breaker_reset",
-                **log_entry
-            })
-
-            log_file.write_text(json.dumps(log_data, indent=2))
-        except Exception as e:
-            print(f"WARNING: Could not write circuit breaker reset: {e}", flush=True)
+        """Log circuit breaker reset event (written before returning)."""
+        self.event_log.append({"type": "circuit_breaker_reset", **log_entry}, sync=True)
 
 
 def load_config() -> Dict:
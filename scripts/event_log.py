@@ -0,0 +1,305 @@
+"""
+Event Log Module
+
+Append-only JSONL event log with a rotating, batched writer.
+
+Used for logs/data_quality/, which used to be one JSON document per day
+that every event re-read, re-parsed and rewrote in full (quadratic over
+a busy day, and concurrent processes could drop each other's events).
+
+Writing:
+- append() only queues the event; a background thread writes queued
+  events as one O_APPEND write per batch and fsyncs once per batch, so
+  callers on the quote path never wait for the disk
+- append(event, sync=True) and flush() block until the event is durable
+  (used for circuit breaker events)
+- Files rotate daily (YYYY-MM-DD.jsonl) and by size (YYYY-MM-DD.1.jsonl,
+  .2, ...) once max_bytes is reached
+- Queued events are flushed at interpreter exit
+
+Each batch is a single write() on a file opened with O_APPEND, so lines
+from several processes appending to the same day never interleave.
+
+Reading: iter_events()/query() filter by time range, ticker and event
+type. Files are named by the day they were written, so files outside the
+date range are skipped without being opened.
+
+Legacy {"date": ..., "events": [...]} files are converted in place with
+convert_legacy() (originals are kept as *.json.migrated).
+
+Usage:
+    from event_log import EventLog
+
+    log = EventLog(Path("logs/data_quality"))
+    log.append({"type": "validation_failure", "ticker": "SPY", "error": "..."})
+    failures = log.query(start="2026-01-20", ticker="SPY", types=["validation_failure"])
+
+    python event_log.py query logs/data_quality --start 2026-01-20 --ticker SPY
+    python event_log.py convert logs/data_quality
+"""
+
+import atexit
+import json
+import os
+import re
+import sys
+import threading
+from datetime import date, datetime, time as dt_time
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Union
+
+DEFAULT_MAX_BYTES = 8 * 1024 * 1024
+DEFAULT_FLUSH_SECONDS = 0.5
+DEFAULT_BATCH_SIZE = 256
+
+_FILE_PATTERN = re.compile(r"^(\d{4}-\d{2}-\d{2})(?:\.(\d+))?\.jsonl$")
+
+TimeBound = Union[str, date, datetime, None]
+
+
+def _parse_bound(value: TimeBound, end: bool = False) -> Optional[datetime]:
+    """Datetime bound from an ISO string, date or datetime (a bare end date includes that whole day)."""
+    if value is None or isinstance(value, datetime):
+        return value
+    if isinstance(value, date):
+        return datetime.combine(value, dt_time.max if end else dt_time.min)
+    if len(value) == 10:
+        return _parse_bound(date.fromisoformat(value), end)
+    return datetime.fromisoformat(value)
+
+
+class EventLog:
+    """Rotating JSONL log under one directory (one file per day, split by size)."""
+
+    def __init__(self, root: Path, max_bytes: int = DEFAULT_MAX_BYTES,
+                 flush_seconds: float = DEFAULT_FLUSH_SECONDS, batch_size: int = DEFAULT_BATCH_SIZE):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.flush_seconds = flush_seconds
+        self.batch_size = batch_size
+        self._queue: List[str] = []
+        self._queued = 0
+        self._written = 0
+        self._cond = threading.Condition()
+        self._write_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._fd: Optional[int] = None
+        self._fd_path: Optional[Path] = None
+
+    # ------------------------------------------------------------------
+    # Writing
+    # ------------------------------------------------------------------
+
+    def append(self, event: Dict, sync: bool = False):
+        """
+        Queue one event (a "timestamp" is added if missing).
+
+        Args:
+            event: JSON-serialisable event dict
+            sync: Block until the event is written and fsynced
+        """
+        if "timestamp" not in event:
+            event = {"timestamp": datetime.now().isoformat(), **event}
+        line = json.dumps(event, separators=(",", ":"), default=str) + "\n"
+        with self._cond:
+            self._queue.append(line)
+            self._queued += 1
+            target = self._queued
+            self._ensure_writer()
+            if len(self._queue) >= self.batch_size:
+                self._cond.notify_all()
+        if sync:
+            self.flush(target)
+
+    def flush(self, target: Optional[int] = None):
+        """Write everything queued so far (or up to event number `target`) and fsync."""
+        with self._cond:
+            target = self._queued if target is None else target
+            if self._written >= target:
+                return
+        self._drain()
+
+    def close(self):
+        self.flush()
+        with self._write_lock:
+            if self._fd is not None:
+                os.close(self._fd)
+                self._fd, self._fd_path = None, None
+
+    def _ensure_writer(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="event-log-writer", daemon=True)
+            self._thread.start()
+            atexit.register(self.flush)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                if len(self._queue) < self.batch_size:
+                    self._cond.wait(self.flush_seconds)
+            self._drain()
+
+    def _drain(self):
+        """Write the queue as one batch; batches are taken and written in queue order."""
+        with self._write_lock:
+            with self._cond:
+                batch, self._queue = self._queue, []
+            if batch:
+                self._write_batch(batch)
+
+    def _path_for(self, day: str) -> Path:
+        """Current file for `day`: the highest size-rotation index still under max_bytes."""
+        index = 0
+        while True:
+            path = self.root / (f"{day}.jsonl" if index == 0 else f"{day}.{index}.jsonl")
+            try:
+                if path.stat().st_size < self.max_bytes:
+                    return path
+            except FileNotFoundError:
+                return path
+            index += 1
+
+    def _write_batch(self, batch: List[str]):
+        """Append one batch and fsync (caller holds _write_lock)."""
+        data = "".join(batch).encode("utf-8")
+        try:
+            day = date.today().isoformat()
+            if (self._fd is None or not self._fd_path.name.startswith(day)
+                    or os.fstat(self._fd).st_size >= self.max_bytes):
+                if self._fd is not None:
+                    os.close(self._fd)
+                    self._fd = None
+                self.root.mkdir(parents=True, exist_ok=True)
+                self._fd_path = self._path_for(day)
+                self._fd = os.open(self._fd_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            os.write(self._fd, data)
+            os.fsync(self._fd)
+        except OSError as e:
+            print(f"WARNING: Could not write to event log {self.root}: {e}", file=sys.stderr)
+        with self._cond:
+            self._written += len(batch)
+
+    # ------------------------------------------------------------------
+    # Reading
+    # ------------------------------------------------------------------
+
+    def files(self, start: TimeBound = None, end: TimeBound = None) -> List[Path]:
+        """Log files in chronological order, limited to days in [start, end]."""
+        start_day = _parse_bound(start).date().isoformat() if start else None
+        end_day = _parse_bound(end, end=True).date().isoformat() if end else None
+        found = []
+        for path in self.root.glob("*.jsonl"):
+            match = _FILE_PATTERN.match(path.name)
+            if not match:
+                continue
+            day = match.group(1)
+            if (start_day and day < start_day) or (end_day and day > end_day):
+                continue
+            found.append((day, int(match.group(2) or 0), path))
+        return [path for _, _, path in sorted(found)]
+
+    def iter_events(self, start: TimeBound = None, end: TimeBound = None, ticker: Optional[str] = None,
+                    types: Optional[Iterable[str]] = None) -> Iterator[Dict]:
+        """
+        Events in write order matching every given filter.
+
+        Args:
+            start: Earliest timestamp (ISO string, date or datetime)
+            end: Latest timestamp (a bare date includes that whole day)
+            ticker: Only events for this ticker
+            types: Only these event types
+        """
+        self.flush()
+        start_at, end_at = _parse_bound(start), _parse_bound(end, end=True)
+        types = set(types) if types else None
+        ticker = ticker.upper() if ticker else None
+
+        for path in self.files(start, end):
+            try:
+                handle = open(path, "r", encoding="utf-8")
+            except OSError as e:
+                print(f"Skipping {path.name}: {e}", file=sys.stderr)
+                continue
+            with handle:
+                for line in handle:
+                    try:
+                        event = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue  # torn line from a crashed writer
+                    if types and event.get("type") not in types:
+                        continue
+                    if ticker and (event.get("ticker") or "").upper() != ticker:
+                        continue
+                    if start_at or end_at:
+                        try:
+                            at = datetime.fromisoformat(event["timestamp"])
+                        except (KeyError, TypeError, ValueError):
+                            continue
+                        if (start_at and at < start_at) or (end_at and at > end_at):
+                            continue
+                    yield event
+
+    def query(self, start: TimeBound = None, end: TimeBound = None, ticker: Optional[str] = None,
+              types: Optional[Iterable[str]] = None, limit: Optional[int] = None) -> List[Dict]:
+        """List of matching events (the most recent `limit` if given)."""
+        events = list(self.iter_events(start, end, ticker, types))
+        return events[-limit:] if limit else events
+
+
+def convert_legacy(root: Path) -> Dict[str, int]:
+    """
+    Convert YYYY-MM-DD.json documents ({"events": [...]}) to JSONL.
+
+    Legacy events are placed ahead of anything already in that day's
+    .jsonl file; the original is renamed to *.json.migrated.
+
+    Returns:
+        {day: events converted}
+    """
+    root = Path(root)
+    converted = {}
+    for legacy in sorted(root.glob("????-??-??.json")):
+        try:
+            events = json.loads(legacy.read_text()).get("events", [])
+        except (OSError, json.JSONDecodeError, AttributeError) as e:
+            print(f"Skipping {legacy.name}: {e}", file=sys.stderr)
+            continue
+
+        target = legacy.with_suffix(".jsonl")
+        existing = target.read_bytes() if target.exists() else b""
+        lines = "".join(json.dumps(event, separators=(",", ":"), default=str) + "\n" for event in events)
+        tmp = target.with_suffix(".jsonl.tmp")
+        with open(tmp, "wb") as handle:
+            handle.write(lines.encode("utf-8") + existing)
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(tmp, target)
+        legacy.rename(legacy.with_name(legacy.name + ".migrated"))
+        converted[legacy.stem] = len(events)
+    return converted
+
+
+def main():
+    """CLI interface for querying and converting event logs."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Query or convert a JSONL event log directory")
+    parser.add_argument("command", choices=["query", "convert"])
+    parser.add_argument("root", help="Log directory, e.g. logs/data_quality")
+    parser.add_argument("--start", help="Earliest timestamp or date (ISO)")
+    parser.add_argument("--end", help="Latest timestamp or date (ISO)")
+    parser.add_argument("--ticker", help="Only events for this ticker")
+    parser.add_argument("--type", action="append", dest="types", help="Event type (repeatable)")
+    parser.add_argument("--limit", type=int, help="Most recent N events")
+    args = parser.parse_args()
+
+    if args.command == "convert":
+        print(json.dumps({"converted": convert_legacy(Path(args.root))}, indent=2))
+    else:
+        events = EventLog(Path(args.root)).query(args.start, args.end, args.ticker, args.types, args.limit)
+        for event in events:
+            print(json.dumps(event))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,196 @@
+"""
+HTTP Client Module
+
+Shared HTTP layer for Stooq, Yahoo Finance, SEC EDGAR and openFDA.
+
+- One pooled requests.Session per host, so consecutive calls reuse a
+  keep-alive connection instead of paying TCP+TLS setup every time
+- Per-host concurrency limits (data_sources.http.host_limits), enforced
+  for threads and coroutines alike
+- Retry with jittered exponential backoff on connection errors, timeouts,
+  429 and 5xx (honouring Retry-After)
+- Every attempt takes a token from the host's cross-process bucket
+  (data_sources.http.rate_limits, see rate_limiter.py)
+- get_async(): asyncio front end, so a batch run can overlap SEC, price
+  and FDA calls with asyncio.gather
+
+The async path runs the pooled sessions on worker threads
+(asyncio.to_thread) rather than adding an async HTTP dependency; waiting
+for a host slot and backing off happen on the event loop.
+
+Usage:
+    import http_client
+
+    response = http_client.get("https://stooq.com/q/l/?s=spy.us&e=json", timeout=10)
+
+    async def run():
+        return await asyncio.gather(
+            http_client.get_async(sec_url, headers=SEC_HEADERS),
+            http_client.get_async(fda_url, params=params),
+        )
+"""
+
+import asyncio
+import json
+import random
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from rate_limiter import RateLimiter
+
+DEFAULT_HOST_LIMIT = 4
+DEFAULT_RETRIES = 2
+DEFAULT_BACKOFF_SECONDS = 0.5
+DEFAULT_MAX_BACKOFF_SECONDS = 8.0
+
+RETRY_STATUS = frozenset({429, 500, 502, 503, 504})
+
+
+def load_http_policy() -> Dict:
+    """Load data_sources.http from CONFIG.json."""
+    config_path = Path(__file__).resolve().parents[1] / "CONFIG.json"
+    if not config_path.exists():
+        return {}
+    with open(config_path, "r") as f:
+        return json.load(f).get("data_sources", {}).get("http", {})
+
+
+class HostPool:
+    """Pooled sessions and concurrency limits, one set per host."""
+
+    def __init__(self, policy: Optional[Dict] = None):
+        policy = load_http_policy() if policy is None else policy
+        self.host_limits = policy.get("host_limits", {})
+        self.default_limit = policy.get("default_host_limit", DEFAULT_HOST_LIMIT)
+        self.retries = policy.get("retries", DEFAULT_RETRIES)
+        self.backoff = policy.get("backoff_seconds", DEFAULT_BACKOFF_SECONDS)
+        self.max_backoff = policy.get("max_backoff_seconds", DEFAULT_MAX_BACKOFF_SECONDS)
+        self.limiter = RateLimiter(policy.get("rate_limits", {}))
+
+        self._lock = threading.Lock()
+        self._sessions: Dict[str, requests.Session] = {}
+        self._slots: Dict[str, threading.BoundedSemaphore] = {}
+        self._async_slots: Dict[Tuple[int, str], asyncio.Semaphore] = {}
+
+    def limit(self, host: str) -> int:
+        return self.host_limits.get(host, self.default_limit)
+
+    def session(self, host: str) -> requests.Session:
+        """Keep-alive session for a host (pool sized to the host limit)."""
+        with self._lock:
+            if host not in self._sessions:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.limit(host))
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                self._sessions[host] = session
+                self._slots[host] = threading.BoundedSemaphore(self.limit(host))
+            return self._sessions[host]
+
+    def slot(self, host: str) -> threading.BoundedSemaphore:
+        self.session(host)
+        return self._slots[host]
+
+    def async_slot(self, host: str) -> asyncio.Semaphore:
+        """Per-host semaphore for the running event loop."""
+        key = (id(asyncio.get_running_loop()), host)
+        with self._lock:
+            if key not in self._async_slots:
+                self._async_slots[key] = asyncio.Semaphore(self.limit(host))
+            return self._async_slots[key]
+
+    def backoff_delay(self, attempt: int, response: Optional[requests.Response] = None) -> float:
+        """Full-jitter exponential backoff; Retry-After wins when the server sends it."""
+        if response is not None:
+            retry_after = response.headers.get("Retry-After")
+            if retry_after and retry_after.isdigit():
+                return min(float(retry_after), self.max_backoff)
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+
+    def close(self):
+        with self._lock:
+            for session in self._sessions.values():
+                session.close()
+            self._sessions.clear()
+            self._slots.clear()
+            self._async_slots.clear()
+
+
+_pool = HostPool()
+
+
+def _host(url: str) -> str:
+    return urlsplit(url).netloc.lower()
+
+
+def _request_once(url: str, params: Optional[Dict], headers: Optional[Dict], timeout: float) -> requests.Response:
+    host = _host(url)
+    session = _pool.session(host)
+    with _pool.slot(host):
+        return session.get(url, params=params, headers=headers, timeout=timeout)
+
+
+def get(url: str, params: Optional[Dict] = None, headers: Optional[Dict] = None,
+        timeout: float = 10, retries: Optional[int] = None) -> requests.Response:
+    """
+    GET through the host's pooled session, retrying transient failures.
+
+    Args:
+        url: Request URL
+        params: Query parameters
+        headers: Request headers
+        timeout: Per-attempt timeout in seconds
+        retries: Retry count (default: data_sources.http.retries)
+
+    Returns:
+        The final response (callers still call raise_for_status)
+
+    Raises:
+        requests.RequestException: If every attempt failed to connect
+    """
+    retries = _pool.retries if retries is None else retries
+    host = _host(url)
+    for attempt in range(retries + 1):
+        _pool.limiter.acquire(host)
+        try:
+            response = _request_once(url, params, headers, timeout)
+        except (requests.ConnectionError, requests.Timeout):
+            if attempt == retries:
+                raise
+            time.sleep(_pool.backoff_delay(attempt))
+            continue
+
+        if response.status_code not in RETRY_STATUS or attempt == retries:
+            return response
+        time.sleep(_pool.backoff_delay(attempt, response))
+
+
+async def get_async(url: str, params: Optional[Dict] = None, headers: Optional[Dict] = None,
+                    timeout: float = 10, retries: Optional[int] = None) -> requests.Response:
+    """
+    Async get(): waits for a host slot and backs off on the event loop.
+
+    Same arguments, return value and exceptions as get().
+    """
+    retries = _pool.retries if retries is None else retries
+    host = _host(url)
+    for attempt in range(retries + 1):
+        await _pool.limiter.acquire_async(host)
+        try:
+            async with _pool.async_slot(host):
+                response = await asyncio.to_thread(_request_once, url, params, headers, timeout)
+        except (requests.ConnectionError, requests.Timeout):
+            if attempt == retries:
+                raise
+            await asyncio.sleep(_pool.backoff_delay(attempt))
+            continue
+
+        if response.status_code not in RETRY_STATUS or attempt == retries:
+            return response
+        await asyncio.sleep(_pool.backoff_delay(attempt, response))
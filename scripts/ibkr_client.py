@@ -0,0 +1,170 @@
+"""
+IBKR Client Module
+
+In-process client for the IBKR gateway daemon (ibkr_gateway.py).
+
+The gateway holds one long-lived IBKR connection and serves market data
+requests over a Unix socket, so fetchers no longer pay an interpreter
+startup and gateway handshake per call. When the daemon is not running,
+requests fall back to a one-shot `ibkr_paper.py` subprocess.
+
+This module only depends on the standard library so it can be imported
+without ibapi installed.
+
+Usage:
+    from ibkr_client import run_ibkr_command
+
+    data = run_ibkr_command("quote", {"ticker": "SPY"}, timeout=30)
+    if "error" not in data:
+        print(data["last"])
+"""
+
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from typing import Dict, List, Optional
+
+
+class GatewayUnavailable(Exception):
+    """Raised when the gateway daemon is not running or refuses connections."""
+
+
+class IBKRTimeout(TimeoutError):
+    """Raised when an IBKR request does not complete within its timeout."""
+
+
+def gateway_socket_path() -> Path:
+    """Resolve the gateway Unix socket path (env override: IBKR_GATEWAY_SOCKET)."""
+    override = os.getenv("IBKR_GATEWAY_SOCKET")
+    if override:
+        return Path(override)
+    return Path(tempfile.gettempdir()) / f"ibkr_gateway_{os.getuid()}.sock"
+
+
+def gateway_request(command: str, params: Optional[Dict] = None, timeout: float = 30) -> Dict:
+    """
+    Send one request to the gateway daemon and return its JSON response.
+
+    Args:
+        command: Gateway command (quote, quotes, quote_option, historical, atm_iv, positions, ...)
+        params: Command parameters (ticker, strike, expiration, ...)
+        timeout: Seconds to wait for the response
+
+    Returns:
+        Response dict (contains "error" if the request failed at IBKR)
+
+    Raises:
+        GatewayUnavailable: Daemon is not running
+        IBKRTimeout: No response within timeout
+    """
+    path = gateway_socket_path()
+    if not path.exists():
+        raise GatewayUnavailable(f"No gateway socket at {path}")
+
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(timeout)
+    try:
+        try:
+            sock.connect(str(path))
+        except (ConnectionRefusedError, FileNotFoundError) as e:
+            raise GatewayUnavailable(f"Gateway not accepting connections: {e}")
+
+        payload = {"command": command, "params": params or {}}
+        sock.sendall((json.dumps(payload) + "\n").encode("utf-8"))
+
+        chunks = []
+        while True:
+            chunk = sock.recv(65536)
+            if not chunk:
+                break
+            chunks.append(chunk)
+            if chunk.endswith(b"\n"):
+                break
+    except socket.timeout:
+        raise IBKRTimeout(f"Gateway {command} timed out after {timeout} seconds")
+    finally:
+        sock.close()
+
+    if not chunks:
+        raise GatewayUnavailable("Gateway closed connection without a response")
+
+    return json.loads(b"".join(chunks).decode("utf-8"))
+
+
+def is_gateway_running(timeout: float = 2) -> bool:
+    """Check whether the gateway daemon answers a ping."""
+    try:
+        return gateway_request("ping", timeout=timeout).get("status") == "ok"
+    except (GatewayUnavailable, IBKRTimeout, OSError, json.JSONDecodeError):
+        return False
+
+
+def _build_cli_args(command: str, params: Dict) -> List[str]:
+    """Translate gateway params into ibkr_paper.py CLI arguments."""
+    args = [command]
+    if params.get("ticker"):
+        args.append(params["ticker"])
+    if params.get("tickers"):
+        args.extend(params["tickers"])
+    for key, value in params.items():
+        if key in ("ticker", "tickers") or value is None:
+            continue
+        args.extend([f"--{key.replace('_', '-')}", str(value)])
+    return args
+
+
+def _run_subprocess(command: str, params: Dict, timeout: float) -> Dict:
+    """Run a one-shot ibkr_paper.py subprocess (used when the gateway is down)."""
+    script_path = Path(__file__).parent / "ibkr_paper.py"
+
+    try:
+        result = subprocess.run(
+            [sys.executable, str(script_path)] + _build_cli_args(command, params),
+            capture_output=True,
+            text=True,
+            timeout=timeout,
+        )
+    except subprocess.TimeoutExpired:
+        raise IBKRTimeout(f"IBKR {command} timed out after {timeout} seconds")
+
+    if result.returncode != 0:
+        error_detail = result.stderr.strip()
+        if result.stdout:
+            try:
+                payload = json.loads(result.stdout)
+                if isinstance(payload, dict) and payload.get("error"):
+                    return payload
+                error_detail = error_detail or str(payload)
+            except json.JSONDecodeError:
+                error_detail = error_detail or result.stdout.strip()
+        return {"error": error_detail or f"ibkr_paper.py {command} exited with {result.returncode}"}
+
+    return json.loads(result.stdout)
+
+
+def run_ibkr_command(command: str, params: Optional[Dict] = None, timeout: float = 30) -> Dict:
+    """
+    Run an IBKR market data command via the gateway, falling back to a subprocess.
+
+    Args:
+        command: ibkr_paper.py command name
+        params: Command parameters
+        timeout: Seconds to wait for the whole request
+
+    Returns:
+        Parsed JSON response (contains "error" on failure)
+
+    Raises:
+        IBKRTimeout: Request timed out
+        json.JSONDecodeError: Response was not valid JSON
+    """
+    params = params or {}
+    try:
+        return gateway_request(command, params, timeout)
+    except GatewayUnavailable:
+        pass
+    return _run_subprocess(command, params, timeout)
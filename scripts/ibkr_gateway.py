@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+IBKR Gateway Daemon
+
+Long-lived local process that holds one IBKR connection and serves market
+data requests over a Unix socket. Replaces the per-call `ibkr_paper.py`
+subprocesses used by price_sources.py and data_fetcher.py, which each paid
+an interpreter startup, an ibapi import and a gateway handshake.
+
+Protocol:
+    One JSON request per connection, newline-terminated:
+        {"command": "quote", "params": {"ticker": "SPY"}}
+    One JSON response, newline-terminated (same shape as the ibkr_paper.py
+    command output; failures carry an "error" key).
+
+Commands: the ibkr_paper.MARKET_DATA_COMMANDS (quote, quotes, resolve,
+quote_option, option_chain, historical, atm_iv, positions,
+prefill_contracts), plus "ping" and "shutdown". Requests from concurrent clients share the connection
+without blocking each other. Each response carries only the connection-level
+messages logged while its request was outstanding; "ping" reports the recent
+ones (farm status, connectivity).
+
+Order placement is intentionally not served here; orders keep using
+one-shot ibkr_paper.py connections.
+
+Usage:
+    python ibkr_gateway.py serve            # run in foreground
+    python ibkr_gateway.py status
+    python ibkr_gateway.py stop
+
+Clients: see ibkr_client.py (run_ibkr_command).
+"""
+import argparse
+import json
+import os
+import socketserver
+import sys
+import threading
+import time
+from datetime import datetime
+
+from ibkr_client import GatewayUnavailable, IBKRTimeout, gateway_request, gateway_socket_path
+from ibkr_paper import MARKET_DATA_COMMANDS, IBKRApp, resolve_connection_settings, start_app
+
+
+class IBKRGateway:
+    """
+    Owns the shared IBKRApp connection and dispatches requests to it.
+
+    IBKRApp routes callbacks by reqId, so requests from concurrent clients
+    run in parallel on the one connection; only (re)connecting is locked.
+    """
+
+    def __init__(self, settings, timeout):
+        self.settings = settings
+        self.timeout = timeout
+        self.app = None
+        self.lock = threading.Lock()
+        self.started_at = datetime.now().isoformat()
+        self.requests_served = 0
+
+    def _ensure_connected(self):
+        """(Re)connect if the gateway connection is missing or dropped."""
+        if self.app is not None and self.app.isConnected() and self.app._ready.is_set():
+            return
+        if self.app is not None:
+            self.app.disconnect()
+        app = IBKRApp()
+        start_app(app, self.settings, self.timeout)
+        self.app = app
+
+    def handle(self, command, params):
+        if command == "ping":
+            return {
+                "status": "ok",
+                "connected": bool(self.app and self.app.isConnected()),
+                "started_at": self.started_at,
+                "requests_served": self.requests_served,
+                "latency": self.app.latency.summary() if self.app else {},
+                "connection_errors": self.app.connection_errors() if self.app else [],
+            }
+
+        func = MARKET_DATA_COMMANDS.get(command)
+        if func is None:
+            return {"error": f"Unknown command: {command}"}
+
+        params = dict(params)
+        timeout = float(params.pop("timeout", None) or self.timeout)
+
+        with self.lock:
+            try:
+                self._ensure_connected()
+            except RuntimeError as exc:
+                self.app = None
+                return {"error": str(exc)}
+            app = self.app
+
+        try:
+            result = func(app, timeout=timeout, **params)
+        except TypeError as exc:
+            return {"error": f"Invalid parameters for {command}: {exc}"}
+        except Exception as exc:
+            return {"error": str(exc)}
+        with self.lock:
+            self.requests_served += 1
+        return result
+
+    def close(self):
+        if self.app is not None:
+            self.app.disconnect()
+
+
+class GatewayRequestHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        line = self.rfile.readline()
+        if not line:
+            return
+        try:
+            request = json.loads(line.decode("utf-8"))
+            command = request.get("command")
+            params = request.get("params") or {}
+        except (json.JSONDecodeError, AttributeError) as exc:
+            response = {"error": f"Malformed request: {exc}"}
+        else:
+            if command == "shutdown":
+                response = {"status": "stopping"}
+                threading.Thread(target=self.server.shutdown, daemon=True).start()
+            else:
+                response = self.server.gateway.handle(command, params)
+
+        self.wfile.write((json.dumps(response) + "\n").encode("utf-8"))
+
+
+class GatewayServer(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, path, gateway):
+        self.gateway = gateway
+        super().__init__(str(path), GatewayRequestHandler)
+
+
+def serve(args):
+    path = gateway_socket_path()
+    if path.exists():
+        try:
+            gateway_request("ping", timeout=2)
+            print(json.dumps({"error": f"Gateway already running at {path}"}))
+            sys.exit(1)
+        except (GatewayUnavailable, IBKRTimeout, OSError):
+            # Stale socket from a crashed daemon.
+            path.unlink()
+
+    settings = resolve_connection_settings()
+    # Use a separate client id so one-shot order commands can still connect.
+    settings["client_id"] = int(os.getenv("IBKR_GATEWAY_CLIENT_ID", settings["client_id"] + 1))
+
+    gateway = IBKRGateway(settings, args.timeout)
+    try:
+        gateway._ensure_connected()
+    except RuntimeError as exc:
+        print(json.dumps({"error": str(exc)}))
+        sys.exit(1)
+
+    server = GatewayServer(path, gateway)
+    os.chmod(path, 0o600)
+    print(json.dumps({"status": "serving", "socket": str(path), "client_id": settings["client_id"]}), flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        gateway.close()
+        if path.exists():
+            path.unlink()
+
+
+def status(args):
+    try:
+        print(json.dumps(gateway_request("ping", timeout=args.timeout), indent=2))
+    except (GatewayUnavailable, IBKRTimeout) as exc:
+        print(json.dumps({"status": "not_running", "detail": str(exc)}, indent=2))
+        sys.exit(1)
+
+
+def stop(args):
+    try:
+        print(json.dumps(gateway_request("shutdown", timeout=args.timeout), indent=2))
+    except (GatewayUnavailable, IBKRTimeout) as exc:
+        print(json.dumps({"status": "not_running", "detail": str(exc)}, indent=2))
+        sys.exit(1)
+    # Wait briefly for the socket to be removed.
+    path = gateway_socket_path()
+    for _ in range(20):
+        if not path.exists():
+            break
+        time.sleep(0.1)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Persistent IBKR market data gateway.")
+    parser.add_argument("--timeout", type=float, default=10.0, help="Seconds to wait for IBKR responses.")
+
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser("serve", help="Run the gateway in the foreground.").set_defaults(func=serve)
+    subparsers.add_parser("status", help="Check whether the gateway is running.").set_defaults(func=status)
+    subparsers.add_parser("stop", help="Stop a running gateway.").set_defaults(func=stop)
+    return parser
+
+
+def main():
+    args = build_parser().parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -7,6 +7,7 @@ for fetching market data, placing orders, and monitoring positions. It supports:
 
 - Stock quotes and historical data
 - Options quotes with Greeks (IV, delta, gamma, vega, theta)
+- Option chain snapshots (listed expirations/strikes via reqSecDefOptParams)
 - ATM IV discovery for PDUFA scoring
 - Options and stock order placement
 - Position monitoring
@@ -25,9 +26,22 @@ Requirements:
 Usage:
     python ibkr_paper.py quote SPY
     python ibkr_paper.py atm_iv SPY --expiration 2026-02-20
+    python ibkr_paper.py option_chain SPY --expiration 2026-02-20 --strikes 5
     python ibkr_paper.py quote_option SPY --strike 600 --expiration 2026-02-20 --right CALL
+
+Market data commands (quote, resolve, quote_option, option_chain,
+historical, atm_iv, positions, prefill_contracts) are forwarded to the gateway daemon (ibkr_gateway.py) when it is
+running, and open a one-shot connection otherwise.
+
+Market data requests return as soon as their required fields arrive
+(ibkr_requests.py completion predicates) and report latency_ms.
+
+Stock contracts are resolved through the persistent contract cache
+(contract_cache.py), so repeat calls skip the reqContractDetails round trip.
 """
 import argparse
+import collections
+import itertools
 import json
 import os
 import sys
@@ -40,7 +54,18 @@ from ibapi.contract import Contract
 from ibapi.order import Order
 from ibapi.wrapper import EWrapper
 
-from options_utils import determine_strike_increment, round_to_increment
+from contract_cache import ContractCache
+from ibkr_client import GatewayUnavailable, gateway_request
+from ibkr_requests import (
+    ASK_TICKS, BID_TICKS, HIGH_TICKS, LAST_TICKS, LatencyStats, PendingRequest, tick_value, wait_all
+)
+from options_utils import (
+    guess_strikes,
+    merge_option_params,
+    nearest_strikes,
+    select_atm_option,
+    select_expiration,
+)
 
 
 def load_broker_config():
@@ -66,30 +91,102 @@ def resolve_connection_settings():
 # IBKR CLIENT & CALLBACKS
 # ============================================================================
 
+# Error codes that are informational for a request rather than terminal.
+# 2100-2199 are connection/farm warnings; 10090 = partial subscription,
+# 10167 = displaying delayed market data.
+NON_FATAL_ERROR_CODES = {10090, 10167}
+
+# "No security definition has been found" - a cached conId is no longer valid
+UNKNOWN_CONTRACT_CODE = 200
+
+_contract_cache = ContractCache()
+
 
 class IBKRApp(EWrapper, EClient):
     def __init__(self):
         EClient.__init__(self, self)
         self.next_order_id = None
         self._ready = threading.Event()
-        self._order_done = threading.Event()
         self._positions_done = threading.Event()
-        self._mktdata_done = threading.Event()
-        self._contract_details_done = threading.Event()
-        self._historical_done = threading.Event()
+        self._positions_lock = threading.Lock()
         self.order_status = {}
         self.positions = []
-        self.market_data = {}
-        self.contract_details = []
-        self.historical_bars = []
-        self.errors = []
+        self.errors = collections.deque(maxlen=100)  # (monotonic time, entry) without a reqId
+        self._req_ids = itertools.count(1)
+        self._requests = {}
+        self._orders = {}
+        self._registry_lock = threading.Lock()
+        self.latency = LatencyStats()
+
+    def next_request_id(self):
+        """Allocate a reqId unique for the life of this connection."""
+        return next(self._req_ids)
+
+    def start_request(self, kind, requires=None):
+        """
+        Register a new request and return its PendingRequest.
+
+        `requires` names the fields that complete a market data request
+        (ibkr_requests.COMPLETION_PREDICATES).
+        """
+        pending = PendingRequest(self.next_request_id(), kind, requires)
+        with self._registry_lock:
+            self._requests[pending.req_id] = pending
+        return pending
+
+    def finish_request(self, pending):
+        """Stop routing callbacks to a request (cancels streaming market data)."""
+        with self._registry_lock:
+            self._requests.pop(pending.req_id, None)
+        self.latency.record(pending)
+        if pending.kind == "mktdata_stream":
+            self.cancelMktData(pending.req_id)
+
+    def start_order(self, order_id):
+        """Register an order so orderStatus can signal its completion."""
+        pending = PendingRequest(order_id, "order")
+        with self._registry_lock:
+            self._orders[order_id] = pending
+        return pending
+
+    def settle_for(self, requires, timeout):
+        """Adaptive wait after the first tick for requests with `requires`."""
+        return self.latency.settle(requires, timeout)
+
+    def _pending(self, req_id):
+        return self._requests.get(req_id)
+
+    def connection_errors(self, since=None):
+        """Connection-level messages, optionally only those logged at or after `since` (monotonic)."""
+        return [entry for at, entry in list(self.errors) if since is None or at >= since]
+
+    def request_errors(self, *pending_requests):
+        """
+        Errors for the given requests plus connection-level messages logged
+        while they were outstanding (not those of earlier requests or startup).
+        """
+        since = min((pending.started_at for pending in pending_requests), default=None)
+        errors = self.connection_errors(since) if since is not None else []
+        for pending in pending_requests:
+            errors.extend(pending.errors)
+        return errors
 
     def nextValidId(self, orderId):
         self.next_order_id = orderId
         self._ready.set()
 
+    def connectionClosed(self):
+        self._ready.clear()
+
     def error(self, reqId, errorCode, errorString):
-        self.errors.append({"reqId": reqId, "code": errorCode, "message": errorString})
+        entry = {"reqId": reqId, "code": errorCode, "message": errorString}
+        pending = self._pending(reqId) or self._orders.get(reqId)
+        if pending is None:
+            self.errors.append((time.monotonic(), entry))
+            return
+        pending.errors.append(entry)
+        if errorCode not in NON_FATAL_ERROR_CODES and not (2100 <= errorCode < 2200):
+            pending.finish()
 
     def orderStatus(
         self,
@@ -112,8 +209,9 @@ class IBKRApp(EWrapper, EClient):
             "avgFillPrice": avgFillPrice,
             "lastFillPrice": lastFillPrice,
         }
-        if status in {"Filled", "Cancelled", "Inactive"}:
-            self._order_done.set()
+        pending = self._orders.get(orderId)
+        if pending is not None and status in {"Filled", "Cancelled", "Inactive"}:
+            pending.finish()
 
     def position(self, account, contract, position, avgCost):
         self.positions.append(
@@ -131,13 +229,17 @@ class IBKRApp(EWrapper, EClient):
         self._positions_done.set()
 
     def tickPrice(self, reqId, tickType, price, attrib):
-        self.market_data.setdefault(reqId, {})[tickType] = price
-        # Include delayed ticks (66/67/68/72) when using market data type 4.
-        if tickType in {1, 2, 4, 6, 66, 67, 68, 72}:  # bid, ask, last, high
-            self._mktdata_done.set()
+        pending = self._pending(reqId)
+        if pending is None:
+            return
+        pending.ticks[tickType] = price
+        pending.notify()
 
     def tickSize(self, reqId, tickType, size):
-        self.market_data.setdefault(reqId, {})[f"size_{tickType}"] = size
+        pending = self._pending(reqId)
+        if pending is not None:
+            pending.ticks[f"size_{tickType}"] = size
+            pending.notify()
 
     def tickOptionComputation(
         self,
@@ -188,7 +290,10 @@ class IBKRApp(EWrapper, EClient):
 
             return value
 
-        greeks = self.market_data.setdefault(reqId, {}).setdefault("greeks", {})
+        pending = self._pending(reqId)
+        if pending is None:
+            return
+        greeks = pending.ticks.setdefault("greeks", {})
 
         # Clean and validate each Greek with appropriate ranges
         greeks["implied_volatility"] = clean_greek(impliedVol, "IV", (0.05, 5.0))  # 5% to 500% IV
@@ -198,19 +303,49 @@ class IBKRApp(EWrapper, EClient):
         greeks["theta"] = clean_greek(theta, "Theta", (-10.0, 0.0))  # Theta for long: -10 to 0
         greeks["option_price"] = clean_greek(optPrice, "OptPrice", (0.0, 10000.0))  # Option price sanity
         greeks["underlying_price"] = clean_greek(undPrice, "UndPrice", (0.0, 100000.0))  # Stock price sanity
+        pending.notify()
 
     def tickSnapshotEnd(self, reqId):
-        self._mktdata_done.set()
+        pending = self._pending(reqId)
+        if pending is not None:
+            pending.finish()
 
     def contractDetails(self, reqId, contractDetails):
-        self.contract_details.append(contractDetails)
+        pending = self._pending(reqId)
+        if pending is not None:
+            pending.items.append(contractDetails)
 
     def contractDetailsEnd(self, reqId):
-        self._contract_details_done.set()
+        pending = self._pending(reqId)
+        if pending is not None:
+            pending.finish()
+
+    def securityDefinitionOptionParameter(
+        self, reqId, exchange, underlyingConId, tradingClass, multiplier, expirations, strikes
+    ):
+        pending = self._pending(reqId)
+        if pending is not None:
+            pending.items.append(
+                {
+                    "exchange": exchange,
+                    "trading_class": tradingClass,
+                    "multiplier": multiplier,
+                    "expirations": sorted(expirations),
+                    "strikes": sorted(strikes),
+                }
+            )
+
+    def securityDefinitionOptionParameterEnd(self, reqId):
+        pending = self._pending(reqId)
+        if pending is not None:
+            pending.finish()
 
     def historicalData(self, reqId, bar):
         """Callback for historical data bars."""
-        self.historical_bars.append(
+        pending = self._pending(reqId)
+        if pending is None:
+            return
+        pending.items.append(
             {
                 "date": bar.date,
                 "open": bar.open,
@@ -225,7 +360,9 @@ class IBKRApp(EWrapper, EClient):
 
     def historicalDataEnd(self, reqId, start, end):
         """Signal historical data request completion."""
-        self._historical_done.set()
+        pending = self._pending(reqId)
+        if pending is not None:
+            pending.finish()
 
 
 def start_app(app, settings, timeout):
@@ -248,7 +385,7 @@ def _detect_data_type(ticks):
     Delayed ticks: 66 (bid), 67 (ask), 68 (last), 72 (high)
 
     Args:
-        ticks: Dict of tick data from app.market_data[req_id]
+        ticks: Dict of tick data from a PendingRequest
 
     Returns:
         str: "real-time", "delayed", or "unknown"
@@ -278,7 +415,8 @@ def build_stock_contract(symbol):
     return contract
 
 
-def build_option_contract(symbol, expiration, strike, right="CALL", exchange="SMART"):
+def build_option_contract(symbol, expiration, strike, right="CALL", exchange="SMART",
+                          trading_class=None, multiplier="100"):
     """
     Build an option contract object for IBKR API requests.
 
@@ -288,6 +426,8 @@ def build_option_contract(symbol, expiration, strike, right="CALL", exchange="SM
         strike: Strike price as float
         right: "CALL" or "PUT"
         exchange: Trading exchange, default "SMART" for best execution
+        trading_class: Optional trading class from the listed chain
+        multiplier: Contract multiplier (default "100")
 
     Returns:
         ibapi.contract.Contract configured for options
@@ -304,7 +444,9 @@ def build_option_contract(symbol, expiration, strike, right="CALL", exchange="SM
     contract.lastTradeDateOrContractMonth = expiration.replace("-", "")  # Convert YYYY-MM-DD to YYYYMMDD
     contract.strike = float(strike)
     contract.right = right.upper()
-    contract.multiplier = "100"
+    contract.multiplier = multiplier or "100"
+    if trading_class:
+        contract.tradingClass = trading_class
     return contract
 
 
@@ -326,6 +468,86 @@ def build_order(action, quantity, order_type, limit_price, tif, account, overrid
     return order
 
 
+def _select_contract(details_list, fallback):
+    if not details_list:
+        return fallback
+    # Prefer NASDAQ-listed contract when available.
+    for details in details_list:
+        c = details.contract
+        if c.primaryExchange == "NASDAQ" and c.currency == "USD":
+            return c
+    return details_list[0].contract
+
+
+def contract_cache_entry(contract):
+    """Fields of a resolved stock contract kept in the contract cache."""
+    return {
+        "conid": contract.conId,
+        "symbol": contract.symbol,
+        "primary_exchange": contract.primaryExchange,
+        "currency": contract.currency,
+        "local_symbol": contract.localSymbol,
+    }
+
+
+def build_cached_contract(entry):
+    """Rebuild a SMART-routed stock contract from a contract cache entry."""
+    contract = Contract()
+    contract.conId = int(entry["conid"])
+    contract.symbol = entry.get("symbol") or ""
+    contract.secType = "STK"
+    contract.exchange = "SMART"
+    contract.primaryExchange = entry.get("primary_exchange") or ""
+    contract.currency = entry.get("currency") or "USD"
+    contract.localSymbol = entry.get("local_symbol") or ""
+    return contract
+
+
+def resolve_contracts(app, tickers, timeout):
+    """
+    Resolve stock contracts for several tickers concurrently.
+
+    Tickers with a fresh contract cache entry are built from the cache;
+    only the rest are looked up (concurrently) and then cached.
+
+    Returns:
+        Tuple of ({ticker: Contract}, [PendingRequest]) - pending requests
+        are returned so callers can report their errors.
+    """
+    contracts = {
+        ticker: build_cached_contract(entry)
+        for ticker, entry in _contract_cache.get_many(tickers).items()
+    }
+
+    pending_by_ticker = {}
+    for ticker in tickers:
+        if ticker in contracts or ticker in pending_by_ticker:
+            continue
+        pending = app.start_request("contract_details")
+        pending_by_ticker[ticker] = pending
+        app.reqContractDetails(pending.req_id, build_stock_contract(ticker))
+
+    if pending_by_ticker:
+        wait_all(pending_by_ticker.values(), timeout)
+
+    resolved = {}
+    for ticker, pending in pending_by_ticker.items():
+        app.finish_request(pending)
+        contracts[ticker] = _select_contract(pending.items, build_stock_contract(ticker))
+        if pending.items:
+            resolved[ticker] = contract_cache_entry(contracts[ticker])
+    _contract_cache.put_many(resolved)
+    return contracts, list(pending_by_ticker.values())
+
+
+def check_cached_contract(ticker, *pending_requests):
+    """Drop a ticker's cached contract if IBKR rejected its conId."""
+    for pending in pending_requests:
+        if any(err["code"] == UNKNOWN_CONTRACT_CODE for err in pending.errors):
+            _contract_cache.invalidate([ticker])
+            return
+
+
 def resolve_contract(app, ticker, timeout, conid=None):
     if conid is not None:
         contract = Contract()
@@ -333,20 +555,8 @@ def resolve_contract(app, ticker, timeout, conid=None):
         contract.exchange = "SMART"
         return contract
 
-    app.contract_details = []
-    app._contract_details_done.clear()
-    contract = build_stock_contract(ticker)
-    app.reqContractDetails(1, contract)
-    app._contract_details_done.wait(timeout)
-    if not app.contract_details:
-        return contract
-
-    # Prefer NASDAQ-listed contract when available.
-    for details in app.contract_details:
-        c = details.contract
-        if c.primaryExchange == "NASDAQ" and c.currency == "USD":
-            return c
-    return app.contract_details[0].contract
+    contracts, _ = resolve_contracts(app, [ticker], timeout)
+    return contracts[ticker]
 
 
 # ============================================================================
@@ -371,9 +581,10 @@ def place_order(args):
     )
 
     order_id = app.next_order_id
+    pending = app.start_order(order_id)
     app.placeOrder(order_id, contract, order)
 
-    app._order_done.wait(args.timeout)
+    pending.wait(args.timeout)
     app.disconnect()
 
     result = {
@@ -385,19 +596,13 @@ def place_order(args):
         "limit": args.limit,
         "tif": args.tif,
         "status": app.order_status.get(order_id, {}),
-        "errors": app.errors,
+        "errors": app.request_errors(pending),
     }
     print(json.dumps(result, indent=2))
 
 
 def list_positions(args):
-    settings = resolve_connection_settings()
-    app = IBKRApp()
-    start_app(app, settings, args.timeout)
-    app.reqPositions()
-    app._positions_done.wait(args.timeout)
-    app.disconnect()
-    print(json.dumps({"positions": app.positions, "errors": app.errors}, indent=2))
+    run_market_data_command(args)
 
 
 def close_position(args):
@@ -421,7 +626,7 @@ def close_position(args):
                     "ticker": args.ticker,
                     "error": "No open position found for ticker.",
                     "positions_checked": app.positions,
-                    "errors": app.errors,
+                    "errors": app.connection_errors(),
                 },
                 indent=2,
             )
@@ -442,8 +647,9 @@ def close_position(args):
     )
 
     order_id = app.next_order_id
+    pending = app.start_order(order_id)
     app.placeOrder(order_id, contract, order)
-    app._order_done.wait(args.timeout)
+    pending.wait(args.timeout)
     app.disconnect()
 
     result = {
@@ -455,7 +661,7 @@ def close_position(args):
         "limit": args.limit,
         "tif": args.tif,
         "status": app.order_status.get(order_id, {}),
-        "errors": app.errors,
+        "errors": app.request_errors(pending),
     }
     print(json.dumps(result, indent=2))
 
@@ -486,9 +692,10 @@ def place_options_order(args):
     )
 
     order_id = app.next_order_id
+    pending = app.start_order(order_id)
     app.placeOrder(order_id, contract, order)
 
-    app._order_done.wait(args.timeout)
+    pending.wait(args.timeout)
     app.disconnect()
 
     result = {
@@ -503,7 +710,7 @@ def place_options_order(args):
         "limit": args.limit,
         "tif": args.tif,
         "status": app.order_status.get(order_id, {}),
-        "errors": app.errors,
+        "errors": app.request_errors(pending),
     }
     print(json.dumps(result, indent=2))
 
@@ -511,50 +718,96 @@ def place_options_order(args):
 # ============================================================================
 # MARKET DATA REQUESTS
 # ============================================================================
+#
+# Each request_* function runs against an already-connected IBKRApp and
+# returns a result dict, so the same logic serves one-shot CLI calls and the
+# long-lived gateway daemon (ibkr_gateway.py). Failures are reported with an
+# "error" key rather than by exiting.
 
 
-def quote(args):
-    settings = resolve_connection_settings()
-    app = IBKRApp()
-    start_app(app, settings, args.timeout)
-    contract = resolve_contract(app, args.ticker, args.timeout, args.conid)
-    req_id = 1
+def _quote_fields(ticks):
+    """Extract bid/ask/last/high from real-time or delayed ticks (None where there is no quote)."""
+    return {
+        "bid": tick_value(ticks, BID_TICKS),
+        "ask": tick_value(ticks, ASK_TICKS),
+        "last": tick_value(ticks, LAST_TICKS),
+        "high": tick_value(ticks, HIGH_TICKS),
+    }
+
+
+def request_quotes(app, tickers, timeout):
+    """
+    Fetch stock snapshots for a whole watchlist in one bounded wait.
+
+    Contract lookups and snapshot requests for all tickers are in flight
+    together on the connection, so the total wait is one timeout per
+    phase rather than one per ticker. Each snapshot completes once bid,
+    ask and last are in.
+    """
+    contracts, lookups = resolve_contracts(app, tickers, timeout)
+
     # Request delayed market data when live subscriptions aren't available.
     app.reqMarketDataType(4)
-    app.reqMktData(req_id, contract, "", True, False, [])
-    app._mktdata_done.wait(args.timeout)
-    app.disconnect()
+    pending_by_ticker = {}
+    for ticker in tickers:
+        pending = app.start_request("mktdata_snapshot", requires="stock_quote")
+        pending_by_ticker[ticker] = pending
+        app.reqMktData(pending.req_id, contracts[ticker], "", True, False, [])
+
+    wait_all(pending_by_ticker.values(), timeout, app.settle_for("stock_quote", timeout))
+
+    quotes = {}
+    for ticker, pending in pending_by_ticker.items():
+        app.finish_request(pending)
+        check_cached_contract(ticker, pending)
+        contract = contracts[ticker]
+        quotes[ticker] = {
+            "ticker": ticker,
+            "conid": getattr(contract, "conId", None) or None,
+            **_quote_fields(pending.ticks),
+            "complete": pending.complete,
+            "latency_ms": pending.latency_ms(),
+            "errors": list(pending.errors),
+        }
 
-    ticks = app.market_data.get(req_id, {})
-    bid = ticks.get(1) or ticks.get(66)
-    ask = ticks.get(2) or ticks.get(67)
-    last = ticks.get(4) or ticks.get(68)
-    high = ticks.get(6) or ticks.get(72)
-    result = {
-        "ticker": args.ticker,
+    return {
+        "quotes": quotes,
+        "errors": app.request_errors(*lookups, *pending_by_ticker.values()),
+    }
+
+
+def request_quote(app, ticker, timeout, conid=None):
+    """Fetch a stock market data snapshot (returns once bid, ask and last are in)."""
+    contract = resolve_contract(app, ticker, timeout, conid)
+    pending = app.start_request("mktdata_snapshot", requires="stock_quote")
+    # Request delayed market data when live subscriptions aren't available.
+    app.reqMarketDataType(4)
+    app.reqMktData(pending.req_id, contract, "", True, False, [])
+    pending.wait(timeout, app.settle_for("stock_quote", timeout))
+    app.finish_request(pending)
+    check_cached_contract(ticker, pending)
+
+    return {
+        "ticker": ticker,
         "conid": getattr(contract, "conId", None) or None,
-        "bid": bid,
-        "ask": ask,
-        "last": last,
-        "high": high,
-        "errors": app.errors,
+        **_quote_fields(pending.ticks),
+        "complete": pending.complete,
+        "latency_ms": pending.latency_ms(),
+        "errors": app.request_errors(pending),
     }
-    print(json.dumps(result, indent=2))
 
 
-def resolve_contract_details(args):
-    settings = resolve_connection_settings()
-    app = IBKRApp()
-    start_app(app, settings, args.timeout)
-    app.contract_details = []
-    app._contract_details_done.clear()
-    contract = build_stock_contract(args.ticker)
-    app.reqContractDetails(1, contract)
-    app._contract_details_done.wait(args.timeout)
-    app.disconnect()
+def request_contract_details(app, ticker, timeout):
+    """Resolve all contract details for a stock ticker (refreshes its contract cache entry)."""
+    pending = app.start_request("contract_details")
+    app.reqContractDetails(pending.req_id, build_stock_contract(ticker))
+    pending.wait(timeout)
+    app.finish_request(pending)
+    if pending.items:
+        _contract_cache.put(ticker, contract_cache_entry(_select_contract(pending.items, None)))
 
     details = []
-    for item in app.contract_details:
+    for item in pending.items:
         c = item.contract
         details.append(
             {
@@ -568,32 +821,102 @@ def resolve_contract_details(args):
             }
         )
 
-    print(json.dumps({"ticker": args.ticker, "contracts": details, "errors": app.errors}, indent=2))
+    return {"ticker": ticker, "contracts": details, "errors": app.request_errors(pending)}
 
 
-def quote_option(args):
+def request_prefill_contracts(app, tickers, timeout):
+    """
+    Resolve and cache contracts for tickers not already in the contract cache.
+
+    Lookups for all missing tickers run concurrently in one bounded wait.
+
+    Returns:
+        Dict with cached (already fresh), resolved ({ticker: conid}),
+        failed (no contract details returned) and errors
+    """
+    tickers = list(dict.fromkeys(ticker.upper() for ticker in tickers))
+    missing = _contract_cache.missing(tickers)
+    lookups = []
+    if missing:
+        _, lookups = resolve_contracts(app, missing, timeout)
+    cached = _contract_cache.get_many(missing)
+
+    return {
+        "cached": [ticker for ticker in tickers if ticker not in missing],
+        "resolved": {ticker: entry["conid"] for ticker, entry in cached.items()},
+        "failed": [ticker for ticker in missing if ticker not in cached],
+        "errors": app.request_errors(*lookups),
+    }
+
+
+def _start_option_request(app, ticker, expiration, strike, right, trading_class=None, multiplier=None):
+    """Start a streaming Greeks request (generic tick 106), complete once quote and Greeks are in."""
+    pending = app.start_request("mktdata_stream", requires="option_quote")
+    contract = build_option_contract(
+        ticker, expiration, strike, right, trading_class=trading_class, multiplier=multiplier
+    )
+    # Request Greeks via generic tick 106 (IV, delta, gamma, vega, theta)
+    app.reqMktData(pending.req_id, contract, "106", False, False, [])
+    return pending
+
+
+def _option_fields(ticks):
+    """Pricing, liquidity and Greeks for one option from its ticks."""
+    greeks = ticks.get("greeks", {})
+    quote_fields = _quote_fields(ticks)
+    bid = quote_fields["bid"]
+    ask = quote_fields["ask"]
+    return {
+        "bid": bid,
+        "ask": ask,
+        "last": quote_fields["last"],
+        "mid_price": ((bid + ask) / 2) if (bid is not None and ask is not None) else None,
+        "volume": ticks.get("size_8"),  # Size tick type 8 = volume
+        "open_interest": ticks.get("size_86"),  # Size tick type 86 = OI
+        "delta": greeks.get("delta"),
+        "theta": greeks.get("theta"),
+        "gamma": greeks.get("gamma"),
+        "vega": greeks.get("vega"),
+        "implied_volatility": greeks.get("implied_volatility"),
+        "underlying_price": greeks.get("underlying_price"),
+    }
+
+
+def _warn_if_delayed(ticker, data_type):
+    if data_type == "delayed":
+        print(
+            f"WARNING: Using delayed data for {ticker} options (OPRA subscription may be inactive)",
+            file=sys.stderr
+        )
+
+
+def request_option_quote(app, ticker, strike, expiration, right, timeout):
     """
     Fetch single option quote with Greeks and pricing.
 
     Requests streaming market data for a specific option contract,
     waiting for Greeks (IV, delta, gamma, vega, theta) via generic
-    tick "106" and pricing via standard ticks (bid/ask/last).
+    tick "106" and pricing via standard ticks (bid/ask/last). Returns as
+    soon as bid, ask, IV and delta are in, or a settle window after the
+    first tick if some never arrive.
 
     Args:
-        args: argparse.Namespace with:
-            - ticker: Stock symbol
-            - expiration: Option expiration (YYYY-MM-DD)
-            - strike: Strike price
-            - right: "CALL" or "PUT"
-            - timeout: Request timeout in seconds
+        app: Connected IBKRApp
+        ticker: Stock symbol
+        strike: Strike price
+        expiration: Option expiration (YYYY-MM-DD)
+        right: "CALL" or "PUT"
+        timeout: Request timeout in seconds
 
     Returns:
-        Prints JSON to stdout with:
+        Dict with:
         - Pricing: bid, ask, last, mid_price
         - Liquidity: volume (tick 8), open_interest (tick 86)
         - Greeks: delta, gamma, vega, theta, implied_volatility
         - underlying_price: From Greeks computation
         - data_type: "real-time", "delayed", or "unknown"
+        - complete: Whether quote and Greeks all arrived
+        - latency_ms: first_tick / complete milliseconds
         - source: "IBKR Paper"
         - errors: List of IBKR error messages
 
@@ -601,81 +924,174 @@ def quote_option(args):
         - OPRA subscription for real-time Greeks
         - Streaming mode (snapshot=False) required for generic ticks
     """
-    settings = resolve_connection_settings()
-    app = IBKRApp()
-    start_app(app, settings, args.timeout)
-
-    contract = build_option_contract(
-        args.ticker,
-        args.expiration,
-        args.strike,
-        args.right
-    )
-
-    req_id = 1
     # Request delayed market data when live subscriptions aren't available
     app.reqMarketDataType(4)
-    # Request Greeks via generic tick 106 (IV, delta, gamma, vega, theta)
-    app.reqMktData(req_id, contract, "106", False, False, [])
-    app._mktdata_done.wait(args.timeout)
-    app.disconnect()
-
-    ticks = app.market_data.get(req_id, {})
-    greeks = ticks.get("greeks", {})
+    pending = _start_option_request(app, ticker, expiration, strike, right)
+    pending.wait(timeout, app.settle_for("option_quote", timeout))
+    app.finish_request(pending)
 
     # Detect if we're getting real-time or delayed data
-    data_type = _detect_data_type(ticks)
-    if data_type == "delayed":
-        print(
-            f"WARNING: Using delayed data for {args.ticker} options (OPRA subscription may be inactive)",
-            file=sys.stderr
-        )
+    data_type = _detect_data_type(pending.ticks)
+    _warn_if_delayed(ticker, data_type)
 
-    bid = ticks.get(1) or ticks.get(66)  # Real-time or delayed bid
-    ask = ticks.get(2) or ticks.get(67)  # Real-time or delayed ask
-    last = ticks.get(4) or ticks.get(68)  # Real-time or delayed last
-    mid_price = ((bid + ask) / 2) if (bid and ask) else None
-
-    result = {
-        "ticker": args.ticker,
-        "strike": args.strike,
-        "expiration": args.expiration,
-        "right": args.right,
-        "bid": bid,
-        "ask": ask,
-        "last": last,
-        "mid_price": mid_price,
-        "volume": ticks.get("size_8"),  # Size tick type 8 = volume
-        "open_interest": ticks.get("size_86"),  # Size tick type 86 = OI
-        "delta": greeks.get("delta"),
-        "theta": greeks.get("theta"),
-        "gamma": greeks.get("gamma"),
-        "vega": greeks.get("vega"),
-        "implied_volatility": greeks.get("implied_volatility"),
-        "underlying_price": greeks.get("underlying_price"),
+    return {
+        "ticker": ticker,
+        "strike": strike,
+        "expiration": expiration,
+        "right": right,
+        **_option_fields(pending.ticks),
         "data_type": data_type,
+        "complete": pending.complete,
+        "latency_ms": pending.latency_ms(),
         "source": "IBKR Paper",
-        "errors": app.errors,
+        "errors": app.request_errors(pending),
     }
-    print(json.dumps(result, indent=2))
 
 
-def fetch_historical(args):
-    """Fetch historical daily bars for a ticker."""
-    settings = resolve_connection_settings()
-    app = IBKRApp()
-    start_app(app, settings, args.timeout)
+def _underlying_price(ticks, underlying_price=None):
+    """Last trade, else bid/ask midpoint, else the caller's override."""
+    quote_fields = _quote_fields(ticks)
+    last = quote_fields["last"]
+    bid = quote_fields["bid"]
+    ask = quote_fields["ask"]
+    spot = last or ((bid + ask) / 2 if (bid and ask) else None)
+    if spot is None and underlying_price is not None:
+        spot = float(underlying_price)
+    return spot
 
-    contract = resolve_contract(app, args.ticker, args.timeout, args.conid)
 
-    app.historical_bars = []
-    app._historical_done.clear()
+def request_option_chain(app, ticker, timeout, expiration=None, strikes=5, right="CALL",
+                         underlying_price=None, conid=None):
+    """
+    Fetch a slice of the listed option chain around the underlying price.
+
+    Algorithm:
+    1. Resolve the underlying contract
+    2. Request the chain definition (reqSecDefOptParams) and an underlying
+       price snapshot concurrently
+    3. Pick the listed expiration (the requested one, else the next listed)
+       and the `strikes` listed strikes on each side of the price
+    4. Request Greeks (generic tick 106) for every option in the window
+       concurrently, against one deadline
+
+    Falls back to price-based strike increments when IBKR returns no chain
+    definition.
+
+    Args:
+        app: Connected IBKRApp
+        ticker: Stock symbol
+        timeout: Per-phase timeout in seconds
+        expiration: Target expiration (YYYY-MM-DD); default nearest listed
+        strikes: Listed strikes to include on each side of the price
+        right: "CALL", "PUT" or "BOTH"
+        underlying_price: Optional fallback underlying price
+        conid: Optional contract ID override
+
+    Returns:
+        Dict with:
+        - underlying_price, expiration (listed), expirations (all listed)
+        - strikes_listed: Number of listed strikes
+        - strike_source: "chain" or "increment" (fallback)
+        - options: One row per (strike, right), sorted by strike, with the
+          quote_option fields
+        - data_type, source, errors
+    """
+    ticker = ticker.upper()
+    contract = resolve_contract(app, ticker, timeout, conid)
+    underlying_conid = getattr(contract, "conId", 0) or 0
+
+    app.reqMarketDataType(4)
+    underlying = app.start_request("mktdata_snapshot", requires="underlying_price")
+    app.reqMktData(underlying.req_id, contract, "", True, False, [])
+    lookups = [underlying]
+
+    secdef = None
+    if underlying_conid:
+        secdef = app.start_request("secdef_opt_params")
+        app.reqSecDefOptParams(secdef.req_id, ticker, "", "STK", underlying_conid)
+        lookups.append(secdef)
+
+    wait_all(lookups, timeout, app.settle_for("underlying_price", timeout))
+    for pending in lookups:
+        app.finish_request(pending)
+    check_cached_contract(ticker, *lookups)
+
+    spot = _underlying_price(underlying.ticks, underlying_price)
+    if spot is None:
+        return {"error": "Missing underlying price", "errors": app.request_errors(*lookups)}
+
+    chain = merge_option_params(secdef.items if secdef else [], ticker)
+    if chain and chain["strikes"]:
+        expirations = chain["expirations"]
+        selected_expiration = select_expiration(expirations, expiration)
+        window = nearest_strikes(chain["strikes"], spot, strikes)
+        strike_source = "chain"
+    else:
+        if expiration is None:
+            return {"error": "No option chain definition and no expiration given",
+                    "errors": app.request_errors(*lookups)}
+        chain = {"strikes": [], "trading_class": None, "multiplier": None}
+        expirations = []
+        selected_expiration = expiration
+        window = guess_strikes(spot, strikes)
+        strike_source = "increment"
+
+    rights = ["CALL", "PUT"] if right == "BOTH" else [right]
+    option_requests = [
+        (
+            strike,
+            option_right,
+            _start_option_request(
+                app, ticker, selected_expiration, strike, option_right,
+                trading_class=chain["trading_class"], multiplier=chain["multiplier"],
+            ),
+        )
+        for strike in window
+        for option_right in rights
+    ]
+    wait_all([pending for _, _, pending in option_requests], timeout, app.settle_for("option_quote", timeout))
+    for _, _, pending in option_requests:
+        app.finish_request(pending)
+
+    options = []
+    data_type = "unknown"
+    for strike, option_right, pending in option_requests:
+        row_type = _detect_data_type(pending.ticks)
+        if data_type == "unknown":
+            data_type = row_type
+        options.append(
+            {"strike": strike, "right": option_right, **_option_fields(pending.ticks), "data_type": row_type,
+             "complete": pending.complete, "latency_ms": pending.latency_ms()}
+        )
+    _warn_if_delayed(ticker, data_type)
+
+    return {
+        "ticker": ticker,
+        "underlying_price": spot,
+        "expiration": selected_expiration,
+        "requested_expiration": expiration,
+        "expirations": expirations,
+        "strikes_listed": len(chain["strikes"]),
+        "strike_source": strike_source,
+        "trading_class": chain["trading_class"],
+        "multiplier": chain["multiplier"],
+        "options": options,
+        "data_type": data_type,
+        "source": "IBKR Paper",
+        "errors": app.request_errors(*lookups, *[pending for _, _, pending in option_requests]),
+    }
 
+
+def request_historical(app, ticker, days, timeout, conid=None):
+    """Fetch historical daily bars for a ticker."""
+    contract = resolve_contract(app, ticker, timeout, conid)
+
+    pending = app.start_request("historical")
     app.reqHistoricalData(
-        1,
+        pending.req_id,
         contract,
         "",
-        f"{args.days} D",
+        f"{days} D",
         "1 day",
         "TRADES",
         1,
@@ -684,54 +1100,57 @@ def fetch_historical(args):
         [],
     )
 
-    if not app._historical_done.wait(args.timeout):
-        app.disconnect()
-        print(json.dumps({"error": "IBKR historical data timeout", "errors": app.errors}))
-        sys.exit(1)
-
-    app.disconnect()
+    completed = pending.wait(timeout)
+    app.finish_request(pending)
+    check_cached_contract(ticker, pending)
+    if not completed:
+        return {"error": "IBKR historical data timeout", "errors": app.request_errors(pending)}
 
-    result = {
-        "ticker": args.ticker,
-        "bars": app.historical_bars,
-        "count": len(app.historical_bars),
+    return {
+        "ticker": ticker,
+        "bars": pending.items,
+        "count": len(pending.items),
         "source": "IBKR Paper",
-        "errors": app.errors,
+        "errors": app.request_errors(pending),
     }
-    print(json.dumps(result, indent=2))
 
 
-def fetch_atm_iv(args):
+# Listed strikes on each side of the price checked for the ATM call
+ATM_STRIKE_WINDOW = 3
+
+
+def request_atm_iv(app, ticker, expiration, timeout, underlying_price=None, conid=None):
     """
     Fetch implied volatility from the nearest ATM call option.
 
     Algorithm:
-    1. Fetch underlying price snapshot
-    2. Calculate candidate strikes (base ± 1,2,3 increments)
-    3. Loop through strikes requesting Greeks (generic tick 106)
-    4. Select first strike with delta in [0.40, 0.60] (ATM range)
-    5. Fallback to closest strike if no ATM found
+    1. Fetch the listed chain slice around the underlying price
+       (request_option_chain: 3 listed strikes each side, calls only)
+    2. Select the strike nearest the price with delta in [0.40, 0.60]
+       (ATM range)
+    3. Fallback to the nearest strike with IV if no ATM found
 
-    Strike increments are based on underlying price:
-    - Price < $50: $2.50 increments
-    - Price $50-$200: $5.00 increments
-    - Price > $200: $10.00 increments
+    The expiration is the requested one when listed, otherwise the next
+    listed expiration; strikes are the real listed strikes (price-based
+    increments only when the chain definition is unavailable).
 
     Args:
-        args: argparse.Namespace with:
-            - ticker: Stock symbol (e.g., "SPY")
-            - expiration: Option expiration date (YYYY-MM-DD)
-            - underlying_price: Optional override for underlying price
-            - timeout: Request timeout in seconds
-            - conid: Optional contract ID override
+        app: Connected IBKRApp
+        ticker: Stock symbol (e.g., "SPY")
+        expiration: Option expiration date (YYYY-MM-DD)
+        timeout: Request timeout in seconds
+        underlying_price: Optional override for underlying price
+        conid: Optional contract ID override
 
     Returns:
-        Prints JSON to stdout with:
+        Dict with:
         - implied_volatility: IV as decimal (e.g., 0.25 = 25%)
         - delta: Call delta (0.0-1.0)
         - strike: Selected strike price
+        - expiration: Listed expiration used
         - underlying_price: Current stock price
         - is_atm: Boolean, True if delta in [0.40, 0.60]
+        - strike_source: "chain" or "increment"
         - data_type: "real-time", "delayed", or "unknown"
         - source: "IBKR Paper"
         - errors: List of IBKR error messages
@@ -741,111 +1160,168 @@ def fetch_atm_iv(args):
         - Cannot use snapshot mode with generic tick "106"
         - Requires streaming data (snapshot=False)
     """
-    settings = resolve_connection_settings()
-    app = IBKRApp()
-    start_app(app, settings, args.timeout)
+    chain = request_option_chain(
+        app, ticker, timeout, expiration=expiration, strikes=ATM_STRIKE_WINDOW,
+        right="CALL", underlying_price=underlying_price, conid=conid,
+    )
+    if "error" in chain:
+        return chain
 
-    contract = resolve_contract(app, args.ticker, args.timeout, args.conid)
+    spot = chain["underlying_price"]
+    selected = select_atm_option(chain["options"], spot)
+    if selected is None:
+        return {"error": "No options data available", "errors": chain["errors"]}
 
-    # Fetch underlying price snapshot
-    app._mktdata_done.clear()
-    req_id = 1
-    app.reqMarketDataType(4)
-    app.reqMktData(req_id, contract, "", True, False, [])
-    app._mktdata_done.wait(args.timeout)
-
-    ticks = app.market_data.get(req_id, {})
-    last = ticks.get(4) or ticks.get(68)
-    bid = ticks.get(1) or ticks.get(66)
-    ask = ticks.get(2) or ticks.get(67)
-    underlying_price = last or ((bid + ask) / 2 if (bid and ask) else None)
-    if underlying_price is None and args.underlying_price is not None:
-        underlying_price = float(args.underlying_price)
-
-    if underlying_price is None:
-        app.disconnect()
-        print(json.dumps({"error": "Missing underlying price", "errors": app.errors}))
-        sys.exit(1)
+    delta = selected["delta"]
+    is_atm = delta is not None and 0.40 <= delta <= 0.60
+    if not is_atm:
+        print(
+            f"WARNING: Delta {delta} outside ATM range for {ticker}",
+            file=sys.stderr,
+        )
 
-    increment = determine_strike_increment(underlying_price)
-    base_strike = round_to_increment(underlying_price, increment)
+    return {
+        "ticker": chain["ticker"],
+        "strike": selected["strike"],
+        "expiration": chain["expiration"],
+        "right": "CALL",
+        "delta": delta,
+        "implied_volatility": selected["implied_volatility"],
+        "underlying_price": spot,
+        "is_atm": is_atm,
+        "strike_source": chain["strike_source"],
+        "data_type": selected["data_type"],
+        "source": "IBKR Paper",
+        "errors": chain["errors"],
+    }
 
-    candidate_strikes = [base_strike]
-    max_steps = 3
-    for offset in range(1, max_steps + 1):
-        candidate_strikes.append(round(base_strike + offset * increment, 2))
-        candidate_strikes.append(round(base_strike - offset * increment, 2))
 
-    candidate_strikes = [strike for strike in candidate_strikes if strike > 0]
+def subscribe_market_data(app, contract, on_update, generic_ticks=""):
+    """
+    Start a streaming market data subscription.
 
-    selected = None
-    selected_strike = None
-    selected_delta = None
-    selected_iv = None
+    `on_update(pending)` runs on the reader thread after every price or
+    Greeks tick; pending.ticks holds the latest values. Cancel with
+    app.finish_request(pending).
+    """
+    pending = app.start_request("mktdata_stream")
+    pending.on_update = on_update
+    app.reqMktData(pending.req_id, contract, generic_ticks, False, False, [])
+    return pending
+
+
+def request_positions(app, timeout):
+    """List open positions (reqPositions has no reqId, so calls are serialized)."""
+    with app._positions_lock:
+        started_at = time.monotonic()
+        app.positions = []
+        app._positions_done.clear()
+        app.reqPositions()
+        app._positions_done.wait(timeout)
+        return {"positions": list(app.positions), "errors": app.connection_errors(since=started_at)}
+
+
+# Commands the gateway daemon can serve on its shared connection.
+# Parameters mirror the CLI arguments of the same-named subcommands.
+MARKET_DATA_COMMANDS = {
+    "quote": request_quote,
+    "quotes": request_quotes,
+    "resolve": request_contract_details,
+    "quote_option": request_option_quote,
+    "option_chain": request_option_chain,
+    "historical": request_historical,
+    "atm_iv": request_atm_iv,
+    "positions": request_positions,
+    "prefill_contracts": request_prefill_contracts,
+}
+
+
+def run_market_data_command(args, **params):
+    """
+    Run a market data command for the CLI and print its JSON result.
 
-    for strike in candidate_strikes:
-        req_id += 1
-        app._mktdata_done.clear()
-        option_contract = build_option_contract(
-            args.ticker,
-            args.expiration,
-            strike,
-            "CALL",
+    Forwards to the gateway daemon when it is running, otherwise opens a
+    one-shot connection for this call.
+    """
+    result = None
+    try:
+        # Multi-step commands (atm_iv, option_chain) make several waits of args.timeout each.
+        result = gateway_request(
+            args.command,
+            dict(params, timeout=args.timeout),
+            timeout=args.timeout * 10,
         )
-        app.reqMarketDataType(4)
-        app.reqMktData(req_id, option_contract, "106", False, False, [])
-        app._mktdata_done.wait(args.timeout)
+    except GatewayUnavailable:
+        pass
+
+    if result is None:
+        settings = resolve_connection_settings()
+        app = IBKRApp()
+        start_app(app, settings, args.timeout)
+        try:
+            result = MARKET_DATA_COMMANDS[args.command](app, timeout=args.timeout, **params)
+        finally:
+            app.disconnect()
 
-        option_ticks = app.market_data.get(req_id, {})
-        greeks = option_ticks.get("greeks", {})
-        implied_vol = greeks.get("implied_volatility")
-        delta = greeks.get("delta")
+    print(json.dumps(result, indent=2))
+    if "error" in result:
+        sys.exit(1)
 
-        if implied_vol is None:
-            continue
 
-        selected = option_ticks
-        selected_strike = strike
-        selected_delta = delta
-        selected_iv = implied_vol
+def quote(args):
+    run_market_data_command(args, ticker=args.ticker, conid=args.conid)
 
-        if delta is not None and 0.40 <= delta <= 0.60:
-            break
 
-    app.disconnect()
+def quotes(args):
+    run_market_data_command(args, tickers=[ticker.upper() for ticker in args.tickers])
 
-    if selected is None:
-        print(json.dumps({"error": "No options data available", "errors": app.errors}))
-        sys.exit(1)
 
-    if selected_delta is None or not (0.40 <= selected_delta <= 0.60):
-        print(
-            f"WARNING: Delta {selected_delta} outside ATM range for {args.ticker}",
-            file=sys.stderr,
-        )
+def resolve_contract_details(args):
+    run_market_data_command(args, ticker=args.ticker)
 
-    # Detect if we're getting real-time or delayed data
-    data_type = _detect_data_type(selected)
-    if data_type == "delayed":
-        print(
-            f"WARNING: Using delayed data for {args.ticker} options (OPRA subscription may be inactive)",
-            file=sys.stderr
-        )
 
-    result = {
-        "ticker": args.ticker,
-        "strike": selected_strike,
-        "expiration": args.expiration,
-        "right": "CALL",
-        "delta": selected_delta,
-        "implied_volatility": selected_iv,
-        "underlying_price": underlying_price,
-        "is_atm": selected_delta is not None and 0.40 <= selected_delta <= 0.60,
-        "data_type": data_type,
-        "source": "IBKR Paper",
-        "errors": app.errors,
-    }
-    print(json.dumps(result, indent=2))
+def prefill_contracts(args):
+    run_market_data_command(args, tickers=[ticker.upper() for ticker in args.tickers])
+
+
+def quote_option(args):
+    """Fetch single option quote with Greeks (see request_option_quote)."""
+    run_market_data_command(
+        args,
+        ticker=args.ticker,
+        strike=args.strike,
+        expiration=args.expiration,
+        right=args.right,
+    )
+
+
+def option_chain(args):
+    """Fetch a listed option chain slice with Greeks (see request_option_chain)."""
+    run_market_data_command(
+        args,
+        ticker=args.ticker,
+        expiration=args.expiration,
+        strikes=args.strikes,
+        right=args.right,
+        underlying_price=args.underlying_price,
+        conid=args.conid,
+    )
+
+
+def fetch_historical(args):
+    """Fetch historical daily bars for a ticker."""
+    run_market_data_command(args, ticker=args.ticker, days=args.days, conid=args.conid)
+
+
+def fetch_atm_iv(args):
+    """Fetch implied volatility from the nearest ATM call (see request_atm_iv)."""
+    run_market_data_command(
+        args,
+        ticker=args.ticker,
+        expiration=args.expiration,
+        underlying_price=args.underlying_price,
+        conid=args.conid,
+    )
 
 
 # ============================================================================
@@ -898,10 +1374,18 @@ def build_parser():
     quote_cmd.add_argument("--conid", type=int, default=None, help="Override contract conId.")
     quote_cmd.set_defaults(func=quote)
 
+    quotes_cmd = subparsers.add_parser("quotes", help="Fetch snapshots for several tickers at once.")
+    quotes_cmd.add_argument("tickers", nargs="+", help="Ticker symbols, e.g. SRPT LULU")
+    quotes_cmd.set_defaults(func=quotes)
+
     resolve_cmd = subparsers.add_parser("resolve", help="Resolve contract details.")
     resolve_cmd.add_argument("ticker", help="Ticker symbol, e.g. SRPT")
     resolve_cmd.set_defaults(func=resolve_contract_details)
 
+    prefill_cmd = subparsers.add_parser("prefill_contracts", help="Resolve and cache contracts for tickers.")
+    prefill_cmd.add_argument("tickers", nargs="+", help="Ticker symbols, e.g. SRPT LULU")
+    prefill_cmd.set_defaults(func=prefill_contracts)
+
     quote_opt = subparsers.add_parser("quote_option", help="Fetch option quote with Greeks.")
     quote_opt.add_argument("ticker", help="Underlying ticker symbol, e.g. SRPT")
     quote_opt.add_argument("--strike", type=float, required=True, help="Strike price")
@@ -926,6 +1410,15 @@ def build_parser():
     )
     place_opt.set_defaults(func=place_options_order)
 
+    chain_cmd = subparsers.add_parser("option_chain", help="Fetch listed option chain slice with Greeks.")
+    chain_cmd.add_argument("ticker", help="Underlying ticker symbol, e.g. SPY")
+    chain_cmd.add_argument("--expiration", default=None, help="Target expiration (YYYY-MM-DD); default nearest listed")
+    chain_cmd.add_argument("--strikes", type=int, default=5, help="Listed strikes on each side of the price.")
+    chain_cmd.add_argument("--right", choices=["CALL", "PUT", "BOTH"], default="CALL", help="Option right")
+    chain_cmd.add_argument("--underlying-price", type=float, default=None, help="Fallback underlying price.")
+    chain_cmd.add_argument("--conid", type=int, default=None, help="Override contract conId.")
+    chain_cmd.set_defaults(func=option_chain)
+
     historical_cmd = subparsers.add_parser("historical", help="Fetch historical daily bars.")
     historical_cmd.add_argument("ticker", help="Ticker symbol, e.g. SPY")
     historical_cmd.add_argument("--days", type=int, default=210, help="Calendar days of history to request.")
@@ -0,0 +1,227 @@
+"""
+IBKR Requests Module
+
+Request futures, completion predicates and latency tracking for
+ibkr_paper.py.
+
+Market data requests finish when their required fields are present
+instead of on the first tick or after the full timeout:
+- stock_quote: bid, ask and last
+- underlying_price: last, or bid and ask
+- option_quote: bid, ask, implied volatility and delta
+
+tickSnapshotEnd, terminal errors and the *End callbacks still finish a
+request. Fields that never arrive (no last trade for an illiquid name,
+Greeks missing outside hours) are bounded by a settle window: once the
+first tick has arrived, a request waits at most `settle` more seconds for
+the rest. The settle window adapts to the connection: twice the recent
+90th percentile first-tick-to-complete time per requirement, so the
+long-lived gateway tightens it as it observes fills.
+
+Every request records when its first tick arrived and when it completed;
+results report both as latency_ms, and the gateway's ping reports the
+rolling summary.
+
+This module only depends on the standard library so it can be imported
+without ibapi installed.
+"""
+
+import collections
+import threading
+import time
+from typing import Dict, Optional
+
+
+# Real-time / delayed tick ids (bid, ask, last, high)
+BID_TICKS = (1, 66)
+ASK_TICKS = (2, 67)
+LAST_TICKS = (4, 68)
+HIGH_TICKS = (6, 72)
+
+# Settle window bounds (seconds after the first tick)
+DEFAULT_SETTLE_SECONDS = 2.0
+MIN_SETTLE_SECONDS = 0.25
+SETTLE_FACTOR = 2.0
+
+# Samples per requirement kept for the adaptive settle window and reports
+LATENCY_WINDOW = 100
+MIN_LATENCY_SAMPLES = 5
+
+
+def tick_value(ticks: Dict, ids) -> Optional[float]:
+    """First positive price among tick ids (IBKR sends -1 when there is no quote)."""
+    for tick_id in ids:
+        value = ticks.get(tick_id)
+        if value is not None and value > 0:
+            return value
+    return None
+
+
+def has_stock_quote(ticks: Dict) -> bool:
+    return all(tick_value(ticks, ids) is not None for ids in (BID_TICKS, ASK_TICKS, LAST_TICKS))
+
+
+def has_underlying_price(ticks: Dict) -> bool:
+    return tick_value(ticks, LAST_TICKS) is not None or (
+        tick_value(ticks, BID_TICKS) is not None and tick_value(ticks, ASK_TICKS) is not None
+    )
+
+
+def has_option_quote(ticks: Dict) -> bool:
+    greeks = ticks.get("greeks", {})
+    return (
+        tick_value(ticks, BID_TICKS) is not None
+        and tick_value(ticks, ASK_TICKS) is not None
+        and greeks.get("implied_volatility") is not None
+        and greeks.get("delta") is not None
+    )
+
+
+COMPLETION_PREDICATES = {
+    "stock_quote": has_stock_quote,
+    "underlying_price": has_underlying_price,
+    "option_quote": has_option_quote,
+}
+
+
+class PendingRequest:
+    """
+    Future for one outstanding IBKR request on a shared connection.
+
+    Callbacks route by reqId into `ticks` (market data) or `items`
+    (historical bars, contract details); `done` is set when the request
+    completes or fails with a terminal error. Market data requests with
+    `requires` (a COMPLETION_PREDICATES key) complete as soon as the
+    required fields are present. Streaming subscribers set `on_update`,
+    called from the reader thread after every price, size or Greeks tick.
+    """
+
+    def __init__(self, req_id, kind, requires=None):
+        self.req_id = req_id
+        self.kind = kind
+        self.requires = requires
+        self.ticks = {}
+        self.items = []
+        self.errors = []
+        self.done = threading.Event()
+        self.on_update = None
+        self.started_at = time.monotonic()
+        self.first_tick_at = None
+        self.completed_at = None
+        self._changed = threading.Condition()
+
+    @property
+    def complete(self) -> bool:
+        """Whether the required fields arrived (always False without `requires`)."""
+        return self.completed_at is not None
+
+    def notify(self):
+        """Record a market data tick: check completion, wake waiters, run on_update."""
+        now = time.monotonic()
+        if self.first_tick_at is None:
+            self.first_tick_at = now
+        predicate = COMPLETION_PREDICATES.get(self.requires)
+        if self.completed_at is None and predicate is not None and predicate(self.ticks):
+            self.completed_at = now
+            self.finish()
+        else:
+            with self._changed:
+                self._changed.notify_all()
+        if self.on_update is not None:
+            self.on_update(self)
+
+    def finish(self):
+        """Mark the request done (end callback, terminal error or completion)."""
+        self.done.set()
+        with self._changed:
+            self._changed.notify_all()
+
+    def wait(self, timeout, settle=None):
+        """
+        Wait until done or `timeout` seconds pass.
+
+        With `settle`, stop waiting `settle` seconds after the first tick
+        even if required fields are still missing.
+
+        Returns:
+            True if the request finished
+        """
+        deadline = time.monotonic() + timeout
+        with self._changed:
+            while not self.done.is_set():
+                limit = deadline
+                if settle is not None and self.first_tick_at is not None:
+                    limit = min(limit, self.first_tick_at + settle)
+                remaining = limit - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._changed.wait(remaining)
+        return self.done.is_set()
+
+    def latency_ms(self) -> Dict[str, Optional[float]]:
+        """Milliseconds from request to first tick and to completion (None if not reached)."""
+        def elapsed(at):
+            return None if at is None else round((at - self.started_at) * 1000, 1)
+        return {"first_tick": elapsed(self.first_tick_at), "complete": elapsed(self.completed_at)}
+
+
+def wait_all(pending_requests, timeout, settle=None):
+    """Wait for several requests against a single deadline."""
+    deadline = time.monotonic() + timeout
+    for pending in pending_requests:
+        pending.wait(max(0.0, deadline - time.monotonic()), settle)
+    return all(pending.done.is_set() for pending in pending_requests)
+
+
+def _percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+class LatencyStats:
+    """Rolling per-requirement latencies for finished market data requests."""
+
+    def __init__(self, window: int = LATENCY_WINDOW):
+        self._window = window
+        self._complete = {}
+        self._fill = {}
+        self._incomplete = collections.Counter()
+        self._lock = threading.Lock()
+
+    def record(self, pending: PendingRequest):
+        """Record a finished request (ignored without `requires`)."""
+        if pending.requires is None:
+            return
+        with self._lock:
+            if pending.completed_at is None:
+                self._incomplete[pending.requires] += 1
+                return
+            self._complete.setdefault(pending.requires, collections.deque(maxlen=self._window)).append(
+                pending.completed_at - pending.started_at)
+            self._fill.setdefault(pending.requires, collections.deque(maxlen=self._window)).append(
+                pending.completed_at - pending.first_tick_at)
+
+    def settle(self, requires: str, timeout: float) -> float:
+        """Seconds to wait after the first tick for the remaining required fields."""
+        with self._lock:
+            samples = list(self._fill.get(requires, ()))
+        if len(samples) < MIN_LATENCY_SAMPLES:
+            return min(DEFAULT_SETTLE_SECONDS, timeout)
+        return min(max(SETTLE_FACTOR * _percentile(samples, 90), MIN_SETTLE_SECONDS), timeout)
+
+    def summary(self) -> Dict:
+        """Per requirement: completed/incomplete counts and p50/p90/max latency (ms)."""
+        with self._lock:
+            complete = {requires: list(samples) for requires, samples in self._complete.items()}
+            incomplete = dict(self._incomplete)
+        summary = {}
+        for requires in sorted(set(complete) | set(incomplete)):
+            samples = complete.get(requires, [])
+            summary[requires] = {
+                "completed": len(samples),
+                "incomplete": incomplete.get(requires, 0),
+                "p50_ms": round(_percentile(samples, 50) * 1000, 1) if samples else None,
+                "p90_ms": round(_percentile(samples, 90) * 1000, 1) if samples else None,
+                "max_ms": round(max(samples) * 1000, 1) if samples else None,
+            }
+        return summary
@@ -0,0 +1,214 @@
+"""
+Indicators Module
+
+Vectorized NumPy indicators over stored bar arrays.
+
+All functions work along the last axis, so they take a single series
+(shape [T]) or a batch of tickers (shape [N, T]) in one pass. Batches are
+built with align_bars(), which right-aligns each ticker's most recent bars
+and pads shorter histories with NaN at the start; a window that reaches
+into padding yields NaN (reported as None by compute_indicators).
+
+Indicators:
+- Rolling / trailing moving averages (MA-200, MA-50)
+- Realized (historical) volatility and its percentile rank over a year
+- Percentile rank of a current value against a history (IV percentile)
+- Drawdown from high and max drawdown
+- N-day returns, including the T-90 run-up for the PDUFA capitalization drag
+- Price progress toward target (info parity price component)
+
+Usage:
+    from indicators import compute_indicators
+
+    table = compute_indicators({"SPY": store.load("SPY"), "LULU": store.load("LULU")})
+    print(table["SPY"]["ma_200"], table["SPY"]["runup_t90"])
+"""
+
+import math
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+TRADING_DAYS_PER_YEAR = 252
+
+# T-90 (calendar days) run-up measured in trading sessions.
+T90_SESSIONS = 63
+
+
+def align_bars(bars_by_ticker: Dict, column: str = "close",
+               lookback: Optional[int] = None) -> Tuple[List[str], np.ndarray]:
+    """
+    Stack one column of several tickers' bars into an [N, T] matrix.
+
+    Each row holds that ticker's last `lookback` bars, right-aligned so the
+    final column is every ticker's latest bar. Missing history is NaN.
+
+    Args:
+        bars_by_ticker: Dict of ticker -> bar_store.Bars (None entries skipped)
+        column: Bars attribute to stack (close, volume, ...)
+        lookback: Number of trailing bars (default: longest history)
+
+    Returns:
+        (tickers, matrix)
+    """
+    tickers = [ticker for ticker, bars in bars_by_ticker.items() if bars is not None and len(bars)]
+    if not tickers:
+        return [], np.empty((0, 0))
+
+    width = lookback or max(len(bars_by_ticker[ticker]) for ticker in tickers)
+    matrix = np.full((len(tickers), width), np.nan)
+    for row, ticker in enumerate(tickers):
+        values = np.asarray(getattr(bars_by_ticker[ticker], column), dtype=np.float64)[-width:]
+        matrix[row, width - len(values):] = values
+    return tickers, matrix
+
+
+def trailing_mean(values: np.ndarray, window: int) -> np.ndarray:
+    """Mean of the last `window` values (NaN if the window is incomplete)."""
+    values = np.asarray(values, dtype=np.float64)
+    if values.shape[-1] < window:
+        return np.full(values.shape[:-1], np.nan)
+    return values[..., -window:].mean(axis=-1)
+
+
+def rolling_mean(values: np.ndarray, window: int) -> np.ndarray:
+    """Rolling mean along the last axis; the first window-1 entries are NaN."""
+    values = np.asarray(values, dtype=np.float64)
+    result = np.full(values.shape, np.nan)
+    if values.shape[-1] < window:
+        return result
+    cumsum = np.cumsum(values, axis=-1)
+    padded = np.concatenate([np.zeros(values.shape[:-1] + (1,)), cumsum], axis=-1)
+    result[..., window - 1:] = (padded[..., window:] - padded[..., :-window]) / window
+    return result
+
+
+def log_returns(closes: np.ndarray) -> np.ndarray:
+    """Daily log returns (one fewer column than closes)."""
+    closes = np.asarray(closes, dtype=np.float64)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.diff(np.log(closes), axis=-1)
+
+
+def realized_volatility(closes: np.ndarray, window: int = 20,
+                        periods_per_year: int = TRADING_DAYS_PER_YEAR) -> np.ndarray:
+    """Annualized standard deviation of the last `window` daily log returns."""
+    returns = log_returns(closes)
+    if returns.shape[-1] < window or window < 2:
+        return np.full(returns.shape[:-1], np.nan)
+    return returns[..., -window:].std(axis=-1, ddof=1) * math.sqrt(periods_per_year)
+
+
+def rolling_volatility(closes: np.ndarray, window: int = 20,
+                       periods_per_year: int = TRADING_DAYS_PER_YEAR) -> np.ndarray:
+    """Annualized rolling realized volatility (one value per complete window)."""
+    returns = log_returns(closes)
+    if returns.shape[-1] < window or window < 2:
+        return np.full(returns.shape[:-1] + (0,), np.nan)
+    windows = np.lib.stride_tricks.sliding_window_view(returns, window, axis=-1)
+    return windows.std(axis=-1, ddof=1) * math.sqrt(periods_per_year)
+
+
+def percentile_rank(history: np.ndarray, current) -> np.ndarray:
+    """
+    Percentile (0-100) of `current` within `history`, ignoring NaN.
+
+    Used for IV percentile (current IV vs past IVs) and HV percentile.
+    """
+    history = np.asarray(history, dtype=np.float64)
+    current = np.asarray(current, dtype=np.float64)
+    valid = ~np.isnan(history)
+    counts = valid.sum(axis=-1)
+    below = ((history <= current[..., None]) & valid).sum(axis=-1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rank = 100.0 * below / counts
+    return np.where((counts > 0) & ~np.isnan(current), rank, np.nan)
+
+
+def drawdown_from_high(closes: np.ndarray) -> np.ndarray:
+    """Latest close relative to the highest close in the series (-0.2 = 20% below)."""
+    closes = np.asarray(closes, dtype=np.float64)
+    with np.errstate(invalid="ignore"):
+        high = np.nanmax(np.where(np.isnan(closes), -np.inf, closes), axis=-1)
+        return closes[..., -1] / high - 1
+
+
+def max_drawdown(closes: np.ndarray) -> np.ndarray:
+    """Largest peak-to-trough decline in the series (-0.35 = 35% drawdown)."""
+    closes = np.asarray(closes, dtype=np.float64)
+    running_high = np.fmax.accumulate(closes, axis=-1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        drawdowns = closes / running_high - 1
+    all_nan = np.isnan(drawdowns).all(axis=-1)
+    filled = np.where(np.isnan(drawdowns), 0.0, drawdowns).min(axis=-1)
+    return np.where(all_nan, np.nan, filled)
+
+
+def period_return(closes: np.ndarray, days: int) -> np.ndarray:
+    """Close-to-close return over the last `days` bars (0.05 = +5%)."""
+    closes = np.asarray(closes, dtype=np.float64)
+    if closes.shape[-1] <= days:
+        return np.full(closes.shape[:-1], np.nan)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        result = closes[..., -1] / closes[..., -days - 1] - 1
+    return np.where(np.isfinite(result), result, np.nan)
+
+
+def price_vs_target(price, entry, target) -> np.ndarray:
+    """
+    Progress from entry toward target (0 = at entry, 1 = at target).
+
+    This is the price component of info parity.
+    """
+    price = np.asarray(price, dtype=np.float64)
+    entry = np.asarray(entry, dtype=np.float64)
+    target = np.asarray(target, dtype=np.float64)
+    span = target - entry
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(span != 0, (price - entry) / span, np.nan)
+
+
+def to_optional(value) -> Optional[float]:
+    """Convert a NumPy scalar to float (NaN becomes None)."""
+    value = float(value)
+    return None if math.isnan(value) else value
+
+
+def compute_indicators(bars_by_ticker: Dict, lookback: int = TRADING_DAYS_PER_YEAR + 1) -> Dict[str, Dict]:
+    """
+    Compute the standard indicator set for many tickers in one pass.
+
+    Args:
+        bars_by_ticker: Dict of ticker -> bar_store.Bars
+        lookback: Trailing bars considered (default: one year plus one)
+
+    Returns:
+        Dict of ticker -> {ma_200, ma_50, last_close, hv_20, hv_percentile,
+        return_20d, runup_t90, drawdown_from_high, max_drawdown,
+        avg_volume_20d}; values are None where history is too short
+    """
+    tickers, closes = align_bars(bars_by_ticker, "close", lookback)
+    if not tickers:
+        return {}
+    _, volumes = align_bars(bars_by_ticker, "volume", lookback)
+
+    hv_history = rolling_volatility(closes, 20)
+    hv_current = hv_history[..., -1] if hv_history.shape[-1] else np.full(len(tickers), np.nan)
+
+    columns = {
+        "last_close": closes[:, -1],
+        "ma_200": trailing_mean(closes, 200),
+        "ma_50": trailing_mean(closes, 50),
+        "hv_20": hv_current,
+        "hv_percentile": percentile_rank(hv_history, hv_current),
+        "return_20d": period_return(closes, 20),
+        "runup_t90": period_return(closes, T90_SESSIONS),
+        "drawdown_from_high": drawdown_from_high(closes),
+        "max_drawdown": max_drawdown(closes),
+        "avg_volume_20d": trailing_mean(volumes, 20),
+    }
+
+    return {
+        ticker: {name: to_optional(values[row]) for name, values in columns.items()}
+        for row, ticker in enumerate(tickers)
+    }
@@ -0,0 +1,311 @@
+"""
+IV Store Module
+
+Local columnar history of ATM implied volatility, one file per ticker.
+
+Every ATM IV fetched (data_fetcher._fetch_atm_iv and fetch_option_chain)
+is recorded as one observation per trading day and expiration in
+cache/iv/{TICKER}.npz: date and expiration as YYYYMMDD ints, days to
+expiration, IV, strike and delta. A later fetch on the same day replaces
+that day's value for the expiration.
+
+Queries work on a daily series: for each date the observation whose
+expiration is closest to TARGET_DTE days, so rolls between expirations do
+not show up as jumps. From it:
+- IV percentile: share of days in the last year with IV at or below the
+  current IV (schema/indicators.json, options_sizing.json)
+- IV multiple vs average: current IV over the mean of the prior
+  AVERAGE_WINDOW days (PDUFA info parity thresholds in exits.json)
+
+Both are None until MIN_HISTORY days have been recorded.
+
+Writes go to a temp file and are atomically renamed into place, so
+concurrent readers never see a partial file.
+
+Usage:
+    from iv_store import IVStore
+
+    store = IVStore()
+    store.record("SPY", 0.18, expiration="2026-02-20", strike=600.0, delta=0.52)
+    print(store.summary("SPY", 0.18))
+
+    python iv_store.py show SPY
+"""
+
+import json
+import os
+import sys
+import tempfile
+from dataclasses import dataclass
+from datetime import date, datetime
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+import indicators
+from price_cache import MARKET_TZ, cache_dir
+
+COLUMNS = ("expiration", "dte", "iv", "strike", "delta")
+
+# Daily series uses the expiration closest to this many days out
+TARGET_DTE = 30
+
+# Trading days of history for the IV percentile
+PERCENTILE_LOOKBACK = indicators.TRADING_DAYS_PER_YEAR
+
+# Trading days in the "average IV" baseline
+AVERAGE_WINDOW = 60
+
+# Days of history required before percentile / average are reported
+MIN_HISTORY = 20
+
+
+def _date_to_int(value) -> int:
+    """Convert 'YYYY-MM-DD', 'YYYYMMDD' or a date to YYYYMMDD."""
+    if isinstance(value, date):
+        return value.year * 10000 + value.month * 100 + value.day
+    return int(str(value).strip().split(" ")[0].replace("-", ""))
+
+
+def _int_to_date(value: int) -> date:
+    return date(value // 10000, value // 100 % 100, value % 100)
+
+
+def _int_to_iso(value: int) -> str:
+    return f"{value // 10000:04d}-{value // 100 % 100:02d}-{value % 100:02d}"
+
+
+@dataclass
+class IVHistory:
+    """ATM IV observations for one ticker, sorted by date then expiration."""
+    ticker: str
+    date: np.ndarray
+    expiration: np.ndarray
+    dte: np.ndarray
+    iv: np.ndarray
+    strike: np.ndarray
+    delta: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.date)
+
+    def daily(self, target_dte: int = TARGET_DTE, expiration: Optional[str] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        One IV per date, oldest first.
+
+        Args:
+            target_dte: Pick the expiration closest to this many days out
+            expiration: Only use this expiration (YYYY-MM-DD) instead
+
+        Returns:
+            (dates as YYYYMMDD ints, IVs)
+        """
+        dates, ivs, dte = self.date, self.iv, self.dte
+        if expiration is not None:
+            mask = self.expiration == _date_to_int(expiration)
+            dates, ivs, dte = dates[mask], ivs[mask], dte[mask]
+        if not len(dates):
+            return dates, ivs
+
+        # Sort by date, then by distance from the target DTE; keep the first per date.
+        order = np.lexsort((np.abs(dte - target_dte), dates))
+        unique_dates, first_idx = np.unique(dates[order], return_index=True)
+        return unique_dates, ivs[order][first_idx]
+
+    def rolling_mean(self, window: int, target_dte: int = TARGET_DTE) -> np.ndarray:
+        """Rolling mean of the daily series (first window-1 entries NaN)."""
+        _, ivs = self.daily(target_dte)
+        return indicators.rolling_mean(ivs, window)
+
+    def percentile(self, current: float, lookback: int = PERCENTILE_LOOKBACK,
+                   min_history: int = MIN_HISTORY) -> Optional[float]:
+        """Percentile (0-100) of `current` within the last `lookback` days."""
+        _, ivs = self.daily()
+        history = ivs[-lookback:]
+        if len(history) < min_history:
+            return None
+        return indicators.to_optional(indicators.percentile_rank(history, current))
+
+    def average(self, window: int = AVERAGE_WINDOW, before: Optional[int] = None,
+                min_history: int = MIN_HISTORY) -> Optional[float]:
+        """
+        Mean IV over the last `window` days before `before` (YYYYMMDD).
+
+        The current day is excluded by the caller via `before`, so the
+        baseline is not inflated by the value it is compared against.
+        """
+        dates, ivs = self.daily()
+        if before is not None:
+            ivs = ivs[dates < before]
+        history = ivs[-window:]
+        if len(history) < min(min_history, window):
+            return None
+        return indicators.to_optional(indicators.trailing_mean(history, len(history)))
+
+    def to_records(self) -> list:
+        return [
+            {
+                "date": _int_to_iso(int(self.date[idx])),
+                "expiration": _int_to_iso(int(self.expiration[idx])),
+                "dte": int(self.dte[idx]),
+                "iv": float(self.iv[idx]),
+                "strike": indicators.to_optional(self.strike[idx]),
+                "delta": indicators.to_optional(self.delta[idx]),
+            }
+            for idx in range(len(self))
+        ]
+
+
+class IVStore:
+    """Per-ticker .npz IV history under cache/iv (override root for tests)."""
+
+    def __init__(self, root: Optional[Path] = None):
+        self._root = Path(root) if root else None
+
+    @property
+    def root(self) -> Path:
+        return self._root or cache_dir() / "iv"
+
+    def _path(self, ticker: str) -> Path:
+        return self.root / f"{ticker.upper()}.npz"
+
+    def load(self, ticker: str) -> Optional[IVHistory]:
+        """Load stored history, or None if the ticker has no (readable) file."""
+        path = self._path(ticker)
+        if not path.exists():
+            return None
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                return IVHistory(ticker=ticker.upper(), date=data["date"],
+                                 **{column: data[column] for column in COLUMNS})
+        except (OSError, KeyError, ValueError) as e:
+            print(f"IV store read error for {ticker}: {e}", file=sys.stderr)
+            return None
+
+    def record(self, ticker: str, iv: float, expiration: str, strike: Optional[float] = None,
+               delta: Optional[float] = None, observed: Optional[date] = None) -> Optional[IVHistory]:
+        """
+        Record one ATM IV observation (replacing the same day and expiration).
+
+        Args:
+            ticker: Stock ticker symbol
+            iv: Implied volatility as decimal (0.25 = 25%)
+            expiration: Option expiration (YYYY-MM-DD)
+            strike: Strike the IV was taken from
+            delta: Delta of that option
+            observed: Trading date (default: today, market time)
+
+        Returns:
+            Updated IVHistory, or None if the observation is unusable
+        """
+        if iv is None or expiration is None:
+            return None
+        observed = observed or datetime.now(MARKET_TZ).date()
+        day = _date_to_int(observed)
+        expiry = _date_to_int(expiration)
+        row = {
+            "expiration": expiry,
+            "dte": (_int_to_date(expiry) - _int_to_date(day)).days,
+            "iv": float(iv),
+            "strike": np.nan if strike is None else float(strike),
+            "delta": np.nan if delta is None else float(delta),
+        }
+
+        existing = self.load(ticker)
+        if existing is not None and len(existing):
+            keep = ~((existing.date == day) & (existing.expiration == expiry))
+            dates = np.append(existing.date[keep], day)
+            columns = {column: np.append(getattr(existing, column)[keep], row[column]) for column in COLUMNS}
+        else:
+            dates = np.array([day], dtype=np.int64)
+            columns = {column: np.array([row[column]]) for column in COLUMNS}
+
+        order = np.lexsort((columns["expiration"], dates))
+        history = IVHistory(
+            ticker=ticker.upper(),
+            date=dates[order].astype(np.int64),
+            expiration=columns["expiration"][order].astype(np.int64),
+            dte=columns["dte"][order].astype(np.int64),
+            iv=columns["iv"][order].astype(np.float64),
+            strike=columns["strike"][order].astype(np.float64),
+            delta=columns["delta"][order].astype(np.float64),
+        )
+        self._write(history)
+        return history
+
+    def _write(self, history: IVHistory):
+        path = self._path(history.ticker)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as handle:
+                np.savez(handle, date=history.date, **{column: getattr(history, column) for column in COLUMNS})
+            os.replace(tmp_name, path)
+        except OSError as e:
+            print(f"IV store write error for {history.ticker}: {e}", file=sys.stderr)
+            if os.path.exists(tmp_name):
+                os.unlink(tmp_name)
+
+    def summary(self, ticker: str, current: Optional[float],
+                observed: Optional[date] = None) -> Dict:
+        """
+        IV percentile and multiple vs average for a current IV.
+
+        Args:
+            ticker: Stock ticker symbol
+            current: Current ATM IV (None = latest stored daily value)
+            observed: Date of `current` (default: today, market time)
+
+        Returns:
+            Dict with iv_percentile (0-100), iv_avg, iv_multiple_vs_avg and
+            iv_history_days; values are None while history is too short
+        """
+        history = self.load(ticker)
+        result = {"iv_percentile": None, "iv_avg": None, "iv_multiple_vs_avg": None, "iv_history_days": 0}
+        if history is None or not len(history):
+            return result
+
+        dates, ivs = history.daily()
+        result["iv_history_days"] = len(dates)
+        if current is None:
+            current = float(ivs[-1])
+
+        today = _date_to_int(observed or datetime.now(MARKET_TZ).date())
+        average = history.average(before=today)
+        result["iv_percentile"] = history.percentile(current)
+        result["iv_avg"] = average
+        if average:
+            result["iv_multiple_vs_avg"] = round(current / average, 3)
+        return result
+
+
+def main():
+    """CLI interface for inspecting stored IV history."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Inspect the local ATM IV history store")
+    parser.add_argument("command", choices=["show"])
+    parser.add_argument("ticker", help="Stock ticker symbol")
+    parser.add_argument("--records", type=int, default=10, help="Most recent observations to print")
+    args = parser.parse_args()
+
+    store = IVStore()
+    history = store.load(args.ticker)
+    if history is None:
+        print(f"ERROR: No stored IV history for {args.ticker.upper()}", file=sys.stderr)
+        sys.exit(1)
+
+    records = history.to_records()
+    print(json.dumps({
+        "ticker": history.ticker,
+        "observations": len(history),
+        "first_date": records[0]["date"] if records else None,
+        "last_date": records[-1]["date"] if records else None,
+        **store.summary(history.ticker, None),
+        "recent": records[-args.records:],
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,411 @@
+"""
+Monitoring Store Module
+
+Columnar history of the numeric monitoring fields of trades.
+
+Each trade file's monitoring array repeats price, P&L, info parity
+signals and moving-average fields as nested dicts per day, so any
+analysis across trades meant parsing every file. This store keeps the
+numeric series column-wise in one file, cache/monitoring.npz:
+- trade_ids and offsets: rows offsets[k]:offsets[k+1] belong to
+  trade_ids[k] and are sorted by date (the per-trade date index)
+- date as YYYYMMDD ints, one float64 column per field in COLUMNS
+  (info_parity.media/iv/price as media/iv/price_signal, above_200_ma as
+  1/0, missing values NaN)
+
+append_day() adds one day for any number of trades in a single atomic
+write (temp file and rename, under a lock file so concurrent appenders do
+not drop each other's rows); a day already stored for a trade is
+replaced. matrix() returns a field as a dates x trades array aligned on
+the union of dates, e.g. unrealized P&L or weighted_sum for the whole
+portfolio.
+
+Trade JSON files remain the record (this store lives in the untracked
+cache/ directory): record_day() appends the entries to the trade files
+through trade_repository.py and then to the store, and sync() rebuilds
+the rows of any trade whose file changed since it was last stored.
+
+Usage:
+    from monitoring_store import MonitoringStore
+
+    store = MonitoringStore()
+    store.sync()                                           # from trades/active
+    store.append_day("2026-01-26", {"TRD-20260119-RGNX-PDUFA": {"price": 14.2, "weighted_sum": 0.1}})
+    dates, trade_ids, pnl = store.matrix("unrealized_pnl")
+
+    python monitoring_store.py sync
+    python monitoring_store.py matrix --field weighted_sum [--start 2026-01-19]
+    python monitoring_store.py show TRD-20260119-RGNX-PDUFA
+    python monitoring_store.py record-day 2026-01-26 '{"TRD-20260119-RGNX-PDUFA": {...}}'
+"""
+
+import fcntl
+import json
+import math
+import os
+import sys
+import tempfile
+from dataclasses import dataclass
+from datetime import date
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from price_cache import cache_dir
+
+COLUMNS = (
+    "price", "change_from_entry_pct", "unrealized_pnl", "media", "iv", "price_signal",
+    "weighted_sum", "ma_200", "above_200_ma",
+)
+
+# Column -> path in a monitoring entry
+FIELD_PATHS = {
+    "price": ("price",),
+    "change_from_entry_pct": ("change_from_entry_pct",),
+    "unrealized_pnl": ("unrealized_pnl",),
+    "media": ("info_parity", "media"),
+    "iv": ("info_parity", "iv"),
+    "price_signal": ("info_parity", "price"),
+    "weighted_sum": ("weighted_sum",),
+    "ma_200": ("ma_200",),
+    "above_200_ma": ("above_200_ma",),
+}
+
+# Options trades record the underlying as underlying_price
+FALLBACK_PATHS = {"price": ("underlying_price",)}
+
+
+def _date_to_int(value) -> int:
+    """Convert 'YYYY-MM-DD' or a date to YYYYMMDD."""
+    if isinstance(value, date):
+        return value.year * 10000 + value.month * 100 + value.day
+    return int(str(value).strip()[:10].replace("-", ""))
+
+
+def _int_to_iso(value: int) -> str:
+    return f"{value // 10000:04d}-{value // 100 % 100:02d}-{value % 100:02d}"
+
+
+def _lookup(entry: Dict, path: Tuple[str, ...]):
+    value = entry
+    for key in path:
+        if not isinstance(value, dict):
+            return None
+        value = value.get(key)
+    return value
+
+
+def entry_row(entry: Dict) -> Dict[str, float]:
+    """Numeric columns of one monitoring entry (NaN where missing or non-numeric)."""
+    row = {}
+    for column, path in FIELD_PATHS.items():
+        value = _lookup(entry, path)
+        if value is None and column in FALLBACK_PATHS:
+            value = _lookup(entry, FALLBACK_PATHS[column])
+        if isinstance(value, bool):
+            value = float(value)
+        row[column] = float(value) if isinstance(value, (int, float)) else math.nan
+    return row
+
+
+@dataclass
+class MonitoringHistory:
+    """All stored rows: per-trade blocks (offsets) sorted by date."""
+    trade_ids: np.ndarray
+    offsets: np.ndarray
+    date: np.ndarray
+    columns: Dict[str, np.ndarray]
+    sources: np.ndarray  # per trade: "mtime_ns:size" of the trade file the rows came from
+
+    @classmethod
+    def empty(cls) -> "MonitoringHistory":
+        return cls(np.array([], dtype=str), np.zeros(1, dtype=np.int64), np.array([], dtype=np.int64),
+                   {column: np.array([], dtype=np.float64) for column in COLUMNS}, np.array([], dtype=str))
+
+    def __len__(self) -> int:
+        return len(self.date)
+
+    def _index(self, trade_id: str) -> Optional[int]:
+        matches = np.flatnonzero(self.trade_ids == trade_id)
+        return int(matches[0]) if len(matches) else None
+
+    def series(self, trade_id: str) -> Optional[Dict[str, np.ndarray]]:
+        """One trade's rows: {"date": ..., column: ...}, or None if not stored."""
+        idx = self._index(trade_id)
+        if idx is None:
+            return None
+        rows = slice(self.offsets[idx], self.offsets[idx + 1])
+        return {"date": self.date[rows], **{column: values[rows] for column, values in self.columns.items()}}
+
+    def blocks(self) -> Dict[str, Dict[str, np.ndarray]]:
+        return {str(trade_id): self.series(str(trade_id)) for trade_id in self.trade_ids}
+
+
+def _from_blocks(blocks: Dict[str, Dict[str, np.ndarray]], sources: Dict[str, str]) -> MonitoringHistory:
+    """Pack per-trade blocks (sorted by trade_id) into one history."""
+    trade_ids = sorted(blocks)
+    lengths = [len(blocks[trade_id]["date"]) for trade_id in trade_ids]
+    offsets = np.concatenate([[0], np.cumsum(lengths)]).astype(np.int64)
+
+    def column(name, dtype):
+        parts = [np.asarray(blocks[trade_id][name], dtype=dtype) for trade_id in trade_ids]
+        return np.concatenate(parts) if parts else np.array([], dtype=dtype)
+
+    return MonitoringHistory(
+        trade_ids=np.array(trade_ids, dtype=str),
+        offsets=offsets,
+        date=column("date", np.int64),
+        columns={name: column(name, np.float64) for name in COLUMNS},
+        sources=np.array([sources.get(trade_id, "") for trade_id in trade_ids], dtype=str),
+    )
+
+
+def _block(days: List[int], rows: List[Dict[str, float]]) -> Dict[str, np.ndarray]:
+    """Block sorted by date, keeping the last row for a repeated date."""
+    latest = dict(zip(days, rows))
+    ordered = sorted(latest)
+    return {"date": np.array(ordered, dtype=np.int64),
+            **{column: np.array([latest[day][column] for day in ordered], dtype=np.float64) for column in COLUMNS}}
+
+
+class MonitoringStore:
+    """cache/monitoring.npz (override the path for tests)."""
+
+    def __init__(self, path: Optional[Path] = None):
+        self._path = Path(path) if path else None
+
+    @property
+    def path(self) -> Path:
+        return self._path or cache_dir() / "monitoring.npz"
+
+    def load(self) -> MonitoringHistory:
+        """Stored history (empty if there is no readable file)."""
+        if not self.path.exists():
+            return MonitoringHistory.empty()
+        try:
+            with np.load(self.path, allow_pickle=False) as data:
+                return MonitoringHistory(
+                    trade_ids=data["trade_ids"], offsets=data["offsets"], date=data["date"],
+                    columns={column: data[column] for column in COLUMNS}, sources=data["sources"],
+                )
+        except (OSError, KeyError, ValueError) as e:
+            print(f"Monitoring store read error: {e}", file=sys.stderr)
+            return MonitoringHistory.empty()
+
+    def _write(self, history: MonitoringHistory):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=self.path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as handle:
+                np.savez(handle, trade_ids=history.trade_ids, offsets=history.offsets, date=history.date,
+                         sources=history.sources, **history.columns)
+            os.replace(tmp_name, self.path)
+        except OSError as e:
+            print(f"Monitoring store write error: {e}", file=sys.stderr)
+            if os.path.exists(tmp_name):
+                os.unlink(tmp_name)
+
+    def _locked(self):
+        """Exclusive lock file serialising read-modify-write cycles across processes."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        handle = open(self.path.with_suffix(".lock"), "w")
+        fcntl.flock(handle, fcntl.LOCK_EX)
+        return handle
+
+    def append_day(self, day, entries: Dict[str, Dict], sources: Optional[Dict[str, str]] = None) -> MonitoringHistory:
+        """
+        Store one day for several trades in a single write.
+
+        Args:
+            day: Date (YYYY-MM-DD or date)
+            entries: {trade_id: monitoring entry} (a "date" in the entry is ignored)
+            sources: Optional {trade_id: "mtime_ns:size"} of the trade files
+                after the same entries were appended to them
+
+        Returns:
+            Updated history
+        """
+        day = _date_to_int(day)
+        with self._locked():
+            history = self.load()
+            blocks = history.blocks()
+            stored_sources = {str(t): str(s) for t, s in zip(history.trade_ids, history.sources)}
+            for trade_id, entry in entries.items():
+                block = blocks.get(trade_id)
+                days = [int(d) for d in block["date"]] if block else []
+                rows = [{column: float(block[column][i]) for column in COLUMNS} for i in range(len(days))]
+                blocks[trade_id] = _block(days + [day], rows + [entry_row(entry)])
+                if sources and trade_id in sources:
+                    stored_sources[trade_id] = sources[trade_id]
+            history = _from_blocks(blocks, stored_sources)
+            self._write(history)
+        return history
+
+    def sync(self, repo=None, status: str = "active") -> Dict:
+        """
+        Rebuild the rows of trades whose file changed since they were stored.
+
+        Trades no longer in `status` are dropped. Only changed trades'
+        monitoring sections are read; nothing is written if none changed.
+
+        Returns:
+            Dict with rebuilt trade_ids and the number of trades stored
+        """
+        if repo is None:
+            from trade_repository import TradeRepository
+            repo = TradeRepository()
+
+        records = {record["trade_id"]: record for record in repo.refresh().values()
+                   if record["status"] == status}
+        with self._locked():
+            history = self.load()
+            blocks = history.blocks()
+            sources = {str(t): str(s) for t, s in zip(history.trade_ids, history.sources)}
+            rebuilt = []
+            for trade_id, record in records.items():
+                signature = f"{record['mtime_ns']}:{record['size']}"
+                if sources.get(trade_id) == signature:
+                    continue
+                entries = [entry for entry in (repo.section(trade_id, "monitoring") or [])
+                           if isinstance(entry, dict) and entry.get("date")]
+                blocks[trade_id] = _block([_date_to_int(entry["date"]) for entry in entries],
+                                          [entry_row(entry) for entry in entries])
+                sources[trade_id] = signature
+                rebuilt.append(trade_id)
+            dropped = set(blocks) - set(records)
+            for trade_id in dropped:
+                del blocks[trade_id]
+            if rebuilt or dropped:
+                self._write(_from_blocks(blocks, sources))
+        return {"rebuilt": sorted(rebuilt), "dropped": sorted(dropped), "trades": len(records)}
+
+    def matrix(self, field: str, trade_ids: Optional[Iterable[str]] = None,
+               start=None, end=None) -> Tuple[np.ndarray, List[str], np.ndarray]:
+        """
+        One column as a dates x trades matrix aligned on the union of dates.
+
+        Args:
+            field: Column name (see COLUMNS)
+            trade_ids: Trades to include (default: every stored trade)
+            start: Earliest date (YYYY-MM-DD or date)
+            end: Latest date
+
+        Returns:
+            (dates as YYYYMMDD ints, trade_ids, values with NaN where a
+            trade has no entry for a date)
+        """
+        if field not in COLUMNS:
+            raise ValueError(f"Unknown monitoring field: {field}")
+        history = self.load()
+        ids = [str(t) for t in history.trade_ids] if trade_ids is None else list(trade_ids)
+
+        mask = np.ones(len(history), dtype=bool)
+        if start is not None:
+            mask &= history.date >= _date_to_int(start)
+        if end is not None:
+            mask &= history.date <= _date_to_int(end)
+
+        trade_rows = np.repeat(np.arange(len(history.trade_ids)), np.diff(history.offsets))
+        wanted = np.full(len(history.trade_ids), -1, dtype=np.int64)
+        for col, trade_id in enumerate(ids):
+            idx = history._index(trade_id)
+            if idx is not None:
+                wanted[idx] = col
+        mask &= wanted[trade_rows] >= 0
+
+        dates = np.unique(history.date[mask])
+        values = np.full((len(dates), len(ids)), np.nan)
+        values[np.searchsorted(dates, history.date[mask]), wanted[trade_rows[mask]]] = history.columns[field][mask]
+        return dates, ids, values
+
+    def pnl_matrix(self, **kwargs) -> Tuple[np.ndarray, List[str], np.ndarray]:
+        return self.matrix("unrealized_pnl", **kwargs)
+
+    def weighted_sum_matrix(self, **kwargs) -> Tuple[np.ndarray, List[str], np.ndarray]:
+        return self.matrix("weighted_sum", **kwargs)
+
+
+def record_day(day, entries: Dict[str, Dict], repo=None, store: Optional[MonitoringStore] = None) -> Dict:
+    """
+    Append one day's monitoring entries to the trade files and the store.
+
+    Each entry is appended to its trade's monitoring array in place (see
+    TradeRepository.append_monitoring), then all of them are written to
+    the columnar store at once.
+
+    Returns:
+        Dict with the trade_ids recorded
+    """
+    if repo is None:
+        from trade_repository import TradeRepository
+        repo = TradeRepository()
+    store = store or MonitoringStore()
+
+    iso_day = _int_to_iso(_date_to_int(day))
+    sources = {}
+    for trade_id, entry in entries.items():
+        repo.append_monitoring(trade_id, {"date": iso_day, **{k: v for k, v in entry.items() if k != "date"}})
+        sources[trade_id] = repo.signature(trade_id)
+    store.append_day(day, entries, sources)
+    return {"date": iso_day, "recorded": sorted(entries)}
+
+
+def _json_value(value: float):
+    return None if math.isnan(value) else round(float(value), 6)
+
+
+def main():
+    """CLI interface for the monitoring store."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Columnar monitoring history for active trades")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("sync", help="Rebuild rows for trade files that changed")
+
+    matrix = sub.add_parser("matrix", help="Dates x trades matrix for one field")
+    matrix.add_argument("--field", default="unrealized_pnl", choices=COLUMNS)
+    matrix.add_argument("--start")
+    matrix.add_argument("--end")
+
+    show = sub.add_parser("show", help="One trade's stored series")
+    show.add_argument("trade_id")
+
+    record = sub.add_parser("record-day", help="Append {trade_id: entry} for one day to trade files and store")
+    record.add_argument("date")
+    record.add_argument("entries")
+    args = parser.parse_args()
+
+    store = MonitoringStore()
+    if args.command == "sync":
+        result = store.sync()
+    elif args.command == "matrix":
+        store.sync()
+        dates, trade_ids, values = store.matrix(args.field, start=args.start, end=args.end)
+        result = {
+            "field": args.field,
+            "trade_ids": trade_ids,
+            "rows": [{"date": _int_to_iso(int(day)), "values": [_json_value(v) for v in row]}
+                     for day, row in zip(dates, values)],
+        }
+    elif args.command == "show":
+        store.sync()
+        series = store.load().series(args.trade_id)
+        if series is None:
+            print(f"ERROR: No stored monitoring history for {args.trade_id}", file=sys.stderr)
+            sys.exit(1)
+        result = [
+            {"date": _int_to_iso(int(day)), **{column: _json_value(series[column][idx]) for column in COLUMNS}}
+            for idx, day in enumerate(series["date"])
+        ]
+    else:
+        try:
+            result = record_day(args.date, json.loads(args.entries))
+        except KeyError as e:
+            print(f"ERROR: Unknown trade {e}", file=sys.stderr)
+            sys.exit(1)
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
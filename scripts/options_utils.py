@@ -17,3 +17,102 @@ def round_to_increment(price, increment):
     if increment <= 0:
         return price
     return round(round(price / increment) * increment, 2)
+
+
+def guess_strikes(price, count):
+    """
+    Candidate strikes from the price-based increment (base ± count steps).
+
+    Fallback for when the listed chain is unavailable; real chains often
+    use $1 strikes or irregular spacing.
+    """
+    increment = determine_strike_increment(price)
+    base = round_to_increment(price, increment)
+    strikes = [round(base + step * increment, 2) for step in range(-count, count + 1)]
+    return [strike for strike in strikes if strike > 0]
+
+
+def merge_option_params(params, symbol):
+    """
+    Combine reqSecDefOptParams results into one chain definition.
+
+    IBKR returns one entry per exchange (and per trading class). SMART
+    entries are preferred, and the trading class matching the symbol is
+    preferred over adjusted/weekly classes.
+
+    Args:
+        params: List of {exchange, trading_class, multiplier, expirations, strikes}
+        symbol: Underlying ticker
+
+    Returns:
+        Dict with sorted "expirations" (YYYY-MM-DD) and "strikes", plus
+        "trading_class" and "multiplier" (None when ambiguous), or None
+    """
+    if not params:
+        return None
+    candidates = [p for p in params if p.get("exchange") == "SMART"] or list(params)
+    candidates = [p for p in candidates if p.get("trading_class") == symbol] or candidates
+
+    expirations = set()
+    strikes = set()
+    for entry in candidates:
+        expirations.update(entry.get("expirations", []))
+        strikes.update(float(strike) for strike in entry.get("strikes", []))
+
+    trading_classes = {p.get("trading_class") for p in candidates}
+    multipliers = {p.get("multiplier") for p in candidates}
+    return {
+        "expirations": sorted(
+            f"{exp[:4]}-{exp[4:6]}-{exp[6:8]}" if "-" not in exp else exp for exp in expirations
+        ),
+        "strikes": sorted(strikes),
+        "trading_class": trading_classes.pop() if len(trading_classes) == 1 else None,
+        "multiplier": multipliers.pop() if len(multipliers) == 1 else None,
+    }
+
+
+def select_expiration(expirations, target):
+    """Listed expiration equal to target, else the first after it, else the last one."""
+    if not expirations:
+        return target
+    if target is None:
+        return expirations[0]
+    for expiration in expirations:
+        if expiration >= target:
+            return expiration
+    return expirations[-1]
+
+
+def nearest_strikes(strikes, price, count):
+    """Up to `count` listed strikes on each side of the strike nearest `price`."""
+    if not strikes:
+        return []
+    strikes = sorted(strikes)
+    center = min(range(len(strikes)), key=lambda i: abs(strikes[i] - price))
+    return strikes[max(0, center - count):center + count + 1]
+
+
+def select_atm_option(options, price):
+    """
+    Nearest-to-price option with IV, preferring delta in the ATM range [0.40, 0.60].
+
+    Args:
+        options: Chain rows with strike, delta, implied_volatility
+        price: Underlying price
+
+    Returns:
+        The selected row, or None if no row has IV
+    """
+    with_iv = [row for row in options if row.get("implied_volatility") is not None]
+    if not with_iv:
+        return None
+    atm = [row for row in with_iv if row.get("delta") is not None and 0.40 <= abs(row["delta"]) <= 0.60]
+    return min(atm or with_iv, key=lambda row: abs(row["strike"] - price))
+
+
+def select_by_delta(options, target_delta):
+    """Option whose |delta| is closest to target_delta, or None if no row has a delta."""
+    with_delta = [row for row in options if row.get("delta") is not None]
+    if not with_delta:
+        return None
+    return min(with_delta, key=lambda row: abs(abs(row["delta"]) - target_delta))
@@ -16,12 +16,13 @@ import subprocess
 import sys
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, Optional, Tuple
 from dataclasses import dataclass, asdict
 from typing import Union
 
 from price_sources import get_bid_ask_midpoint
-from data_fetcher import fetch_options_data
+from data_fetcher import fetch_option_chain, fetch_options_data
+from options_utils import select_by_delta
 
 
 @dataclass
@@ -242,19 +243,44 @@ def display_preview(preview: OrderPreview):
     print("═" * 60)
 
 
-def preview_options_order(ticker: str, strike: float, expiration: str,
+def select_option_strike(ticker: str, expiration: str, right: str = "CALL",
+                         target_delta: float = 0.50) -> Tuple[float, str]:
+    """
+    Pick a listed strike from the option chain by delta.
+
+    Args:
+        ticker: Stock ticker (underlying)
+        expiration: Target expiration (YYYY-MM-DD); the next listed one is used if needed
+        right: CALL or PUT
+        target_delta: Desired |delta| (0.50 = ATM)
+
+    Returns:
+        Tuple of (strike, listed expiration)
+    """
+    chain = fetch_option_chain(ticker, expiration, right=right)
+    if not chain:
+        raise ValueError(f"Could not fetch option chain for {ticker} {expiration}")
+
+    selected = select_by_delta(chain["options"], target_delta)
+    if selected is None:
+        raise ValueError(f"No option with delta in chain for {ticker} {chain['expiration']}")
+    return selected["strike"], chain["expiration"]
+
+
+def preview_options_order(ticker: str, strike: Optional[float], expiration: str,
                           contracts: int, archetype: str,
                           right: str = "CALL",
                           options_strategy: str = "long_calls",
                           score: Optional[float] = None,
                           kill_screens: str = "PASS",
-                          catalyst_date: Optional[str] = None) -> OptionsOrderPreview:
+                          catalyst_date: Optional[str] = None,
+                          target_delta: float = 0.50) -> OptionsOrderPreview:
     """
     Create options order preview with all details.
 
     Args:
         ticker: Stock ticker (underlying)
-        strike: Strike price
+        strike: Strike price (None = listed strike nearest target_delta)
         expiration: Expiration date (YYYY-MM-DD)
         contracts: Number of contracts
         archetype: Trade archetype
@@ -263,6 +289,7 @@ def preview_options_order(ticker: str, strike: float, expiration: str,
         score: Total score from scoring filter
         kill_screens: Kill screen status
         catalyst_date: Catalyst date if applicable
+        target_delta: Delta used to pick the strike when none is given
 
     Returns:
         OptionsOrderPreview object
@@ -270,6 +297,9 @@ def preview_options_order(ticker: str, strike: float, expiration: str,
     config = load_config()
     account_size = config["account"]["size"]
 
+    if strike is None:
+        strike, expiration = select_option_strike(ticker, expiration, right, target_delta)
+
     # Fetch options data (Greeks, premium, IV)
     options_data = fetch_options_data(ticker, strike, expiration)
 
@@ -623,7 +653,10 @@ def main():
     # preview_option command
     parser_preview_opt = subparsers.add_parser("preview_option", help="Preview an options order")
     parser_preview_opt.add_argument("ticker", help="Stock ticker (underlying)")
-    parser_preview_opt.add_argument("--strike", type=float, required=True, help="Strike price")
+    parser_preview_opt.add_argument("--strike", type=float,
+                                    help="Strike price (default: listed strike nearest --target-delta)")
+    parser_preview_opt.add_argument("--target-delta", type=float, default=0.50,
+                                    help="Delta used to pick the strike from the chain when --strike is omitted")
     parser_preview_opt.add_argument("--expiration", required=True, help="Expiration date (YYYY-MM-DD)")
     parser_preview_opt.add_argument("--contracts", type=int, required=True, help="Number of contracts")
     parser_preview_opt.add_argument("--right", choices=["CALL", "PUT"], default="CALL", help="Call or Put")
@@ -635,7 +668,10 @@ def main():
     # execute_option command
     parser_execute_opt = subparsers.add_parser("execute_option", help="Execute options order with confirmation")
     parser_execute_opt.add_argument("ticker", help="Stock ticker (underlying)")
-    parser_execute_opt.add_argument("--strike", type=float, required=True, help="Strike price")
+    parser_execute_opt.add_argument("--strike", type=float,
+                                    help="Strike price (default: listed strike nearest --target-delta)")
+    parser_execute_opt.add_argument("--target-delta", type=float, default=0.50,
+                                    help="Delta used to pick the strike from the chain when --strike is omitted")
     parser_execute_opt.add_argument("--expiration", required=True, help="Expiration date (YYYY-MM-DD)")
     parser_execute_opt.add_argument("--contracts", type=int, required=True, help="Number of contracts")
     parser_execute_opt.add_argument("--right", choices=["CALL", "PUT"], default="CALL", help="Call or Put")
@@ -711,7 +747,8 @@ def main():
             right=args.right,
             options_strategy=args.strategy,
             score=args.score,
-            catalyst_date=getattr(args, "catalyst_date", None)
+            catalyst_date=getattr(args, "catalyst_date", None),
+            target_delta=args.target_delta
         )
 
         display_options_preview(preview)
@@ -726,7 +763,8 @@ def main():
             right=args.right,
             options_strategy=args.strategy,
             score=args.score,
-            catalyst_date=getattr(args, "catalyst_date", None)
+            catalyst_date=getattr(args, "catalyst_date", None),
+            target_delta=args.target_delta
         )
 
         display_options_preview(preview)
@@ -0,0 +1,287 @@
+"""
+Price Cache Module
+
+Disk-backed price cache shared across processes.
+
+Every skill invocation runs in a fresh process, so an in-memory cache never
+produces a hit. This cache lives in a SQLite file under the repo's cache/
+directory (override with IDIO_CACHE_DIR) and is shared by fetch_price,
+fetch_prices, fetch_historical_yahoo and the IBKR historical path.
+
+Expiry follows the US equity session (America/New_York):
+- Regular hours (Mon-Fri 9:30-16:00): short TTL, capped at the close
+- After the close, before the open and on weekends: valid until the next open
+
+Exchange holidays are not modelled; on a holiday entries expire at 9:30 and
+are then refreshed on the regular-hours TTL.
+
+Each entry records its source and fetch time (staleness metadata), and the
+table is bounded by max_entries with least-recently-used eviction.
+
+Usage:
+    python price_cache.py stats
+    python price_cache.py purge            # drop expired entries
+    python price_cache.py clear
+"""
+
+import json
+import os
+import sqlite3
+import sys
+import time
+from datetime import datetime, timedelta, time as dtime
+from pathlib import Path
+from typing import Dict, Optional
+from zoneinfo import ZoneInfo
+
+MARKET_TZ = ZoneInfo("America/New_York")
+MARKET_OPEN = dtime(9, 30)
+MARKET_CLOSE = dtime(16, 0)
+
+DEFAULT_REGULAR_HOURS_MINUTES = 5
+DEFAULT_HISTORICAL_MINUTES = 60
+DEFAULT_MAX_ENTRIES = 5000
+
+
+def load_cache_policy() -> Dict:
+    """Load data_sources.cache_policy from CONFIG.json."""
+    config_path = Path(__file__).resolve().parents[1] / "CONFIG.json"
+    if not config_path.exists():
+        return {}
+    with open(config_path, "r") as f:
+        return json.load(f).get("data_sources", {}).get("cache_policy", {})
+
+
+def cache_dir() -> Path:
+    """Resolve the on-disk cache directory (env override: IDIO_CACHE_DIR)."""
+    override = os.getenv("IDIO_CACHE_DIR")
+    if override:
+        return Path(override)
+    return Path(__file__).resolve().parents[1] / "cache"
+
+
+def is_market_open(now: Optional[datetime] = None) -> bool:
+    """Check whether US equities are in the regular session."""
+    now = (now or datetime.now(MARKET_TZ)).astimezone(MARKET_TZ)
+    return now.weekday() < 5 and MARKET_OPEN <= now.time() < MARKET_CLOSE
+
+
+def next_market_open(now: Optional[datetime] = None) -> datetime:
+    """Next regular-session open strictly after `now`."""
+    now = (now or datetime.now(MARKET_TZ)).astimezone(MARKET_TZ)
+    candidate = datetime.combine(now.date(), MARKET_OPEN, tzinfo=MARKET_TZ)
+    if candidate <= now:
+        candidate += timedelta(days=1)
+    while candidate.weekday() >= 5:
+        candidate += timedelta(days=1)
+    return candidate
+
+
+def expires_at(regular_hours_ttl: timedelta, now: Optional[datetime] = None) -> datetime:
+    """
+    Expiry time for data fetched at `now`.
+
+    During regular hours: now + regular_hours_ttl, but never past the close
+    (so the closing price replaces intraday data). Otherwise: next open.
+    """
+    now = (now or datetime.now(MARKET_TZ)).astimezone(MARKET_TZ)
+    if is_market_open(now):
+        close = datetime.combine(now.date(), MARKET_CLOSE, tzinfo=MARKET_TZ)
+        return min(now + regular_hours_ttl, close)
+    return next_market_open(now)
+
+
+class PriceCache:
+    """
+    SQLite-backed cache with market-hours-aware expiry and LRU bounds.
+
+    Entries are keyed by (namespace, key): namespace separates quotes from
+    historical bars, key is the ticker (plus any request parameters).
+    Safe for concurrent use from several processes (WAL mode, busy timeout).
+    """
+
+    def __init__(self, path: Optional[Path] = None, regular_hours_minutes: Optional[float] = None,
+                 max_entries: Optional[int] = None):
+        policy = load_cache_policy()
+        self._path = Path(path) if path else None
+        self.regular_hours_ttl = timedelta(minutes=regular_hours_minutes or policy.get(
+            "price_regular_hours_minutes", DEFAULT_REGULAR_HOURS_MINUTES))
+        # Daily bars barely move intraday, so they keep a longer regular-hours TTL.
+        self.historical_ttl = timedelta(minutes=policy.get(
+            "price_duration_minutes", DEFAULT_HISTORICAL_MINUTES))
+        self.max_entries = max_entries or policy.get("price_max_entries", DEFAULT_MAX_ENTRIES)
+        self._initialized = set()
+
+    @property
+    def path(self) -> Path:
+        return self._path or cache_dir() / "prices.sqlite"
+
+    def _connect(self) -> sqlite3.Connection:
+        path = self.path
+        if path not in self._initialized:
+            path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(path), timeout=10)
+        if path not in self._initialized:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS entries (
+                    namespace TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    source TEXT,
+                    payload TEXT NOT NULL,
+                    fetched_at REAL NOT NULL,
+                    expires_at REAL NOT NULL,
+                    last_access REAL NOT NULL,
+                    PRIMARY KEY (namespace, key)
+                )
+                """
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_entries_last_access ON entries(last_access)")
+            conn.commit()
+            self._initialized.add(path)
+        return conn
+
+    def get(self, ticker: str, namespace: str = "quote") -> Optional[Dict]:
+        """
+        Get cached data if it has not expired.
+
+        Returns:
+            Cached payload plus cached_at / cache_age_seconds, or None
+        """
+        now = time.time()
+        try:
+            conn = self._connect()
+            try:
+                with conn:
+                    row = conn.execute(
+                        "SELECT payload, fetched_at FROM entries "
+                        "WHERE namespace = ? AND key = ? AND expires_at > ?",
+                        (namespace, ticker, now),
+                    ).fetchone()
+                    if row is None:
+                        return None
+                    conn.execute(
+                        "UPDATE entries SET last_access = ? WHERE namespace = ? AND key = ?",
+                        (now, namespace, ticker),
+                    )
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            print(f"Price cache read error for {ticker}: {e}", file=sys.stderr)
+            return None
+
+        payload, fetched_at = row
+        data = json.loads(payload)
+        if isinstance(data, dict):
+            data["cached_at"] = datetime.fromtimestamp(fetched_at).isoformat()
+            data["cache_age_seconds"] = round(now - fetched_at, 1)
+        return data
+
+    def set(self, ticker: str, data, namespace: str = "quote", source: Optional[str] = None,
+            regular_hours_ttl: Optional[timedelta] = None):
+        """Cache data with a session-aware expiry and evict LRU entries over max_entries."""
+        now = time.time()
+        expiry = expires_at(regular_hours_ttl or self.regular_hours_ttl).timestamp()
+        if source is None and isinstance(data, dict):
+            source = data.get("source")
+        payload = json.dumps(data)
+
+        try:
+            conn = self._connect()
+            try:
+                with conn:
+                    conn.execute(
+                        "INSERT OR REPLACE INTO entries "
+                        "(namespace, key, source, payload, fetched_at, expires_at, last_access) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                        (namespace, ticker, source, payload, now, expiry, now),
+                    )
+                    conn.execute(
+                        "DELETE FROM entries WHERE rowid IN ("
+                        "SELECT rowid FROM entries ORDER BY last_access ASC "
+                        "LIMIT MAX(0, (SELECT COUNT(*) FROM entries) - ?))",
+                        (self.max_entries,),
+                    )
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            print(f"Price cache write error for {ticker}: {e}", file=sys.stderr)
+
+    def purge_expired(self) -> int:
+        """Delete expired entries. Returns the number removed."""
+        conn = self._connect()
+        try:
+            with conn:
+                return conn.execute("DELETE FROM entries WHERE expires_at <= ?", (time.time(),)).rowcount
+        finally:
+            conn.close()
+
+    def clear(self):
+        """Clear all cached data."""
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute("DELETE FROM entries")
+        finally:
+            conn.close()
+
+    def stats(self) -> Dict:
+        """
+        Per-source staleness summary.
+
+        Returns:
+            Dict with total entry count and, per (namespace, source), the
+            entry count, live count and oldest/newest fetch times
+        """
+        now = time.time()
+        conn = self._connect()
+        try:
+            rows = conn.execute(
+                "SELECT namespace, COALESCE(source, 'unknown'), COUNT(*), "
+                "SUM(expires_at > ?), MIN(fetched_at), MAX(fetched_at) "
+                "FROM entries GROUP BY namespace, source",
+                (now,),
+            ).fetchall()
+        finally:
+            conn.close()
+
+        sources = {}
+        for namespace, source, count, live, oldest, newest in rows:
+            sources.setdefault(namespace, {})[source] = {
+                "entries": count,
+                "live": live or 0,
+                "oldest_fetch": datetime.fromtimestamp(oldest).isoformat(),
+                "newest_fetch": datetime.fromtimestamp(newest).isoformat(),
+                "max_age_seconds": round(now - oldest, 1),
+            }
+
+        return {
+            "path": str(self.path),
+            "entries": sum(row[2] for row in rows),
+            "max_entries": self.max_entries,
+            "market_open": is_market_open(),
+            "sources": sources,
+        }
+
+
+def main():
+    """CLI interface for inspecting the price cache."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Inspect the shared on-disk price cache")
+    parser.add_argument("command", choices=["stats", "purge", "clear"])
+    args = parser.parse_args()
+
+    cache = PriceCache()
+    if args.command == "stats":
+        print(json.dumps(cache.stats(), indent=2))
+    elif args.command == "purge":
+        print(json.dumps({"removed": cache.purge_expired()}, indent=2))
+    elif args.command == "clear":
+        cache.clear()
+        print(json.dumps({"status": "cleared"}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -6,88 +6,71 @@ Fetches price data from multiple sources with graceful degradation:
 2. Stooq (15-min delay)
 3. Yahoo Finance (fallback)
 
-Includes caching to avoid redundant API calls.
+Includes caching to avoid redundant API calls. The cache is on disk and
+shared across processes (see price_cache.py), so consecutive skill runs
+reuse each other's quotes and bars.
+
+For watchlists, fetch_prices() sends every ticker to each source at once
+(IBKR batch snapshot, Stooq multi-symbol, Yahoo multi-symbol quote) and
+only falls back to the next source for tickers that failed.
+
+HTTP sources share pooled keep-alive sessions (http_client.py);
+fetch_price_async() is the asyncio variant for overlapping calls.
 """
 
+import asyncio
 import json
-import subprocess
 import sys
-from datetime import datetime, timedelta
-from pathlib import Path
-from typing import Dict, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
 import requests
 
-class PriceCache:
-    """In-memory cache for price data with TTL."""
-
-    def __init__(self, ttl_minutes: int = 60):
-        self.cache: Dict[str, Tuple[Dict, datetime]] = {}
-        self.ttl = timedelta(minutes=ttl_minutes)
+import http_client
+from ibkr_client import IBKRTimeout, run_ibkr_command
+from price_cache import PriceCache
 
-    def get(self, ticker: str) -> Optional[Dict]:
-        """Get cached price if still valid."""
-        if ticker in self.cache:
-            data, timestamp = self.cache[ticker]
-            if datetime.now() - timestamp < self.ttl:
-                return data
-            else:
-                # Expired, remove from cache
-                del self.cache[ticker]
-        return None
 
-    def set(self, ticker: str, data: Dict):
-        """Cache price data with current timestamp."""
-        self.cache[ticker] = (data, datetime.now())
+# Global cache instance
+_price_cache = PriceCache()
 
-    def clear(self):
-        """Clear all cached data."""
-        self.cache.clear()
 
+def _ibkr_price(data: Dict) -> Optional[Dict]:
+    """Convert an ibkr_paper.py quote payload to the price dict shape."""
+    if not data.get("last"):
+        return None
 
-# Global cache instance
-_price_cache = PriceCache()
+    return {
+        "price": data.get("last"),
+        "bid": data.get("bid"),
+        "ask": data.get("ask"),
+        "last": data.get("last"),
+        "timestamp": datetime.now().isoformat(),
+        "source": "IBKR Paper"
+    }
 
 
 def fetch_from_ibkr(ticker: str) -> Optional[Dict]:
     """
     Fetch price from IBKR paper trading account.
 
-    Uses existing ibkr_paper.py script.
+    Goes through the IBKR gateway daemon when running, otherwise a
+    one-shot ibkr_paper.py subprocess (see ibkr_client.py).
 
     Returns:
         Dict with keys: price, bid, ask, last, timestamp, source
         None if fetch fails
     """
     try:
-        script_path = Path(__file__).parent / "ibkr_paper.py"
-
-        result = subprocess.run(
-            [sys.executable, str(script_path), "quote", ticker],
-            capture_output=True,
-            text=True,
-            timeout=30
-        )
+        data = run_ibkr_command("quote", {"ticker": ticker}, timeout=30)
 
-        if result.returncode != 0:
-            print(f"IBKR fetch failed for {ticker}: {result.stderr}", file=sys.stderr)
+        if "error" in data:
+            print(f"IBKR fetch failed for {ticker}: {data['error']}", file=sys.stderr)
             return None
 
-        # Parse JSON output from ibkr_paper.py
-        data = json.loads(result.stdout)
+        return _ibkr_price(data)
 
-        if "error" in data or not data.get("last"):
-            return None
-
-        return {
-            "price": data.get("last"),
-            "bid": data.get("bid"),
-            "ask": data.get("ask"),
-            "last": data.get("last"),
-            "timestamp": datetime.now().isoformat(),
-            "source": "IBKR Paper"
-        }
-
-    except subprocess.TimeoutExpired:
+    except IBKRTimeout:
         print(f"IBKR fetch timeout for {ticker}", file=sys.stderr)
         return None
     except json.JSONDecodeError as e:
@@ -98,6 +81,39 @@ def fetch_from_ibkr(ticker: str) -> Optional[Dict]:
         return None
 
 
+def _stooq_price(symbol_data: Dict) -> Optional[Dict]:
+    """Convert one Stooq quote row to the price dict shape."""
+    if not symbol_data.get("close"):
+        return None
+
+    return {
+        "price": float(symbol_data["close"]),
+        "open": float(symbol_data.get("open", 0)),
+        "high": float(symbol_data.get("high", 0)),
+        "low": float(symbol_data.get("low", 0)),
+        "volume": int(symbol_data.get("volume", 0)),
+        "timestamp": datetime.now().isoformat(),
+        "source": "Stooq (15-min delay)"
+    }
+
+
+def _stooq_url(ticker: str) -> str:
+    # Stooq uses ticker + .us suffix for US stocks
+    return f"https://stooq.com/q/l/?s={ticker}.us&f=sd2t2ohlcv&h&e=json"
+
+
+def _parse_stooq(response) -> Optional[Dict]:
+    """Price dict from a single-symbol Stooq response."""
+    response.raise_for_status()
+
+    data = response.json()
+
+    if not data or "symbols" not in data or not data["symbols"]:
+        return None
+
+    return _stooq_price(data["symbols"][0])
+
+
 def fetch_from_stooq(ticker: str) -> Optional[Dict]:
     """
     Fetch price from Stooq (15-minute delay).
@@ -109,31 +125,20 @@ def fetch_from_stooq(ticker: str) -> Optional[Dict]:
         None if fetch fails
     """
     try:
-        # Stooq uses ticker + .us suffix for US stocks
-        url = f"https://stooq.com/q/l/?s={ticker}.us&f=sd2t2ohlcv&h&e=json"
-
-        response = requests.get(url, timeout=10)
-        response.raise_for_status()
+        return _parse_stooq(http_client.get(_stooq_url(ticker), timeout=10))
 
-        data = response.json()
-
-        if not data or "symbols" not in data or not data["symbols"]:
-            return None
-
-        symbol_data = data["symbols"][0]
+    except requests.RequestException as e:
+        print(f"Stooq fetch error for {ticker}: {e}", file=sys.stderr)
+        return None
+    except (KeyError, ValueError, TypeError) as e:
+        print(f"Stooq data parse error for {ticker}: {e}", file=sys.stderr)
+        return None
 
-        if not symbol_data.get("close"):
-            return None
 
-        return {
-            "price": float(symbol_data["close"]),
-            "open": float(symbol_data.get("open", 0)),
-            "high": float(symbol_data.get("high", 0)),
-            "low": float(symbol_data.get("low", 0)),
-            "volume": int(symbol_data.get("volume", 0)),
-            "timestamp": datetime.now().isoformat(),
-            "source": "Stooq (15-min delay)"
-        }
+async def fetch_from_stooq_async(ticker: str) -> Optional[Dict]:
+    """Async fetch_from_stooq (shared connection pool, see http_client.py)."""
+    try:
+        return _parse_stooq(await http_client.get_async(_stooq_url(ticker), timeout=10))
 
     except requests.RequestException as e:
         print(f"Stooq fetch error for {ticker}: {e}", file=sys.stderr)
@@ -143,6 +148,45 @@ def fetch_from_stooq(ticker: str) -> Optional[Dict]:
         return None
 
 
+def _yahoo_price(current_price, previous_close, fields: Dict) -> Optional[Dict]:
+    """Convert Yahoo chart meta or quote fields to the price dict shape."""
+    if not current_price:
+        return None
+
+    return {
+        "price": float(current_price),
+        "previous_close": float(previous_close or 0),
+        "open": float(fields.get("regularMarketOpen", 0)),
+        "day_high": float(fields.get("regularMarketDayHigh", 0)),
+        "day_low": float(fields.get("regularMarketDayLow", 0)),
+        "volume": int(fields.get("regularMarketVolume", 0)),
+        "timestamp": datetime.now().isoformat(),
+        "source": "Yahoo Finance"
+    }
+
+
+YAHOO_HEADERS = {"User-Agent": "Mozilla/5.0"}
+
+
+def _yahoo_chart_url(ticker: str) -> str:
+    return f"https://query1.finance.yahoo.com/v8/finance/chart/{ticker}"
+
+
+def _parse_yahoo_chart(response) -> Optional[Dict]:
+    """Price dict from a Yahoo chart response."""
+    response.raise_for_status()
+
+    data = response.json()
+
+    if "chart" not in data or "result" not in data["chart"]:
+        return None
+
+    result = data["chart"]["result"][0]
+    meta = result.get("meta", {})
+
+    return _yahoo_price(meta.get("regularMarketPrice"), meta.get("previousClose"), meta)
+
+
 def fetch_from_yahoo(ticker: str) -> Optional[Dict]:
     """
     Fetch price from Yahoo Finance.
@@ -155,68 +199,190 @@ def fetch_from_yahoo(ticker: str) -> Optional[Dict]:
         None if fetch fails
     """
     try:
-        url = f"https://query1.finance.yahoo.com/v8/finance/chart/{ticker}"
         params = {
             "range": "1d",
             "interval": "1m"
         }
+        response = http_client.get(_yahoo_chart_url(ticker), params=params, headers=YAHOO_HEADERS, timeout=10)
+        return _parse_yahoo_chart(response)
 
-        headers = {
-            "User-Agent": "Mozilla/5.0"
-        }
+    except requests.RequestException as e:
+        print(f"Yahoo fetch error for {ticker}: {e}", file=sys.stderr)
+        return None
+    except (KeyError, ValueError, TypeError) as e:
+        print(f"Yahoo data parse error for {ticker}: {e}", file=sys.stderr)
+        return None
+
+
+async def fetch_from_yahoo_async(ticker: str) -> Optional[Dict]:
+    """Async fetch_from_yahoo (shared connection pool, see http_client.py)."""
+    try:
+        params = {"range": "1d", "interval": "1m"}
+        response = await http_client.get_async(
+            _yahoo_chart_url(ticker), params=params, headers=YAHOO_HEADERS, timeout=10
+        )
+        return _parse_yahoo_chart(response)
+
+    except requests.RequestException as e:
+        print(f"Yahoo fetch error for {ticker}: {e}", file=sys.stderr)
+        return None
+    except (KeyError, ValueError, TypeError) as e:
+        print(f"Yahoo data parse error for {ticker}: {e}", file=sys.stderr)
+        return None
+
+
+def fetch_from_ibkr_batch(tickers: List[str]) -> Dict[str, Dict]:
+    """
+    Fetch prices for many tickers with one IBKR batch snapshot.
+
+    All contract lookups and snapshots are in flight together on one
+    connection (ibkr_paper.py quotes), so the wait is bounded once for
+    the whole list.
+
+    Returns:
+        Dict of ticker -> price dict for tickers that returned a last price
+    """
+    if not tickers:
+        return {}
+
+    try:
+        data = run_ibkr_command("quotes", {"tickers": tickers}, timeout=30 + len(tickers))
+    except IBKRTimeout:
+        print(f"IBKR batch fetch timeout for {len(tickers)} tickers", file=sys.stderr)
+        return {}
+    except json.JSONDecodeError as e:
+        print(f"IBKR batch JSON parse error: {e}", file=sys.stderr)
+        return {}
+    except Exception as e:
+        print(f"IBKR batch fetch error: {e}", file=sys.stderr)
+        return {}
+
+    if "error" in data:
+        print(f"IBKR batch fetch failed: {data['error']}", file=sys.stderr)
+        return {}
+
+    prices = {}
+    for ticker, quote in (data.get("quotes") or {}).items():
+        price = _ibkr_price(quote)
+        if price:
+            prices[ticker.upper()] = price
+    return prices
+
+
+def fetch_from_stooq_batch(tickers: List[str]) -> Dict[str, Dict]:
+    """
+    Fetch prices for many tickers with one Stooq multi-symbol request.
 
-        response = requests.get(url, params=params, headers=headers, timeout=10)
+    Stooq accepts symbols joined with "+" on the quote endpoint.
+
+    Returns:
+        Dict of ticker -> price dict for tickers Stooq returned
+    """
+    if not tickers:
+        return {}
+
+    try:
+        symbols = "+".join(f"{ticker.lower()}.us" for ticker in tickers)
+        url = f"https://stooq.com/q/l/?s={symbols}&f=sd2t2ohlcv&h&e=json"
+
+        response = http_client.get(url, timeout=10)
         response.raise_for_status()
 
         data = response.json()
+    except requests.RequestException as e:
+        print(f"Stooq batch fetch error: {e}", file=sys.stderr)
+        return {}
+    except ValueError as e:
+        print(f"Stooq batch data parse error: {e}", file=sys.stderr)
+        return {}
+
+    prices = {}
+    for symbol_data in (data or {}).get("symbols") or []:
+        ticker = str(symbol_data.get("symbol", "")).upper()
+        if ticker.endswith(".US"):
+            ticker = ticker[:-3]
+        try:
+            price = _stooq_price(symbol_data)
+        except (KeyError, ValueError, TypeError):
+            # Unknown symbols come back as "N/D" rows.
+            continue
+        if price:
+            prices[ticker] = price
+    return prices
 
-        if "chart" not in data or "result" not in data["chart"]:
-            return None
 
-        result = data["chart"]["result"][0]
-        meta = result.get("meta", {})
+def fetch_from_yahoo_batch(tickers: List[str]) -> Dict[str, Dict]:
+    """
+    Fetch prices for many tickers from Yahoo Finance.
 
-        current_price = meta.get("regularMarketPrice")
+    Uses the multi-symbol quote endpoint first; tickers it does not return
+    (or all of them, if Yahoo rejects the request) are fetched from the
+    per-ticker chart endpoint concurrently.
 
-        if not current_price:
-            return None
+    Returns:
+        Dict of ticker -> price dict for tickers Yahoo returned
+    """
+    if not tickers:
+        return {}
 
-        return {
-            "price": float(current_price),
-            "previous_close": float(meta.get("previousClose", 0)),
-            "open": float(meta.get("regularMarketOpen", 0)),
-            "day_high": float(meta.get("regularMarketDayHigh", 0)),
-            "day_low": float(meta.get("regularMarketDayLow", 0)),
-            "volume": int(meta.get("regularMarketVolume", 0)),
-            "timestamp": datetime.now().isoformat(),
-            "source": "Yahoo Finance"
-        }
+    prices = {}
+    try:
+        url = "https://query1.finance.yahoo.com/v7/finance/quote"
+        params = {"symbols": ",".join(tickers)}
+        response = http_client.get(url, params=params, headers=YAHOO_HEADERS, timeout=10)
+        response.raise_for_status()
 
+        for quote in response.json().get("quoteResponse", {}).get("result") or []:
+            try:
+                price = _yahoo_price(
+                    quote.get("regularMarketPrice"), quote.get("regularMarketPreviousClose"), quote
+                )
+            except (KeyError, ValueError, TypeError):
+                continue
+            if price:
+                prices[str(quote.get("symbol", "")).upper()] = price
     except requests.RequestException as e:
-        print(f"Yahoo fetch error for {ticker}: {e}", file=sys.stderr)
-        return None
-    except (KeyError, ValueError, TypeError) as e:
-        print(f"Yahoo data parse error for {ticker}: {e}", file=sys.stderr)
-        return None
+        print(f"Yahoo batch quote error, using chart endpoint: {e}", file=sys.stderr)
+    except (AttributeError, ValueError) as e:
+        print(f"Yahoo batch quote parse error, using chart endpoint: {e}", file=sys.stderr)
+
+    missing = [ticker for ticker in tickers if ticker not in prices]
+    prices.update(_fetch_each(fetch_from_yahoo, missing))
+    return prices
 
 
-def fetch_historical_yahoo(ticker: str, days: int = 210) -> Optional[list]:
+def _fetch_each(fetch_func: Callable[[str], Optional[Dict]], tickers: List[str],
+                max_workers: int = 8) -> Dict[str, Dict]:
+    """Run a single-ticker fetcher over tickers concurrently."""
+    if not tickers:
+        return {}
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(tickers))) as executor:
+        results = executor.map(fetch_func, tickers)
+        return {ticker: data for ticker, data in zip(tickers, results) if data}
+
+
+def fetch_historical_yahoo(ticker: str, days: int = 210, use_cache: bool = True) -> Optional[list]:
     """
     Fetch historical daily bars from Yahoo Finance.
 
     Returns:
-        List of dicts with keys: date (YYYY-MM-DD), close, volume
+        List of dicts with keys: date (YYYY-MM-DD), open, high, low, close, volume
         None if fetch fails
     """
+    cache_key = f"yahoo:{ticker.upper()}:{days}"
+    if use_cache:
+        cached = _price_cache.get(cache_key, namespace="historical")
+        if cached:
+            return cached
+
     try:
         url = f"https://query1.finance.yahoo.com/v8/finance/chart/{ticker}"
         params = {
             "range": f"{days}d",
             "interval": "1d",
         }
-        headers = {"User-Agent": "Mozilla/5.0"}
-
-        response = requests.get(url, params=params, headers=headers, timeout=15)
+        response = http_client.get(url, params=params, headers=YAHOO_HEADERS, timeout=15)
         response.raise_for_status()
 
         data = response.json()
@@ -235,6 +401,7 @@ def fetch_historical_yahoo(ticker: str, days: int = 210) -> Optional[list]:
 
         close_values = quotes[0].get("close", [])
         volume_values = quotes[0].get("volume", [])
+        ohlc_values = {column: quotes[0].get(column, []) for column in ("open", "high", "low")}
 
         bars = []
         for idx, ts in enumerate(timestamps):
@@ -243,14 +410,23 @@ def fetch_historical_yahoo(ticker: str, days: int = 210) -> Optional[list]:
                 continue
             volume = volume_values[idx] if idx < len(volume_values) else 0
             date_str = datetime.utcfromtimestamp(ts).date().isoformat()
+            ohlc = {
+                column: float(values[idx])
+                for column, values in ohlc_values.items()
+                if idx < len(values) and values[idx] is not None
+            }
             bars.append(
                 {
                     "date": date_str,
+                    **ohlc,
                     "close": float(close),
                     "volume": int(volume or 0),
                 }
             )
 
+        if bars:
+            _price_cache.set(cache_key, bars, namespace="historical", source="Yahoo Finance",
+                             regular_hours_ttl=_price_cache.historical_ttl)
         return bars
 
     except requests.RequestException as e:
@@ -312,6 +488,107 @@ def fetch_price(ticker: str, use_cache: bool = True) -> Optional[Dict]:
     return None
 
 
+async def fetch_price_async(ticker: str, use_cache: bool = True) -> Optional[Dict]:
+    """
+    Async fetch_price(): same cache and source order, without blocking the loop.
+
+    IBKR runs on a worker thread (gateway socket or subprocess); Stooq and
+    Yahoo go through the shared async HTTP layer, so many tickers - and
+    SEC/FDA calls - can be awaited together with asyncio.gather.
+
+    Args:
+        ticker: Stock ticker symbol
+        use_cache: Whether to check cache first (default: True)
+
+    Returns:
+        Dict with price data and source, or None if all sources fail
+    """
+    ticker = ticker.upper()
+
+    if use_cache:
+        cached = _price_cache.get(ticker)
+        if cached:
+            cached["cache_hit"] = True
+            return cached
+
+    sources = [
+        ("IBKR Paper", lambda t: asyncio.to_thread(fetch_from_ibkr, t)),
+        ("Stooq", fetch_from_stooq_async),
+        ("Yahoo Finance", fetch_from_yahoo_async)
+    ]
+
+    for source_name, fetch_func in sources:
+        try:
+            data = await fetch_func(ticker)
+            if data:
+                data["cache_hit"] = False
+                _price_cache.set(ticker, data)
+                return data
+        except Exception as e:
+            print(f"{source_name} error for {ticker}: {e}", file=sys.stderr)
+            continue
+
+    print(f"ERROR: All price sources failed for {ticker}", file=sys.stderr)
+    return None
+
+
+def fetch_prices(tickers: List[str], use_cache: bool = True) -> Dict[str, Optional[Dict]]:
+    """
+    Fetch prices for many tickers with graceful degradation across sources.
+
+    Same priority order as fetch_price(), but each source receives every
+    outstanding ticker in one batch, and only tickers it failed on fall
+    through to the next source.
+
+    Args:
+        tickers: Stock ticker symbols
+        use_cache: Whether to check cache first (default: True)
+
+    Returns:
+        Dict of ticker -> price dict (same shape as fetch_price), or None
+        for tickers where all sources failed
+    """
+    tickers = list(dict.fromkeys(ticker.upper() for ticker in tickers))
+    results: Dict[str, Optional[Dict]] = {}
+
+    pending = []
+    for ticker in tickers:
+        cached = _price_cache.get(ticker) if use_cache else None
+        if cached:
+            cached["cache_hit"] = True
+            results[ticker] = cached
+        else:
+            pending.append(ticker)
+
+    sources = [
+        ("IBKR Paper", fetch_from_ibkr_batch),
+        ("Stooq", fetch_from_stooq_batch),
+        ("Yahoo Finance", fetch_from_yahoo_batch)
+    ]
+
+    for source_name, fetch_func in sources:
+        if not pending:
+            break
+        try:
+            fetched = fetch_func(pending)
+        except Exception as e:
+            print(f"{source_name} batch error: {e}", file=sys.stderr)
+            continue
+
+        for ticker, data in fetched.items():
+            if ticker not in pending:
+                continue
+            data["cache_hit"] = False
+            _price_cache.set(ticker, data)
+            results[ticker] = data
+        pending = [ticker for ticker in pending if ticker not in results]
+
+    for ticker in pending:
+        print(f"ERROR: All price sources failed for {ticker}", file=sys.stderr)
+
+    return {ticker: results.get(ticker) for ticker in tickers}
+
+
 def get_bid_ask_midpoint(ticker: str) -> Optional[float]:
     """
     Get bid/ask midpoint for limit order pricing.
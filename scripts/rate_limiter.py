@@ -0,0 +1,218 @@
+"""
+Rate Limiter Module
+
+Per-host token buckets shared by every process on the machine.
+
+Skill runs execute in parallel processes, so an in-process limiter lets
+each of them spend the full budget. Bucket state lives in a SQLite file
+under the cache directory (override with IDIO_CACHE_DIR); each acquire is
+one short IMMEDIATE transaction that refills the bucket, takes a token
+and, if the bucket is empty, reserves the next one and returns how long
+to wait. Waiters therefore queue in order without polling.
+
+Buckets are configured in data_sources.http.rate_limits, keyed by host or
+parent domain ("sec.gov" covers data.sec.gov and www.sec.gov, matching
+SEC's 10 requests/second policy across its hosts). Hosts without a bucket
+are not limited.
+
+Every bucket records how many requests were throttled and the total time
+spent waiting.
+
+Usage:
+    python rate_limiter.py stats
+    python rate_limiter.py reset
+"""
+
+import asyncio
+import json
+import sqlite3
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from price_cache import cache_dir
+
+
+class RateLimiter:
+    """Token-bucket limiter with SQLite-backed state shared across processes."""
+
+    def __init__(self, limits: Optional[Dict[str, Dict]] = None, path: Optional[Path] = None):
+        self.limits = limits or {}
+        self._path = Path(path) if path else None
+        self._initialized = set()
+
+    @property
+    def path(self) -> Path:
+        return self._path or cache_dir() / "rate_limits.sqlite"
+
+    def bucket(self, host: str) -> Optional[Tuple[str, float, float]]:
+        """(bucket name, tokens per second, burst) for a host, or None if unlimited."""
+        host = host.lower()
+        for name, limit in self.limits.items():
+            if host == name or host.endswith("." + name):
+                per_second = float(limit.get("per_second", 0))
+                if per_second <= 0:
+                    return None
+                return name, per_second, float(limit.get("burst", per_second))
+        return None
+
+    def _connect(self) -> sqlite3.Connection:
+        path = self.path
+        if path not in self._initialized:
+            path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(path), timeout=10, isolation_level=None)
+        if path not in self._initialized:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS buckets (
+                    name TEXT PRIMARY KEY,
+                    tokens REAL NOT NULL,
+                    updated_at REAL NOT NULL,
+                    acquired INTEGER NOT NULL DEFAULT 0,
+                    throttled INTEGER NOT NULL DEFAULT 0,
+                    throttled_seconds REAL NOT NULL DEFAULT 0,
+                    last_throttled_at REAL
+                )
+                """
+            )
+            self._initialized.add(path)
+        return conn
+
+    def reserve(self, host: str) -> float:
+        """
+        Take a token for `host`.
+
+        Returns:
+            Seconds the caller must wait before sending (0 if a token was free)
+        """
+        bucket = self.bucket(host)
+        if bucket is None:
+            return 0.0
+        name, per_second, burst = bucket
+
+        try:
+            conn = self._connect()
+            try:
+                conn.execute("BEGIN IMMEDIATE")
+                now = time.time()
+                row = conn.execute("SELECT tokens, updated_at FROM buckets WHERE name = ?", (name,)).fetchone()
+                if row is None:
+                    tokens = burst
+                else:
+                    tokens = min(burst, row[0] + (now - row[1]) * per_second)
+
+                # Going negative reserves a future token for this caller.
+                tokens -= 1
+                wait = -tokens / per_second if tokens < 0 else 0.0
+
+                conn.execute(
+                    """
+                    INSERT INTO buckets (name, tokens, updated_at, acquired, throttled, throttled_seconds, last_throttled_at)
+                    VALUES (?, ?, ?, 1, ?, ?, ?)
+                    ON CONFLICT(name) DO UPDATE SET
+                        tokens = excluded.tokens,
+                        updated_at = excluded.updated_at,
+                        acquired = acquired + 1,
+                        throttled = throttled + excluded.throttled,
+                        throttled_seconds = throttled_seconds + excluded.throttled_seconds,
+                        last_throttled_at = COALESCE(excluded.last_throttled_at, last_throttled_at)
+                    """,
+                    (name, tokens, now, int(wait > 0), wait, now if wait > 0 else None),
+                )
+                conn.execute("COMMIT")
+            except sqlite3.Error:
+                if conn.in_transaction:
+                    conn.execute("ROLLBACK")
+                raise
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            # Fail open: a broken state file must not stop data fetching.
+            print(f"Rate limiter error for {host}: {e}", file=sys.stderr)
+            return 0.0
+
+        return wait
+
+    def acquire(self, host: str) -> float:
+        """Block until a request to `host` is allowed. Returns seconds waited."""
+        wait = self.reserve(host)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    async def acquire_async(self, host: str) -> float:
+        """
+        Async acquire(): the SQLite reservation runs in a worker thread (it
+        can block on another process's transaction) and the wait is spent on
+        the event loop. Returns seconds waited.
+        """
+        if self.bucket(host) is None:
+            return 0.0
+        wait = await asyncio.to_thread(self.reserve, host)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+    def stats(self) -> Dict[str, Dict]:
+        """Per-bucket configuration and throttle metrics."""
+        stats = {
+            name: {"per_second": limit.get("per_second"), "burst": limit.get("burst", limit.get("per_second")),
+                   "acquired": 0, "throttled": 0, "throttled_seconds": 0.0, "last_throttled_at": None}
+            for name, limit in self.limits.items()
+        }
+        if not self.path.exists():
+            return stats
+        try:
+            conn = self._connect()
+            try:
+                rows = conn.execute(
+                    "SELECT name, acquired, throttled, throttled_seconds, last_throttled_at FROM buckets"
+                ).fetchall()
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            print(f"Rate limiter stats error: {e}", file=sys.stderr)
+            return stats
+
+        for name, acquired, throttled, throttled_seconds, last_throttled_at in rows:
+            stats.setdefault(name, {}).update({
+                "acquired": acquired,
+                "throttled": throttled,
+                "throttled_seconds": round(throttled_seconds, 3),
+                "last_throttled_at": last_throttled_at,
+            })
+        return stats
+
+    def reset(self):
+        """Drop all bucket state and metrics."""
+        if not self.path.exists():
+            return
+        conn = self._connect()
+        try:
+            conn.execute("DELETE FROM buckets")
+        finally:
+            conn.close()
+
+
+def main():
+    """CLI interface for inspecting shared rate limits."""
+    import argparse
+
+    from http_client import load_http_policy
+
+    parser = argparse.ArgumentParser(description="Inspect shared per-host rate limits")
+    parser.add_argument("command", choices=["stats", "reset"])
+    args = parser.parse_args()
+
+    limiter = RateLimiter(load_http_policy().get("rate_limits", {}))
+    if args.command == "stats":
+        print(json.dumps({"path": str(limiter.path), "buckets": limiter.stats()}, indent=2))
+    elif args.command == "reset":
+        limiter.reset()
+        print(json.dumps({"status": "reset"}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -5,6 +5,7 @@ Fetches FDA regulatory data for PDUFA archetype analysis using the openFDA API.
 
 Working Functions:
 - search_fda_enforcement() - Search FDA drug enforcement reports (recalls, warnings)
+- search_fda_enforcement_async() - Same, for overlapping with SEC/price calls
 
 Manual Lookups Required (not automatable via API):
 - Form 483 with OAI status: Visit FDA FOIA Reading Room
@@ -12,7 +13,8 @@ Manual Lookups Required (not automatable via API):
 - CRL classification: Request via FDA FOIA or check company 8-K filings
 
 Data Sources:
-- openFDA API (free, public, no auth required)
+- openFDA API (free, public, no auth required; 240 req/min, enforced by the
+  shared api.fda.gov bucket in rate_limiter.py)
 
 Usage:
     from regulatory_data import search_fda_enforcement
@@ -23,28 +25,71 @@ Usage:
 
 import requests
 import json
-import time
 from typing import Dict
 import logging
 
+import http_client
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Rate limiting
-LAST_REQUEST_TIME = {}
+FDA_ENFORCEMENT_URL = "https://api.fda.gov/drug/enforcement.json"
+
+
+def _enforcement_params(company_name: str, limit: int) -> Dict:
+    return {
+        "search": f'openfda.manufacturer_name:"{company_name}"',
+        "limit": limit
+    }
+
 
+def _parse_enforcement(response, company_name: str) -> Dict:
+    """Enforcement result dict from an openFDA response."""
+    response.raise_for_status()
+
+    data = response.json()
+    results = data.get("results", [])
+
+    enforcement_actions = []
+    for item in results:
+        enforcement_actions.append({
+            "classification": item.get("classification"),
+            "status": item.get("status"),
+            "recall_initiation_date": item.get("recall_initiation_date"),
+            "product_description": item.get("product_description"),
+            "reason_for_recall": item.get("reason_for_recall")
+        })
+
+    result = {
+        "enforcement_actions": enforcement_actions,
+        "count": len(enforcement_actions),
+        "source": "openfda_api"
+    }
 
-def rate_limit(api_name: str, min_interval_seconds: float = 0.25):
-    """Rate limiter for API calls (respects 240 req/min for openFDA)"""
-    global LAST_REQUEST_TIME
+    logger.info(f"Found {len(enforcement_actions)} enforcement actions for {company_name}")
+    return result
 
-    if api_name in LAST_REQUEST_TIME:
-        elapsed = time.time() - LAST_REQUEST_TIME[api_name]
-        if elapsed < min_interval_seconds:
-            time.sleep(min_interval_seconds - elapsed)
 
-    LAST_REQUEST_TIME[api_name] = time.time()
+def _enforcement_error(e: Exception, company_name: str) -> Dict:
+    """Result dict for a failed search (404 means no results)."""
+    if isinstance(e, requests.exceptions.HTTPError):
+        if e.response is not None and e.response.status_code == 404:
+            # No results found
+            return {
+                "enforcement_actions": [],
+                "count": 0,
+                "source": "openfda_api"
+            }
+        logger.error(f"HTTP error searching FDA enforcement: {e}")
+    else:
+        logger.error(f"Error searching FDA enforcement for {company_name}: {e}")
+    return {
+        "enforcement_actions": [],
+        "count": 0,
+        "source": "error",
+        "error": str(e)
+    }
 
 
 def search_fda_enforcement(company_name: str, limit: int = 10) -> Dict:
@@ -67,63 +112,25 @@ def search_fda_enforcement(company_name: str, limit: int = 10) -> Dict:
     logger.info(f"Searching FDA enforcement for {company_name}")
 
     try:
-        rate_limit("openfda", min_interval_seconds=0.25)  # 240 req/min = 4 req/sec
+        response = http_client.get(FDA_ENFORCEMENT_URL, params=_enforcement_params(company_name, limit), timeout=10)
+        return _parse_enforcement(response, company_name)
 
-        url = "https://api.fda.gov/drug/enforcement.json"
-        params = {
-            "search": f'openfda.manufacturer_name:"{company_name}"',
-            "limit": limit
-        }
+    except Exception as e:
+        return _enforcement_error(e, company_name)
 
-        response = requests.get(url, params=params, timeout=10)
-        response.raise_for_status()
-
-        data = response.json()
-        results = data.get("results", [])
-
-        enforcement_actions = []
-        for item in results:
-            enforcement_actions.append({
-                "classification": item.get("classification"),
-                "status": item.get("status"),
-                "recall_initiation_date": item.get("recall_initiation_date"),
-                "product_description": item.get("product_description"),
-                "reason_for_recall": item.get("reason_for_recall")
-            })
-
-        result = {
-            "enforcement_actions": enforcement_actions,
-            "count": len(enforcement_actions),
-            "source": "openfda_api"
-        }
 
-        logger.info(f"Found {len(enforcement_actions)} enforcement actions for {company_name}")
-        return result
+async def search_fda_enforcement_async(company_name: str, limit: int = 10) -> Dict:
+    """Async search_fda_enforcement (shared connection pool, see http_client.py)."""
+    logger.info(f"Searching FDA enforcement for {company_name}")
+
+    try:
+        response = await http_client.get_async(
+            FDA_ENFORCEMENT_URL, params=_enforcement_params(company_name, limit), timeout=10
+        )
+        return _parse_enforcement(response, company_name)
 
-    except requests.exceptions.HTTPError as e:
-        if e.response.status_code == 404:
-            # No results found
-            return {
-                "enforcement_actions": [],
-                "count": 0,
-                "source": "openfda_api"
-            }
-        else:
-            logger.error(f"HTTP error searching FDA enforcement: {e}")
-            return {
-                "enforcement_actions": [],
-                "count": 0,
-                "source": "error",
-                "error": str(e)
-            }
     except Exception as e:
-        logger.error(f"Error searching FDA enforcement for {company_name}: {e}")
-        return {
-            "enforcement_actions": [],
-            "count": 0,
-            "source": "error",
-            "error": str(e)
-        }
+        return _enforcement_error(e, company_name)
 
 
 # Manual lookup instructions for agent reference
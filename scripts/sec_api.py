@@ -7,16 +7,30 @@ Fetches financial data from SEC EDGAR API for kill screen calculations:
 
 Primary source: SEC XBRL API
 Fallback: Manual calculation from 10-Q/10-K filings
+
+companyfacts documents are cached on disk per CIK (see sec_cache.py) and
+only re-downloaded when SEC reports a change. Requests share pooled
+keep-alive sessions (http_client.py); get_company_facts_async() is the
+asyncio variant for overlapping SEC calls with price and FDA fetches.
 """
 
 import json
 import requests
 import sys
-from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, Optional, Tuple
+from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass
 
+import http_client
+from sec_cache import CompanyFactsCache, TickerIndex, latest_filed_date, normalize_ticker
+from xbrl_extract import REVENUE_CONCEPTS, PeriodRecord, extract_periods
+
+SEC_HEADERS = {"User-Agent": "Trading System research@example.com"}
+
+# Shared on-disk companyfacts cache and ticker -> CIK index
+_facts_cache = CompanyFactsCache()
+_ticker_index = TickerIndex()
+
 
 @dataclass
 class FinancialData:
@@ -54,11 +68,47 @@ class FinancialData:
     source: str = "SEC API"
 
 
+def _load_ticker_index() -> Optional[Dict]:
+    """
+    Ticker -> CIK index, rebuilt from company_tickers.json at most daily.
+
+    Falls back to a stale persisted index if SEC is unreachable.
+    """
+    index = _ticker_index.load()
+    if _ticker_index.is_fresh(index):
+        return index
+
+    try:
+        url = "https://www.sec.gov/files/company_tickers.json"
+        response = http_client.get(url, headers=SEC_HEADERS, timeout=10)
+        response.raise_for_status()
+        return _ticker_index.build(response.json())
+
+    except (requests.RequestException, ValueError, AttributeError) as e:
+        print(f"Error refreshing SEC ticker index: {e}", file=sys.stderr)
+        return index
+
+
+def resolve_ciks(tickers: List[str]) -> Dict[str, Optional[str]]:
+    """
+    Resolve many tickers to CIKs with one index load.
+
+    Args:
+        tickers: Stock ticker symbols (BRK.B and BRK-B both accepted)
+
+    Returns:
+        Dict of upper-case ticker -> CIK (10-digit zero-padded), or None if not found
+    """
+    index = _load_ticker_index() or {}
+    lookup = index.get("tickers", {})
+    return {ticker.upper(): lookup.get(normalize_ticker(ticker)) for ticker in tickers}
+
+
 def get_cik_from_ticker(ticker: str) -> Optional[str]:
     """
     Get CIK (Central Index Key) from ticker symbol.
 
-    Uses SEC company tickers JSON mapping.
+    Uses the persisted SEC company tickers index (see resolve_ciks).
 
     Args:
         ticker: Stock ticker symbol
@@ -66,137 +116,213 @@ def get_cik_from_ticker(ticker: str) -> Optional[str]:
     Returns:
         CIK string (zero-padded to 10 digits), or None if not found
     """
-    try:
-        url = "https://www.sec.gov/files/company_tickers.json"
-        headers = {"User-Agent": "Trading System research@example.com"}
+    return resolve_ciks([ticker]).get(ticker.upper())
 
-        response = requests.get(url, headers=headers, timeout=10)
-        response.raise_for_status()
 
-        data = response.json()
+def get_company_name(cik: str) -> Optional[str]:
+    """
+    Get the registrant name for a CIK from the SEC company tickers index.
 
-        ticker = ticker.upper()
+    Args:
+        cik: Company CIK
 
-        for entry in data.values():
-            if entry.get("ticker") == ticker:
-                cik = str(entry["cik_str"]).zfill(10)
-                return cik
+    Returns:
+        Company name, or None if not found
+    """
+    index = _load_ticker_index() or {}
+    return index.get("names", {}).get(str(cik).zfill(10))
 
-        return None
 
-    except Exception as e:
-        print(f"Error getting CIK for {ticker}: {e}", file=sys.stderr)
-        return None
+def _submissions_url(cik: str) -> str:
+    return f"https://data.sec.gov/submissions/CIK{cik}.json"
+
+
+def _companyfacts_url(cik: str) -> str:
+    return f"https://data.sec.gov/api/xbrl/companyfacts/CIK{cik}.json"
+
+
+def _latest_xbrl_date(response) -> Optional[str]:
+    response.raise_for_status()
 
+    recent = response.json().get("filings", {}).get("recent", {})
+    dates = recent.get("filingDate", [])
+    xbrl_flags = recent.get("isXBRL", [1] * len(dates))
+    xbrl_dates = [filed for filed, is_xbrl in zip(dates, xbrl_flags) if is_xbrl]
+    return max(xbrl_dates) if xbrl_dates else None
 
-def get_company_facts(cik: str) -> Optional[Dict]:
+
+def get_latest_xbrl_submission_date(cik: str) -> Optional[str]:
     """
-    Fetch company facts from SEC XBRL API.
+    Latest filing date with XBRL data, from the SEC submissions feed.
 
-    API: https://data.sec.gov/api/xbrl/companyfacts/CIK{cik}.json
+    API: https://data.sec.gov/submissions/CIK{cik}.json
 
     Args:
         cik: Company CIK (10-digit zero-padded)
 
     Returns:
-        Dict with company facts, or None if fetch fails
+        YYYY-MM-DD of the most recent XBRL filing, or None
     """
     try:
-        url = f"https://data.sec.gov/api/xbrl/companyfacts/CIK{cik}.json"
-        headers = {"User-Agent": "Trading System research@example.com"}
+        return _latest_xbrl_date(http_client.get(_submissions_url(cik), headers=SEC_HEADERS, timeout=10))
+
+    except requests.RequestException as e:
+        print(f"Error fetching submissions for CIK {cik}: {e}", file=sys.stderr)
+        return None
+    except (AttributeError, ValueError, TypeError) as e:
+        print(f"Error parsing submissions for CIK {cik}: {e}", file=sys.stderr)
+        return None
 
-        response = requests.get(url, headers=headers, timeout=15)
-        response.raise_for_status()
 
-        return response.json()
+async def get_latest_xbrl_submission_date_async(cik: str) -> Optional[str]:
+    """Async get_latest_xbrl_submission_date."""
+    try:
+        response = await http_client.get_async(_submissions_url(cik), headers=SEC_HEADERS, timeout=10)
+        return _latest_xbrl_date(response)
 
     except requests.RequestException as e:
-        print(f"Error fetching company facts for CIK {cik}: {e}", file=sys.stderr)
+        print(f"Error fetching submissions for CIK {cik}: {e}", file=sys.stderr)
+        return None
+    except (AttributeError, ValueError, TypeError) as e:
+        print(f"Error parsing submissions for CIK {cik}: {e}", file=sys.stderr)
         return None
 
 
-def extract_latest_value(facts: Dict, concept: str, taxonomy: str = "us-gaap") -> Optional[float]:
-    """
-    Extract latest value for a given XBRL concept.
+def _recent_cached_facts(cik: str, meta: Optional[Dict]) -> Optional[Dict]:
+    """Cached document if it was validated within the revalidation window."""
+    if meta and _facts_cache.is_recent(meta):
+        return _facts_cache.load(cik)
+    return None
 
-    Args:
-        facts: Company facts dict from SEC API
-        concept: XBRL concept name (e.g., "Assets", "Liabilities")
-        taxonomy: XBRL taxonomy (default: "us-gaap")
 
-    Returns:
-        Latest value for the concept, or None if not found
-    """
-    try:
-        if taxonomy not in facts.get("facts", {}):
-            return None
+def _needs_submissions_check(meta: Optional[Dict]) -> bool:
+    """Without HTTP validators, compare against the submissions feed instead."""
+    return bool(meta and not meta.get("etag") and not meta.get("last_modified") and meta.get("latest_filed"))
 
-        if concept not in facts["facts"][taxonomy]:
-            return None
 
-        units = facts["facts"][taxonomy][concept].get("units", {})
+def _unchanged_facts(cik: str, meta: Dict, latest: Optional[str]) -> Optional[Dict]:
+    """Cached document (marked revalidated) if nothing newer was filed."""
+    if latest and latest <= meta["latest_filed"]:
+        facts = _facts_cache.load(cik)
+        if facts:
+            _facts_cache.touch(cik, meta)
+            return facts
+    return None
 
-        # Try USD first, then shares
-        for unit_type in ["USD", "shares", "pure"]:
-            if unit_type in units:
-                values = units[unit_type]
-                # Sort by filing date, get most recent
-                sorted_values = sorted(values, key=lambda x: x.get("end", ""), reverse=True)
 
-                for value in sorted_values:
-                    if "val" in value:
-                        return float(value["val"])
+def _conditional_headers(meta: Optional[Dict]) -> Dict:
+    headers = dict(SEC_HEADERS)
+    if meta and meta.get("etag"):
+        headers["If-None-Match"] = meta["etag"]
+    if meta and meta.get("last_modified"):
+        headers["If-Modified-Since"] = meta["last_modified"]
+    return headers
 
-        return None
 
-    except (KeyError, ValueError, TypeError) as e:
-        print(f"Error extracting {concept}: {e}", file=sys.stderr)
-        return None
+def _store_facts(cik: str, response, use_cache: bool) -> Dict:
+    response.raise_for_status()
+
+    facts = response.json()
+    if use_cache:
+        _facts_cache.store(
+            cik, facts,
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified"),
+        )
+    return facts
+
+
+def _facts_fallback(cik: str, meta: Optional[Dict], error: Exception) -> Optional[Dict]:
+    print(f"Error fetching company facts for CIK {cik}: {error}", file=sys.stderr)
+    if meta:
+        print(f"Using cached company facts for CIK {cik}", file=sys.stderr)
+        return _facts_cache.load(cik)
+    return None
 
 
-def extract_two_periods(facts: Dict, concept: str, taxonomy: str = "us-gaap") -> Tuple[Optional[float], Optional[float]]:
+def get_company_facts(cik: str, use_cache: bool = True) -> Optional[Dict]:
     """
-    Extract latest TWO values for a given XBRL concept (for M-Score calculation).
+    Fetch company facts from SEC XBRL API.
+
+    API: https://data.sec.gov/api/xbrl/companyfacts/CIK{cik}.json
+
+    With use_cache, a cached document validated within the revalidation
+    window is returned without any request. Older entries are revalidated
+    with a conditional GET (ETag / Last-Modified), or, when SEC sent no
+    validators, against the submissions feed's latest XBRL filing date.
+    If SEC is unreachable the cached copy is returned.
 
     Args:
-        facts: Company facts dict from SEC API
-        concept: XBRL concept name
-        taxonomy: XBRL taxonomy (default: "us-gaap")
+        cik: Company CIK (10-digit zero-padded)
+        use_cache: Whether to use the on-disk cache (default: True)
 
     Returns:
-        Tuple of (current_value, previous_value), or (None, None) if not found
+        Dict with company facts, or None if fetch fails
     """
+    cik = str(cik).zfill(10)
+    meta = _facts_cache.meta(cik) if use_cache else None
+
+    facts = _recent_cached_facts(cik, meta)
+    if facts:
+        return facts
+
+    if _needs_submissions_check(meta):
+        facts = _unchanged_facts(cik, meta, get_latest_xbrl_submission_date(cik))
+        if facts:
+            return facts
+
     try:
-        if taxonomy not in facts.get("facts", {}):
-            return (None, None)
+        url = _companyfacts_url(cik)
+        response = http_client.get(url, headers=_conditional_headers(meta), timeout=15)
 
-        if concept not in facts["facts"][taxonomy]:
-            return (None, None)
+        if meta and response.status_code == 304:
+            facts = _facts_cache.load(cik)
+            if facts:
+                _facts_cache.touch(cik, meta)
+                return facts
+            # Cached copy unreadable: fetch unconditionally.
+            response = http_client.get(url, headers=SEC_HEADERS, timeout=15)
 
-        units = facts["facts"][taxonomy][concept].get("units", {})
-
-        for unit_type in ["USD", "shares", "pure"]:
-            if unit_type in units:
-                values = units[unit_type]
-                # Sort by end date (most recent first)
-                sorted_values = sorted(
-                    [v for v in values if "val" in v],
-                    key=lambda x: x.get("end", ""),
-                    reverse=True
-                )
-
-                if len(sorted_values) >= 2:
-                    current = float(sorted_values[0]["val"])
-                    previous = float(sorted_values[1]["val"])
-                    return (current, previous)
-                elif len(sorted_values) == 1:
-                    return (float(sorted_values[0]["val"]), None)
+        return _store_facts(cik, response, use_cache)
 
-        return (None, None)
+    except requests.RequestException as e:
+        return _facts_fallback(cik, meta, e)
 
-    except (KeyError, ValueError, TypeError) as e:
-        print(f"Error extracting two periods for {concept}: {e}", file=sys.stderr)
-        return (None, None)
+
+async def get_company_facts_async(cik: str, use_cache: bool = True) -> Optional[Dict]:
+    """
+    Async get_company_facts(): same caching and revalidation rules.
+
+    Requests go through the shared async HTTP layer (http_client.py), so
+    many companies - and price/FDA calls - can be awaited together.
+    """
+    cik = str(cik).zfill(10)
+    meta = _facts_cache.meta(cik) if use_cache else None
+
+    facts = _recent_cached_facts(cik, meta)
+    if facts:
+        return facts
+
+    if _needs_submissions_check(meta):
+        facts = _unchanged_facts(cik, meta, await get_latest_xbrl_submission_date_async(cik))
+        if facts:
+            return facts
+
+    try:
+        url = _companyfacts_url(cik)
+        response = await http_client.get_async(url, headers=_conditional_headers(meta), timeout=15)
+
+        if meta and response.status_code == 304:
+            facts = _facts_cache.load(cik)
+            if facts:
+                _facts_cache.touch(cik, meta)
+                return facts
+            response = await http_client.get_async(url, headers=SEC_HEADERS, timeout=15)
+
+        return _store_facts(cik, response, use_cache)
+
+    except requests.RequestException as e:
+        return _facts_fallback(cik, meta, e)
 
 
 def parse_financials(ticker: str, cik: Optional[str] = None) -> Optional[FinancialData]:
@@ -220,51 +346,54 @@ def parse_financials(ticker: str, cik: Optional[str] = None) -> Optional[Financi
     if not facts:
         return None
 
-    # Extract key metrics
     try:
-        # Basic balance sheet
-        total_assets = extract_latest_value(facts, "Assets") or 0
-        current_assets = extract_latest_value(facts, "AssetsCurrent") or 0
-        current_liabilities = extract_latest_value(facts, "LiabilitiesCurrent") or 0
-
-        # Try multiple XBRL tags for revenue (companies use different ones)
-        revenue = (extract_latest_value(facts, "Revenues") or
-                  extract_latest_value(facts, "RevenueFromContractWithCustomerExcludingAssessedTax") or
-                  extract_latest_value(facts, "SalesRevenueNet") or 0)
-
-        # Gross profit (Revenue - COGS)
-        gross_profit = extract_latest_value(facts, "GrossProfit") or 0
-
-        return FinancialData(
-            total_assets=total_assets,
-            current_assets=current_assets,
-            total_liabilities=extract_latest_value(facts, "Liabilities") or 0,
-            current_liabilities=current_liabilities,
-            retained_earnings=extract_latest_value(facts, "RetainedEarningsAccumulatedDeficit") or 0,
-            working_capital=current_assets - current_liabilities,
-            ppe=extract_latest_value(facts, "PropertyPlantAndEquipmentNet") or 0,
-            long_term_debt=extract_latest_value(facts, "LongTermDebt") or 0,
-            revenue=revenue,
-            ebit=extract_latest_value(facts, "OperatingIncomeLoss") or 0,
-            net_income=extract_latest_value(facts, "NetIncomeLoss") or 0,
-            gross_profit=gross_profit,
-            sga_expenses=extract_latest_value(facts, "SellingGeneralAndAdministrativeExpense") or 0,
-            depreciation=extract_latest_value(facts, "DepreciationDepletionAndAmortization") or 0,
-            accounts_receivable=extract_latest_value(facts, "AccountsReceivableNetCurrent") or 0,
-            operating_cash_flow=extract_latest_value(facts, "NetCashProvidedByUsedInOperatingActivities") or 0,
-            cash_and_equivalents=extract_latest_value(facts, "CashAndCashEquivalentsAtCarryingValue") or 0,
-            market_cap=0,  # Will be calculated separately from price data
-            shares_outstanding=extract_latest_value(facts, "CommonStockSharesOutstanding") or 0,
-            filing_date=datetime.now().isoformat(),
-            fiscal_period="Latest available",
-            source="SEC XBRL API"
-        )
+        current, _ = extract_periods(facts)
+        if not current:
+            print(f"No 10-K/10-Q facts for {ticker}", file=sys.stderr)
+            return None
+        return _financial_data(current)
 
     except Exception as e:
         print(f"Error parsing financials for {ticker}: {e}", file=sys.stderr)
         return None
 
 
+def _financial_data(period: PeriodRecord, revenue_concept: Optional[str] = None) -> FinancialData:
+    """Build FinancialData from one extracted period (missing concepts become 0)."""
+    def value(concept):
+        return period.get(concept) or 0
+
+    if revenue_concept:
+        revenue = value(revenue_concept)
+    else:
+        _, revenue = period.first(REVENUE_CONCEPTS)
+
+    return FinancialData(
+        total_assets=value("Assets"),
+        current_assets=value("AssetsCurrent"),
+        total_liabilities=value("Liabilities"),
+        current_liabilities=value("LiabilitiesCurrent"),
+        retained_earnings=value("RetainedEarningsAccumulatedDeficit"),
+        working_capital=value("AssetsCurrent") - value("LiabilitiesCurrent"),
+        ppe=value("PropertyPlantAndEquipmentNet"),
+        long_term_debt=value("LongTermDebt"),
+        revenue=revenue or 0,
+        ebit=value("OperatingIncomeLoss"),
+        net_income=value("NetIncomeLoss"),
+        gross_profit=value("GrossProfit"),
+        sga_expenses=value("SellingGeneralAndAdministrativeExpense"),
+        depreciation=value("DepreciationDepletionAndAmortization"),
+        accounts_receivable=value("AccountsReceivableNetCurrent"),
+        operating_cash_flow=value("NetCashProvidedByUsedInOperatingActivities"),
+        cash_and_equivalents=value("CashAndCashEquivalentsAtCarryingValue"),
+        market_cap=0,  # Will be calculated separately from price data
+        shares_outstanding=value("CommonStockSharesOutstanding"),
+        filing_date=period.filed or "",
+        fiscal_period=period.fiscal_period,
+        source="SEC XBRL API"
+    )
+
+
 def fetch_two_periods(ticker: str, cik: Optional[str] = None) -> Tuple[Optional[FinancialData], Optional[FinancialData]]:
     """
     Fetch current AND previous period financials for M-Score calculation.
@@ -282,77 +411,19 @@ def fetch_two_periods(ticker: str, cik: Optional[str] = None) -> Tuple[Optional[
         return (None, None)
 
     try:
-        # Extract TWO periods for each metric
-        ar_curr, ar_prev = extract_two_periods(facts, "AccountsReceivableNetCurrent")
-        rev_curr, rev_prev = extract_two_periods(facts, "Revenues")
-        if not rev_curr:
-            rev_curr, rev_prev = extract_two_periods(facts, "RevenueFromContractWithCustomerExcludingAssessedTax")
-
-        ta_curr, ta_prev = extract_two_periods(facts, "Assets")
-        ca_curr, ca_prev = extract_two_periods(facts, "AssetsCurrent")
-        cl_curr, cl_prev = extract_two_periods(facts, "LiabilitiesCurrent")
-        ppe_curr, ppe_prev = extract_two_periods(facts, "PropertyPlantAndEquipmentNet")
-        gp_curr, gp_prev = extract_two_periods(facts, "GrossProfit")
-        sga_curr, sga_prev = extract_two_periods(facts, "SellingGeneralAndAdministrativeExpense")
-        dep_curr, dep_prev = extract_two_periods(facts, "DepreciationDepletionAndAmortization")
-        ltd_curr, ltd_prev = extract_two_periods(facts, "LongTermDebt")
-        cash_curr, cash_prev = extract_two_periods(facts, "CashAndCashEquivalentsAtCarryingValue")
-
-        # Build current period
-        current = FinancialData(
-            total_assets=ta_curr or 0,
-            current_assets=ca_curr or 0,
-            total_liabilities=extract_latest_value(facts, "Liabilities") or 0,
-            current_liabilities=cl_curr or 0,
-            retained_earnings=extract_latest_value(facts, "RetainedEarningsAccumulatedDeficit") or 0,
-            working_capital=(ca_curr or 0) - (cl_curr or 0),
-            ppe=ppe_curr or 0,
-            long_term_debt=ltd_curr or 0,
-            revenue=rev_curr or 0,
-            ebit=extract_latest_value(facts, "OperatingIncomeLoss") or 0,
-            net_income=extract_latest_value(facts, "NetIncomeLoss") or 0,
-            gross_profit=gp_curr or 0,
-            sga_expenses=sga_curr or 0,
-            depreciation=dep_curr or 0,
-            accounts_receivable=ar_curr or 0,
-            operating_cash_flow=extract_latest_value(facts, "NetCashProvidedByUsedInOperatingActivities") or 0,
-            cash_and_equivalents=cash_curr or 0,
-            market_cap=0,
-            shares_outstanding=extract_latest_value(facts, "CommonStockSharesOutstanding") or 0,
-            filing_date=datetime.now().isoformat(),
-            fiscal_period="Current",
-            source="SEC XBRL API"
-        )
+        # One pass over all concepts; previous is the same fiscal period a year earlier
+        current_period, previous_period = extract_periods(facts)
+        if not current_period:
+            return (None, None)
 
-        # Build previous period (if available)
-        if ta_prev and rev_prev:
-            previous = FinancialData(
-                total_assets=ta_prev,
-                current_assets=ca_prev or 0,
-                total_liabilities=0,  # Not needed for M-Score ratios
-                current_liabilities=cl_prev or 0,
-                retained_earnings=0,
-                working_capital=(ca_prev or 0) - (cl_prev or 0),
-                ppe=ppe_prev or 0,
-                long_term_debt=ltd_prev or 0,
-                revenue=rev_prev,
-                ebit=0,
-                net_income=0,
-                gross_profit=gp_prev or 0,
-                sga_expenses=sga_prev or 0,
-                depreciation=dep_prev or 0,
-                accounts_receivable=ar_prev or 0,
-                operating_cash_flow=0,
-                cash_and_equivalents=cash_prev or 0,
-                market_cap=0,
-                shares_outstanding=0,
-                filing_date="",
-                fiscal_period="Previous",
-                source="SEC XBRL API"
-            )
-            return (current, previous)
-        else:
-            return (current, None)
+        # Use the same revenue tag for both periods
+        revenue_concept, _ = current_period.first(REVENUE_CONCEPTS)
+        current = _financial_data(current_period, revenue_concept)
+
+        if (previous_period and previous_period.get("Assets")
+                and revenue_concept and previous_period.get(revenue_concept)):
+            return (current, _financial_data(previous_period, revenue_concept))
+        return (current, None)
 
     except Exception as e:
         print(f"Error fetching two periods for {ticker}: {e}", file=sys.stderr)
@@ -511,7 +582,8 @@ def get_latest_filing_date(cik: str) -> Optional[str]:
     """
     Get the date of the most recent SEC filing.
 
-    Used for cache invalidation logic.
+    Used for cache invalidation logic. Served from the companyfacts cache
+    metadata, so it costs no extra download once the facts are cached.
 
     Args:
         cik: Company CIK
@@ -524,20 +596,11 @@ def get_latest_filing_date(cik: str) -> Optional[str]:
         if not facts:
             return None
 
-        # Extract filing dates from any concept's values
-        us_gaap = facts.get("facts", {}).get("us-gaap", {})
-
-        latest_date = None
-
-        for concept_data in us_gaap.values():
-            units = concept_data.get("units", {})
-            for unit_values in units.values():
-                for value in unit_values:
-                    filed = value.get("filed")
-                    if filed and (not latest_date or filed > latest_date):
-                        latest_date = filed
+        meta = _facts_cache.meta(str(cik).zfill(10))
+        if meta and meta.get("latest_filed"):
+            return meta["latest_filed"]
 
-        return latest_date
+        return latest_filed_date(facts)
 
     except Exception as e:
         print(f"Error getting latest filing date: {e}", file=sys.stderr)
@@ -0,0 +1,319 @@
+"""
+SEC Cache Module
+
+On-disk caches for SEC EDGAR data:
+- XBRL companyfacts documents, one per CIK
+- The ticker -> CIK / CIK -> name index from company_tickers.json
+- XBRL frames (one concept across all filers for one period)
+
+companyfacts JSON is often several MB and only changes when the company
+files. Each document is stored gzip-compressed in
+cache/sec/companyfacts/CIK{cik}.json.gz with a small sidecar
+(CIK{cik}.meta.json) holding the HTTP validators (ETag, Last-Modified),
+the latest "filed" date inside the document and when it was last
+validated. sec_api.get_company_facts uses the sidecar to skip the request
+entirely within the revalidation window, then to revalidate with a
+conditional GET or against the submissions feed.
+
+The ticker index is rebuilt from company_tickers.json at most once per
+sec_ticker_index_hours (default 24) and persisted as a compact
+cache/sec/ticker_index.json, so lookups are dict hits instead of a
+download and linear scan per ticker.
+
+Frames are stored gzip-compressed in cache/sec/frames/ and re-downloaded
+after sec_frames_hours (default 24); late and amended filings keep
+adding companies to recent periods.
+
+Usage:
+    python sec_cache.py stats
+    python sec_cache.py clear
+"""
+
+import gzip
+import json
+import os
+import sys
+import tempfile
+import time
+from datetime import timedelta
+from pathlib import Path
+from typing import Dict, Optional
+
+from price_cache import cache_dir, load_cache_policy
+
+DEFAULT_REVALIDATE_HOURS = 12
+DEFAULT_TICKER_INDEX_HOURS = 24
+DEFAULT_FRAMES_HOURS = 24
+
+
+def normalize_ticker(ticker: str) -> str:
+    """SEC ticker form: upper case, class separator as '-' (BRK.B -> BRK-B)."""
+    return ticker.strip().upper().replace(".", "-").replace("/", "-")
+
+
+def latest_filed_date(facts: Dict) -> Optional[str]:
+    """Most recent "filed" date across all taxonomies in a companyfacts document."""
+    latest = None
+    for taxonomy in facts.get("facts", {}).values():
+        for concept_data in taxonomy.values():
+            for unit_values in concept_data.get("units", {}).values():
+                for value in unit_values:
+                    filed = value.get("filed")
+                    if filed and (latest is None or filed > latest):
+                        latest = filed
+    return latest
+
+
+class CompanyFactsCache:
+    """Compressed per-CIK companyfacts files plus validator sidecars."""
+
+    def __init__(self, root: Optional[Path] = None, revalidate_hours: Optional[float] = None):
+        self._root = Path(root) if root else None
+        self.revalidate_after = timedelta(hours=revalidate_hours or load_cache_policy().get(
+            "sec_revalidate_hours", DEFAULT_REVALIDATE_HOURS))
+        # Decompressed documents already loaded by this process.
+        self._loaded: Dict[str, Dict] = {}
+
+    @property
+    def root(self) -> Path:
+        return self._root or cache_dir() / "sec" / "companyfacts"
+
+    def _data_path(self, cik: str) -> Path:
+        return self.root / f"CIK{cik}.json.gz"
+
+    def _meta_path(self, cik: str) -> Path:
+        return self.root / f"CIK{cik}.meta.json"
+
+    def meta(self, cik: str) -> Optional[Dict]:
+        """Validator metadata for a cached CIK, or None if not cached."""
+        path = self._meta_path(cik)
+        if not path.exists() or not self._data_path(cik).exists():
+            return None
+        try:
+            return json.loads(path.read_text())
+        except (OSError, json.JSONDecodeError):
+            return None
+
+    def is_recent(self, meta: Optional[Dict]) -> bool:
+        """Whether the entry was validated recently enough to skip any request."""
+        if not meta:
+            return False
+        return time.time() - meta.get("validated_at", 0) < self.revalidate_after.total_seconds()
+
+    def load(self, cik: str) -> Optional[Dict]:
+        """Load the cached companyfacts document."""
+        if cik in self._loaded:
+            return self._loaded[cik]
+        try:
+            with gzip.open(self._data_path(cik), "rt", encoding="utf-8") as handle:
+                facts = json.load(handle)
+        except (OSError, EOFError, json.JSONDecodeError) as e:
+            print(f"SEC cache read error for CIK {cik}: {e}", file=sys.stderr)
+            return None
+        self._loaded[cik] = facts
+        return facts
+
+    def store(self, cik: str, facts: Dict, etag: Optional[str] = None,
+              last_modified: Optional[str] = None) -> Dict:
+        """Write a fresh document and its validators. Returns the new metadata."""
+        meta = {
+            "cik": cik,
+            "etag": etag,
+            "last_modified": last_modified,
+            "latest_filed": latest_filed_date(facts),
+            "fetched_at": time.time(),
+            "validated_at": time.time(),
+        }
+        try:
+            self.root.mkdir(parents=True, exist_ok=True)
+            self._atomic_write(self._data_path(cik), gzip.compress(json.dumps(facts).encode("utf-8")))
+            self._atomic_write(self._meta_path(cik), json.dumps(meta, indent=2).encode("utf-8"))
+        except OSError as e:
+            print(f"SEC cache write error for CIK {cik}: {e}", file=sys.stderr)
+        self._loaded[cik] = facts
+        return meta
+
+    def touch(self, cik: str, meta: Dict) -> Dict:
+        """Record a successful revalidation (document unchanged)."""
+        meta = dict(meta, validated_at=time.time())
+        try:
+            self._atomic_write(self._meta_path(cik), json.dumps(meta, indent=2).encode("utf-8"))
+        except OSError as e:
+            print(f"SEC cache write error for CIK {cik}: {e}", file=sys.stderr)
+        return meta
+
+    def _atomic_write(self, path: Path, payload: bytes):
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as handle:
+                handle.write(payload)
+            os.replace(tmp_name, path)
+        except OSError:
+            if os.path.exists(tmp_name):
+                os.unlink(tmp_name)
+            raise
+
+    def clear(self):
+        """Remove all cached documents."""
+        self._loaded.clear()
+        if not self.root.exists():
+            return
+        for path in self.root.iterdir():
+            if path.name.startswith("CIK"):
+                path.unlink()
+
+    def stats(self) -> Dict:
+        """Number of cached CIKs and their compressed size on disk."""
+        files = list(self.root.glob("CIK*.json.gz")) if self.root.exists() else []
+        return {
+            "path": str(self.root),
+            "companies": len(files),
+            "compressed_bytes": sum(path.stat().st_size for path in files),
+            "revalidate_hours": self.revalidate_after.total_seconds() / 3600,
+        }
+
+
+class TickerIndex:
+    """Persisted ticker -> CIK and CIK -> name maps built from company_tickers.json."""
+
+    def __init__(self, path: Optional[Path] = None, max_age_hours: Optional[float] = None):
+        self._path = Path(path) if path else None
+        self.max_age = timedelta(hours=max_age_hours or load_cache_policy().get(
+            "sec_ticker_index_hours", DEFAULT_TICKER_INDEX_HOURS))
+        self._index: Optional[Dict] = None
+
+    @property
+    def path(self) -> Path:
+        return self._path or cache_dir() / "sec" / "ticker_index.json"
+
+    def load(self) -> Optional[Dict]:
+        """Load the persisted index (kept in memory after the first read)."""
+        if self._index is not None:
+            return self._index
+        try:
+            self._index = json.loads(self.path.read_text())
+        except (OSError, json.JSONDecodeError):
+            return None
+        return self._index
+
+    def is_fresh(self, index: Optional[Dict]) -> bool:
+        """Whether the index was built within max_age."""
+        if not index:
+            return False
+        return time.time() - index.get("built_at", 0) < self.max_age.total_seconds()
+
+    def build(self, company_tickers: Dict) -> Dict:
+        """
+        Build and persist the index from the raw company_tickers.json payload.
+
+        Args:
+            company_tickers: {"0": {"cik_str": 320193, "ticker": "AAPL", "title": "Apple Inc."}, ...}
+
+        Returns:
+            Index dict with "tickers" (ticker -> 10-digit CIK) and "names" (CIK -> title)
+        """
+        tickers = {}
+        names = {}
+        for entry in company_tickers.values():
+            ticker = entry.get("ticker")
+            if not ticker or entry.get("cik_str") is None:
+                continue
+            cik = str(entry["cik_str"]).zfill(10)
+            # First listing wins, matching the order SEC publishes.
+            tickers.setdefault(normalize_ticker(ticker), cik)
+            names.setdefault(cik, entry.get("title"))
+
+        index = {"built_at": time.time(), "tickers": tickers, "names": names}
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_name = tempfile.mkstemp(dir=self.path.parent, suffix=".tmp")
+            with os.fdopen(fd, "w") as handle:
+                json.dump(index, handle, separators=(",", ":"))
+            os.replace(tmp_name, self.path)
+        except OSError as e:
+            print(f"SEC ticker index write error: {e}", file=sys.stderr)
+        self._index = index
+        return index
+
+
+class FrameCache:
+    """Compressed XBRL frame documents, refreshed by file age."""
+
+    def __init__(self, root: Optional[Path] = None, max_age_hours: Optional[float] = None):
+        self._root = Path(root) if root else None
+        self.max_age = timedelta(hours=max_age_hours or load_cache_policy().get(
+            "sec_frames_hours", DEFAULT_FRAMES_HOURS))
+
+    @property
+    def root(self) -> Path:
+        return self._root or cache_dir() / "sec" / "frames"
+
+    def _path(self, taxonomy: str, concept: str, unit: str, period: str) -> Path:
+        return self.root / f"{taxonomy}_{concept}_{unit}_{period}.json.gz"
+
+    def load(self, taxonomy: str, concept: str, unit: str, period: str,
+             max_age: Optional[timedelta] = None) -> Optional[Dict]:
+        """Cached frame, or None if missing or older than max_age (default: self.max_age)."""
+        path = self._path(taxonomy, concept, unit, period)
+        max_age = self.max_age if max_age is None else max_age
+        try:
+            if time.time() - path.stat().st_mtime >= max_age.total_seconds():
+                return None
+            with gzip.open(path, "rt", encoding="utf-8") as handle:
+                return json.load(handle)
+        except (OSError, EOFError, json.JSONDecodeError):
+            return None
+
+    def store(self, taxonomy: str, concept: str, unit: str, period: str, frame: Dict):
+        path = self._path(taxonomy, concept, unit, period)
+        try:
+            self.root.mkdir(parents=True, exist_ok=True)
+            fd, tmp_name = tempfile.mkstemp(dir=self.root, suffix=".tmp")
+            with os.fdopen(fd, "wb") as handle:
+                handle.write(gzip.compress(json.dumps(frame).encode("utf-8")))
+            os.replace(tmp_name, path)
+        except OSError as e:
+            print(f"SEC frame cache write error for {concept} {period}: {e}", file=sys.stderr)
+
+    def clear(self):
+        if not self.root.exists():
+            return
+        for path in self.root.glob("*.json.gz"):
+            path.unlink()
+
+
+def main():
+    """CLI interface for inspecting the SEC caches."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Inspect the SEC companyfacts, ticker index and frames caches")
+    parser.add_argument("command", choices=["stats", "clear"])
+    args = parser.parse_args()
+
+    cache = CompanyFactsCache()
+    index = TickerIndex()
+    frames = FrameCache()
+    if args.command == "stats":
+        loaded = index.load() or {}
+        print(json.dumps({
+            "companyfacts": cache.stats(),
+            "ticker_index": {
+                "path": str(index.path),
+                "tickers": len(loaded.get("tickers", {})),
+                "fresh": index.is_fresh(loaded),
+            },
+            "frames": {
+                "path": str(frames.root),
+                "files": len(list(frames.root.glob("*.json.gz"))) if frames.root.exists() else 0,
+            },
+        }, indent=2))
+    elif args.command == "clear":
+        cache.clear()
+        frames.clear()
+        if index.path.exists():
+            index.path.unlink()
+        print(json.dumps({"status": "cleared"}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,345 @@
+"""
+SEC Frames Module
+
+Universe-wide kill screen pre-screen from SEC XBRL frames.
+
+A frame is one concept for one period across every filer
+(data.sec.gov/api/xbrl/frames/us-gaap/Assets/USD/CY2024Q4I.json), so the
+inputs for Beneish M-Score and Altman Z-Score for thousands of companies
+take ~25 requests instead of one companyfacts download per company.
+
+The frames are stacked into a cross-sectional table (one row per CIK,
+one NumPy column per concept and period) and both scores are computed in
+a single vectorized pass with the same formulas and zero-handling as
+sec_api.calculate_m_score / calculate_z_score.
+
+Limitations of the pre-screen:
+- Calendar-aligned periods (CY2024 / CY2024Q4I); off-calendar fiscal
+  years land in the nearest calendar frame.
+- Frames carry no prices, so the Z-Score market cap term (X4) is 0 and
+  the score is a lower bound: a Z pass is a real pass, a Z fail needs the
+  per-ticker fetch_all check.
+- Industry is unknown, so the general Z threshold (1.81) is used.
+
+Usage:
+    python sec_frames.py prescreen --year 2024
+    python sec_frames.py prescreen --year 2024 --output /tmp/prescreen.json --limit 500
+"""
+
+import json
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import requests
+
+import http_client
+from sec_api import SEC_HEADERS, _load_ticker_index
+from sec_cache import FrameCache
+from xbrl_extract import REVENUE_CONCEPTS
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+FRAMES_URL = "https://data.sec.gov/api/xbrl/frames/{taxonomy}/{concept}/{unit}/{period}.json"
+
+# Balance sheet concepts (instant frames)
+INSTANT_CONCEPTS = (
+    "Assets",
+    "AssetsCurrent",
+    "Liabilities",
+    "LiabilitiesCurrent",
+    "RetainedEarningsAccumulatedDeficit",
+    "PropertyPlantAndEquipmentNet",
+    "LongTermDebt",
+    "AccountsReceivableNetCurrent",
+    "CashAndCashEquivalentsAtCarryingValue",
+)
+
+# Income statement concepts (annual duration frames)
+DURATION_CONCEPTS = REVENUE_CONCEPTS + (
+    "GrossProfit",
+    "SellingGeneralAndAdministrativeExpense",
+    "DepreciationDepletionAndAmortization",
+    "OperatingIncomeLoss",
+)
+
+M_SCORE_THRESHOLD = -1.78
+Z_SCORE_THRESHOLD = 1.81
+
+_frame_cache = FrameCache()
+
+
+def frame_periods(year: int) -> Tuple[str, str]:
+    """Frame period names (duration, instant) for a calendar year."""
+    return f"CY{year}", f"CY{year}Q4I"
+
+
+def fetch_frame(concept: str, period: str, unit: str = "USD", taxonomy: str = "us-gaap",
+                use_cache: bool = True) -> Optional[Dict]:
+    """
+    Fetch one XBRL frame (one concept, one period, all filers).
+
+    Args:
+        concept: XBRL concept name (e.g., "Assets")
+        period: Frame period (CY2024 for annual durations, CY2024Q4I for instants)
+        unit: Unit of measure (default: "USD")
+        taxonomy: XBRL taxonomy (default: "us-gaap")
+        use_cache: Serve from the on-disk frame cache when recent
+
+    Returns:
+        Frame dict with a "data" list of {cik, entityName, end, val, ...}, or None
+    """
+    if use_cache:
+        cached = _frame_cache.load(taxonomy, concept, unit, period)
+        if cached is not None:
+            return cached
+
+    url = FRAMES_URL.format(taxonomy=taxonomy, concept=concept, unit=unit, period=period)
+    try:
+        response = http_client.get(url, headers=SEC_HEADERS, timeout=30)
+        if response.status_code == 404:
+            # No filer reported this concept for the period
+            return None
+        response.raise_for_status()
+        frame = response.json()
+        _frame_cache.store(taxonomy, concept, unit, period, frame)
+        return frame
+
+    except (requests.RequestException, ValueError) as e:
+        print(f"Error fetching frame {concept} {period}: {e}", file=sys.stderr)
+        # A stale frame beats no frame for a pre-screen
+        return _frame_cache.load(taxonomy, concept, unit, period, max_age=timedelta.max)
+
+
+def fetch_frames(year: int, use_cache: bool = True) -> Dict[str, Dict]:
+    """
+    Fetch every frame the kill screens need for `year` and the year before.
+
+    Returns:
+        Dict of column name -> frame; columns are "{concept}" for `year`
+        and "{concept}_prev" for the year before
+    """
+    frames = {}
+    for suffix, frame_year in (("", year), ("_prev", year - 1)):
+        duration, instant = frame_periods(frame_year)
+        for concept in INSTANT_CONCEPTS:
+            frames[concept + suffix] = fetch_frame(concept, instant, use_cache=use_cache)
+        for concept in DURATION_CONCEPTS:
+            frames[concept + suffix] = fetch_frame(concept, duration, use_cache=use_cache)
+    return frames
+
+
+def build_table(frames: Dict[str, Optional[Dict]]) -> Tuple[np.ndarray, Dict[int, str], Dict[str, np.ndarray]]:
+    """
+    Stack frames into a cross-sectional table aligned by CIK.
+
+    Args:
+        frames: Dict of column name -> frame (None for unavailable frames)
+
+    Returns:
+        (ciks, names, columns): sorted CIK array, CIK -> entity name, and
+        column name -> float array aligned with ciks (NaN where not reported)
+    """
+    parsed = {}
+    names = {}
+    for column, frame in frames.items():
+        data = (frame or {}).get("data", [])
+        ciks = np.fromiter((row["cik"] for row in data), dtype=np.int64, count=len(data))
+        values = np.fromiter((row["val"] for row in data), dtype=np.float64, count=len(data))
+        parsed[column] = (ciks, values)
+        for row in data:
+            names.setdefault(row["cik"], row.get("entityName"))
+
+    all_ciks = np.unique(np.concatenate([ciks for ciks, _ in parsed.values()] or [np.empty(0, np.int64)]))
+    columns = {}
+    for column, (ciks, values) in parsed.items():
+        array = np.full(len(all_ciks), np.nan)
+        array[np.searchsorted(all_ciks, ciks)] = values
+        columns[column] = array
+    return all_ciks, names, columns
+
+
+def _safe_ratio(numerator: np.ndarray, denominator: np.ndarray, default: float = 1.0) -> np.ndarray:
+    """Vectorized sec_api safe_ratio: default where the denominator is 0."""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(denominator == 0, default, numerator / np.where(denominator == 0, 1.0, denominator))
+
+
+def _revenue(columns: Dict[str, np.ndarray], size: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Revenue for both years using the first tag each company reports (same tag for both)."""
+    current = np.full(size, np.nan)
+    previous = np.full(size, np.nan)
+    for concept in REVENUE_CONCEPTS:
+        cur = columns.get(concept, np.full(size, np.nan))
+        prev = columns.get(concept + "_prev", np.full(size, np.nan))
+        use = np.isnan(current) & ~np.isnan(cur)
+        current[use] = cur[use]
+        previous[use] = prev[use]
+    return current, previous
+
+
+def compute_scores(columns: Dict[str, np.ndarray], size: int) -> Dict[str, np.ndarray]:
+    """
+    Vectorized Beneish M-Score and Altman Z-Score (X4 = 0) over the table.
+
+    Missing values count as 0, as in FinancialData. M-Score is NaN where the
+    previous year's assets or revenue are missing; Z-Score is NaN where
+    total assets are missing.
+    """
+    def col(name):
+        return np.nan_to_num(columns.get(name, np.full(size, np.nan)), nan=0.0)
+
+    rev_raw, rev_prev_raw = _revenue(columns, size)
+    rev, rev_prev = np.nan_to_num(rev_raw), np.nan_to_num(rev_prev_raw)
+
+    ta, ta_prev = col("Assets"), col("Assets_prev")
+    ca, ca_prev = col("AssetsCurrent"), col("AssetsCurrent_prev")
+    cl, cl_prev = col("LiabilitiesCurrent"), col("LiabilitiesCurrent_prev")
+    ppe, ppe_prev = col("PropertyPlantAndEquipmentNet"), col("PropertyPlantAndEquipmentNet_prev")
+    ar, ar_prev = col("AccountsReceivableNetCurrent"), col("AccountsReceivableNetCurrent_prev")
+    gp, gp_prev = col("GrossProfit"), col("GrossProfit_prev")
+    sga, sga_prev = col("SellingGeneralAndAdministrativeExpense"), col("SellingGeneralAndAdministrativeExpense_prev")
+    dep, dep_prev = col("DepreciationDepletionAndAmortization"), col("DepreciationDepletionAndAmortization_prev")
+    ltd, ltd_prev = col("LongTermDebt"), col("LongTermDebt_prev")
+    cash, cash_prev = col("CashAndCashEquivalentsAtCarryingValue"), col("CashAndCashEquivalentsAtCarryingValue_prev")
+    wc, wc_prev = ca - cl, ca_prev - cl_prev
+
+    dsri = _safe_ratio(_safe_ratio(ar, rev), _safe_ratio(ar_prev, rev_prev))
+    gmi = _safe_ratio(_safe_ratio(gp_prev, rev_prev), _safe_ratio(gp, rev))
+    aqi = _safe_ratio(1 - _safe_ratio(ca + ppe, ta, 0), 1 - _safe_ratio(ca_prev + ppe_prev, ta_prev, 0))
+    sgi = _safe_ratio(rev, rev_prev)
+    depi = _safe_ratio(_safe_ratio(dep_prev, ppe_prev + dep_prev, 0), _safe_ratio(dep, ppe + dep, 0))
+    sgai = _safe_ratio(_safe_ratio(sga, rev), _safe_ratio(sga_prev, rev_prev))
+    lvgi = _safe_ratio(_safe_ratio(ltd + cl, ta), _safe_ratio(ltd_prev + cl_prev, ta_prev))
+    tata = _safe_ratio((wc - wc_prev) - (cash - cash_prev) - dep, ta, 0)
+
+    m_score = (
+        -4.84
+        + 0.920 * dsri
+        + 0.528 * gmi
+        + 0.404 * aqi
+        + 0.892 * sgi
+        + 0.115 * depi
+        - 0.172 * sgai
+        + 4.679 * tata
+        - 0.327 * lvgi
+    )
+    has_previous = (ta_prev != 0) & (rev_prev != 0)
+    m_score = np.where(has_previous, m_score, np.nan)
+
+    z_score = np.where(ta != 0, (
+        1.2 * _safe_ratio(wc, ta, 0)
+        + 1.4 * _safe_ratio(col("RetainedEarningsAccumulatedDeficit"), ta, 0)
+        + 3.3 * _safe_ratio(col("OperatingIncomeLoss"), ta, 0)
+        + 1.0 * np.where(rev > 0, _safe_ratio(rev, ta, 0), 0)
+    ), np.nan)
+
+    return {"m_score": m_score, "z_score": z_score, "total_assets": np.where(ta != 0, ta, np.nan)}
+
+
+def _cik_tickers() -> Dict[int, str]:
+    """CIK -> ticker from the SEC ticker index (first listed share class)."""
+    index = _load_ticker_index() or {}
+    tickers = {}
+    for ticker, cik in index.get("tickers", {}).items():
+        tickers.setdefault(int(cik), ticker)
+    return tickers
+
+
+def prescreen(year: int, limit: Optional[int] = None, use_cache: bool = True) -> Dict:
+    """
+    Rank all filers by the frames-based kill screens.
+
+    Companies passing both screens come first, ordered by M-Score (lowest
+    manipulation risk first); then companies failing a screen, then those
+    missing data.
+
+    Args:
+        year: Calendar year of the current period (previous = year - 1)
+        limit: Keep only the top N rows
+        use_cache: Use the on-disk frame cache
+
+    Returns:
+        Pre-screen document ready to write to universe/screened/
+    """
+    frames = fetch_frames(year, use_cache=use_cache)
+    ciks, names, columns = build_table(frames)
+    scores = compute_scores(columns, len(ciks))
+    m_score, z_score = scores["m_score"], scores["z_score"]
+
+    m_pass = m_score <= M_SCORE_THRESHOLD
+    z_pass = z_score >= Z_SCORE_THRESHOLD
+    complete = ~np.isnan(m_score) & ~np.isnan(z_score)
+    passed = complete & m_pass & z_pass
+
+    # Sort: passed, then failed, then incomplete; within each by M-Score
+    group = np.where(passed, 0, np.where(complete, 1, 2))
+    order = np.lexsort((np.nan_to_num(m_score, nan=np.inf), group))
+    if limit:
+        order = order[:limit]
+
+    tickers = _cik_tickers()
+    companies = []
+    for rank, row in enumerate(order, start=1):
+        cik = int(ciks[row])
+        companies.append({
+            "rank": rank,
+            "cik": str(cik).zfill(10),
+            "ticker": tickers.get(cik),
+            "company": names.get(cik),
+            "m_score": None if np.isnan(m_score[row]) else round(float(m_score[row]), 3),
+            "z_score": None if np.isnan(z_score[row]) else round(float(z_score[row]), 3),
+            "m_score_pass": bool(m_pass[row]),
+            "z_score_pass": bool(z_pass[row]),
+            "kill_screens_passed": bool(passed[row]),
+            "total_assets": None if np.isnan(scores["total_assets"][row]) else float(scores["total_assets"][row]),
+        })
+
+    duration, instant = frame_periods(year)
+    return {
+        "generated_at": datetime.now().isoformat(),
+        "source": "SEC XBRL frames",
+        "periods": {"duration": duration, "instant": instant, "previous": list(frame_periods(year - 1))},
+        "thresholds": {"m_score": M_SCORE_THRESHOLD, "z_score": Z_SCORE_THRESHOLD},
+        "note": "Z-Score excludes the market cap term (lower bound); confirm with data_fetcher.py fetch_all before acting",
+        "frames_missing": sorted(column for column, frame in frames.items() if frame is None),
+        "summary": {
+            "companies": int(len(ciks)),
+            "scored": int(complete.sum()),
+            "passed": int(passed.sum()),
+        },
+        "companies": companies,
+    }
+
+
+def main():
+    """CLI interface for the frames pre-screen."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Universe-wide M-Score/Z-Score pre-screen from SEC XBRL frames")
+    subparsers = parser.add_subparsers(dest="command")
+
+    prescreen_parser = subparsers.add_parser("prescreen", help="Rank all filers by frames-based kill screens")
+    prescreen_parser.add_argument("--year", type=int, default=datetime.now().year - 1,
+                                  help="Calendar year of the current period (default: last year)")
+    prescreen_parser.add_argument("--output", help="Output file (default: universe/screened/prescreen-CY{year}.json)")
+    prescreen_parser.add_argument("--limit", type=int, help="Keep only the top N companies")
+    prescreen_parser.add_argument("--no-cache", action="store_true", help="Re-download all frames")
+
+    args = parser.parse_args()
+    if args.command != "prescreen":
+        parser.print_help()
+        sys.exit(1)
+
+    result = prescreen(args.year, limit=args.limit, use_cache=not args.no_cache)
+    output = Path(args.output) if args.output else REPO_ROOT / "universe" / "screened" / f"prescreen-CY{args.year}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(result, indent=2))
+
+    print(json.dumps({"output": str(output), **result["summary"]}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
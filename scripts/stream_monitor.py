@@ -0,0 +1,422 @@
+#!/usr/bin/env python3
+"""
+Stream Monitor Module
+
+Streaming market data mode for the monitor skill. Subscribes to every
+active position in trades/active/*.json on one IBKR connection, keeps a
+live in-memory price/Greeks table and evaluates exit rules on every tick,
+so stop breaches and info parity price signals are caught intraday
+without polling.
+
+Rules evaluated per trade (schema/exits.json):
+- stop_loss: underlying price at or below position.stop_price (hard exit)
+- info_parity_price: price has moved >50% of the way from entry to target
+- exit_signal: weighted_sum with the live price signal reaches the
+  exit_50_percent / full_exit threshold (2.0/3.0, options 1.5/2.5); the
+  media and IV signals come from the trade's latest monitoring entry
+
+Alerts are edge-triggered: each fires once when its condition becomes
+true and re-arms after the condition clears, so a price hovering at the
+stop does not flood alerts.json.
+
+Output is one JSON line per event on stdout: alerts as they fire and a
+final {"type": "snapshot"} with the live table. With --write-alerts,
+alerts are also added to the alert store (alert_store.py), which shows
+them in alerts.json.
+
+Uses its own client id (broker client_id + 2, or IBKR_STREAM_CLIENT_ID)
+so it can run next to the gateway daemon and one-shot order commands.
+
+Usage:
+    python stream_monitor.py run                    # until Ctrl-C
+    python stream_monitor.py run --duration 3600 --write-alerts
+    python stream_monitor.py watches                # show what would be watched
+"""
+
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import indicators
+from alert_store import AlertStore
+from ibkr_requests import ASK_TICKS, BID_TICKS, LAST_TICKS, tick_value
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+TRADES_DIR = REPO_ROOT / "trades" / "active"
+
+# Info parity price signal: >50% move toward target
+PRICE_SIGNAL_THRESHOLD = 0.5
+
+# weighted_sum thresholds (schema/exits.json logic / options_adjustments)
+EXIT_THRESHOLDS = {"exit_50_percent": 2.0, "full_exit": 3.0}
+OPTIONS_EXIT_THRESHOLDS = {"exit_50_percent": 1.5, "full_exit": 2.5}
+
+DEFAULT_WEIGHTS = {"media": 1.0, "iv": 1.0, "price": 1.0}
+
+# Seconds between connection liveness checks while streaming
+HEARTBEAT_SECONDS = 5
+
+
+@dataclass
+class Watch:
+    """One active trade and the levels its exit rules are evaluated against."""
+    trade_id: str
+    ticker: str
+    archetype: Optional[str]
+    entry_price: Optional[float]
+    stop_price: Optional[float]
+    target_price: Optional[float]
+    weights: Dict[str, float] = field(default_factory=lambda: dict(DEFAULT_WEIGHTS))
+    signals: Dict[str, float] = field(default_factory=dict)
+    thresholds: Dict[str, float] = field(default_factory=lambda: dict(EXIT_THRESHOLDS))
+    option: Optional[Dict] = None
+
+    @property
+    def option_key(self) -> Optional[str]:
+        """Live table key for the option leg, e.g. 'RGNX 2026-03-20 15.0 CALL'."""
+        if not self.option:
+            return None
+        return f"{self.ticker} {self.option['expiration']} {self.option['strike']} {self.option['right']}"
+
+
+def _optional_float(value) -> Optional[float]:
+    try:
+        return float(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def watch_from_trade(trade: Dict) -> Optional[Watch]:
+    """
+    Build a Watch from a trade file (None if it has no ticker).
+
+    Options trades (options_position) watch the underlying for stop and
+    price signals plus the option leg for Greeks; the entry reference is
+    the underlying price at entry, and weights/thresholds come from
+    options_exit_plan.
+    """
+    ticker = (trade.get("ticker") or "").upper()
+    if not ticker:
+        return None
+
+    position = trade.get("position") or {}
+    options_position = trade.get("options_position") or {}
+    exit_plan = trade.get("options_exit_plan") if options_position else trade.get("exit_plan")
+    exit_plan = exit_plan or {}
+    weights = {
+        name: float(value)
+        for name, value in (exit_plan.get("info_parity_weights") or DEFAULT_WEIGHTS).items()
+        if isinstance(value, (int, float))
+    }
+    thresholds = dict(OPTIONS_EXIT_THRESHOLDS if options_position else EXIT_THRESHOLDS)
+    thresholds.update({
+        level: float(value)
+        for level, value in (exit_plan.get("info_parity_thresholds") or {}).items()
+        if level in thresholds and isinstance(value, (int, float))
+    })
+    monitoring = trade.get("monitoring") or []
+    latest = (monitoring[-1].get("info_parity") or {}) if monitoring else {}
+
+    option = None
+    if options_position.get("strike") and options_position.get("expiration"):
+        option = {
+            "strike": float(options_position["strike"]),
+            "expiration": options_position["expiration"],
+            "right": (options_position.get("right") or "CALL").upper(),
+        }
+
+    entry = position.get("entry_price")
+    if entry is None:
+        entry = options_position.get("underlying_price_at_entry")
+
+    return Watch(
+        trade_id=trade.get("trade_id") or ticker,
+        ticker=ticker,
+        archetype=trade.get("archetype"),
+        entry_price=_optional_float(entry),
+        stop_price=_optional_float(position.get("stop_price")),
+        target_price=_optional_float(position.get("target_price")),
+        weights=weights or dict(DEFAULT_WEIGHTS),
+        signals={name: float(latest.get(name) or 0) for name in ("media", "iv")},
+        thresholds=thresholds,
+        option=option,
+    )
+
+
+def load_watches(trades_dir: Optional[Path] = None) -> List[Watch]:
+    """Watches for trades/active/*.json (unreadable files are skipped)."""
+    watches = []
+    for trade_file in sorted(Path(trades_dir or TRADES_DIR).glob("*.json")):
+        try:
+            watch = watch_from_trade(json.loads(trade_file.read_text()))
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"Skipping {trade_file.name}: {e}", file=sys.stderr)
+            continue
+        if watch is not None:
+            watches.append(watch)
+    return watches
+
+
+def tick_price(ticks: Dict) -> Optional[float]:
+    """Last trade price, else bid/ask mid (real-time or delayed tick ids)."""
+    last = tick_value(ticks, LAST_TICKS)
+    if last is not None:
+        return last
+    bid = tick_value(ticks, BID_TICKS)
+    ask = tick_value(ticks, ASK_TICKS)
+    if bid is not None and ask is not None:
+        return (bid + ask) / 2
+    return None
+
+
+class StreamMonitor:
+    """
+    Live price/Greeks table plus edge-triggered exit rule evaluation.
+
+    on_stock_tick/on_option_tick are called from the IBKR reader thread;
+    every alert that fires is passed to `on_alert` and returned.
+    """
+
+    def __init__(self, watches: List[Watch], on_alert: Optional[Callable[[Dict], None]] = None):
+        self.watches = watches
+        self.on_alert = on_alert
+        self.table = {}
+        self.options = {}
+        self._by_ticker = {}
+        for watch in watches:
+            self._by_ticker.setdefault(watch.ticker, []).append(watch)
+        self._active = set()
+        self._lock = threading.Lock()
+
+    @property
+    def tickers(self) -> List[str]:
+        return list(self._by_ticker)
+
+    def on_stock_tick(self, ticker: str, ticks: Dict) -> List[Dict]:
+        """Update the table row for `ticker` and evaluate its trades."""
+        price = tick_price(ticks)
+        with self._lock:
+            self.table[ticker] = {
+                "price": price,
+                "bid": tick_value(ticks, BID_TICKS),
+                "ask": tick_value(ticks, ASK_TICKS),
+                "last": tick_value(ticks, LAST_TICKS),
+                "updated_at": datetime.now().isoformat(),
+            }
+            if price is None:
+                return []
+            alerts = []
+            for watch in self._by_ticker.get(ticker, []):
+                alerts.extend(self._evaluate(watch, price))
+
+        for alert in alerts:
+            if self.on_alert is not None:
+                self.on_alert(alert)
+        return alerts
+
+    def on_option_tick(self, key: str, ticks: Dict):
+        """Update the Greeks row for an option leg."""
+        greeks = ticks.get("greeks", {})
+        with self._lock:
+            self.options[key] = {
+                "price": tick_price(ticks),
+                **{name: greeks.get(name) for name in ("implied_volatility", "delta", "gamma", "vega", "theta")},
+                "updated_at": datetime.now().isoformat(),
+            }
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            return {"stocks": dict(self.table), "options": dict(self.options)}
+
+    def _edge(self, key, condition: bool) -> bool:
+        """True only when `condition` turns on; clears the latch when it turns off."""
+        if not condition:
+            self._active.discard(key)
+            return False
+        if key in self._active:
+            return False
+        self._active.add(key)
+        return True
+
+    def _evaluate(self, watch: Watch, price: float) -> List[Dict]:
+        alerts = []
+        details = {"current_price": price, "entry_price": watch.entry_price}
+
+        if watch.stop_price is not None and self._edge((watch.trade_id, "stop_loss"), price <= watch.stop_price):
+            alerts.append(build_alert(
+                watch, "stop_loss", "immediate",
+                f"Price ${price:.2f} at or below stop ${watch.stop_price:.2f}. Hard exit.",
+                {**details, "stop_price": watch.stop_price},
+            ))
+
+        if watch.entry_price is None or watch.target_price is None:
+            return alerts
+
+        progress = indicators.to_optional(indicators.price_vs_target(price, watch.entry_price, watch.target_price))
+        price_signal = progress is not None and progress >= PRICE_SIGNAL_THRESHOLD
+        signals = {**watch.signals, "price": 1.0 if price_signal else 0.0}
+        weighted_sum = round(sum(watch.weights.get(name, 0.0) * value for name, value in signals.items()), 3)
+        details.update({
+            "target_price": watch.target_price,
+            "price_vs_target": None if progress is None else round(progress, 4),
+            "weighted_sum": weighted_sum,
+            "signals": signals,
+        })
+
+        if self._edge((watch.trade_id, "info_parity_price"), price_signal):
+            alerts.append(build_alert(
+                watch, "info_parity_price", "daily_digest",
+                f"Price signal on: {progress:.0%} of the move from entry to target.",
+                details,
+            ))
+
+        for level, action in (("full_exit", "Full exit"), ("exit_50_percent", "Exit 50%")):
+            threshold = watch.thresholds[level]
+            if self._edge((watch.trade_id, level), weighted_sum >= threshold):
+                alerts.append(build_alert(
+                    watch, "exit_signal", "immediate",
+                    f"Info parity weighted sum = {weighted_sum}. {action} recommended.",
+                    {**details, "threshold": threshold, "level": level},
+                ))
+                break
+        return alerts
+
+
+def build_alert(watch: Watch, alert_type: str, priority: str, message: str, details: Dict) -> Dict:
+    """Alert in the alerts.json format (monitor skill, Step 4)."""
+    now = datetime.now()
+    return {
+        "id": f"ALERT-{now.strftime('%Y%m%d%H%M%S')}-{watch.ticker}-{alert_type}",
+        "timestamp": now.isoformat(),
+        "priority": priority,
+        "type": alert_type,
+        "trade_id": watch.trade_id,
+        "ticker": watch.ticker,
+        "message": message,
+        "details": details,
+        "action_required": priority == "immediate",
+        "acknowledged": False,
+        "source": "stream_monitor",
+    }
+
+
+_alert_store: Optional[AlertStore] = None
+
+
+def append_alert(alert: Dict, alerts_file: Optional[Path] = None):
+    """Add an alert to the alert store (alerts.json view, or `alerts_file` instead)."""
+    global _alert_store
+    try:
+        if alerts_file is not None:
+            AlertStore(active_file=alerts_file).add(alert)
+            return
+        if _alert_store is None:
+            _alert_store = AlertStore()
+        _alert_store.add(alert)
+    except (OSError, sqlite3.Error) as e:
+        print(f"Failed to write alert: {e}", file=sys.stderr)
+
+
+def _emit(event: Dict):
+    print(json.dumps(event), flush=True)
+
+
+def _subscribe_all(app, monitor: StreamMonitor, timeout: int) -> List:
+    """Resolve contracts and start one subscription per ticker and option leg."""
+    from ibkr_paper import build_option_contract, resolve_contracts, subscribe_market_data
+
+    app.reqMarketDataType(4)
+    contracts, lookups = resolve_contracts(app, monitor.tickers, timeout)
+    for pending in lookups:
+        for err in pending.errors:
+            print(f"IBKR error {err['code']}: {err['message']}", file=sys.stderr)
+
+    subscriptions = []
+    for ticker, contract in contracts.items():
+        subscriptions.append(subscribe_market_data(
+            app, contract, lambda pending, ticker=ticker: monitor.on_stock_tick(ticker, pending.ticks)
+        ))
+    for watch in monitor.watches:
+        if watch.option is None:
+            continue
+        contract = build_option_contract(watch.ticker, watch.option["expiration"],
+                                         watch.option["strike"], watch.option["right"])
+        subscriptions.append(subscribe_market_data(
+            app, contract, lambda pending, key=watch.option_key: monitor.on_option_tick(key, pending.ticks), "106"
+        ))
+    return subscriptions
+
+
+def run(duration: Optional[float] = None, write_alerts: bool = False, timeout: int = 15):
+    """Stream until `duration` seconds pass or Ctrl-C; reconnects if the connection drops."""
+    from ibkr_paper import IBKRApp, resolve_connection_settings, start_app
+
+    watches = load_watches()
+    if not watches:
+        print("ERROR: No active trades to monitor", file=sys.stderr)
+        sys.exit(1)
+
+    def on_alert(alert):
+        _emit({"type": "alert", "alert": alert})
+        if write_alerts:
+            append_alert(alert)
+
+    monitor = StreamMonitor(watches, on_alert=on_alert)
+    settings = resolve_connection_settings()
+    settings["client_id"] = int(os.getenv("IBKR_STREAM_CLIENT_ID", settings["client_id"] + 2))
+    deadline = time.monotonic() + duration if duration else None
+
+    app = None
+    subscriptions = []
+    try:
+        while deadline is None or time.monotonic() < deadline:
+            if app is None or not app.isConnected():
+                app = IBKRApp()
+                try:
+                    start_app(app, settings, timeout)
+                except RuntimeError as exc:
+                    print(f"ERROR: {exc}", file=sys.stderr)
+                    app = None
+                    time.sleep(HEARTBEAT_SECONDS)
+                    continue
+                subscriptions = _subscribe_all(app, monitor, timeout)
+                _emit({"type": "status", "status": "streaming", "client_id": settings["client_id"],
+                       "tickers": monitor.tickers, "subscriptions": len(subscriptions)})
+            remaining = HEARTBEAT_SECONDS if deadline is None else min(HEARTBEAT_SECONDS, deadline - time.monotonic())
+            time.sleep(max(remaining, 0))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if app is not None:
+            for pending in subscriptions:
+                app.finish_request(pending)
+            app.disconnect()
+        _emit({"type": "snapshot", "timestamp": datetime.now().isoformat(), "table": monitor.snapshot()})
+
+
+def main():
+    """CLI interface for streaming monitor mode."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Stream market data for active trades and alert on exit rules")
+    parser.add_argument("command", choices=["run", "watches"])
+    parser.add_argument("--duration", type=float, help="Seconds to stream (default: until Ctrl-C)")
+    parser.add_argument("--write-alerts", action="store_true", help="Also append alerts to alerts.json")
+    parser.add_argument("--timeout", type=int, default=15, help="Connection/contract lookup timeout (seconds)")
+    args = parser.parse_args()
+
+    if args.command == "watches":
+        print(json.dumps([asdict(watch) for watch in load_watches()], indent=2))
+    else:
+        run(duration=args.duration, write_alerts=args.write_alerts, timeout=args.timeout)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,586 @@
+"""
+Trade Repository Module
+
+Indexed access to trade files in trades/active, trades/passed and
+trades/closed (JSON files only; closed .md write-ups are not indexed).
+
+Skills used to glob and parse every trade document in full, including
+monitoring arrays that grow by one entry per trade per day. The
+repository keeps an index (cache/trade_index.json, see
+price_cache.cache_dir) with, per file:
+- trade_id, ticker, archetype, status (the directory: active, passed,
+  closed), instrument_type, catalyst_date, linked_event, date
+- the position block and a summary of the latest monitoring entry
+  (date, price, unrealized P&L, weighted_sum, action)
+- byte offsets of every top-level section and of the last monitoring entry
+
+A file is re-indexed only when its size or mtime changes, so queries and
+portfolio summaries never parse monitoring histories. section() reads and
+parses only the bytes of one section. append_monitoring() inserts the new
+entry at the end of the monitoring array under an exclusive lock on
+<trade>.json.lock (a side file, stable across the renames below): in place
+when only closing brackets follow it (monitoring is the last section),
+otherwise by splicing it into a temp copy that replaces the file
+atomically. Either way the index offsets are shifted instead of re-scanned.
+
+Trades without a trade_id (older pass files) are keyed by file name.
+
+Usage:
+    from trade_repository import TradeRepository
+
+    repo = TradeRepository()
+    for trade in repo.find(status="active", archetype="pdufa"):
+        print(trade["trade_id"], trade["catalyst_date"], trade["latest"])
+    plan = repo.section("TRD-20260119-RGNX-PDUFA", "exit_plan")
+    repo.append_monitoring("TRD-20260119-RGNX-PDUFA", {"date": "2026-01-26", "price": 14.2, ...})
+
+    python trade_repository.py list --status active [--ticker LULU] [--archetype activist]
+    python trade_repository.py list --linked-event EVT-2026-038
+    python trade_repository.py list --catalyst-from 2026-02-01 --catalyst-to 2026-02-28
+    python trade_repository.py show TRD-20260119-RGNX-PDUFA [--section position]
+    python trade_repository.py summary
+    python trade_repository.py append-monitoring TRD-20260119-RGNX-PDUFA '{"date": "2026-01-26", ...}'
+"""
+
+import fcntl
+import json
+import os
+import re
+import sys
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from price_cache import cache_dir
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+TRADES_ROOT = REPO_ROOT / "trades"
+
+STATUSES = ("active", "passed", "closed")
+
+INDEX_VERSION = 1
+
+# Latest-entry fields kept in the index for portfolio summaries
+LATEST_FIELDS = ("date", "price", "unrealized_pnl", "change_from_entry_pct", "weighted_sum", "action")
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_ISO_DATE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+_DECODER = json.JSONDecoder()
+
+# Bytes that may follow the last monitoring entry for an in-place append
+_CLOSING = b" \t\r\n]}"
+
+
+def _skip(text: str, pos: int) -> int:
+    return _WHITESPACE.match(text, pos).end()
+
+
+def scan_sections(raw: bytes) -> Tuple[Dict[str, List[int]], Optional[Dict]]:
+    """
+    Byte spans of the top-level sections of a JSON object.
+
+    The document is decoded as latin-1 (one character per byte), so the
+    decoder's character offsets are byte offsets into the UTF-8 file.
+
+    Returns:
+        ({section: [start, end]}, monitoring) where monitoring has the
+        offset of the array's "[", the entry count and the last entry's span
+        (None if there is no monitoring array)
+    """
+    text = raw.decode("latin-1")
+    pos = _skip(text, 0)
+    if text[pos:pos + 1] != "{":
+        raise ValueError("trade file is not a JSON object")
+    pos = _skip(text, pos + 1)
+
+    sections, monitoring = {}, None
+    while text[pos:pos + 1] != "}":
+        key, pos = _DECODER.raw_decode(text, pos)
+        pos = _skip(text, pos)
+        if text[pos:pos + 1] != ":":
+            raise ValueError(f"expected ':' at byte {pos}")
+        start = _skip(text, pos + 1)
+        if key == "monitoring" and text[start:start + 1] == "[":
+            count, last, end = _scan_array(text, start)
+            monitoring = {"open": start, "count": count, "last": last}
+        else:
+            _, end = _DECODER.raw_decode(text, start)
+        sections[key] = [start, end]
+        pos = _skip(text, end)
+        if text[pos:pos + 1] == ",":
+            pos = _skip(text, pos + 1)
+    return sections, monitoring
+
+
+def _scan_array(text: str, start: int) -> Tuple[int, Optional[List[int]], int]:
+    """Entry count, last entry span and end offset of the array at `start`."""
+    pos = _skip(text, start + 1)
+    count, last = 0, None
+    while text[pos:pos + 1] != "]":
+        _, end = _DECODER.raw_decode(text, pos)
+        count, last = count + 1, [pos, end]
+        pos = _skip(text, end)
+        if text[pos:pos + 1] == ",":
+            pos = _skip(text, pos + 1)
+    return count, last, pos + 1
+
+
+def _summarize_latest(entry: Optional[Dict]) -> Optional[Dict]:
+    if not isinstance(entry, dict):
+        return None
+    return {field: entry.get(field) for field in LATEST_FIELDS if field in entry}
+
+
+def _build_record(rel_path: str, status: str, raw: bytes, stat: os.stat_result) -> Dict:
+    """Index record for one trade file."""
+    trade = json.loads(raw)
+    sections, monitoring = scan_sections(raw)
+    thesis = trade.get("thesis") if isinstance(trade.get("thesis"), dict) else {}
+    decision = trade.get("decision") if isinstance(trade.get("decision"), dict) else {}
+    position = trade.get("position") if isinstance(trade.get("position"), dict) else None
+    history = trade.get("monitoring") if isinstance(trade.get("monitoring"), list) else []
+
+    return {
+        "path": rel_path,
+        "mtime_ns": stat.st_mtime_ns,
+        "size": stat.st_size,
+        "trade_id": trade.get("trade_id") or Path(rel_path).stem,
+        "ticker": (trade.get("ticker") or "").upper() or None,
+        "archetype": trade.get("archetype"),
+        "status": status,
+        "instrument_type": trade.get("instrument_type"),
+        "catalyst_date": thesis.get("catalyst_date"),
+        "linked_event": thesis.get("linked_event") or trade.get("event_id"),
+        "date": decision.get("date") or trade.get("decision_date") or trade.get("date"),
+        "position": position,
+        "options_position": trade.get("options_position"),
+        "sections": sections,
+        "monitoring": monitoring,
+        "latest": _summarize_latest(history[-1] if history else None),
+    }
+
+
+def _locked(path: Path):
+    """Exclusive lock on `<trade file>.lock`, serialising appends across processes."""
+    handle = open(path.with_name(path.name + ".lock"), "w")
+    fcntl.flock(handle, fcntl.LOCK_EX)
+    return handle
+
+
+def _replace_file(path: Path, raw: bytes):
+    """Atomically replace `path` with `raw` (temp file in the same directory and rename)."""
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as out:
+            out.write(raw)
+            out.flush()
+            os.fsync(out.fileno())
+        os.chmod(tmp_name, path.stat().st_mode & 0o777)
+        os.replace(tmp_name, path)
+    except OSError:
+        if os.path.exists(tmp_name):
+            os.unlink(tmp_name)
+        raise
+
+
+def _public(record: Dict) -> Dict:
+    """Index record without the file offsets."""
+    public = {key: value for key, value in record.items()
+              if key not in ("sections", "monitoring", "mtime_ns", "size")}
+    public["monitoring_entries"] = (record.get("monitoring") or {}).get("count", 0)
+    return public
+
+
+class TradeRepository:
+    """
+    Index over trade JSON files with lazy section reads and in-place monitoring appends.
+
+    The index is shared by every process through cache/trade_index.json
+    (written to a temp file and renamed); offsets are only used after the
+    file's size and mtime have been checked against the index.
+    """
+
+    def __init__(self, root: Optional[Path] = None, index_path: Optional[Path] = None):
+        self.root = Path(root) if root else TRADES_ROOT
+        self._index_path = Path(index_path) if index_path else None
+        self._records: Dict[str, Dict] = {}
+        self._loaded_mtime = None
+        self._lock = threading.RLock()
+
+    @property
+    def index_path(self) -> Path:
+        return self._index_path or cache_dir() / "trade_index.json"
+
+    # ------------------------------------------------------------------
+    # Index maintenance
+    # ------------------------------------------------------------------
+
+    def _load_index(self):
+        try:
+            mtime = self.index_path.stat().st_mtime_ns
+        except FileNotFoundError:
+            return
+        if mtime == self._loaded_mtime:
+            return
+        try:
+            data = json.loads(self.index_path.read_text())
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"Rebuilding trade index ({e})", file=sys.stderr)
+            return
+        if data.get("version") == INDEX_VERSION and data.get("root") == str(self.root):
+            self._records = data.get("files", {})
+        self._loaded_mtime = mtime
+
+    def _save_index(self):
+        try:
+            self.index_path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_name = tempfile.mkstemp(dir=self.index_path.parent, suffix=".tmp")
+            with os.fdopen(fd, "w") as handle:
+                json.dump({"version": INDEX_VERSION, "root": str(self.root), "files": self._records}, handle)
+            os.replace(tmp_name, self.index_path)
+            self._loaded_mtime = self.index_path.stat().st_mtime_ns
+        except OSError as e:
+            print(f"Could not write trade index: {e}", file=sys.stderr)
+
+    def _index_file(self, rel_path: str, status: str) -> Optional[Dict]:
+        path = self.root / rel_path
+        try:
+            with open(path, "rb") as handle:
+                fcntl.flock(handle, fcntl.LOCK_SH)
+                raw = handle.read()
+                stat = os.fstat(handle.fileno())
+            return _build_record(rel_path, status, raw, stat)
+        except (OSError, ValueError) as e:
+            print(f"Skipping {rel_path}: {e}", file=sys.stderr)
+            return None
+
+    def refresh(self) -> Dict[str, Dict]:
+        """Re-index new or changed trade files and drop deleted ones. Returns the records by path."""
+        with self._lock:
+            self._load_index()
+            seen, changed = set(), False
+            for status in STATUSES:
+                directory = self.root / status
+                if not directory.is_dir():
+                    continue
+                for path in sorted(directory.rglob("*.json")):
+                    rel_path = path.relative_to(self.root).as_posix()
+                    seen.add(rel_path)
+                    try:
+                        stat = path.stat()
+                    except OSError:
+                        continue
+                    record = self._records.get(rel_path)
+                    if record and record["mtime_ns"] == stat.st_mtime_ns and record["size"] == stat.st_size:
+                        continue
+                    record = self._index_file(rel_path, status)
+                    if record is None:
+                        self._records.pop(rel_path, None)
+                    else:
+                        self._records[rel_path] = record
+                    changed = True
+            for rel_path in set(self._records) - seen:
+                del self._records[rel_path]
+                changed = True
+            if changed:
+                self._save_index()
+            return self._records
+
+    def _record(self, trade_id: str) -> Dict:
+        """Fresh index record for a trade (KeyError if unknown)."""
+        for record in self.refresh().values():
+            if record["trade_id"] == trade_id:
+                return record
+        raise KeyError(trade_id)
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def find(self, ticker: Optional[str] = None, archetype: Optional[str] = None,
+             status: Optional[str] = None, linked_event: Optional[str] = None,
+             catalyst_from: Optional[str] = None, catalyst_to: Optional[str] = None) -> List[Dict]:
+        """
+        Index records matching every given filter, by trade_id.
+
+        Args:
+            ticker: Ticker (case-insensitive)
+            archetype: Archetype (e.g. "pdufa", "activist")
+            status: "active", "passed" or "closed"
+            linked_event: Event id (e.g. "EVT-2026-038")
+            catalyst_from: Earliest catalyst_date (YYYY-MM-DD); trades
+                without an exact catalyst date are excluded
+            catalyst_to: Latest catalyst_date (YYYY-MM-DD)
+
+        Returns:
+            Records with trade_id, ticker, archetype, status, catalyst_date,
+            linked_event, date, position, latest (monitoring summary), path
+        """
+        ticker = ticker.upper() if ticker else None
+        results = []
+        for record in self.refresh().values():
+            if ticker and record["ticker"] != ticker:
+                continue
+            if archetype and record["archetype"] != archetype:
+                continue
+            if status and record["status"] != status:
+                continue
+            if linked_event and record["linked_event"] != linked_event:
+                continue
+            if catalyst_from or catalyst_to:
+                catalyst = record["catalyst_date"]
+                if not isinstance(catalyst, str) or not _ISO_DATE.match(catalyst):
+                    continue
+                if (catalyst_from and catalyst < catalyst_from) or (catalyst_to and catalyst > catalyst_to):
+                    continue
+            results.append(_public(record))
+        return sorted(results, key=lambda record: record["trade_id"])
+
+    def get(self, trade_id: str) -> Dict:
+        """Index record for one trade (KeyError if unknown)."""
+        return _public(self._record(trade_id))
+
+    def signature(self, trade_id: str) -> str:
+        """Signature ("mtime_ns:size") of the trade's file, for caches derived from it."""
+        record = self._record(trade_id)
+        return f"{record['mtime_ns']}:{record['size']}"
+
+    def _read_span(self, record: Dict, start: int, end: int) -> bytes:
+        with open(self.root / record["path"], "rb") as handle:
+            fcntl.flock(handle, fcntl.LOCK_SH)
+            handle.seek(start)
+            return handle.read(end - start)
+
+    def section(self, trade_id: str, name: str, default: Any = None) -> Any:
+        """One top-level section of a trade, parsed from its bytes only."""
+        record = self._record(trade_id)
+        span = record["sections"].get(name)
+        if span is None:
+            return default
+        return json.loads(self._read_span(record, *span))
+
+    def load(self, trade_id: str) -> Dict:
+        """The whole trade document."""
+        record = self._record(trade_id)
+        return json.loads((self.root / record["path"]).read_bytes())
+
+    def latest_monitoring(self, trade_id: str) -> Optional[Dict]:
+        """Most recent monitoring entry (read without the rest of the history)."""
+        record = self._record(trade_id)
+        last = (record.get("monitoring") or {}).get("last")
+        return json.loads(self._read_span(record, *last)) if last else None
+
+    def portfolio_summary(self) -> Dict:
+        """
+        Active positions with their latest monitoring summary, from the index only.
+
+        Returns:
+            Dict with "positions" (per active trade) and "totals" (count,
+            cost basis and unrealized P&L of the latest monitoring entries)
+        """
+        positions = []
+        for record in self.find(status="active"):
+            position = record.get("position") or record.get("options_position") or {}
+            latest = record.get("latest") or {}
+            positions.append({
+                "trade_id": record["trade_id"],
+                "ticker": record["ticker"],
+                "archetype": record["archetype"],
+                "catalyst_date": record["catalyst_date"],
+                "entry_date": position.get("entry_date"),
+                "entry_price": position.get("entry_price"),
+                "cost_basis": position.get("cost_basis"),
+                "stop_price": position.get("stop_price"),
+                "target_price": position.get("target_price"),
+                "last_update": latest.get("date"),
+                "price": latest.get("price"),
+                "unrealized_pnl": latest.get("unrealized_pnl"),
+                "weighted_sum": latest.get("weighted_sum"),
+                "action": latest.get("action"),
+            })
+        return {
+            "positions": positions,
+            "totals": {
+                "count": len(positions),
+                "cost_basis": round(sum(p["cost_basis"] or 0 for p in positions), 2),
+                "unrealized_pnl": round(sum(p["unrealized_pnl"] or 0 for p in positions), 2),
+            },
+        }
+
+    # ------------------------------------------------------------------
+    # Monitoring appends
+    # ------------------------------------------------------------------
+
+    def append_monitoring(self, trade_id: str, entry: Dict) -> Dict:
+        """
+        Append one entry to a trade's monitoring array.
+
+        The entry is written in place after the last monitoring entry when
+        only closing brackets follow it; otherwise the file is spliced into
+        a temp copy and renamed, so a failed write never truncates it.
+        Files without a monitoring array get one through a full (atomic)
+        rewrite.
+
+        Returns:
+            Updated index record
+        """
+        with self._lock:
+            record = self._record(trade_id)
+            path = self.root / record["path"]
+            # The trade file itself may be replaced by a rename, so the lock
+            # lives on a stable side file and the trade file is opened (and
+            # re-stat'ed) only once it is held
+            with _locked(path), open(path, "r+b") as handle:
+                stat = os.fstat(handle.fileno())
+                if stat.st_mtime_ns != record["mtime_ns"] or stat.st_size != record["size"]:
+                    handle.seek(0)
+                    record = _build_record(record["path"], record["status"], handle.read(), stat)
+                monitoring = record.get("monitoring")
+                if monitoring is None:
+                    record = self._rewrite_with_monitoring(handle, record, entry)
+                else:
+                    record = self._insert_entry(handle, record, entry)
+            self._records[record["path"]] = record
+            self._save_index()
+            return _public(record)
+
+    @staticmethod
+    def _line_indent(handle, pos: int) -> Optional[str]:
+        """Whitespace before `pos` on its line (None if other text precedes it)."""
+        window_start = max(0, pos - 256)
+        handle.seek(window_start)
+        before = handle.read(pos - window_start).decode("latin-1")
+        if "\n" not in before and window_start > 0:
+            return None
+        line = before[before.rfind("\n") + 1:]
+        return line if not line.strip() else None
+
+    @staticmethod
+    def _write_tail(handle, pos: int, data: bytes, original: bytes):
+        """Write `data` at `pos` in place; on failure restore the original tail."""
+        try:
+            handle.seek(pos)
+            handle.write(data)
+            handle.flush()
+            os.fsync(handle.fileno())
+        except OSError:
+            handle.seek(pos)
+            handle.truncate()
+            handle.write(original)
+            handle.flush()
+            raise
+
+    def _insert_entry(self, handle, record: Dict, entry: Dict) -> Dict:
+        monitoring = record["monitoring"]
+        last = monitoring["last"]
+        array_indent = self._line_indent(handle, monitoring["open"])
+        if last:
+            insert_at = last[1]
+            indent = self._line_indent(handle, last[0])
+            prefix, suffix = ",\n", ""
+        else:
+            insert_at = monitoring["open"] + 1
+            indent = None
+            prefix, suffix = "\n", "\n" + (array_indent or "")
+        if indent is None:
+            indent = (array_indent or "") + "  "
+
+        body = json.dumps(entry, indent=2, ensure_ascii=False).replace("\n", "\n" + indent)
+        new_bytes = (prefix + indent).encode("utf-8")
+        entry_start = insert_at + len(new_bytes)
+        new_bytes += body.encode("utf-8")
+        entry_end = insert_at + len(new_bytes)
+        new_bytes += suffix.encode("utf-8")
+
+        handle.seek(insert_at)
+        tail = handle.read()
+        path = self.root / record["path"]
+        if tail.strip(_CLOSING):
+            # Later sections follow the array: splice into a copy and rename
+            # so a failed write cannot truncate the trade file
+            handle.seek(0)
+            _replace_file(path, handle.read(insert_at) + new_bytes + tail)
+            stat = path.stat()
+        else:
+            self._write_tail(handle, insert_at, new_bytes + tail, tail)
+            stat = os.fstat(handle.fileno())
+
+        delta = len(new_bytes)
+        sections = {}
+        for name, (start, end) in record["sections"].items():
+            if start >= insert_at:
+                start, end = start + delta, end + delta
+            elif end > insert_at:
+                end += delta
+            sections[name] = [start, end]
+        return {
+            **record,
+            "mtime_ns": stat.st_mtime_ns,
+            "size": stat.st_size,
+            "sections": sections,
+            "monitoring": {"open": monitoring["open"], "count": monitoring["count"] + 1,
+                           "last": [entry_start, entry_end]},
+            "latest": _summarize_latest(entry),
+        }
+
+    def _rewrite_with_monitoring(self, handle, record: Dict, entry: Dict) -> Dict:
+        handle.seek(0)
+        trade = json.loads(handle.read())
+        trade["monitoring"] = [entry]
+        raw = (json.dumps(trade, indent=2, ensure_ascii=False) + "\n").encode("utf-8")
+        path = self.root / record["path"]
+        _replace_file(path, raw)
+        return _build_record(record["path"], record["status"], raw, path.stat())
+
+
+def main():
+    """CLI interface for the trade repository."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Query trades and append monitoring entries")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    find = sub.add_parser("list", help="Trades matching filters (from the index)")
+    find.add_argument("--ticker")
+    find.add_argument("--archetype")
+    find.add_argument("--status", choices=STATUSES)
+    find.add_argument("--linked-event")
+    find.add_argument("--catalyst-from", help="YYYY-MM-DD")
+    find.add_argument("--catalyst-to", help="YYYY-MM-DD")
+
+    show = sub.add_parser("show", help="One trade (or one section of it)")
+    show.add_argument("trade_id")
+    show.add_argument("--section")
+
+    sub.add_parser("summary", help="Active positions with their latest monitoring entry")
+
+    append = sub.add_parser("append-monitoring", help="Append a monitoring entry (JSON object)")
+    append.add_argument("trade_id")
+    append.add_argument("entry")
+
+    sub.add_parser("reindex", help="Rebuild the index")
+    args = parser.parse_args()
+
+    repo = TradeRepository()
+    try:
+        if args.command == "list":
+            result = repo.find(args.ticker, args.archetype, args.status, args.linked_event,
+                               args.catalyst_from, args.catalyst_to)
+        elif args.command == "show":
+            result = repo.section(args.trade_id, args.section) if args.section else repo.load(args.trade_id)
+        elif args.command == "summary":
+            result = repo.portfolio_summary()
+        elif args.command == "append-monitoring":
+            result = repo.append_monitoring(args.trade_id, json.loads(args.entry))
+        else:
+            repo.index_path.unlink(missing_ok=True)
+            result = {"indexed": len(repo.refresh())}
+    except KeyError as e:
+        print(f"ERROR: Unknown trade {e}", file=sys.stderr)
+        sys.exit(1)
+    print(json.dumps(result, indent=2, default=str))
+
+
+if __name__ == "__main__":
+    main()
@@ -9,14 +9,13 @@ Usage:
 
 Output:
     - Console: Test results summary
-    - File: logs/data_quality/YYYY-MM-DD.json
+    - File: logs/data_quality/YYYY-MM-DD.jsonl (one "daily_validation" event)
 
 Exit codes:
     0: All tests passed
     1: One or more tests failed
 """
 
-import json
 import sys
 import time
 from datetime import datetime, timedelta
@@ -67,7 +66,7 @@ class OptionsDataValidator:
         print("\n" + "=" * 60)
         if self.results["tests_failed"] > 0:
             print(f"❌ FAILED: {self.results['tests_failed']} tests failed")
-            print(f"Review: logs/data_quality/{self.results['date']}.json")
+            print(f"Review: logs/data_quality/{self.results['date']}.jsonl")
             exit_code = 1
         else:
             print(f"✅ PASSED: All {self.results['tests_passed']} tests passed")
@@ -305,30 +304,10 @@ class OptionsDataValidator:
         })
 
     def write_log(self):
-        """Write results to daily log file."""
-        log_dir = Path("logs/data_quality")
-        log_dir.mkdir(parents=True, exist_ok=True)
+        """Append results to the daily data quality event log."""
+        self.monitor.event_log.append({"type": "daily_validation", **self.results}, sync=True)
 
-        log_file = log_dir / f"{self.results['date']}.json"
-
-        # If file exists, append to events
-        if log_file.exists():
-            existing_data = json.loads(log_file.read_text())
-        else:
-            existing_data = {
-                "date": self.results['date'],
-                "events": []
-            }
-
-        # Add this validation run as an event
-        existing_data["events"].append({
-            "type": "daily_validation",
-            **self.results
-        })
-
-        log_file.write_text(json.dumps(existing_data, indent=2))
-
-        print(f"\nResults logged to: {log_file}")
+        print(f"\nResults logged to: {self.monitor.event_log.root}/{self.results['date']}.jsonl")
 
 
 def main():
@@ -0,0 +1,214 @@
+"""
+XBRL Extract Module
+
+Single-pass extraction of period-aligned values from SEC companyfacts.
+
+The kill screens need the same ~20 us-gaap concepts for the latest
+reporting period and the comparable period one year earlier. Instead of
+sorting every concept's value list by end date, extract_periods() walks
+each requested concept once with a linear max-scan:
+
+1. The anchor is the latest Assets fact (by end, then filed date) from a
+   10-K/10-Q. Its fy/fp/form identify the current fiscal period.
+2. Current values are facts ending on the anchor date. For flow concepts
+   the longest duration up to a year is used, so a Q2 10-Q yields
+   six-month year-to-date figures (cash flow items are only reported
+   year-to-date) and a 10-K yields full-year figures.
+3. Previous values are facts of the same duration ending one year
+   earlier (same fp, prior fy), whichever filing reported them.
+
+Restatements win: when several filings report the same period, the most
+recently filed value is kept. A concept with no fact for the anchor
+period is left out rather than filled from an older period, so the
+revenue tag fallbacks (Revenues -> RevenueFromContract...) work.
+
+Usage:
+    from xbrl_extract import extract_periods
+
+    current, previous = extract_periods(facts)
+    print(current.fp, current.fy, current.get("Assets"), previous.get("Assets"))
+"""
+
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import Dict, Iterable, Optional, Tuple
+
+# Concepts used by parse_financials / fetch_two_periods
+KILL_SCREEN_CONCEPTS = (
+    "Assets",
+    "AssetsCurrent",
+    "Liabilities",
+    "LiabilitiesCurrent",
+    "RetainedEarningsAccumulatedDeficit",
+    "PropertyPlantAndEquipmentNet",
+    "LongTermDebt",
+    "Revenues",
+    "RevenueFromContractWithCustomerExcludingAssessedTax",
+    "SalesRevenueNet",
+    "OperatingIncomeLoss",
+    "NetIncomeLoss",
+    "GrossProfit",
+    "SellingGeneralAndAdministrativeExpense",
+    "DepreciationDepletionAndAmortization",
+    "AccountsReceivableNetCurrent",
+    "NetCashProvidedByUsedInOperatingActivities",
+    "CashAndCashEquivalentsAtCarryingValue",
+    "CommonStockSharesOutstanding",
+)
+
+REVENUE_CONCEPTS = (
+    "Revenues",
+    "RevenueFromContractWithCustomerExcludingAssessedTax",
+    "SalesRevenueNet",
+)
+
+ANNUAL_FORMS = frozenset({"10-K", "10-K/A", "20-F", "40-F"})
+ALL_FORMS = ANNUAL_FORMS | {"10-Q", "10-Q/A"}
+
+# Unit preference, matching the kill screen inputs
+UNIT_TYPES = ("USD", "shares", "pure")
+
+ANCHOR_CONCEPT = "Assets"
+
+# Fiscal years drift by a few days (52/53-week calendars)
+YEAR_TOLERANCE_DAYS = 15
+
+
+@dataclass
+class PeriodRecord:
+    """Values for one fiscal period, keyed by concept name."""
+    end: str
+    fy: Optional[int]
+    fp: Optional[str]
+    form: Optional[str]
+    filed: Optional[str]
+    months: int = 0  # Duration of flow values (0 = balance sheet only)
+    values: Dict[str, float] = field(default_factory=dict)
+
+    @property
+    def fiscal_period(self) -> str:
+        """Label such as "FY 2025" or "Q2 2025"."""
+        if self.fp and self.fy:
+            return f"{self.fp} {self.fy}"
+        return f"Period ending {self.end}"
+
+    def get(self, concept: str, default: Optional[float] = None) -> Optional[float]:
+        return self.values.get(concept, default)
+
+    def first(self, concepts: Iterable[str]) -> Tuple[Optional[str], Optional[float]]:
+        """First concept with a value, e.g. the revenue tag this company uses."""
+        for concept in concepts:
+            if concept in self.values:
+                return concept, self.values[concept]
+        return None, None
+
+
+def _unit_values(concept_data: Dict) -> list:
+    units = concept_data.get("units", {})
+    for unit_type in UNIT_TYPES:
+        if unit_type in units:
+            return units[unit_type]
+    return []
+
+
+def _months(value: Dict) -> int:
+    """Duration of a fact in whole months (0 for instant facts)."""
+    start = value.get("start")
+    if not start:
+        return 0
+    days = (date.fromisoformat(value["end"]) - date.fromisoformat(start)).days
+    return round(days / 30.44)
+
+
+def _usable(value: Dict, forms: frozenset) -> bool:
+    return "val" in value and "end" in value and value.get("form") in forms
+
+
+def _find_anchor(concepts: Dict, names: Iterable[str], forms: frozenset) -> Optional[Dict]:
+    """Latest fact (by end, then filed) of the anchor concept, or of any concept."""
+    candidates = [ANCHOR_CONCEPT] if ANCHOR_CONCEPT in concepts else list(names)
+    anchor = None
+    for name in candidates:
+        for value in _unit_values(concepts.get(name, {})):
+            if not _usable(value, forms):
+                continue
+            key = (value["end"], value.get("filed", ""))
+            if anchor is None or key > (anchor["end"], anchor.get("filed", "")):
+                anchor = value
+    return anchor
+
+
+def extract_periods(facts: Dict, concepts: Iterable[str] = KILL_SCREEN_CONCEPTS,
+                    annual: bool = False,
+                    taxonomy: str = "us-gaap") -> Tuple[Optional[PeriodRecord], Optional[PeriodRecord]]:
+    """
+    Extract current and prior-year values for many concepts in one pass.
+
+    Args:
+        facts: Company facts dict from SEC API
+        concepts: XBRL concept names to extract
+        annual: Only use 10-K (annual) facts, so current is the latest fiscal year
+        taxonomy: XBRL taxonomy (default: "us-gaap")
+
+    Returns:
+        Tuple of (current, previous) PeriodRecords; previous is None if no
+        concept has a comparable prior-year value
+    """
+    concepts = list(concepts)
+    taxonomy_facts = facts.get("facts", {}).get(taxonomy, {})
+    forms = ANNUAL_FORMS if annual else ALL_FORMS
+
+    anchor = _find_anchor(taxonomy_facts, concepts, forms)
+    if anchor is None:
+        return (None, None)
+
+    anchor_end = anchor["end"]
+    prior_end = date.fromisoformat(anchor_end) - timedelta(days=365)
+    prior_lo = (prior_end - timedelta(days=YEAR_TOLERANCE_DAYS)).isoformat()
+    prior_hi = (prior_end + timedelta(days=YEAR_TOLERANCE_DAYS)).isoformat()
+
+    current = PeriodRecord(end=anchor_end, fy=anchor.get("fy"), fp=anchor.get("fp"),
+                           form=anchor.get("form"), filed=anchor.get("filed"))
+    previous = PeriodRecord(end=prior_end.isoformat(),
+                            fy=anchor["fy"] - 1 if isinstance(anchor.get("fy"), int) else None,
+                            fp=anchor.get("fp"), form=None, filed=None)
+
+    for concept in concepts:
+        if concept not in taxonomy_facts:
+            continue
+
+        best_current = None   # (months, filed, value)
+        best_prior = {}       # months -> (filed, value)
+        for value in _unit_values(taxonomy_facts[concept]):
+            if not _usable(value, forms):
+                continue
+            end = value["end"]
+            if end == anchor_end:
+                months = _months(value)
+                if months > 12:
+                    continue
+                key = (months, value.get("filed", ""))
+                if best_current is None or key > best_current[:2]:
+                    best_current = key + (value,)
+            elif prior_lo <= end <= prior_hi:
+                months = _months(value)
+                filed = value.get("filed", "")
+                if months not in best_prior or filed > best_prior[months][0]:
+                    best_prior[months] = (filed, value)
+
+        if best_current is None:
+            continue
+        months, _, value = best_current
+        current.values[concept] = float(value["val"])
+        current.months = max(current.months, months)
+
+        if months in best_prior:
+            filed, prior_value = best_prior[months]
+            previous.values[concept] = float(prior_value["val"])
+            if previous.filed is None or filed > previous.filed:
+                previous.filed = filed
+                previous.form = prior_value.get("form")
+                previous.end = prior_value["end"]
+            previous.months = max(previous.months, months)
+
+    return (current, previous if previous.values else None)
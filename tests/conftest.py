@@ -0,0 +1,13 @@
+"""
+Shared pytest fixtures.
+"""
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def isolated_cache_dir(tmp_path, monkeypatch):
+    """Point on-disk caches (and the alert store) at a per-test directory instead of the repo's."""
+    monkeypatch.setenv("IDIO_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setenv("IDIO_ALERTS_DB", str(tmp_path / "alerts" / "alerts.sqlite"))
+    return tmp_path / "cache"
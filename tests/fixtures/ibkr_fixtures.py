@@ -388,6 +388,45 @@ class IBKRMockResponses:
             "errors": [],
         }
 
+    @staticmethod
+    def valid_option_chain_abc():
+        """Option chain slice with $1 listed strikes (not a 2.5/5/10 increment)."""
+        options = []
+        for strike, delta, iv in [(22.0, 0.71, 0.64), (23.0, 0.58, 0.61), (24.0, 0.47, 0.60),
+                                  (25.0, 0.36, 0.62), (26.0, 0.27, 0.65)]:
+            options.append({
+                "strike": strike,
+                "right": "CALL",
+                "bid": 1.10,
+                "ask": 1.30,
+                "last": 1.20,
+                "mid_price": 1.20,
+                "volume": 150,
+                "open_interest": 900,
+                "delta": delta,
+                "theta": -0.03,
+                "gamma": 0.08,
+                "vega": 0.04,
+                "implied_volatility": iv,
+                "underlying_price": 23.6,
+                "data_type": "real-time",
+            })
+        return {
+            "ticker": "ABC",
+            "underlying_price": 23.6,
+            "expiration": "2026-02-20",
+            "requested_expiration": "2026-02-19",
+            "expirations": ["2026-02-20", "2026-03-20"],
+            "strikes_listed": 30,
+            "strike_source": "chain",
+            "trading_class": "ABC",
+            "multiplier": "100",
+            "options": options,
+            "data_type": "real-time",
+            "source": "IBKR Paper",
+            "errors": [],
+        }
+
 
 def get_mock_response(response_type: str):
     """
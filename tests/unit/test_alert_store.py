@@ -0,0 +1,77 @@
+"""
+Unit tests for the SQLite alert store and its alerts.json view.
+"""
+
+import json
+import sys
+from pathlib import Path
+
+# Add scripts directory to path
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "scripts"))
+
+from alert_store import AlertStore
+
+EXIT_ALERT = {
+    "id": "ALERT-20260120143000",
+    "priority": "immediate",
+    "type": "exit_signal",
+    "trade_id": "TRD-20260105-SRPT-PDUFA",
+    "ticker": "SRPT",
+    "message": "Info parity weighted sum = 2.1. Exit 50% recommended.",
+    "action_required": True,
+    "acknowledged": False,
+}
+
+
+class TestAlertStore:
+    """Tests for inserts, dedup, acknowledgement and the alerts.json view."""
+
+    def test_add_writes_view_and_dedups_active(self, tmp_path):
+        store = AlertStore(tmp_path / "alerts.sqlite")
+
+        assert store.add(EXIT_ALERT) == ("ALERT-20260120143000", True)
+        assert AlertStore(tmp_path / "alerts.sqlite").add({**EXIT_ALERT, "id": "ALERT-2"}) == \
+            ("ALERT-20260120143000", False)
+
+        view = json.loads((tmp_path / "alerts.json").read_text())
+        assert [alert["id"] for alert in view["alerts"]] == ["ALERT-20260120143000"]
+        assert view["alerts"][0]["occurrences"] == 2
+
+    def test_acknowledge_and_archive(self, tmp_path):
+        store = AlertStore(tmp_path / "alerts.sqlite")
+        store.add(EXIT_ALERT)
+
+        assert store.acknowledge(["ALERT-20260120143000"], resolution="Exited 50%") == 1
+        assert store.active() == []
+        assert json.loads((tmp_path / "alerts.json").read_text())["alerts"] == []
+
+        # Same alert after acknowledgement is new again
+        assert store.add(EXIT_ALERT)[1] is True
+        assert store.archive() == 1
+        assert store.stats()["archived"] == 1
+        assert store.history(ticker="srpt")[-1]["resolution"] == "Exited 50%"
+
+    def test_import_and_hand_edited_view(self, tmp_path):
+        archive = tmp_path / "alerts_archive.json"
+        archive.write_text(json.dumps({"archived_alerts": [
+            {**EXIT_ALERT, "id": "ALERT-OLD", "acknowledged": True, "acknowledged_date": "2026-01-23T14:25:00Z"}
+        ]}))
+        view = tmp_path / "alerts.json"
+        view.write_text(json.dumps({"alerts": [{**EXIT_ALERT, "type": "regime_change", "ticker": None}],
+                                    "metadata": {"version": "1.0"}}))
+        store = AlertStore(tmp_path / "alerts.sqlite")
+
+        assert store.import_json(archive) == 1
+        assert store.import_json(archive) == 0
+        assert [alert["type"] for alert in store.active()] == ["regime_change"]
+        assert store.stats() == {"path": str(tmp_path / "alerts.sqlite"), "active": 1, "acknowledged": 0,
+                                 "archived": 1}
+        assert json.loads(view.read_text())["metadata"] == {"version": "1.0"}
+
+    def test_active_by_priority(self, tmp_path):
+        store = AlertStore(tmp_path / "alerts.sqlite", write_view=False)
+        store.add(EXIT_ALERT)
+        store.add({**EXIT_ALERT, "id": "ALERT-3", "priority": "daily_digest", "message": "P&L summary"})
+
+        assert [alert["id"] for alert in store.active(priority="daily_digest")] == ["ALERT-3"]
+        assert not (tmp_path / "alerts.json").exists()
@@ -0,0 +1,111 @@
+"""
+Unit tests for the local daily bar store and incremental MA-200 fetching.
+"""
+
+import sys
+import time
+from datetime import date, timedelta
+from pathlib import Path
+from unittest.mock import patch
+
+# Add scripts and fixtures directories to path
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "scripts"))
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "fixtures"))
+
+import data_fetcher
+from bar_store import BarStore
+
+
+def _bars(start, count, close_start=100.0, volume=1000):
+    return [
+        {
+            "date": (start + timedelta(days=idx)).isoformat(),
+            "close": close_start + idx,
+            "volume": volume,
+        }
+        for idx in range(count)
+    ]
+
+
+class TestBarStore:
+    """Tests for append/merge and stats computed from stored arrays."""
+
+    def test_append_round_trip(self, tmp_path):
+        store = BarStore(tmp_path)
+        store.append("spy", _bars(date(2025, 1, 1), 5), source="IBKR Paper")
+
+        bars = store.load("SPY")
+
+        assert len(bars) == 5
+        assert bars.source == "IBKR Paper"
+        assert bars.last_date == date(2025, 1, 5)
+        assert bars.to_records()[0] == {
+            "date": "2025-01-01", "open": 100.0, "high": 100.0, "low": 100.0, "close": 100.0, "volume": 1000.0
+        }
+
+    def test_append_merges_and_replaces_overlap(self, tmp_path):
+        store = BarStore(tmp_path)
+        store.append("SPY", _bars(date(2025, 1, 1), 5), source="IBKR Paper")
+        # Tail re-fetch: last stored day corrected, one new day added (IBKR date format)
+        bars = store.append(
+            "SPY",
+            [{"date": "20250105", "close": 150.0}, {"date": "20250106", "close": 151.0}],
+            source="IBKR Paper",
+        )
+
+        assert len(bars) == 6
+        assert list(bars.close[-2:]) == [150.0, 151.0]
+        assert list(bars.date) == sorted(bars.date)
+
+    def test_stats(self, tmp_path):
+        bars = BarStore(tmp_path).append("SPY", _bars(date(2025, 1, 1), 210), source="Yahoo Finance")
+
+        assert bars.moving_average(200) == sum(110.0 + idx for idx in range(200)) / 200
+        assert bars.average_volume(20) == 1000.0
+        assert bars.period_return(1) == 309.0 / 308.0 - 1
+        assert bars.moving_average(300) is None
+
+    def test_missing_days_and_freshness(self, tmp_path):
+        store = BarStore(tmp_path)
+        assert store.missing_days(None, 210) == 210
+        assert not store.is_fresh(None)
+
+        bars = store.append("SPY", _bars(date.today() - timedelta(days=3), 1), source="IBKR Paper")
+        assert 2 <= store.missing_days(bars, 210) <= 5
+        assert store.is_fresh(bars)
+
+        bars.fetched_at = time.time() - 7 * 86400
+        assert not store.is_fresh(bars)
+
+
+class TestIncrementalMA200:
+    """Tests for tail-only fetching in _fetch_ma_200."""
+
+    def test_only_missing_tail_is_fetched(self, tmp_path):
+        store = BarStore(tmp_path)
+        stored = store.append("SPY", _bars(date.today() - timedelta(days=210), 209), source="IBKR Paper")
+        stored.fetched_at = 0.0
+        with patch.object(data_fetcher, "_bar_store", store), patch.object(
+            store, "load", return_value=stored
+        ), patch("data_fetcher.run_ibkr_command") as run_mock:
+            run_mock.return_value = {"bars": _bars(date.today() - timedelta(days=1), 1, close_start=500.0)}
+            data = data_fetcher._fetch_ma_200("SPY")
+
+        days_requested = run_mock.call_args[0][1]["days"]
+        assert days_requested < 10
+        assert data["bars_fetched"] == 1
+        assert data["bars_total"] == 210
+
+    def test_fresh_store_skips_fetch(self, tmp_path):
+        store = BarStore(tmp_path)
+        store.append("SPY", _bars(date.today() - timedelta(days=210), 210), source="Yahoo Finance")
+        with patch.object(data_fetcher, "_bar_store", store), patch(
+            "data_fetcher.run_ibkr_command"
+        ) as run_mock, patch("data_fetcher.fetch_historical_yahoo") as yahoo_mock:
+            data = data_fetcher._fetch_ma_200("SPY")
+
+        run_mock.assert_not_called()
+        yahoo_mock.assert_not_called()
+        assert data["source"] == "Yahoo Finance"
+        assert data["bars_fetched"] == 0
+        assert data["indicators"]["avg_volume_20d"] == 1000.0
@@ -0,0 +1,94 @@
+"""
+Unit tests for the Black-Scholes Greeks engine and its use as a second Greeks source.
+"""
+
+import sys
+from datetime import date, timedelta
+from pathlib import Path
+from unittest.mock import patch
+
+# Add scripts and fixtures directories to path
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "scripts"))
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "fixtures"))
+
+import numpy as np
+import pytest
+
+import black_scholes as bs
+import data_fetcher
+from data_quality_monitor import OptionsDataQualityMonitor
+from ibkr_fixtures import get_mock_response
+
+
+class TestPricingAndGreeks:
+    """Tests against textbook values (S=K=100, T=1, r=5%, sigma=20%)."""
+
+    def test_price_and_greeks(self):
+        assert bs.price(100, 100, 1.0, 0.2, True, 0.05, 0.0) == pytest.approx(10.4506, abs=1e-3)
+        assert bs.price(100, 100, 1.0, 0.2, False, 0.05, 0.0) == pytest.approx(5.5735, abs=1e-3)
+
+        greeks = bs.greeks(100, 100, 1.0, 0.2, True, 0.05, 0.0)
+
+        assert greeks["delta"] == pytest.approx(0.6368, abs=1e-4)
+        assert greeks["gamma"] == pytest.approx(0.01876, abs=1e-5)
+        assert greeks["vega"] == pytest.approx(0.3752, abs=1e-4)  # per vol point
+        assert greeks["theta"] == pytest.approx(-6.414 / 365, abs=1e-4)  # per day
+
+    def test_implied_volatility_round_trip_vectorized(self):
+        spot = np.array([100.0, 100.0, 100.0, 50.0])
+        strike = np.array([80.0, 100.0, 130.0, 100.0])
+        is_call = np.array([True, False, True, False])
+        sigma = np.array([0.3, 0.5, 1.2, 0.9])
+        prices = bs.price(spot, strike, 0.25, sigma, is_call, 0.04, 0.01)
+
+        recovered = bs.implied_volatility(prices, spot, strike, 0.25, is_call, 0.04, 0.01)
+
+        np.testing.assert_allclose(recovered, sigma, atol=1e-5)
+
+    def test_implied_volatility_below_intrinsic_is_nan(self):
+        assert np.isnan(bs.implied_volatility(10.0, 100.0, 50.0, 0.25, True))
+
+
+class TestSecondSource:
+    """Tests for filling and cross-checking IBKR Greeks."""
+
+    def _monitor(self):
+        return OptionsDataQualityMonitor({})
+
+    def test_reconcile_fills_sentinels_and_flags_divergence(self):
+        model = {"implied_volatility": 0.30, "delta": 0.52, "gamma": 0.03, "vega": 0.12, "theta": -0.05}
+        ibkr = {"implied_volatility": 0.45, "delta": None, "gamma": 0.03, "vega": 0.12, "theta": 3.0}
+
+        merged, filled, divergences = self._monitor().reconcile_greeks(ibkr, model)
+
+        assert filled == ["delta", "theta"]
+        assert merged["delta"] == 0.52
+        assert merged["theta"] == -0.05
+        assert [d["field"] for d in divergences] == ["implied_volatility"]
+        assert self._monitor().validate_greeks(ibkr)[0] is False
+        assert self._monitor().validate_greeks(ibkr, model_greeks=model) == (True, "")
+
+    def test_fill_chain_greeks(self):
+        chain = get_mock_response("valid_option_chain_abc")
+        chain["expiration"] = (date.today() + timedelta(days=60)).isoformat()
+        chain["options"][2]["delta"] = None
+
+        bs.fill_chain_greeks(chain)
+
+        row = chain["options"][2]
+        assert row["model_filled"] == ["delta"]
+        assert 0.3 < row["delta"] < 0.7
+        assert all("model_divergence" in option for option in chain["options"])
+
+    def test_fetch_options_data_uses_model_for_missing_greeks(self):
+        quote = get_mock_response("invalid_greeks_none_values")
+        expiration = (date.today() + timedelta(days=45)).isoformat()
+
+        with patch("data_fetcher.run_ibkr_command", return_value=quote), \
+                patch("data_fetcher.get_monitor", return_value=self._monitor()):
+            data = data_fetcher.fetch_options_data("XYZ", 100.0, expiration)
+
+        assert data is not None
+        assert set(data["greeks_model_filled"]) == set(bs.GREEK_FIELDS)
+        assert 0.3 < data["implied_volatility"] < 0.6
+        assert 0.4 < data["delta"] < 0.7
@@ -0,0 +1,88 @@
+"""
+Unit tests for the shared circuit breaker state.
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+# Add scripts directory to path
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "scripts"))
+
+from breaker_state import CircuitBreakerState
+from data_quality_monitor import OptionsDataQualityMonitor
+
+
+def _monitor(tmp_path, **circuit_breaker):
+    config = {"data_quality": {"circuit_breaker": {
+        "consecutive_failures_threshold": 3,
+        "timeout_threshold_per_hour": 3,
+        "auto_reset_after_hours": 24,
+        **circuit_breaker,
+    }}}
+    return OptionsDataQualityMonitor(config, log_dir=tmp_path / "logs", state_path=tmp_path / "breaker.sqlite")
+
+
+class TestCircuitBreakerState:
+    """Tests for the SQLite-backed counters."""
+
+    def test_counters_shared_across_instances(self, tmp_path):
+        path = tmp_path / "breaker.sqlite"
+        CircuitBreakerState(path).record_failure({"type": "ibkr_timeout"}, timeout=True)
+
+        counts = CircuitBreakerState(path).record_failure({"type": "greeks_validation"})
+
+        assert counts == {"consecutive": 2, "timeouts_last_hour": 1, "triggered": False}
+
+    def test_only_first_trip_wins(self, tmp_path):
+        first = CircuitBreakerState(tmp_path / "breaker.sqlite")
+        second = CircuitBreakerState(tmp_path / "breaker.sqlite")
+
+        assert first.trip("first") is True
+        assert second.trip("second") is False
+        assert second.status()["reason"] == "first"
+
+    def test_success_clears_consecutive_only(self, tmp_path):
+        state = CircuitBreakerState(tmp_path / "breaker.sqlite")
+        state.record_failure({"type": "ibkr_timeout"}, timeout=True)
+        state.record_success()
+
+        status = state.status()
+        assert status["consecutive_failures"] == 0
+        assert status["timeouts_last_hour"] == 1
+
+
+class TestMonitorBreaker:
+    """Tests that the monitor's breaker holds across monitor instances (processes)."""
+
+    def test_consecutive_failures_across_runs(self, tmp_path):
+        _monitor(tmp_path).record_failure("greeks_validation", "IV missing", ticker="ABC")
+        _monitor(tmp_path).record_failure("pricing_validation", "Wide spread", ticker="ABC")
+
+        with pytest.raises(RuntimeError, match="OPTIONS TRADING HALTED"):
+            _monitor(tmp_path).record_failure("greeks_validation", "IV missing", ticker="ABC")
+
+        assert _monitor(tmp_path).is_circuit_breaker_active()
+        assert len(_monitor(tmp_path).failures) == 3
+
+    def test_timeouts_per_hour_survive_successes(self, tmp_path):
+        monitor = _monitor(tmp_path, consecutive_failures_threshold=10)
+        for _ in range(2):
+            monitor.record_failure("ibkr_timeout", "IBKR timeout after 30 seconds", ticker="ABC")
+            monitor.reset_failures()
+
+        with pytest.raises(RuntimeError, match="3 IBKR timeouts in the last hour"):
+            _monitor(tmp_path, consecutive_failures_threshold=10).record_failure(
+                "ibkr_timeout", "IBKR timeout after 30 seconds", ticker="ABC")
+
+    def test_auto_reset_after_hours(self, tmp_path):
+        monitor = _monitor(tmp_path)
+        monitor.breaker.trip("test")
+        monitor.breaker._transaction(lambda conn: conn.execute(
+            "UPDATE state SET triggered_at = ?", (time.time() - 25 * 3600,)))
+
+        assert _monitor(tmp_path).is_circuit_breaker_active() is False
+        assert monitor.breaker.status()["triggered"] is False
+        assert monitor.event_log.query(types=["circuit_breaker_reset"])[0]["note"] == "Auto reset after 24 hours"
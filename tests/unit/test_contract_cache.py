@@ -0,0 +1,89 @@
+"""
+Unit tests for the persistent IBKR contract cache and watchlist prefill.
+"""
+
+import json
+import multiprocessing
+import sys
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+# Add scripts directory to path
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "scripts"))
+
+import data_fetcher
+from contract_cache import ContractCache
+
+SPY = {"conid": 756733, "symbol": "SPY", "primary_exchange": "ARCA", "currency": "USD", "local_symbol": "SPY"}
+
+
+class TestContractCache:
+    """Tests for lookups, revalidation and invalidation."""
+
+    def test_put_and_get_shared_across_instances(self, tmp_path):
+        path = tmp_path / "contracts.json"
+        ContractCache(path).put("spy", SPY)
+
+        entry = ContractCache(path).get("SPY")
+
+        assert entry["conid"] == 756733
+        assert entry["primary_exchange"] == "ARCA"
+
+    def test_stale_entry_needs_revalidation(self, tmp_path):
+        path = tmp_path / "contracts.json"
+        cache = ContractCache(path, revalidate_days=7)
+        cache.put_many({"SPY": SPY, "QQQ": {**SPY, "conid": 320227571, "symbol": "QQQ"}})
+        data = json.loads(path.read_text())
+        data["contracts"]["QQQ"]["validated_at"] = time.time() - 8 * 86400
+        path.write_text(json.dumps(data))
+
+        assert set(ContractCache(path, revalidate_days=7).get_many(["SPY", "QQQ"])) == {"SPY"}
+        assert cache.missing(["SPY", "QQQ", "IWM"]) == ["QQQ", "IWM"]
+
+    def test_invalidate_and_unresolved_entries(self, tmp_path):
+        cache = ContractCache(tmp_path / "contracts.json")
+        cache.put_many({"SPY": SPY, "BAD": {"conid": 0}})
+
+        cache.invalidate(["spy"])
+
+        assert cache.get("SPY") is None
+        assert cache.stats()["entries"] == 0
+
+
+def _put_range(path, start, count):
+    cache = ContractCache(path)
+    for conid in range(start, start + count):
+        cache.put(f"T{conid}", {**SPY, "conid": conid, "symbol": f"T{conid}"})
+
+
+class TestConcurrentWriters:
+    """Tests that processes sharing the file do not drop each other's entries."""
+
+    def test_parallel_processes_keep_all_entries(self, tmp_path):
+        path = tmp_path / "contracts.json"
+        context = multiprocessing.get_context("fork")
+        workers = [context.Process(target=_put_range, args=(path, start, 20)) for start in (1, 101, 201, 301)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+        assert ContractCache(path).stats()["entries"] == 80
+
+
+class TestPrefill:
+    """Tests for data_fetcher.prefill_contracts."""
+
+    def test_prefill_defaults_to_watchlist(self):
+        response = {"cached": ["LULU"], "resolved": {"RGNX": 1}, "failed": [], "errors": []}
+        with patch("data_fetcher.watchlist_tickers", return_value=["LULU", "RGNX"]), \
+                patch("data_fetcher.run_ibkr_command", return_value=response) as run_mock:
+            data = data_fetcher.prefill_contracts()
+
+        assert run_mock.call_args[0][:2] == ("prefill_contracts", {"tickers": ["LULU", "RGNX"]})
+        assert data["resolved"] == {"RGNX": 1}
+
+    def test_prefill_error(self):
+        with patch("data_fetcher.run_ibkr_command", return_value={"error": "IBKR connection timed out"}):
+            assert data_fetcher.prefill_contracts(["SPY"]) is None
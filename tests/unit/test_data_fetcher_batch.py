@@ -0,0 +1,82 @@
+"""
+Unit tests for fetch_all_batch (ticker list loading, worker pool, JSONL streaming).
+"""
+
+import io
+import json
+import sys
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+# Add scripts directory to path
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "scripts"))
+
+import data_fetcher
+
+
+def _fake_fetch_all(delays, fail=()):
+    def func(ticker, industry, archetype):
+        time.sleep(delays.get(ticker, 0))
+        if ticker in fail:
+            raise RuntimeError("SEC unavailable")
+        return {"ticker": ticker, "kill_screens_status": "PASS"}
+    return func
+
+
+class TestFetchAllBatch:
+    """Tests for streaming output and partial failures."""
+
+    def test_streams_in_completion_order(self):
+        batch = [{"ticker": t, "industry": "general", "archetype": "general"} for t in ("SLOW", "FAST")]
+        output = io.StringIO()
+
+        with patch("data_fetcher.fetch_all", side_effect=_fake_fetch_all({"SLOW": 0.2})):
+            summary = data_fetcher.fetch_all_batch(batch, max_workers=2, output=output)
+
+        lines = [json.loads(line) for line in output.getvalue().splitlines()]
+        assert [line["ticker"] for line in lines] == ["FAST", "SLOW"]
+        assert all(line["ok"] for line in lines)
+        assert summary["total"] == 2
+        assert summary["passed"] == 2
+
+    def test_failure_does_not_block_batch(self):
+        batch = [{"ticker": t, "industry": "general", "archetype": "general"} for t in ("AAA", "BAD", "CCC")]
+        output = io.StringIO()
+
+        with patch("data_fetcher.fetch_all", side_effect=_fake_fetch_all({}, fail={"BAD"})):
+            summary = data_fetcher.fetch_all_batch(batch, max_workers=2, output=output)
+
+        lines = {line["ticker"]: line for line in map(json.loads, output.getvalue().splitlines())}
+        assert set(lines) == {"AAA", "BAD", "CCC"}
+        assert lines["BAD"]["ok"] is False
+        assert "SEC unavailable" in lines["BAD"]["error"]
+        assert summary["ok"] == 2
+        assert summary["failed"] == 1
+
+
+class TestLoadBatchRequests:
+    """Tests for ticker list sources."""
+
+    def test_text_file(self, tmp_path):
+        path = tmp_path / "tickers.csv"
+        path.write_text("ticker,industry,archetype\nabc,biotech,pdufa\n# comment\nXYZ\nABC,retail,general\n")
+
+        batch = data_fetcher.load_batch_requests(str(path))
+
+        assert batch == [
+            {"ticker": "ABC", "industry": "biotech", "archetype": "pdufa"},
+            {"ticker": "XYZ", "industry": "general", "archetype": "general"},
+        ]
+
+    def test_events_default_filters_status(self, tmp_path):
+        (tmp_path / "universe").mkdir()
+        (tmp_path / "universe" / "events.json").write_text(json.dumps({"events": [
+            {"id": "evt-1", "ticker": "AAA", "archetype": "pdufa", "status": "tracking"},
+            {"id": "evt-2", "ticker": "BBB", "archetype": "activist", "status": "completed"},
+        ]}))
+
+        with patch("data_fetcher.REPO_ROOT", tmp_path):
+            batch = data_fetcher.load_batch_requests()
+
+        assert batch == [{"ticker": "AAA", "industry": "general", "archetype": "pdufa", "event_id": "evt-1"}]
@@ -0,0 +1,84 @@
+"""
+Unit tests for the fetch_all task graph (overlapping sources, join, timings).
+"""
+
+import sys
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+# Add scripts directory to path
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "scripts"))
+
+import pytest
+
+import data_fetcher
+from sec_api import FinancialData
+
+
+def _financials(**overrides):
+    values = dict(
+        total_assets=1000.0, current_assets=400.0, total_liabilities=300.0, current_liabilities=100.0,
+        retained_earnings=500.0, working_capital=300.0, ppe=200.0, long_term_debt=50.0,
+        revenue=800.0, ebit=150.0, net_income=100.0, gross_profit=400.0, sga_expenses=100.0,
+        depreciation=20.0, accounts_receivable=80.0, operating_cash_flow=120.0,
+        cash_and_equivalents=200.0, market_cap=0, shares_outstanding=10.0,
+        filing_date="2025-11-01", fiscal_period="FY 2025",
+    )
+    values.update(overrides)
+    return FinancialData(**values)
+
+
+def _slow(value, seconds):
+    def func(*args, **kwargs):
+        time.sleep(seconds)
+        return value
+    return func
+
+
+class TestFetchAllGraph:
+    """Tests for concurrent stages and the market cap / kill screen join."""
+
+    def test_sources_overlap(self):
+        with patch("data_fetcher.fetch_price", side_effect=_slow({"price": 20.0, "source": "Stooq"}, 0.3)), patch(
+            "data_fetcher.get_cik_from_ticker", side_effect=_slow("0000320193", 0.1)
+        ), patch(
+            "data_fetcher.fetch_two_periods", side_effect=_slow((_financials(), _financials(revenue=700.0)), 0.2)
+        ):
+            started = time.perf_counter()
+            result = data_fetcher.fetch_all("test")
+            elapsed = time.perf_counter() - started
+
+        # Price (0.3s) overlaps CIK -> financials (0.1s + 0.2s); sequential would be 0.6s
+        assert elapsed < 0.5
+        assert result["market_cap"] == 200.0
+        assert result["m_score"] is not None
+        timings = result["stage_timings_ms"]
+        assert set(timings) == {"price", "cik", "financials", "archetype", "kill_screens", "total"}
+        assert timings["price"] >= 300
+        assert timings["total"] < timings["price"] + timings["cik"] + timings["financials"]
+
+    def test_failed_stage_does_not_block_join(self):
+        with patch("data_fetcher.fetch_price", side_effect=RuntimeError("gateway down")), patch(
+            "data_fetcher.get_cik_from_ticker", return_value="0000320193"
+        ), patch("data_fetcher.fetch_two_periods", return_value=(_financials(), None)):
+            result = data_fetcher.fetch_all("test")
+
+        assert result["price"] is None
+        assert result["market_cap"] is None
+        assert "price stage failed: gateway down" in result["errors"]
+        assert result["z_score"] == pytest.approx(data_fetcher.calculate_z_score(_financials()))
+
+    def test_pdufa_runs_fda_lookup(self):
+        enforcement = {"enforcement_actions": [], "count": 0, "source": "openfda_api"}
+        with patch("data_fetcher.fetch_price", return_value=None), patch(
+            "data_fetcher.get_cik_from_ticker", return_value="0001234567"
+        ), patch("data_fetcher.fetch_two_periods", return_value=(None, None)), patch(
+            "data_fetcher.get_company_name", return_value="Regenxbio Inc."
+        ), patch("data_fetcher.search_fda_enforcement", return_value=enforcement) as fda_mock:
+            result = data_fetcher.fetch_all("rgnx", archetype="pdufa")
+
+        fda_mock.assert_called_once_with("Regenxbio Inc.")
+        assert result["fda_enforcement"] == enforcement
+        assert "Form 483 with OAI status (FDA FOIA Reading Room)" in result["manual_checks_required"]
+        assert result["kill_screens_status"] == "FAIL"
@@ -42,7 +42,7 @@ class TestIBKRIVFetch:
     """Tests for IBKR IV fetch handling."""
 
     def test_ibkr_iv_success_atm(self):
-        with patch("data_fetcher.subprocess.run") as run_mock:
+        with patch("ibkr_client.subprocess.run") as run_mock:
             run_mock.return_value = mock_subprocess_run_success("valid_atm_iv_spy")
             data = data_fetcher._fetch_atm_iv("SPY", expiration="2026-02-20")
 
@@ -51,7 +51,7 @@ class TestIBKRIVFetch:
         assert data["is_atm"] is True
 
     def test_ibkr_iv_warning_not_atm(self):
-        with patch("data_fetcher.subprocess.run") as run_mock:
+        with patch("ibkr_client.subprocess.run") as run_mock:
             run_mock.return_value = mock_subprocess_run_success("invalid_iv_not_atm")
             data = data_fetcher._fetch_atm_iv("QQQ", expiration="2026-04-17")
 
@@ -65,13 +65,13 @@ class TestIBKRIVFetch:
                 self.stderr = ""
                 self.returncode = 0
 
-        with patch("data_fetcher.subprocess.run", return_value=MockCompletedProcess()):
+        with patch("ibkr_client.subprocess.run", return_value=MockCompletedProcess()):
             data = data_fetcher._fetch_atm_iv("SPY", expiration="2026-02-20")
 
         assert data is None
 
     def test_ibkr_iv_timeout(self):
-        with patch("data_fetcher.subprocess.run", side_effect=subprocess.TimeoutExpired("cmd", 30)):
+        with patch("ibkr_client.subprocess.run", side_effect=subprocess.TimeoutExpired("cmd", 30)):
             data = data_fetcher._fetch_atm_iv("SPY", expiration="2026-02-20")
 
         assert data is None
@@ -39,7 +39,7 @@ class TestIBKRHistoricalFetch:
     """Tests for IBKR historical fetch handling."""
 
     def test_ibkr_historical_success(self):
-        with patch("data_fetcher.subprocess.run") as run_mock, patch(
+        with patch("ibkr_client.subprocess.run") as run_mock, patch(
             "data_fetcher.fetch_historical_yahoo"
         ) as yahoo_mock:
             run_mock.return_value = mock_subprocess_run_success("valid_historical_data_spy")
@@ -56,7 +56,7 @@ class TestIBKRHistoricalFetch:
             {"date": f"2026-01-{idx:02d}", "close": float(idx), "volume": 100}
             for idx in range(1, 211)
         ]
-        with patch("data_fetcher.subprocess.run") as run_mock, patch(
+        with patch("ibkr_client.subprocess.run") as run_mock, patch(
             "data_fetcher.fetch_historical_yahoo",
             return_value=yahoo_bars,
         ) as yahoo_mock:
@@ -73,13 +73,23 @@ class TestIBKRHistoricalFetch:
             {"date": f"2026-02-{idx:02d}", "close": float(idx), "volume": 100}
             for idx in range(1, 211)
         ]
-        with patch("data_fetcher.subprocess.run", side_effect=subprocess.TimeoutExpired("cmd", 60)):
+        with patch("ibkr_client.subprocess.run", side_effect=subprocess.TimeoutExpired("cmd", 60)):
             with patch("data_fetcher.fetch_historical_yahoo", return_value=yahoo_bars):
                 data = data_fetcher._fetch_ma_200("SPY")
 
         assert data is not None
         assert data["source"] == "Yahoo Finance"
 
+    def test_ibkr_historical_cached_across_calls(self):
+        with patch("ibkr_client.subprocess.run") as run_mock:
+            run_mock.return_value = mock_subprocess_run_success("valid_historical_data_spy")
+            first = data_fetcher._fetch_ma_200("SPY")
+            second = data_fetcher._fetch_ma_200("SPY")
+
+        assert first["ma_200"] == second["ma_200"]
+        assert second["source"] == "IBKR Paper"
+        run_mock.assert_called_once()
+
 
 class TestYahooHistoricalFallback:
     """Tests for Yahoo Finance historical fallback."""
@@ -107,7 +117,7 @@ class TestYahooHistoricalFallback:
             def json(self):
                 return payload
 
-        with patch("price_sources.requests.get", return_value=MockResponse()):
+        with patch("price_sources.http_client.get", return_value=MockResponse()):
             bars = price_sources.fetch_historical_yahoo("SPY", days=2)
 
         assert bars is not None
@@ -138,7 +148,7 @@ class TestYahooHistoricalFallback:
             def json(self):
                 return payload
 
-        with patch("price_sources.requests.get", return_value=MockResponse()):
+        with patch("price_sources.http_client.get", return_value=MockResponse()):
             bars = price_sources.fetch_historical_yahoo("SPY", days=3)
 
         assert bars is not None
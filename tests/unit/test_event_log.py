@@ -0,0 +1,69 @@
+"""
+Unit tests for the append-only JSONL event log (data quality log).
+"""
+
+import json
+import sys
+from datetime import date, timedelta
+from pathlib import Path
+
+# Add scripts directory to path
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "scripts"))
+
+from data_quality_monitor import OptionsDataQualityMonitor
+from event_log import EventLog, convert_legacy
+
+
+class TestEventLog:
+    """Tests for batched writes, rotation and queries."""
+
+    def test_append_then_query_filters(self, tmp_path):
+        today = date.today().isoformat()
+        log = EventLog(tmp_path)
+        log.append({"type": "validation_failure", "ticker": "SPY", "timestamp": f"{today}T00:00:01"})
+        log.append({"type": "validation_failure", "ticker": "QQQ", "timestamp": f"{today}T00:00:03"})
+        log.append({"type": "circuit_breaker_triggered"}, sync=True)
+
+        assert [e["ticker"] for e in log.query(types=["validation_failure"])] == ["SPY", "QQQ"]
+        assert [e["ticker"] for e in log.query(ticker="spy")] == ["SPY"]
+        assert [e.get("ticker") for e in log.query(start=f"{today}T00:00:02", end=f"{today}T00:00:04")] == ["QQQ"]
+        assert log.query(end=date.today() - timedelta(days=1)) == []
+        assert len(log.query(limit=1)) == 1
+
+    def test_size_rotation_and_file_order(self, tmp_path):
+        log = EventLog(tmp_path, max_bytes=200)
+        for idx in range(6):
+            log.append({"type": "validation_failure", "seq": idx, "error": "x" * 60}, sync=True)
+        log.close()
+
+        files = log.files()
+        assert len(files) > 1
+        assert [event["seq"] for event in log.iter_events()] == list(range(6))
+
+    def test_torn_line_is_skipped(self, tmp_path):
+        (tmp_path / "2026-01-20.jsonl").write_text('{"type": "a", "timestamp": "2026-01-20T10:00:00"}\n{"type": "b"')
+
+        assert [event["type"] for event in EventLog(tmp_path).iter_events()] == ["a"]
+
+    def test_convert_legacy(self, tmp_path):
+        legacy = {"date": "2026-01-20", "events": [{"type": "validation_failure", "ticker": "SPY",
+                                                    "timestamp": "2026-01-20T10:00:00"}]}
+        (tmp_path / "2026-01-20.json").write_text(json.dumps(legacy))
+        (tmp_path / "2026-01-20.jsonl").write_text('{"type": "circuit_breaker_reset", "timestamp": "2026-01-20T12:00:00"}\n')
+
+        assert convert_legacy(tmp_path) == {"2026-01-20": 1}
+        assert (tmp_path / "2026-01-20.json.migrated").exists()
+        assert [e["type"] for e in EventLog(tmp_path).query()] == ["validation_failure", "circuit_breaker_reset"]
+
+
+class TestMonitorLogging:
+    """Tests that the data quality monitor writes to the event log."""
+
+    def test_record_failure_and_reset_logged(self, tmp_path):
+        monitor = OptionsDataQualityMonitor({}, log_dir=tmp_path)
+        monitor.record_failure("greeks_validation", "IV 900% outside range", ticker="ABC")
+        monitor.reset_circuit_breaker()
+
+        events = monitor.event_log.query()
+        assert [event["type"] for event in events] == ["greeks_validation", "circuit_breaker_reset"]
+        assert events[0]["ticker"] == "ABC"
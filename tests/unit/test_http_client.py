@@ -0,0 +1,129 @@
+"""
+Unit tests for the shared HTTP layer and the async fetch variants.
+"""
+
+import asyncio
+import sys
+import threading
+import time
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+# Add scripts directory to path
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "scripts"))
+
+import pytest
+import requests
+
+import http_client
+import price_sources
+import sec_api
+from http_client import HostPool
+from sec_cache import CompanyFactsCache
+
+
+def _response(status_code=200, payload=None, headers=None):
+    response = MagicMock()
+    response.status_code = status_code
+    response.headers = headers or {}
+    response.json.return_value = payload
+    response.raise_for_status.return_value = None
+    return response
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    pool = HostPool({"retries": 2, "backoff_seconds": 0, "host_limits": {"slow.example": 2}})
+    monkeypatch.setattr(http_client, "_pool", pool)
+    yield pool
+    pool.close()
+
+
+class TestGet:
+    """Tests for pooled sessions and retries."""
+
+    def test_session_reused_per_host(self, pool):
+        assert pool.session("stooq.com") is pool.session("stooq.com")
+        assert pool.session("stooq.com") is not pool.session("data.sec.gov")
+        assert pool.limit("slow.example") == 2
+        assert pool.limit("other.example") == http_client.DEFAULT_HOST_LIMIT
+
+    def test_retries_transient_status(self, pool):
+        responses = [_response(503), _response(200, {"ok": True})]
+        with patch("http_client._request_once", side_effect=responses) as request_mock:
+            response = http_client.get("https://stooq.com/q/l/")
+
+        assert response.status_code == 200
+        assert request_mock.call_count == 2
+
+    def test_gives_up_after_retries(self, pool):
+        with patch("http_client._request_once", side_effect=requests.ConnectionError("down")) as request_mock:
+            with pytest.raises(requests.ConnectionError):
+                http_client.get("https://stooq.com/q/l/")
+        assert request_mock.call_count == 3
+
+    def test_not_found_is_not_retried(self, pool):
+        with patch("http_client._request_once", return_value=_response(404)) as request_mock:
+            assert http_client.get("https://stooq.com/q/l/").status_code == 404
+        request_mock.assert_called_once()
+
+    def test_retry_after_header(self, pool):
+        assert pool.backoff_delay(0, _response(429, headers={"Retry-After": "3"})) == 3.0
+
+
+class TestGetAsync:
+    """Tests for the asyncio front end."""
+
+    def test_per_host_concurrency_limit(self, pool):
+        active = {"now": 0, "max": 0}
+        lock = threading.Lock()
+
+        def slow_request(url, params, headers, timeout):
+            with lock:
+                active["now"] += 1
+                active["max"] = max(active["max"], active["now"])
+            time.sleep(0.02)
+            with lock:
+                active["now"] -= 1
+            return _response(200)
+
+        async def run():
+            return await asyncio.gather(*(http_client.get_async("https://slow.example/x") for _ in range(6)))
+
+        with patch("http_client._request_once", side_effect=slow_request):
+            responses = asyncio.run(run())
+
+        assert len(responses) == 6
+        assert active["max"] == 2
+
+
+class TestAsyncVariants:
+    """Tests for fetch_price_async and get_company_facts_async."""
+
+    def test_fetch_price_async_falls_back_to_stooq(self, pool):
+        stooq = _response(200, {"symbols": [{"symbol": "SPY.US", "close": 500.0}]})
+        with patch("price_sources.fetch_from_ibkr", return_value=None), patch(
+            "price_sources.http_client.get_async", return_value=stooq
+        ):
+            data = asyncio.run(price_sources.fetch_price_async("spy", use_cache=False))
+
+        assert data["price"] == 500.0
+        assert data["source"] == "Stooq (15-min delay)"
+
+    def test_company_facts_async_overlaps_and_caches(self, pool, tmp_path, monkeypatch):
+        cache = CompanyFactsCache(tmp_path)
+        monkeypatch.setattr(sec_api, "_facts_cache", cache)
+        facts = {"facts": {}}
+
+        async def run():
+            return await asyncio.gather(
+                sec_api.get_company_facts_async("320193"),
+                sec_api.get_company_facts_async("789019"),
+            )
+
+        with patch("sec_api.http_client.get_async", return_value=_response(200, facts)) as get_mock:
+            assert asyncio.run(run()) == [facts, facts]
+            assert get_mock.call_count == 2
+            # Second run served from the on-disk cache
+            assert asyncio.run(run()) == [facts, facts]
+            assert get_mock.call_count == 2
@@ -0,0 +1,106 @@
+"""
+Unit tests for the IBKR gateway client (socket transport and subprocess fallback).
+"""
+
+import json
+import socket
+import sys
+import threading
+from pathlib import Path
+from unittest.mock import patch
+
+# Add scripts and fixtures directories to path
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "scripts"))
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "fixtures"))
+
+import pytest
+
+import ibkr_client
+from ibkr_fixtures import mock_subprocess_run_failure, mock_subprocess_run_success
+
+
+def _serve_once(path, response):
+    """Accept one connection on a Unix socket and reply with `response`."""
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(str(path))
+    server.listen(1)
+    received = {}
+
+    def run():
+        conn, _ = server.accept()
+        with conn:
+            received["request"] = json.loads(conn.makefile().readline())
+            conn.sendall((json.dumps(response) + "\n").encode("utf-8"))
+        server.close()
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    return thread, received
+
+
+class TestCLIArgs:
+    """Tests for gateway params -> ibkr_paper.py CLI translation."""
+
+    def test_positional_ticker_and_flags(self):
+        args = ibkr_client._build_cli_args(
+            "atm_iv", {"ticker": "SPY", "expiration": "2026-02-20", "underlying_price": 500.0}
+        )
+        assert args == ["atm_iv", "SPY", "--expiration", "2026-02-20", "--underlying-price", "500.0"]
+
+    def test_none_values_skipped(self):
+        args = ibkr_client._build_cli_args("quote", {"ticker": "SPY", "conid": None})
+        assert args == ["quote", "SPY"]
+
+    def test_no_ticker(self):
+        assert ibkr_client._build_cli_args("positions", {}) == ["positions"]
+
+    def test_ticker_list_positional(self):
+        args = ibkr_client._build_cli_args("quotes", {"tickers": ["LULU", "RGNX"]})
+        assert args == ["quotes", "LULU", "RGNX"]
+
+
+class TestGatewayTransport:
+    """Tests for requests served by a running gateway."""
+
+    def test_request_round_trip(self, tmp_path, monkeypatch):
+        path = tmp_path / "gw.sock"
+        monkeypatch.setenv("IBKR_GATEWAY_SOCKET", str(path))
+        thread, received = _serve_once(path, {"ticker": "SPY", "last": 501.2})
+
+        with patch("ibkr_client.subprocess.run") as run_mock:
+            data = ibkr_client.run_ibkr_command("quote", {"ticker": "SPY"}, timeout=5)
+        thread.join(timeout=5)
+
+        assert data["last"] == 501.2
+        assert received["request"] == {"command": "quote", "params": {"ticker": "SPY"}}
+        run_mock.assert_not_called()
+
+    def test_missing_socket_falls_back_to_subprocess(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("IBKR_GATEWAY_SOCKET", str(tmp_path / "missing.sock"))
+        with patch("ibkr_client.subprocess.run") as run_mock:
+            run_mock.return_value = mock_subprocess_run_success("valid_atm_iv_spy")
+            data = ibkr_client.run_ibkr_command("atm_iv", {"ticker": "SPY", "expiration": "2026-02-20"})
+
+        assert data["implied_volatility"] == 0.18
+        run_mock.assert_called_once()
+
+    def test_stale_socket_raises_unavailable(self, tmp_path, monkeypatch):
+        path = tmp_path / "stale.sock"
+        stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        stale.bind(str(path))
+        stale.close()
+        monkeypatch.setenv("IBKR_GATEWAY_SOCKET", str(path))
+
+        with pytest.raises(ibkr_client.GatewayUnavailable):
+            ibkr_client.gateway_request("ping", timeout=1)
+
+
+class TestSubprocessFallback:
+    """Tests for one-shot subprocess result handling."""
+
+    def test_failure_returns_error_dict(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("IBKR_GATEWAY_SOCKET", str(tmp_path / "missing.sock"))
+        with patch("ibkr_client.subprocess.run", return_value=mock_subprocess_run_failure()):
+            data = ibkr_client.run_ibkr_command("quote", {"ticker": "BAD"})
+
+        assert data == {"error": "IBKR error: Invalid contract"}
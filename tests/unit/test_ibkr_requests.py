@@ -0,0 +1,103 @@
+"""
+Unit tests for IBKR request completion predicates, settle windows and latency stats.
+"""
+
+import sys
+import threading
+import time
+from pathlib import Path
+
+# Add scripts directory to path
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "scripts"))
+
+import ibkr_requests
+from ibkr_requests import LatencyStats, PendingRequest, wait_all
+
+
+def _tick_later(pending, ticks, delay=0.02):
+    def deliver():
+        for key, value in ticks:
+            pending.ticks[key] = value
+            pending.notify()
+    timer = threading.Timer(delay, deliver)
+    timer.start()
+    return timer
+
+
+class TestCompletion:
+    """Tests for predicate-driven completion."""
+
+    def test_predicates(self):
+        assert ibkr_requests.has_stock_quote({66: 10.0, 67: 10.2, 68: 10.1})
+        assert not ibkr_requests.has_stock_quote({1: 10.0, 2: 10.2})
+        assert ibkr_requests.has_underlying_price({1: 10.0, 2: 10.2})
+        assert not ibkr_requests.has_option_quote({1: 1.0, 2: 1.1, "greeks": {"implied_volatility": 0.4}})
+        assert ibkr_requests.has_option_quote({1: 1.0, 2: 1.1, "greeks": {"implied_volatility": 0.4, "delta": 0.5}})
+
+    def test_placeholder_ticks_are_not_quotes(self):
+        placeholders = {1: -1.0, 2: -1.0, 4: -1.0}
+
+        assert not ibkr_requests.COMPLETION_PREDICATES["stock_quote"](placeholders)
+        assert not ibkr_requests.COMPLETION_PREDICATES["underlying_price"](placeholders)
+        assert not ibkr_requests.has_option_quote({1: -1.0, 2: 1.1, "greeks": {"implied_volatility": 0.4, "delta": 0.5}})
+        assert ibkr_requests.tick_value({4: -1.0, 68: 10.1}, ibkr_requests.LAST_TICKS) == 10.1
+        assert ibkr_requests.tick_value(placeholders, ibkr_requests.BID_TICKS) is None
+
+    def test_completes_when_required_fields_arrive(self):
+        pending = PendingRequest(1, "mktdata_snapshot", requires="stock_quote")
+        _tick_later(pending, [(1, 10.0), (2, 10.2), (4, 10.1)])
+
+        started = time.monotonic()
+        assert pending.wait(5.0) is True
+        assert time.monotonic() - started < 1.0
+        assert pending.complete
+        assert pending.latency_ms()["complete"] >= pending.latency_ms()["first_tick"]
+
+    def test_settle_bounds_wait_for_missing_fields(self):
+        pending = PendingRequest(1, "mktdata_stream", requires="option_quote")
+        _tick_later(pending, [(1, 1.0), (2, 1.1)])  # Greeks never arrive
+
+        started = time.monotonic()
+        assert pending.wait(5.0, settle=0.1) is False
+        assert time.monotonic() - started < 1.0
+        assert not pending.complete
+        assert pending.latency_ms()["complete"] is None
+
+    def test_wait_all_without_ticks_uses_timeout(self):
+        requests = [PendingRequest(idx, "mktdata_snapshot", requires="stock_quote") for idx in range(2)]
+
+        assert wait_all(requests, 0.05, settle=0.01) is False
+
+
+class TestLatencyStats:
+    """Tests for the adaptive settle window and summary."""
+
+    def _finished(self, requires, fill_seconds, complete=True):
+        pending = PendingRequest(1, "mktdata_snapshot", requires=requires)
+        pending.started_at = 100.0
+        pending.first_tick_at = 100.05
+        pending.completed_at = 100.05 + fill_seconds if complete else None
+        return pending
+
+    def test_settle_adapts_to_observed_fill_times(self):
+        stats = LatencyStats()
+        assert stats.settle("option_quote", 10.0) == ibkr_requests.DEFAULT_SETTLE_SECONDS
+
+        for _ in range(10):
+            stats.record(self._finished("option_quote", 0.3))
+
+        assert abs(stats.settle("option_quote", 10.0) - 0.6) < 1e-9
+        assert stats.settle("option_quote", 0.4) == 0.4
+
+    def test_summary_counts_incomplete(self):
+        stats = LatencyStats()
+        stats.record(self._finished("stock_quote", 0.1))
+        stats.record(self._finished("stock_quote", 0.0, complete=False))
+        stats.record(PendingRequest(2, "historical"))
+
+        summary = stats.summary()
+
+        assert list(summary) == ["stock_quote"]
+        assert summary["stock_quote"]["completed"] == 1
+        assert summary["stock_quote"]["incomplete"] == 1
+        assert summary["stock_quote"]["p50_ms"] == 150.0
@@ -0,0 +1,104 @@
+"""
+Unit tests for the vectorized indicator engine.
+"""
+
+import math
+import sys
+from datetime import date, timedelta
+from pathlib import Path
+from unittest.mock import patch
+
+# Add scripts directory to path
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "scripts"))
+
+import numpy as np
+import pytest
+
+import data_fetcher
+import indicators
+from bar_store import BarStore
+
+
+def _store_bars(store, ticker, closes, volume=1000):
+    start = date(2025, 1, 1)
+    bars = [
+        {"date": (start + timedelta(days=idx)).isoformat(), "close": close, "volume": volume}
+        for idx, close in enumerate(closes)
+    ]
+    return store.append(ticker, bars, source="Yahoo Finance")
+
+
+class TestArrayFunctions:
+    """Tests for the per-array indicator functions."""
+
+    def test_trailing_and_rolling_mean_batch(self):
+        values = np.array([[1.0, 2.0, 3.0, 4.0], [np.nan, 2.0, 4.0, 6.0]])
+
+        assert list(indicators.trailing_mean(values, 2)) == [3.5, 5.0]
+        assert math.isnan(indicators.trailing_mean(values, 4)[1])
+        assert list(indicators.rolling_mean(values[0], 2)[1:]) == [1.5, 2.5, 3.5]
+
+    def test_realized_volatility_constant_growth_is_zero(self):
+        closes = 100 * 1.01 ** np.arange(30)
+        assert indicators.realized_volatility(closes, 20) == pytest.approx(0.0, abs=1e-12)
+
+    def test_percentile_rank(self):
+        history = np.array([[10.0, 20.0, 30.0, 40.0], [1.0, np.nan, 3.0, 4.0]])
+        ranks = indicators.percentile_rank(history, np.array([30.0, 0.5]))
+        assert list(ranks) == [75.0, 0.0]
+
+    def test_drawdowns(self):
+        closes = np.array([100.0, 120.0, 90.0, 110.0])
+        assert indicators.drawdown_from_high(closes) == pytest.approx(110 / 120 - 1)
+        assert indicators.max_drawdown(closes) == pytest.approx(-0.25)
+
+    def test_period_return_and_price_vs_target(self):
+        closes = np.array([[10.0, 11.0, 13.0], [20.0, 20.0, 10.0]])
+        assert list(indicators.period_return(closes, 2)) == pytest.approx([0.3, -0.5])
+        assert math.isnan(indicators.period_return(closes, 3)[0])
+
+        progress = indicators.price_vs_target([14.13, 5.0], [13.62, 5.0], [30.78, 5.0])
+        assert progress[0] == pytest.approx(0.0297, abs=1e-4)
+        assert math.isnan(progress[1])
+
+
+class TestComputeIndicators:
+    """Tests for the batched indicator table."""
+
+    def test_batch_with_short_history(self, tmp_path):
+        store = BarStore(tmp_path)
+        long_bars = _store_bars(store, "SPY", [100.0 + idx for idx in range(260)])
+        short_bars = _store_bars(store, "NEW", [10.0] * 30)
+
+        table = indicators.compute_indicators({"SPY": long_bars, "NEW": short_bars, "NONE": None})
+
+        assert set(table) == {"SPY", "NEW"}
+        assert table["SPY"]["ma_200"] == pytest.approx(long_bars.moving_average(200))
+        assert table["SPY"]["runup_t90"] == pytest.approx(359.0 / 296.0 - 1)
+        assert table["SPY"]["drawdown_from_high"] == 0.0
+        assert table["NEW"]["ma_200"] is None
+        assert table["NEW"]["hv_20"] == 0.0
+        assert table["NEW"]["avg_volume_20d"] == 1000.0
+
+
+class TestFetchIndicators:
+    """Tests for the monitor-flow batch entry point."""
+
+    def test_trades_get_price_vs_target(self, tmp_path):
+        store = BarStore(tmp_path)
+        stored = {"RGNX": _store_bars(store, "RGNX", [12.0] * 210)}
+        trades = [{
+            "trade_id": "TRD-20260119-RGNX-PDUFA",
+            "ticker": "RGNX",
+            "position": {"entry_price": 13.62, "target_price": 30.78, "stop_price": 8.0},
+        }]
+        with patch("data_fetcher._update_bars", side_effect=lambda t: (stored.get(t), 0)), patch(
+            "data_fetcher.fetch_prices", return_value={"RGNX": {"price": 14.13, "source": "Stooq"}}
+        ), patch("data_fetcher._load_active_trades", return_value=trades):
+            data = data_fetcher.fetch_indicators(["rgnx"])
+
+        row = data["trades"][0]
+        assert data["indicators"]["RGNX"]["price"] == 14.13
+        assert data["indicators"]["RGNX"]["ma_200"] == 12.0
+        assert row["price_vs_target"] == pytest.approx(0.0297, abs=1e-4)
+        assert row["below_stop"] is False
@@ -0,0 +1,85 @@
+"""
+Unit tests for the local ATM IV history store (IV percentile, average IV).
+"""
+
+import sys
+from datetime import date, timedelta
+from pathlib import Path
+from unittest.mock import patch
+
+# Add scripts and fixtures directories to path
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "scripts"))
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "fixtures"))
+
+import data_fetcher
+from ibkr_fixtures import mock_subprocess_run_success
+from iv_store import IVStore
+
+
+def _record_days(store, ticker, start, ivs, expiration="2026-06-19"):
+    for offset, iv in enumerate(ivs):
+        store.record(ticker, iv, expiration, observed=start + timedelta(days=offset))
+
+
+class TestIVStore:
+    """Tests for recording and daily-series queries."""
+
+    def test_same_day_same_expiration_replaced(self, tmp_path):
+        store = IVStore(tmp_path)
+        store.record("spy", 0.20, "2026-02-20", strike=600.0, delta=0.5, observed=date(2026, 1, 5))
+        store.record("SPY", 0.22, "2026-02-20", observed=date(2026, 1, 5))
+        history = store.record("SPY", 0.25, "2026-03-20", observed=date(2026, 1, 5))
+
+        assert len(history) == 2
+        assert list(store.load("SPY").iv) == [0.22, 0.25]
+
+    def test_daily_series_uses_expiration_nearest_target_dte(self, tmp_path):
+        store = IVStore(tmp_path)
+        observed = date(2026, 1, 5)
+        store.record("SPY", 0.30, "2026-01-09", observed=observed)  # 4 DTE
+        store.record("SPY", 0.20, "2026-02-06", observed=observed)  # 32 DTE
+        store.record("SPY", 0.18, "2026-04-17", observed=observed)  # 102 DTE
+
+        dates, ivs = store.load("SPY").daily()
+
+        assert list(dates) == [20260105]
+        assert list(ivs) == [0.20]
+
+    def test_summary_percentile_and_multiple(self, tmp_path):
+        store = IVStore(tmp_path)
+        start = date(2026, 1, 1)
+        _record_days(store, "ABC", start, [0.40 + 0.01 * (idx % 5) for idx in range(30)])
+        today = start + timedelta(days=30)
+        store.record("ABC", 1.00, "2026-06-19", observed=today)
+
+        summary = store.summary("ABC", 1.00, observed=today)
+
+        assert summary["iv_history_days"] == 31
+        assert summary["iv_percentile"] == 100.0
+        assert abs(summary["iv_avg"] - 0.42) < 1e-9
+        assert summary["iv_multiple_vs_avg"] == round(1.00 / 0.42, 3)
+
+    def test_summary_none_until_min_history(self, tmp_path):
+        store = IVStore(tmp_path)
+        _record_days(store, "ABC", date(2026, 1, 1), [0.4] * 5)
+
+        summary = store.summary("ABC", 0.5, observed=date(2026, 1, 10))
+
+        assert summary["iv_history_days"] == 5
+        assert summary["iv_percentile"] is None
+        assert summary["iv_multiple_vs_avg"] is None
+
+
+class TestFetchRecordsIV:
+    """Tests that live ATM IV fetches feed the store."""
+
+    def test_fetch_atm_iv_records_observation(self, tmp_path):
+        with patch("data_fetcher._iv_store", IVStore(tmp_path)) as store, \
+                patch("ibkr_client.subprocess.run") as run_mock:
+            run_mock.return_value = mock_subprocess_run_success("valid_atm_iv_spy")
+            data_fetcher._fetch_atm_iv("SPY", expiration="2026-02-20")
+
+        history = store.load("SPY")
+        assert len(history) == 1
+        assert history.iv[0] == 0.18
+        assert history.expiration[0] == 20260220
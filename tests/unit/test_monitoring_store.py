@@ -0,0 +1,85 @@
+"""
+Unit tests for the columnar monitoring-history store.
+"""
+
+import json
+import math
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# Add scripts directory to path
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "scripts"))
+
+from monitoring_store import MonitoringStore, entry_row, record_day
+from trade_repository import TradeRepository
+
+
+def _entry(day, price, pnl, weighted_sum, **extra):
+    return {"date": day, "price": price, "unrealized_pnl": pnl, "weighted_sum": weighted_sum,
+            "info_parity": {"media": 0, "iv": 1, "price": 0.2}, "above_200_ma": True, **extra}
+
+
+def _write_trade(root, trade_id, monitoring):
+    path = root / "active" / f"{trade_id}.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({"trade_id": trade_id, "ticker": trade_id.split("-")[2],
+                                "monitoring": monitoring}, indent=2))
+    return path
+
+
+class TestMonitoringStore:
+    """Tests for appends, sync and aligned matrices."""
+
+    def test_entry_row(self):
+        row = entry_row({"underlying_price": 128.0, "info_parity": {"iv": 1}, "above_200_ma": False,
+                         "weighted_sum": "n/a"})
+
+        assert row["price"] == 128.0
+        assert row["iv"] == 1.0
+        assert row["above_200_ma"] == 0.0
+        assert math.isnan(row["weighted_sum"])
+
+    def test_append_day_and_aligned_matrix(self, tmp_path):
+        store = MonitoringStore(tmp_path / "monitoring.npz")
+        store.append_day("2026-01-20", {"TRD-A": _entry("2026-01-20", 10.0, 1.0, 0.5),
+                                        "TRD-B": _entry("2026-01-20", 20.0, -2.0, 1.0)})
+        store.append_day("2026-01-21", {"TRD-A": _entry("2026-01-21", 11.0, 2.0, 0.7)})
+        store.append_day("2026-01-21", {"TRD-A": _entry("2026-01-21", 11.5, 3.0, 0.9)})  # replaces the day
+
+        dates, trade_ids, pnl = store.pnl_matrix()
+
+        assert dates.tolist() == [20260120, 20260121]
+        assert trade_ids == ["TRD-A", "TRD-B"]
+        np.testing.assert_array_equal(pnl, [[1.0, -2.0], [3.0, np.nan]])
+        _, _, weighted = store.weighted_sum_matrix(trade_ids=["TRD-B"], start="2026-01-21")
+        assert weighted.shape == (0, 1)
+
+    def test_sync_rebuilds_changed_trades(self, tmp_path):
+        _write_trade(tmp_path, "TRD-20260119-RGNX-PDUFA", [_entry("2026-01-19", 13.62, 0.0, 0.0),
+                                                            _entry("2026-01-20", 14.0, 10.26, 0.02)])
+        path = _write_trade(tmp_path, "TRD-20260107-LULU-ACTIVIST", [_entry("2026-01-20", 190.0, -20.0, 0.5)])
+        repo = TradeRepository(tmp_path, tmp_path / "index.json")
+        store = MonitoringStore(tmp_path / "monitoring.npz")
+
+        assert store.sync(repo)["rebuilt"] == ["TRD-20260107-LULU-ACTIVIST", "TRD-20260119-RGNX-PDUFA"]
+        assert store.sync(repo)["rebuilt"] == []
+
+        path.unlink()
+        assert store.sync(repo)["dropped"] == ["TRD-20260107-LULU-ACTIVIST"]
+        series = store.load().series("TRD-20260119-RGNX-PDUFA")
+        assert series["date"].tolist() == [20260119, 20260120]
+        assert series["price_signal"].tolist() == [0.2, 0.2]
+
+    def test_record_day_writes_trade_files_and_store(self, tmp_path):
+        path = _write_trade(tmp_path, "TRD-20260119-RGNX-PDUFA", [_entry("2026-01-19", 13.62, 0.0, 0.0)])
+        repo = TradeRepository(tmp_path, tmp_path / "index.json")
+        store = MonitoringStore(tmp_path / "monitoring.npz")
+        store.sync(repo)
+
+        record_day("2026-01-20", {"TRD-20260119-RGNX-PDUFA": _entry(None, 14.0, 10.26, 0.02)}, repo, store)
+
+        assert json.loads(path.read_text())["monitoring"][-1]["date"] == "2026-01-20"
+        assert store.sync(repo)["rebuilt"] == []
+        assert store.load().series("TRD-20260119-RGNX-PDUFA")["unrealized_pnl"].tolist() == [0.0, 10.26]
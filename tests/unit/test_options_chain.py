@@ -0,0 +1,73 @@
+"""
+Unit tests for option chain selection (listed expirations/strikes) and fetching.
+"""
+
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+# Add scripts and fixtures directories to path
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "scripts"))
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "fixtures"))
+
+import data_fetcher
+import options_utils
+from ibkr_fixtures import get_mock_response, mock_subprocess_run_success
+
+
+class TestChainSelection:
+    """Tests for picking contracts from the listed chain."""
+
+    def test_merge_prefers_smart_and_symbol_trading_class(self):
+        params = [
+            {"exchange": "CBOE", "trading_class": "ABC", "multiplier": "100",
+             "expirations": ["20260220"], "strikes": [22.5]},
+            {"exchange": "SMART", "trading_class": "ABC", "multiplier": "100",
+             "expirations": ["20260320", "20260220"], "strikes": [24.0, 23.0]},
+            {"exchange": "SMART", "trading_class": "2ABC", "multiplier": "100",
+             "expirations": ["20260220"], "strikes": [23.37]},
+        ]
+
+        chain = options_utils.merge_option_params(params, "ABC")
+
+        assert chain["expirations"] == ["2026-02-20", "2026-03-20"]
+        assert chain["strikes"] == [23.0, 24.0]
+        assert chain["trading_class"] == "ABC"
+
+    def test_nearest_strikes_uses_listed_spacing(self):
+        strikes = [float(k) for k in range(15, 35)]
+
+        assert options_utils.nearest_strikes(strikes, 23.6, 2) == [22.0, 23.0, 24.0, 25.0, 26.0]
+        assert options_utils.nearest_strikes(strikes, 15.2, 2) == [15.0, 16.0, 17.0]
+
+    def test_select_expiration_rolls_to_next_listed(self):
+        expirations = ["2026-02-20", "2026-03-20"]
+
+        assert options_utils.select_expiration(expirations, "2026-02-19") == "2026-02-20"
+        assert options_utils.select_expiration(expirations, "2026-03-20") == "2026-03-20"
+        assert options_utils.select_expiration(expirations, None) == "2026-02-20"
+
+    def test_select_atm_and_delta(self):
+        options = get_mock_response("valid_option_chain_abc")["options"]
+
+        assert options_utils.select_atm_option(options, 23.6)["strike"] == 24.0
+        assert options_utils.select_by_delta(options, 0.35)["strike"] == 25.0
+
+
+class TestFetchOptionChain:
+    """Tests for data_fetcher.fetch_option_chain."""
+
+    def test_fetch_option_chain_success(self):
+        with patch("ibkr_client.subprocess.run") as run_mock:
+            run_mock.return_value = mock_subprocess_run_success("valid_option_chain_abc")
+            data = data_fetcher.fetch_option_chain("abc", expiration="2026-02-19", strikes=2)
+
+        args = run_mock.call_args[0][0]
+        assert args[2:4] == ["option_chain", "ABC"]
+        assert "--strikes" in args
+        assert data["expiration"] == "2026-02-20"
+        assert [row["strike"] for row in data["options"]] == [22.0, 23.0, 24.0, 25.0, 26.0]
+
+    def test_fetch_option_chain_error(self):
+        with patch("data_fetcher.run_ibkr_command", return_value={"error": "No security definition"}):
+            assert data_fetcher.fetch_option_chain("ABC") is None
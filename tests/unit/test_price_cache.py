@@ -0,0 +1,96 @@
+"""
+Unit tests for the disk-backed price cache (session-aware expiry, LRU, sharing).
+"""
+
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+from unittest.mock import patch
+
+# Add scripts directory to path
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "scripts"))
+
+import price_cache
+from price_cache import MARKET_TZ, PriceCache, expires_at, is_market_open, next_market_open
+
+
+def _et(*args):
+    return datetime(*args, tzinfo=MARKET_TZ)
+
+
+class TestMarketSession:
+    """Tests for session boundaries and expiry times."""
+
+    def test_regular_hours(self):
+        assert is_market_open(_et(2026, 1, 20, 10, 0))  # Tuesday
+        assert not is_market_open(_et(2026, 1, 20, 9, 29))
+        assert not is_market_open(_et(2026, 1, 20, 16, 0))
+        assert not is_market_open(_et(2026, 1, 24, 12, 0))  # Saturday
+
+    def test_next_open_after_friday_close_is_monday(self):
+        assert next_market_open(_et(2026, 1, 23, 17, 0)) == _et(2026, 1, 26, 9, 30)
+
+    def test_next_open_before_open_is_same_day(self):
+        assert next_market_open(_et(2026, 1, 20, 7, 0)) == _et(2026, 1, 20, 9, 30)
+
+    def test_intraday_expiry_is_short_and_capped_at_close(self):
+        ttl = timedelta(minutes=5)
+        assert expires_at(ttl, _et(2026, 1, 20, 10, 0)) == _et(2026, 1, 20, 10, 5)
+        assert expires_at(ttl, _et(2026, 1, 20, 15, 58)) == _et(2026, 1, 20, 16, 0)
+
+    def test_after_close_valid_until_next_open(self):
+        assert expires_at(timedelta(minutes=5), _et(2026, 1, 20, 18, 0)) == _et(2026, 1, 21, 9, 30)
+
+
+class TestPriceCache:
+    """Tests for persistence, expiry and eviction."""
+
+    def test_shared_between_instances(self, tmp_path):
+        path = tmp_path / "prices.sqlite"
+        PriceCache(path).set("LULU", {"price": 200.0, "source": "Stooq (15-min delay)"})
+
+        data = PriceCache(path).get("LULU")
+
+        assert data["price"] == 200.0
+        assert "cache_age_seconds" in data
+
+    def test_namespaces_are_separate(self, tmp_path):
+        cache = PriceCache(tmp_path / "prices.sqlite")
+        cache.set("LULU", [{"date": "2026-01-20", "close": 200.0}], namespace="historical", source="Yahoo Finance")
+
+        assert cache.get("LULU") is None
+        assert cache.get("LULU", namespace="historical")[0]["close"] == 200.0
+
+    def test_expired_entry_is_miss(self, tmp_path):
+        cache = PriceCache(tmp_path / "prices.sqlite")
+        past = datetime.now(MARKET_TZ) - timedelta(minutes=1)
+        with patch("price_cache.expires_at", return_value=past):
+            cache.set("LULU", {"price": 200.0})
+
+        assert cache.get("LULU") is None
+        assert cache.purge_expired() == 1
+
+    def test_lru_eviction(self, tmp_path):
+        cache = PriceCache(tmp_path / "prices.sqlite", max_entries=2)
+        with patch("price_cache.time.time", side_effect=[1.0, 2.0, 3.0, 4.0]):
+            cache.set("A", {"price": 1.0})
+            cache.set("B", {"price": 2.0})
+            cache.get("A")  # A is now more recent than B
+            cache.set("C", {"price": 3.0})
+
+        keys = {key for key in ("A", "B", "C") if cache.get(key, "quote") is not None}
+        assert keys == {"A", "C"}
+
+    def test_stats_by_source(self, tmp_path):
+        cache = PriceCache(tmp_path / "prices.sqlite")
+        cache.set("LULU", {"price": 200.0, "source": "IBKR Paper"})
+        cache.set("RGNX", {"price": 12.0, "source": "Stooq (15-min delay)"})
+
+        stats = cache.stats()
+
+        assert stats["entries"] == 2
+        assert stats["sources"]["quote"]["IBKR Paper"]["entries"] == 1
+
+    def test_default_path_follows_cache_dir(self, isolated_cache_dir):
+        assert PriceCache().path == isolated_cache_dir / "prices.sqlite"
+        assert price_cache.cache_dir() == isolated_cache_dir
@@ -0,0 +1,124 @@
+"""
+Unit tests for batched price fetching (fetch_prices and per-source batch fetchers).
+"""
+
+import sys
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+# Add scripts directory to path
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "scripts"))
+
+import pytest
+import requests
+
+import price_sources
+
+
+def _response(payload):
+    response = MagicMock()
+    response.json.return_value = payload
+    response.raise_for_status.return_value = None
+    return response
+
+
+def _stooq_row(symbol, close):
+    return {"symbol": symbol, "open": close, "high": close, "low": close, "close": close, "volume": 1000}
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    price_sources._price_cache.clear()
+    yield
+    price_sources._price_cache.clear()
+
+
+class TestSourceBatches:
+    """Tests for the per-source batch fetchers."""
+
+    def test_ibkr_batch_keeps_tickers_with_last(self):
+        payload = {
+            "quotes": {
+                "LULU": {"ticker": "LULU", "bid": 199.5, "ask": 200.5, "last": 200.0},
+                "RGNX": {"ticker": "RGNX", "bid": None, "ask": None, "last": None},
+            },
+            "errors": [],
+        }
+        with patch("price_sources.run_ibkr_command", return_value=payload) as run_mock:
+            prices = price_sources.fetch_from_ibkr_batch(["LULU", "RGNX"])
+
+        assert run_mock.call_args[0][:2] == ("quotes", {"tickers": ["LULU", "RGNX"]})
+        assert list(prices) == ["LULU"]
+        assert prices["LULU"]["source"] == "IBKR Paper"
+        assert prices["LULU"]["bid"] == 199.5
+
+    def test_stooq_batch_single_request_skips_missing_symbols(self):
+        payload = {
+            "symbols": [
+                _stooq_row("LULU.US", 200.0),
+                {"symbol": "ZZZZ.US", "close": "N/D", "open": "N/D"},
+            ]
+        }
+        with patch("price_sources.http_client.get", return_value=_response(payload)) as get_mock:
+            prices = price_sources.fetch_from_stooq_batch(["LULU", "ZZZZ"])
+
+        get_mock.assert_called_once()
+        assert "s=lulu.us+zzzz.us" in get_mock.call_args[0][0]
+        assert list(prices) == ["LULU"]
+        assert prices["LULU"]["price"] == 200.0
+
+    def test_yahoo_batch_falls_back_to_chart_for_missing(self):
+        quote_payload = {
+            "quoteResponse": {
+                "result": [{"symbol": "LULU", "regularMarketPrice": 200.0, "regularMarketPreviousClose": 198.0}]
+            }
+        }
+        chart_result = {"price": 12.0, "source": "Yahoo Finance"}
+        with patch("price_sources.http_client.get", return_value=_response(quote_payload)), patch(
+            "price_sources.fetch_from_yahoo", return_value=chart_result
+        ) as chart_mock:
+            prices = price_sources.fetch_from_yahoo_batch(["LULU", "RGNX"])
+
+        chart_mock.assert_called_once_with("RGNX")
+        assert prices["LULU"]["previous_close"] == 198.0
+        assert prices["RGNX"]["price"] == 12.0
+
+    def test_yahoo_batch_rejected_uses_chart_for_all(self):
+        with patch(
+            "price_sources.http_client.get", side_effect=requests.RequestException("401 Unauthorized")
+        ), patch("price_sources.fetch_from_yahoo", return_value={"price": 1.0}) as chart_mock:
+            prices = price_sources.fetch_from_yahoo_batch(["LULU", "RGNX"])
+
+        assert chart_mock.call_count == 2
+        assert set(prices) == {"LULU", "RGNX"}
+
+
+class TestFetchPrices:
+    """Tests for fallback across sources in fetch_prices."""
+
+    def test_falls_back_only_for_failed_tickers(self):
+        with patch(
+            "price_sources.fetch_from_ibkr_batch", return_value={"LULU": {"price": 200.0, "source": "IBKR Paper"}}
+        ) as ibkr_mock, patch(
+            "price_sources.fetch_from_stooq_batch", return_value={"RGNX": {"price": 12.0, "source": "Stooq"}}
+        ) as stooq_mock, patch("price_sources.fetch_from_yahoo_batch", return_value={}) as yahoo_mock:
+            prices = price_sources.fetch_prices(["lulu", "RGNX", "ZZZZ", "LULU"])
+
+        ibkr_mock.assert_called_once_with(["LULU", "RGNX", "ZZZZ"])
+        stooq_mock.assert_called_once_with(["RGNX", "ZZZZ"])
+        yahoo_mock.assert_called_once_with(["ZZZZ"])
+        assert list(prices) == ["LULU", "RGNX", "ZZZZ"]
+        assert prices["LULU"]["source"] == "IBKR Paper"
+        assert prices["RGNX"]["cache_hit"] is False
+        assert prices["ZZZZ"] is None
+
+    def test_cached_tickers_skip_sources(self):
+        price_sources._price_cache.set("LULU", {"price": 200.0, "source": "IBKR Paper"})
+        with patch("price_sources.fetch_from_ibkr_batch", return_value={}) as ibkr_mock, patch(
+            "price_sources.fetch_from_stooq_batch", return_value={"RGNX": {"price": 12.0}}
+        ), patch("price_sources.fetch_from_yahoo_batch") as yahoo_mock:
+            prices = price_sources.fetch_prices(["LULU", "RGNX"])
+
+        ibkr_mock.assert_called_once_with(["RGNX"])
+        yahoo_mock.assert_not_called()
+        assert prices["LULU"]["cache_hit"] is True
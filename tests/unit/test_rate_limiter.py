@@ -0,0 +1,113 @@
+"""
+Unit tests for the cross-process token-bucket rate limiter.
+"""
+
+import asyncio
+import sqlite3
+import sys
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+# Add scripts directory to path
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "scripts"))
+
+import pytest
+
+import http_client
+from http_client import HostPool
+from rate_limiter import RateLimiter
+
+LIMITS = {"sec.gov": {"per_second": 10, "burst": 2}}
+
+
+class TestRateLimiter:
+    """Tests for bucket accounting."""
+
+    def test_burst_then_wait(self, tmp_path):
+        limiter = RateLimiter(LIMITS, tmp_path / "limits.sqlite")
+
+        assert limiter.reserve("data.sec.gov") == 0
+        assert limiter.reserve("www.sec.gov") == 0
+        # Bucket shared by both SEC hosts is now empty: next token in ~0.1s
+        assert limiter.reserve("data.sec.gov") == pytest.approx(0.1, abs=0.02)
+        assert limiter.reserve("data.sec.gov") == pytest.approx(0.2, abs=0.02)
+
+    def test_state_shared_between_instances(self, tmp_path):
+        path = tmp_path / "limits.sqlite"
+        first = RateLimiter(LIMITS, path)
+        second = RateLimiter(LIMITS, path)  # e.g. another skill process
+
+        first.reserve("data.sec.gov")
+        first.reserve("data.sec.gov")
+        assert second.reserve("data.sec.gov") > 0
+
+    def test_unlimited_host_skips_state(self, tmp_path):
+        limiter = RateLimiter(LIMITS, tmp_path / "limits.sqlite")
+        assert limiter.bucket("notsec.gov") is None
+        assert limiter.reserve("stooq.com") == 0
+        assert not limiter.path.exists()
+
+    def test_throttle_metrics(self, tmp_path):
+        limiter = RateLimiter(LIMITS, tmp_path / "limits.sqlite")
+        for _ in range(3):
+            limiter.reserve("data.sec.gov")
+
+        stats = limiter.stats()["sec.gov"]
+        assert stats["acquired"] == 3
+        assert stats["throttled"] == 1
+        assert stats["throttled_seconds"] == pytest.approx(0.1, abs=0.02)
+
+        limiter.reset()
+        assert limiter.stats()["sec.gov"]["acquired"] == 0
+
+    def test_acquire_async_waits_on_loop(self, tmp_path):
+        limiter = RateLimiter({"api.fda.gov": {"per_second": 50, "burst": 1}}, tmp_path / "limits.sqlite")
+
+        async def run():
+            return [await limiter.acquire_async("api.fda.gov") for _ in range(2)]
+
+        first, second = asyncio.run(run())
+        assert first == 0
+        assert second == pytest.approx(0.02, abs=0.01)
+
+    def test_acquire_async_keeps_loop_responsive_while_db_locked(self, tmp_path):
+        limiter = RateLimiter(LIMITS, tmp_path / "limits.sqlite")
+        limiter.reserve("data.sec.gov")
+        # Another process holds the bucket table
+        holder = sqlite3.connect(str(limiter.path), isolation_level=None)
+        holder.execute("BEGIN IMMEDIATE")
+
+        async def run():
+            ticks = 0
+
+            async def ticker():
+                nonlocal ticks
+                while True:
+                    ticks += 1
+                    await asyncio.sleep(0.01)
+
+            ticking = asyncio.create_task(ticker())
+            asyncio.get_running_loop().call_later(0.3, holder.execute, "COMMIT")
+            await limiter.acquire_async("data.sec.gov")
+            ticking.cancel()
+            return ticks
+
+        try:
+            assert asyncio.run(run()) >= 10
+        finally:
+            holder.close()
+
+
+class TestHttpClientLimits:
+    """Tests for limiter use in http_client."""
+
+    def test_every_attempt_takes_a_token(self, monkeypatch):
+        pool = HostPool({"retries": 1, "backoff_seconds": 0, "rate_limits": LIMITS})
+        monkeypatch.setattr(http_client, "_pool", pool)
+        retry = MagicMock(status_code=503, headers={})
+        ok = MagicMock(status_code=200, headers={})
+
+        with patch("http_client._request_once", side_effect=[retry, ok]):
+            assert http_client.get("https://data.sec.gov/submissions/CIK0000320193.json").status_code == 200
+
+        assert pool.limiter.stats()["sec.gov"]["acquired"] == 2
@@ -0,0 +1,176 @@
+"""
+Unit tests for the SEC companyfacts cache, conditional revalidation and
+the persisted ticker -> CIK index.
+"""
+
+import json
+import sys
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+# Add scripts directory to path
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "scripts"))
+
+import pytest
+import requests
+
+import sec_api
+from sec_cache import CompanyFactsCache, TickerIndex, latest_filed_date
+
+CIK = "0000320193"
+
+FACTS = {
+    "cik": 320193,
+    "facts": {
+        "us-gaap": {
+            "Assets": {"units": {"USD": [
+                {"end": "2025-06-30", "val": 100.0, "filed": "2025-08-01"},
+                {"end": "2025-09-30", "val": 110.0, "filed": "2025-11-01"},
+            ]}},
+        },
+        "dei": {
+            "EntityCommonStockSharesOutstanding": {"units": {"shares": [
+                {"end": "2025-10-15", "val": 50.0, "filed": "2025-11-01"},
+            ]}},
+        },
+    },
+}
+
+COMPANY_TICKERS = {
+    "0": {"cik_str": 320193, "ticker": "AAPL", "title": "Apple Inc."},
+    "1": {"cik_str": 1067983, "ticker": "BRK-B", "title": "BERKSHIRE HATHAWAY INC"},
+    "2": {"cik_str": 1067983, "ticker": "BRK-A", "title": "BERKSHIRE HATHAWAY INC"},
+}
+
+
+def _response(status_code=200, payload=None, headers=None):
+    response = MagicMock()
+    response.status_code = status_code
+    response.headers = headers or {}
+    response.json.return_value = payload
+    if status_code >= 400:
+        response.raise_for_status.side_effect = requests.HTTPError(str(status_code))
+    else:
+        response.raise_for_status.return_value = None
+    return response
+
+
+@pytest.fixture
+def facts_cache(tmp_path, monkeypatch):
+    cache = CompanyFactsCache(tmp_path, revalidate_hours=12)
+    monkeypatch.setattr(sec_api, "_facts_cache", cache)
+    return cache
+
+
+@pytest.fixture
+def ticker_index(tmp_path, monkeypatch):
+    index = TickerIndex(tmp_path / "ticker_index.json", max_age_hours=24)
+    monkeypatch.setattr(sec_api, "_ticker_index", index)
+    return index
+
+
+def _expire(cache):
+    """Mark the cached entry as last validated long ago."""
+    meta = cache.meta(CIK)
+    meta["validated_at"] = 0
+    cache._meta_path(CIK).write_text(json.dumps(meta))
+
+
+class TestCompanyFactsCache:
+    """Tests for on-disk storage."""
+
+    def test_store_and_load_round_trip(self, tmp_path):
+        cache = CompanyFactsCache(tmp_path)
+        meta = cache.store(CIK, FACTS, etag='"abc"')
+
+        fresh = CompanyFactsCache(tmp_path)
+        assert fresh.load(CIK) == FACTS
+        assert fresh.meta(CIK)["etag"] == '"abc"'
+        assert meta["latest_filed"] == "2025-11-01"
+        assert (tmp_path / f"CIK{CIK}.json.gz").exists()
+
+    def test_latest_filed_date(self):
+        assert latest_filed_date(FACTS) == "2025-11-01"
+        assert latest_filed_date({"facts": {}}) is None
+
+
+class TestGetCompanyFacts:
+    """Tests for cache use and revalidation in get_company_facts."""
+
+    def test_recent_entry_makes_no_request(self, facts_cache):
+        facts_cache.store(CIK, FACTS)
+        with patch("sec_api.http_client.get") as get_mock:
+            assert sec_api.get_company_facts(CIK) == FACTS
+        get_mock.assert_not_called()
+
+    def test_first_fetch_stores_validators(self, facts_cache):
+        with patch("sec_api.http_client.get", return_value=_response(200, FACTS, {"ETag": '"v1"'})):
+            assert sec_api.get_company_facts("320193") == FACTS
+        assert facts_cache.meta(CIK)["etag"] == '"v1"'
+
+    def test_conditional_get_not_modified(self, facts_cache):
+        facts_cache.store(CIK, FACTS, etag='"v1"', last_modified="Sat, 01 Nov 2025 00:00:00 GMT")
+        _expire(facts_cache)
+
+        with patch("sec_api.http_client.get", return_value=_response(304)) as get_mock:
+            assert sec_api.get_company_facts(CIK) == FACTS
+
+        headers = get_mock.call_args[1]["headers"]
+        assert headers["If-None-Match"] == '"v1"'
+        assert headers["If-Modified-Since"] == "Sat, 01 Nov 2025 00:00:00 GMT"
+        assert facts_cache.is_recent(facts_cache.meta(CIK))
+
+    def test_submissions_check_without_validators(self, facts_cache):
+        facts_cache.store(CIK, FACTS)
+        _expire(facts_cache)
+        submissions = {"filings": {"recent": {
+            "filingDate": ["2025-12-01", "2025-11-01"],
+            "isXBRL": [0, 1],  # newer Form 4 has no XBRL
+        }}}
+
+        with patch("sec_api.http_client.get", return_value=_response(200, submissions)) as get_mock:
+            assert sec_api.get_company_facts(CIK) == FACTS
+
+        assert "submissions" in get_mock.call_args[0][0]
+        get_mock.assert_called_once()
+
+    def test_network_error_falls_back_to_cache(self, facts_cache):
+        facts_cache.store(CIK, FACTS, etag='"v1"')
+        _expire(facts_cache)
+
+        with patch("sec_api.http_client.get", side_effect=requests.ConnectionError("down")):
+            assert sec_api.get_company_facts(CIK) == FACTS
+
+    def test_latest_filing_date_uses_cache(self, facts_cache):
+        facts_cache.store(CIK, FACTS)
+        with patch("sec_api.http_client.get") as get_mock:
+            assert sec_api.get_latest_filing_date(CIK) == "2025-11-01"
+        get_mock.assert_not_called()
+
+
+class TestTickerIndex:
+    """Tests for the persisted ticker -> CIK index."""
+
+    def test_many_tickers_one_download(self, ticker_index):
+        with patch("sec_api.http_client.get", return_value=_response(200, COMPANY_TICKERS)) as get_mock:
+            ciks = sec_api.resolve_ciks(["aapl", "BRK.B", "NOPE"])
+            assert sec_api.get_cik_from_ticker("BRK-A") == "0001067983"
+
+        get_mock.assert_called_once()
+        assert ciks == {"AAPL": CIK, "BRK.B": "0001067983", "NOPE": None}
+        assert sec_api.get_company_name("320193") == "Apple Inc."
+
+    def test_fresh_index_makes_no_request(self, ticker_index, tmp_path):
+        ticker_index.build(COMPANY_TICKERS)
+        # A new process reads the persisted file instead of downloading
+        reloaded = TickerIndex(tmp_path / "ticker_index.json", max_age_hours=24)
+        with patch.object(sec_api, "_ticker_index", reloaded), patch("sec_api.http_client.get") as get_mock:
+            assert sec_api.get_cik_from_ticker("AAPL") == CIK
+        get_mock.assert_not_called()
+
+    def test_stale_index_used_when_refresh_fails(self, ticker_index):
+        index = ticker_index.build(COMPANY_TICKERS)
+        index["built_at"] = 0
+
+        with patch("sec_api.http_client.get", side_effect=requests.ConnectionError("down")):
+            assert sec_api.get_cik_from_ticker("AAPL") == CIK
@@ -0,0 +1,113 @@
+"""
+Unit tests for the frames-based universe pre-screen (recorded frame fixtures).
+"""
+
+import json
+import sys
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+# Add scripts and fixtures directories to path
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "scripts"))
+FIXTURES = Path(__file__).resolve().parents[1] / "fixtures"
+
+import numpy as np
+import pytest
+
+import sec_api
+import sec_frames
+from sec_cache import FrameCache
+
+FRAMES = json.loads((FIXTURES / "sec_frames.json").read_text())
+
+
+def _recorded_get(url, headers=None, timeout=None):
+    key = url.split("/frames/")[1].rsplit(".json", 1)[0]
+    response = MagicMock()
+    response.status_code = 200 if key in FRAMES else 404
+    response.json.return_value = FRAMES.get(key)
+    response.raise_for_status.return_value = None
+    return response
+
+
+@pytest.fixture
+def recorded_frames(tmp_path, monkeypatch):
+    monkeypatch.setattr(sec_frames, "_frame_cache", FrameCache(tmp_path))
+    monkeypatch.setattr(sec_frames, "_cik_tickers", lambda: {320193: "AAPL"})
+    with patch("sec_frames.http_client.get", side_effect=_recorded_get) as get_mock:
+        yield get_mock
+
+
+def _financials(columns, row, suffix=""):
+    def value(concept):
+        array = columns.get(concept + suffix)
+        return 0 if array is None or np.isnan(array[row]) else float(array[row])
+
+    revenue = value("RevenueFromContractWithCustomerExcludingAssessedTax") or value("Revenues")
+    return sec_api.FinancialData(
+        total_assets=value("Assets"), current_assets=value("AssetsCurrent"),
+        total_liabilities=value("Liabilities"), current_liabilities=value("LiabilitiesCurrent"),
+        retained_earnings=value("RetainedEarningsAccumulatedDeficit"),
+        working_capital=value("AssetsCurrent") - value("LiabilitiesCurrent"),
+        ppe=value("PropertyPlantAndEquipmentNet"), long_term_debt=value("LongTermDebt"),
+        revenue=revenue, ebit=value("OperatingIncomeLoss"), net_income=0,
+        gross_profit=value("GrossProfit"), sga_expenses=value("SellingGeneralAndAdministrativeExpense"),
+        depreciation=value("DepreciationDepletionAndAmortization"),
+        accounts_receivable=value("AccountsReceivableNetCurrent"), operating_cash_flow=0,
+        cash_and_equivalents=value("CashAndCashEquivalentsAtCarryingValue"),
+        market_cap=0, shares_outstanding=0, filing_date="", fiscal_period="",
+    )
+
+
+class TestBuildTable:
+    """Tests for the cross-sectional table and vectorized scores."""
+
+    def test_scores_match_per_company_formulas(self, recorded_frames):
+        frames = sec_frames.fetch_frames(2024)
+        ciks, names, columns = sec_frames.build_table(frames)
+        scores = sec_frames.compute_scores(columns, len(ciks))
+
+        assert list(ciks) == [320193, 1000001, 1000002]
+        assert names[320193] == "Apple Inc."
+        for row in range(2):
+            current = _financials(columns, row)
+            previous = _financials(columns, row, "_prev")
+            assert scores["m_score"][row] == pytest.approx(sec_api.calculate_m_score(current, previous))
+            assert scores["z_score"][row] == pytest.approx(sec_api.calculate_z_score(current))
+        # New filer: no prior year, so no M-Score, but a Z-Score
+        assert np.isnan(scores["m_score"][2])
+        assert not np.isnan(scores["z_score"][2])
+
+    def test_frames_cached_on_disk(self, recorded_frames):
+        sec_frames.fetch_frames(2024)
+        calls = recorded_frames.call_count
+        sec_frames.fetch_frames(2024)
+        # Only the 404 frames (never cached) are requested again
+        assert recorded_frames.call_count - calls == 2 * len(sec_frames.INSTANT_CONCEPTS + sec_frames.DURATION_CONCEPTS) - len(FRAMES)
+
+
+class TestPrescreen:
+    """Tests for the ranked pre-screen document."""
+
+    def test_ranked_output(self, recorded_frames):
+        result = sec_frames.prescreen(2024)
+        companies = result["companies"]
+
+        assert [c["cik"] for c in companies] == ["0000320193", "0001000001", "0001000002"]
+        apple, stretch, new_filer = companies
+        assert apple["ticker"] == "AAPL"
+        assert apple["kill_screens_passed"] is True
+        assert stretch["m_score_pass"] is False
+        assert new_filer["m_score"] is None
+        assert result["summary"] == {"companies": 3, "scored": 2, "passed": 1}
+        assert "SalesRevenueNet" in result["frames_missing"]
+
+    def test_cli_writes_file(self, recorded_frames, tmp_path):
+        output = tmp_path / "prescreen.json"
+        with patch.object(sys, "argv", ["sec_frames.py", "prescreen", "--year", "2024",
+                                        "--output", str(output), "--limit", "1"]):
+            sec_frames.main()
+
+        written = json.loads(output.read_text())
+        assert len(written["companies"]) == 1
+        assert written["periods"]["instant"] == "CY2024Q4I"
@@ -0,0 +1,111 @@
+"""
+Unit tests for streaming monitor mode (watches, live table, edge-triggered alerts).
+"""
+
+import json
+import sys
+from pathlib import Path
+
+# Add scripts directory to path
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "scripts"))
+
+import stream_monitor
+from stream_monitor import StreamMonitor, load_watches, watch_from_trade
+
+
+def _trade(**overrides):
+    trade = {
+        "trade_id": "TRD-20260119-ABC-ACTIVIST",
+        "ticker": "abc",
+        "archetype": "activist",
+        "position": {"entry_price": 50.0, "stop_price": 45.0, "target_price": 70.0, "shares": 10},
+        "exit_plan": {"info_parity_weights": {"media": 1.0, "iv": 0.5, "price": 1.0}},
+        "monitoring": [{"date": "2026-01-23", "info_parity": {"media": 1, "iv": 0, "price": 0}}],
+    }
+    trade.update(overrides)
+    return trade
+
+
+class TestWatches:
+    """Tests for building watches from trade files."""
+
+    def test_load_watches(self, tmp_path):
+        (tmp_path / "a.json").write_text(json.dumps(_trade()))
+        (tmp_path / "broken.json").write_text("{")
+
+        watches = load_watches(tmp_path)
+
+        assert len(watches) == 1
+        assert watches[0].ticker == "ABC"
+        assert watches[0].signals == {"media": 1.0, "iv": 0.0}
+        assert watches[0].thresholds == {"exit_50_percent": 2.0, "full_exit": 3.0}
+
+    def test_options_trade_uses_options_exit_plan(self):
+        watch = watch_from_trade(_trade(
+            position=None,
+            options_position={"strike": 55.0, "expiration": "2026-03-20", "underlying_price_at_entry": 50.0},
+            options_exit_plan={"info_parity_weights": {"media": 0.5, "iv": 1.5, "price": 1.0},
+                               "info_parity_thresholds": {"exit_50_percent": 1.5, "full_exit": 2.5}},
+        ))
+
+        assert watch.entry_price == 50.0
+        assert watch.stop_price is None
+        assert watch.option_key == "ABC 2026-03-20 55.0 CALL"
+        assert watch.weights["iv"] == 1.5
+        assert watch.thresholds["exit_50_percent"] == 1.5
+
+
+class TestStreamMonitor:
+    """Tests for tick evaluation."""
+
+    def test_stop_alert_fires_once_and_rearms(self):
+        fired = []
+        monitor = StreamMonitor([watch_from_trade(_trade())], on_alert=fired.append)
+
+        monitor.on_stock_tick("ABC", {4: 44.9})
+        monitor.on_stock_tick("ABC", {4: 44.5})
+        monitor.on_stock_tick("ABC", {4: 46.0})
+        monitor.on_stock_tick("ABC", {4: 45.0})
+
+        assert [alert["type"] for alert in fired] == ["stop_loss", "stop_loss"]
+        assert fired[0]["priority"] == "immediate"
+        assert monitor.snapshot()["stocks"]["ABC"]["price"] == 45.0
+
+    def test_no_quote_ticks_ignored(self):
+        monitor = StreamMonitor([watch_from_trade(_trade())])
+
+        assert monitor.on_stock_tick("ABC", {1: -1.0, 2: 50.2}) == []
+        assert monitor.on_stock_tick("ABC", {4: -1.0}) == []
+        row = monitor.snapshot()["stocks"]["ABC"]
+        assert row["price"] is None
+        assert row["last"] is None
+
+    def test_price_signal_and_exit_signal(self):
+        monitor = StreamMonitor([watch_from_trade(_trade())])
+
+        assert monitor.on_stock_tick("ABC", {66: 59.0, 67: 59.2}) == []  # 45.5% of the move
+        alerts = monitor.on_stock_tick("ABC", {68: 61.0})  # 55%, weighted_sum = media 1 + price 1
+
+        assert [alert["type"] for alert in alerts] == ["info_parity_price", "exit_signal"]
+        assert alerts[1]["details"]["weighted_sum"] == 2.0
+        assert alerts[1]["details"]["level"] == "exit_50_percent"
+
+    def test_option_greeks_table(self):
+        monitor = StreamMonitor([])
+        monitor.on_option_tick("ABC 2026-03-20 55.0 CALL", {1: 1.0, 2: 1.2, "greeks": {"delta": 0.4}})
+
+        row = monitor.snapshot()["options"]["ABC 2026-03-20 55.0 CALL"]
+        assert row["price"] == 1.1
+        assert row["delta"] == 0.4
+
+    def test_append_alert(self, tmp_path):
+        alerts_file = tmp_path / "alerts.json"
+        alerts_file.write_text(json.dumps({"alerts": [], "metadata": {"version": "1.0"}}))
+        monitor = StreamMonitor([watch_from_trade(_trade())],
+                                on_alert=lambda alert: stream_monitor.append_alert(alert, alerts_file))
+
+        monitor.on_stock_tick("ABC", {4: 40.0})
+
+        data = json.loads(alerts_file.read_text())
+        assert data["metadata"] == {"version": "1.0"}
+        assert data["alerts"][0]["trade_id"] == "TRD-20260119-ABC-ACTIVIST"
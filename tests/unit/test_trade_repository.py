@@ -0,0 +1,185 @@
+"""
+Unit tests for the indexed trade repository.
+"""
+
+import json
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+# Add scripts directory to path
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "scripts"))
+
+import trade_repository
+from trade_repository import TradeRepository, scan_sections
+
+
+def _trade(trade_id="TRD-20260119-RGNX-PDUFA", ticker="RGNX", archetype="pdufa", **overrides):
+    trade = {
+        "trade_id": trade_id,
+        "ticker": ticker,
+        "archetype": archetype,
+        "status": "active",
+        "thesis": {"summary": "Gene therapy PDUFA – first in class", "catalyst_date": "2026-02-08",
+                   "linked_event": "EVT-2026-038"},
+        "position": {"entry_price": 13.62, "shares": 27, "cost_basis": 367.74, "stop_price": 8.0,
+                     "target_price": 30.78},
+        "monitoring": [
+            {"date": "2026-01-19", "price": 13.62, "unrealized_pnl": 0.0, "weighted_sum": 0.0, "action": "OPEN"},
+            {"date": "2026-01-20", "price": 14.0, "unrealized_pnl": 10.26, "weighted_sum": 0.02, "action": "HOLD"},
+        ],
+        "key_dates": {"pdufa_date": "2026-02-08"},
+    }
+    trade.update(overrides)
+    return trade
+
+
+def _write(root, status, name, trade):
+    path = root / status / f"{name}.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(trade, indent=2, ensure_ascii=False) + "\n")
+    return path
+
+
+class TestIndex:
+    """Tests for indexed queries and lazy section reads."""
+
+    def test_find_by_fields(self, tmp_path):
+        _write(tmp_path, "active", "TRD-20260119-RGNX-PDUFA", _trade())
+        _write(tmp_path, "active", "TRD-20260107-LULU-ACTIVIST", _trade(
+            "TRD-20260107-LULU-ACTIVIST", "LULU", "activist",
+            thesis={"catalyst_date": None, "linked_event": "EVT-2026-030"}))
+        _write(tmp_path, "passed", "CMA-20260107-PASS", {"ticker": "CMA", "archetype": "merger_arb", "date": "2026-01-07"})
+        (tmp_path / "active" / "broken.json").write_text("{")
+        repo = TradeRepository(tmp_path, tmp_path / "index.json")
+
+        assert [t["trade_id"] for t in repo.find(status="active")] == [
+            "TRD-20260107-LULU-ACTIVIST", "TRD-20260119-RGNX-PDUFA"]
+        assert [t["ticker"] for t in repo.find(archetype="merger_arb")] == ["CMA"]
+        assert repo.find(status="passed")[0]["trade_id"] == "CMA-20260107-PASS"
+        assert [t["ticker"] for t in repo.find(catalyst_from="2026-02-01", catalyst_to="2026-02-28")] == ["RGNX"]
+        assert [t["ticker"] for t in repo.find(linked_event="EVT-2026-030")] == ["LULU"]
+        assert repo.get("TRD-20260119-RGNX-PDUFA")["latest"]["action"] == "HOLD"
+
+    def test_sections_read_lazily(self, tmp_path):
+        trade = _trade()
+        path = _write(tmp_path, "active", "TRD-20260119-RGNX-PDUFA", trade)
+        repo = TradeRepository(tmp_path, tmp_path / "index.json")
+
+        sections, monitoring = scan_sections(path.read_bytes())
+        start, end = sections["thesis"]
+        assert json.loads(path.read_bytes()[start:end]) == trade["thesis"]
+        assert monitoring["count"] == 2
+        assert repo.section("TRD-20260119-RGNX-PDUFA", "key_dates") == {"pdufa_date": "2026-02-08"}
+        assert repo.latest_monitoring("TRD-20260119-RGNX-PDUFA")["date"] == "2026-01-20"
+
+    def test_index_refreshes_changed_files(self, tmp_path):
+        path = _write(tmp_path, "active", "TRD-20260119-RGNX-PDUFA", _trade())
+        repo = TradeRepository(tmp_path, tmp_path / "index.json")
+        assert repo.get("TRD-20260119-RGNX-PDUFA")["ticker"] == "RGNX"
+
+        _write(tmp_path, "active", "TRD-20260119-RGNX-PDUFA", _trade(archetype="pdufa_extended", extra="x"))
+        assert TradeRepository(tmp_path, tmp_path / "index.json").get("TRD-20260119-RGNX-PDUFA")[
+            "archetype"] == "pdufa_extended"
+
+        path.unlink()
+        assert repo.find() == []
+
+
+class TestAppendMonitoring:
+    """Tests for in-place monitoring appends."""
+
+    def test_append_keeps_document_and_offsets(self, tmp_path):
+        trade = _trade()
+        path = _write(tmp_path, "active", "TRD-20260119-RGNX-PDUFA", trade)
+        repo = TradeRepository(tmp_path, tmp_path / "index.json")
+        entry = {"date": "2026-01-21", "price": 14.5, "unrealized_pnl": 23.76, "weighted_sum": 0.05,
+                 "action": "HOLD", "notes": "≥ 50% to target not reached"}
+
+        repo.append_monitoring("TRD-20260119-RGNX-PDUFA", entry)
+        record = repo.append_monitoring("TRD-20260119-RGNX-PDUFA", {**entry, "date": "2026-01-22"})
+
+        updated = json.loads(path.read_text())
+        assert updated["monitoring"] == trade["monitoring"] + [entry, {**entry, "date": "2026-01-22"}]
+        assert {k: v for k, v in updated.items() if k != "monitoring"} == \
+            {k: v for k, v in trade.items() if k != "monitoring"}
+        assert record["monitoring_entries"] == 4
+        assert record["latest"]["date"] == "2026-01-22"
+
+        fresh = TradeRepository(tmp_path, tmp_path / "index.json")
+        assert fresh.section("TRD-20260119-RGNX-PDUFA", "key_dates") == trade["key_dates"]
+        assert fresh.latest_monitoring("TRD-20260119-RGNX-PDUFA")["date"] == "2026-01-22"
+
+    def test_append_to_empty_or_missing_monitoring(self, tmp_path):
+        empty = _write(tmp_path, "active", "TRD-A", _trade("TRD-A", monitoring=[]))
+        missing = _write(tmp_path, "active", "TRD-B", {"trade_id": "TRD-B", "ticker": "B"})
+        repo = TradeRepository(tmp_path, tmp_path / "index.json")
+
+        repo.append_monitoring("TRD-A", {"date": "2026-01-21"})
+        repo.append_monitoring("TRD-B", {"date": "2026-01-21"})
+        repo.append_monitoring("TRD-B", {"date": "2026-01-22"})
+
+        assert json.loads(empty.read_text())["monitoring"] == [{"date": "2026-01-21"}]
+        assert [m["date"] for m in json.loads(missing.read_text())["monitoring"]] == ["2026-01-21", "2026-01-22"]
+
+    def test_append_in_place_when_monitoring_is_last(self, tmp_path):
+        trade = _trade()
+        del trade["key_dates"]
+        path = _write(tmp_path, "active", "TRD-20260119-RGNX-PDUFA", trade)
+        inode = path.stat().st_ino
+        repo = TradeRepository(tmp_path, tmp_path / "index.json")
+
+        repo.append_monitoring("TRD-20260119-RGNX-PDUFA", {"date": "2026-01-21"})
+
+        assert path.stat().st_ino == inode
+        assert json.loads(path.read_text())["monitoring"][-1] == {"date": "2026-01-21"}
+
+    def test_failed_append_leaves_file_intact(self, tmp_path, monkeypatch):
+        path = _write(tmp_path, "active", "TRD-20260119-RGNX-PDUFA", _trade())
+        original = path.read_bytes()
+        repo = TradeRepository(tmp_path, tmp_path / "index.json")
+
+        def disk_full(*args):
+            raise OSError(28, "No space left on device")
+
+        monkeypatch.setattr(trade_repository.os, "replace", disk_full)
+        with pytest.raises(OSError):
+            repo.append_monitoring("TRD-20260119-RGNX-PDUFA", {"date": "2026-01-21"})
+
+        assert path.read_bytes() == original
+        assert sorted(p.name for p in path.parent.iterdir()) == [path.name, path.name + ".lock"]
+
+    def test_concurrent_appenders_keep_both_entries(self, tmp_path, monkeypatch):
+        path = _write(tmp_path, "active", "TRD-20260119-RGNX-PDUFA", _trade())
+        first = TradeRepository(tmp_path, tmp_path / "index.json")
+        second = TradeRepository(tmp_path, tmp_path / "index.json")
+        second.get("TRD-20260119-RGNX-PDUFA")
+        writer = threading.Thread(target=second.append_monitoring,
+                                  args=("TRD-20260119-RGNX-PDUFA", {"date": "B"}))
+        replace_file = trade_repository._replace_file
+
+        def slow_replace(target, raw):
+            # Let the second appender queue up while the first still holds the lock
+            if not writer.is_alive():
+                writer.start()
+                time.sleep(0.2)
+            replace_file(target, raw)
+
+        monkeypatch.setattr(trade_repository, "_replace_file", slow_replace)
+        first.append_monitoring("TRD-20260119-RGNX-PDUFA", {"date": "A"})
+        writer.join()
+
+        assert [m["date"] for m in json.loads(path.read_text())["monitoring"]] == [
+            "2026-01-19", "2026-01-20", "A", "B"]
+
+    def test_portfolio_summary_from_index(self, tmp_path):
+        _write(tmp_path, "active", "TRD-20260119-RGNX-PDUFA", _trade())
+        _write(tmp_path, "passed", "CMA-20260107-PASS", {"ticker": "CMA", "archetype": "merger_arb"})
+
+        summary = TradeRepository(tmp_path, tmp_path / "index.json").portfolio_summary()
+
+        assert summary["totals"] == {"count": 1, "cost_basis": 367.74, "unrealized_pnl": 10.26}
+        assert summary["positions"][0]["weighted_sum"] == 0.02
@@ -0,0 +1,89 @@
+"""
+Unit tests for the single-pass, period-aligned XBRL extractor.
+"""
+
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+# Add scripts directory to path
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "scripts"))
+
+import sec_api
+from xbrl_extract import extract_periods
+
+
+def _fact(end, val, form="10-Q", fy=2025, fp="Q2", filed="2025-08-01", start=None):
+    fact = {"end": end, "val": val, "form": form, "fy": fy, "fp": fp, "filed": filed}
+    if start:
+        fact["start"] = start
+    return fact
+
+
+FACTS = {"facts": {"us-gaap": {
+    "Assets": {"units": {"USD": [
+        _fact("2024-06-30", 900.0, fy=2024, filed="2024-08-01"),
+        _fact("2024-12-31", 950.0, form="10-K", fy=2024, fp="FY", filed="2025-02-15"),
+        _fact("2025-06-30", 1000.0),
+        _fact("2024-12-31", 950.0, filed="2025-08-01"),  # comparative in the 10-Q
+    ]}},
+    "RevenueFromContractWithCustomerExcludingAssessedTax": {"units": {"USD": [
+        # Q2 2025: three-month and six-month year-to-date values
+        _fact("2025-06-30", 300.0, start="2025-04-01"),
+        _fact("2025-06-30", 550.0, start="2025-01-01"),
+        # Q2 2024 as originally filed, then as restated in the 2025 10-Q
+        _fact("2024-06-30", 400.0, fy=2024, start="2024-01-01", filed="2024-08-01"),
+        _fact("2024-06-30", 410.0, start="2024-01-01"),
+        _fact("2024-12-31", 900.0, form="10-K", fy=2024, fp="FY", start="2024-01-01", filed="2025-02-15"),
+    ]}},
+    # Tag abandoned years ago: must not supply the current revenue
+    "Revenues": {"units": {"USD": [
+        _fact("2018-12-31", 123.0, form="10-K", fy=2018, fp="FY", start="2018-01-01", filed="2019-02-15"),
+    ]}},
+    "CommonStockSharesOutstanding": {"units": {"shares": [
+        _fact("2025-06-30", 50.0),
+        _fact("2025-07-25", 51.0, form="8-K"),  # not a periodic report
+    ]}},
+}}}
+
+
+class TestExtractPeriods:
+    """Tests for period alignment."""
+
+    def test_latest_quarter_with_prior_year_comparable(self):
+        current, previous = extract_periods(FACTS)
+
+        assert (current.end, current.fy, current.fp, current.form) == ("2025-06-30", 2025, "Q2", "10-Q")
+        assert current.get("Assets") == 1000.0
+        # Year-to-date flow, compared with the restated prior-year YTD
+        assert current.get("RevenueFromContractWithCustomerExcludingAssessedTax") == 550.0
+        assert previous.get("RevenueFromContractWithCustomerExcludingAssessedTax") == 410.0
+        assert previous.get("Assets") == 900.0
+        assert previous.fiscal_period == "Q2 2024"
+        assert current.get("Revenues") is None
+        assert current.get("CommonStockSharesOutstanding") == 50.0
+
+    def test_annual_mode_uses_10k(self):
+        current, previous = extract_periods(FACTS, annual=True)
+
+        assert current.fiscal_period == "FY 2024"
+        assert current.get("Assets") == 950.0
+        assert current.get("RevenueFromContractWithCustomerExcludingAssessedTax") == 900.0
+        assert previous is None
+
+    def test_no_periodic_facts(self):
+        assert extract_periods({"facts": {}}) == (None, None)
+
+
+class TestFetchTwoPeriods:
+    """Tests for FinancialData built from extracted periods."""
+
+    def test_revenue_tag_consistent_across_periods(self):
+        with patch("sec_api.get_company_facts", return_value=FACTS):
+            current, previous = sec_api.fetch_two_periods("TEST", cik="0000000001")
+
+        assert current.revenue == 550.0
+        assert previous.revenue == 410.0
+        assert current.total_assets == 1000.0
+        assert current.fiscal_period == "Q2 2025"
+        assert current.filing_date == "2025-08-01"